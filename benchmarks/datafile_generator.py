@@ -0,0 +1,285 @@
+# Copyright 2026, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Generates synthetic datafiles of a given size for the benchmarks.
+
+Flags have A/B test rules and a rollout with a targeted delivery and an everyone else rule. Rules target
+typed audiences whose conditions are nested condition_depth levels deep. Mutually exclusive groups add
+grouped experiments to the first flags and global holdouts apply to all flags. Datafiles only depend on
+the seed, so results of different runs are comparable.
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import random
+from dataclasses import dataclass
+from typing import Any
+
+from optimizely.optimizely_user_context import UserAttributes
+
+ATTRIBUTE_COUNT = 10
+EVENT_COUNT = 10
+VARIABLE_TYPES = (
+    ('boolean', None, 'true'),
+    ('string', None, 'value'),
+    ('integer', None, '10'),
+    ('double', None, '1.5'),
+    ('string', 'json', '{"key": "value", "count": 1}'),
+)
+
+
+@dataclass(frozen=True)
+class DatafileScale:
+    """Size of a synthetic datafile."""
+    flags: int
+    rules_per_flag: int
+    audiences: int
+    condition_depth: int
+    holdouts: int
+    variables: int
+    groups: int
+
+
+SCALES: dict[str, DatafileScale] = {
+    'small': DatafileScale(flags=10, rules_per_flag=2, audiences=5, condition_depth=1, holdouts=0, variables=2,
+                           groups=1),
+    'medium': DatafileScale(flags=100, rules_per_flag=3, audiences=50, condition_depth=2, holdouts=2, variables=5,
+                            groups=5),
+    'large': DatafileScale(flags=1000, rules_per_flag=4, audiences=200, condition_depth=3, holdouts=5, variables=10,
+                           groups=20),
+}
+
+
+def get_attribute_key(index: int) -> str:
+    return f'attribute_{index % ATTRIBUTE_COUNT}'
+
+
+def get_event_key(index: int) -> str:
+    return f'event_{index % EVENT_COUNT}'
+
+
+def generate_user_attributes(rng: random.Random) -> UserAttributes:
+    """Attributes matching about half of the leaf conditions of the generated audiences."""
+    attributes = UserAttributes({})
+    for index in range(ATTRIBUTE_COUNT):
+        if index % 2:
+            attributes[get_attribute_key(index)] = rng.randint(0, 100)
+        else:
+            attributes[get_attribute_key(index)] = f'value_{rng.randint(0, 3)}'
+    return attributes
+
+
+def _generate_condition(rng: random.Random, depth: int) -> Any:
+    """A condition tree with two children per level, whose leaves compare a user attribute."""
+    if depth <= 0:
+        index = rng.randrange(ATTRIBUTE_COUNT)
+        if index % 2:
+            return {'name': get_attribute_key(index), 'type': 'custom_attribute', 'match': 'gt',
+                    'value': rng.randint(0, 100)}
+        return {'name': get_attribute_key(index), 'type': 'custom_attribute', 'match': 'exact',
+                'value': f'value_{rng.randint(0, 3)}'}
+
+    operator = rng.choice(('and', 'or'))
+    return [operator, _generate_condition(rng, depth - 1), _generate_condition(rng, depth - 1)]
+
+
+class _Ids:
+    """Unique entity ids."""
+
+    def __init__(self) -> None:
+        self.next_id = 100000
+
+    def new(self) -> str:
+        self.next_id += 1
+        return str(self.next_id)
+
+
+def _generate_variations(
+    ids: _Ids, key_prefix: str, count: int, variables: list[dict[str, Any]]
+) -> list[dict[str, Any]]:
+    return [
+        {
+            'id': ids.new(),
+            'key': f'{key_prefix}_variation_{index}',
+            'featureEnabled': index > 0,
+            'variables': [{'id': variable['id'], 'value': variable['defaultValue']} for variable in variables],
+        }
+        for index in range(count)
+    ]
+
+
+def _generate_traffic_allocation(variations: list[dict[str, Any]], end_of_range: int = 10000) -> list[dict[str, Any]]:
+    step = end_of_range // len(variations)
+    allocation = [
+        {'entityId': variation['id'], 'endOfRange': step * (index + 1)} for index, variation in enumerate(variations)
+    ]
+    allocation[-1]['endOfRange'] = end_of_range
+    return allocation
+
+
+def _generate_rule(
+    ids: _Ids,
+    rng: random.Random,
+    key: str,
+    layer_id: str,
+    audience_ids: list[str],
+    variation_count: int,
+    variables: list[dict[str, Any]]
+) -> dict[str, Any]:
+    audience_id = rng.choice(audience_ids) if audience_ids else None
+    variations = _generate_variations(ids, key, variation_count, variables)
+    return {
+        'id': ids.new(),
+        'key': key,
+        'status': 'Running',
+        'layerId': layer_id,
+        'audienceIds': [audience_id] if audience_id else [],
+        'audienceConditions': ['or', audience_id] if audience_id else [],
+        'forcedVariations': {},
+        'variations': variations,
+        'trafficAllocation': _generate_traffic_allocation(variations),
+    }
+
+
+def generate_datafile(scale: DatafileScale, seed: int = 0) -> dict[str, Any]:
+    """Generate a datafile of the given scale.
+
+    Returns:
+        The datafile as a dict, to be serialized with json.dumps.
+    """
+    rng = random.Random(seed)
+    ids = _Ids()
+
+    attributes = [{'id': ids.new(), 'key': get_attribute_key(index)} for index in range(ATTRIBUTE_COUNT)]
+    typed_audiences = [
+        {'id': ids.new(), 'name': f'audience_{index}', 'conditions': _generate_condition(rng, scale.condition_depth)}
+        for index in range(scale.audiences)
+    ]
+    # typed audiences are listed with placeholder conditions for SDKs without support for them
+    audiences = [
+        {
+            'id': audience['id'],
+            'name': audience['name'],
+            'conditions': '["or", {"match": "exact", "name": "$opt_dummy_attribute", "type": "custom_attribute", '
+                          '"value": "$opt_dummy_value"}]',
+        }
+        for audience in typed_audiences
+    ]
+    audience_ids = [audience['id'] for audience in typed_audiences]
+
+    experiments: list[dict[str, Any]] = []
+    groups: list[dict[str, Any]] = []
+    rollouts: list[dict[str, Any]] = []
+    feature_flags: list[dict[str, Any]] = []
+
+    for flag_index in range(scale.flags):
+        flag_key = f'flag_{flag_index}'
+        variables = []
+        for variable_index in range(scale.variables):
+            variable_type, sub_type, default_value = VARIABLE_TYPES[variable_index % len(VARIABLE_TYPES)]
+            variable = {'id': ids.new(), 'key': f'variable_{variable_index}', 'type': variable_type,
+                        'defaultValue': default_value}
+            if sub_type:
+                variable['subType'] = sub_type
+            variables.append(variable)
+
+        experiment_ids = []
+        for rule_index in range(max(0, scale.rules_per_flag - 1)):
+            experiment = _generate_rule(
+                ids, rng, f'{flag_key}_experiment_{rule_index}', ids.new(), audience_ids, 2, variables
+            )
+            experiments.append(experiment)
+            experiment_ids.append(experiment['id'])
+
+        if flag_index < scale.groups:
+            group_experiments = [
+                _generate_rule(ids, rng, f'{flag_key}_grouped_experiment_{index}', ids.new(), audience_ids, 2,
+                               variables)
+                for index in range(2)
+            ]
+            groups.append({
+                'id': ids.new(),
+                'policy': 'random',
+                'experiments': group_experiments,
+                'trafficAllocation': _generate_traffic_allocation(group_experiments),
+            })
+            experiment_ids.extend(experiment['id'] for experiment in group_experiments)
+
+        rollout_id = ids.new()
+        targeted_delivery = _generate_rule(
+            ids, rng, f'{flag_key}_targeted_delivery', rollout_id, audience_ids, 1, variables
+        )
+        everyone_else = _generate_rule(ids, rng, f'{flag_key}_everyone_else', rollout_id, [], 1, variables)
+        rollouts.append({'id': rollout_id, 'experiments': [targeted_delivery, everyone_else]})
+
+        feature_flags.append({
+            'id': ids.new(),
+            'key': flag_key,
+            'experimentIds': experiment_ids,
+            'rolloutId': rollout_id,
+            'variables': variables,
+        })
+
+    all_experiment_ids = [experiment['id'] for experiment in experiments]
+    for group in groups:
+        all_experiment_ids.extend(experiment['id'] for experiment in group['experiments'])
+    events = [
+        {'id': ids.new(), 'key': get_event_key(index), 'experimentIds': all_experiment_ids[index::EVENT_COUNT]}
+        for index in range(EVENT_COUNT)
+    ]
+
+    holdouts = []
+    for index in range(scale.holdouts):
+        variation = {'id': ids.new(), 'key': f'holdout_{index}_off', 'featureEnabled': False, 'variables': []}
+        holdouts.append({
+            'id': ids.new(),
+            'key': f'holdout_{index}',
+            'status': 'Running',
+            'audienceIds': [],
+            'variations': [variation],
+            'trafficAllocation': [{'entityId': variation['id'], 'endOfRange': 100}],
+        })
+
+    return {
+        'version': '4',
+        'revision': '1',
+        'projectId': '10000',
+        'accountId': '10001',
+        'sdkKey': 'benchmark',
+        'anonymizeIP': False,
+        'botFiltering': False,
+        'sendFlagDecisions': True,
+        'attributes': attributes,
+        'audiences': audiences,
+        'typedAudiences': typed_audiences,
+        'experiments': experiments,
+        'groups': groups,
+        'rollouts': rollouts,
+        'featureFlags': feature_flags,
+        'events': events,
+        'holdouts': holdouts,
+        'integrations': [],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--scale', choices=sorted(SCALES), default='small')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    print(json.dumps(generate_datafile(SCALES[args.scale], args.seed)))
+
+
+if __name__ == '__main__':
+    main()
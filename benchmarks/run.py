@@ -0,0 +1,435 @@
+# Copyright 2026, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Runs the SDK benchmarks on synthetic datafiles and writes the results as JSON.
+
+Every benchmark is run for each requested scale and thread count. Threads run the operation in a loop
+until the duration has passed, or for a fixed number of iterations each, and the latency of every
+operation is recorded. Results can be compared with the results of an earlier run to detect regressions:
+
+    python -m benchmarks.run --scales small medium --threads 1 4 --output results.json
+    python -m benchmarks.run --baseline results.json --max-regression 0.2
+"""
+
+from __future__ import annotations
+import argparse
+import json
+import platform
+import random
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Optional
+
+from optimizely import optimizely
+from optimizely.bucketer import Bucketer
+from optimizely.event.event_factory import EventFactory
+from optimizely.event.event_processor import ForwardingEventProcessor
+from optimizely.event.user_event_factory import UserEventFactory
+from optimizely.helpers import enums
+from optimizely.helpers.audience import does_user_meet_audience_conditions
+from optimizely.logger import NoOpLogger
+from optimizely.odp.lru_cache import create_lru_cache
+from optimizely.optimizely_user_context import OptimizelyUserContext, UserAttributes
+from optimizely.project_config import ProjectConfig
+from optimizely.version import __version__
+
+from .datafile_generator import SCALES, DatafileScale, generate_datafile, generate_user_attributes
+
+# number of distinct users each thread cycles through
+USER_COUNT = 1000
+LRU_CACHE_CAPACITY = 10000
+
+# operation run by a thread, called with the index of the iteration
+Operation = Callable[[int], Any]
+# creates the operation of a thread from the context, state shared by the threads of the run and the thread index
+OperationFactory = Callable[['BenchmarkContext', dict[str, Any], int], Operation]
+
+
+@dataclass
+class BenchmarkResult:
+    """Throughput and latency of one benchmark at one scale and thread count."""
+    benchmark: str
+    scale: str
+    threads: int
+    operations: int
+    seconds: float
+    ops_per_sec: float
+    mean_us: float
+    p50_us: float
+    p95_us: float
+    p99_us: float
+
+
+class _NoOpEventDispatcher:
+    @staticmethod
+    def dispatch_event(log_event: Any) -> None:
+        pass
+
+
+class BenchmarkContext:
+    """Datafile and SDK objects shared by the benchmarks of one scale."""
+
+    def __init__(self, scale: DatafileScale, seed: int = 0):
+        self.scale = scale
+        self.datafile = json.dumps(generate_datafile(scale, seed))
+        self.logger = NoOpLogger()
+        self.client = self._create_client()
+        self._listener_client: Optional[optimizely.Optimizely] = None
+        self._lock = threading.Lock()
+        config = self.client.config_manager.get_config()
+        assert config is not None
+        self.config: ProjectConfig = config
+        self.flag_keys = list(self.config.feature_key_map)
+        self.experiments = list(self.config.experiment_id_map.values())
+        self.event_keys = list(self.config.event_key_map)
+
+        rng = random.Random(seed)
+        self.users = [(f'user_{index}', generate_user_attributes(rng)) for index in range(USER_COUNT)]
+
+    def _create_client(self) -> optimizely.Optimizely:
+        return optimizely.Optimizely(
+            self.datafile,
+            logger=self.logger,
+            event_processor=ForwardingEventProcessor(_NoOpEventDispatcher(), logger=self.logger)
+        )
+
+    def get_listener_client(self) -> optimizely.Optimizely:
+        """Returns a client of the datafile with a DECISION notification listener, created on first use."""
+        with self._lock:
+            if self._listener_client is None:
+                self._listener_client = self._create_client()
+                self._listener_client.notification_center.add_notification_listener(
+                    enums.NotificationTypes.DECISION, lambda *args: None
+                )
+            return self._listener_client
+
+    def get_user_index(self, thread_index: int, iteration: int) -> int:
+        # threads start at different users so that they don't evaluate the same user at the same time
+        return (thread_index * 7919 + iteration) % len(self.users)
+
+    def get_user(self, thread_index: int, iteration: int) -> tuple[str, UserAttributes]:
+        return self.users[self.get_user_index(thread_index, iteration)]
+
+    def create_user_context(
+        self, user_id: str, attributes: UserAttributes, client: Optional[optimizely.Optimizely] = None
+    ) -> OptimizelyUserContext:
+        user_context = (client or self.client).create_user_context(user_id, attributes)
+        assert user_context is not None
+        return user_context
+
+    def close(self) -> None:
+        self.client.close()
+        if self._listener_client is not None:
+            self._listener_client.close()
+
+
+def _config_build(context: BenchmarkContext, shared: dict[str, Any], thread_index: int) -> Operation:
+    datafile = context.datafile
+    return lambda iteration: ProjectConfig(datafile, context.logger, context.client.error_handler)
+
+
+def _decide_operation(context: BenchmarkContext, client: optimizely.Optimizely, thread_index: int) -> Operation:
+    user_contexts = [
+        context.create_user_context(user_id, attributes, client) for user_id, attributes in context.users
+    ]
+    flag_keys = context.flag_keys
+
+    def operation(iteration: int) -> Any:
+        user_context = user_contexts[context.get_user_index(thread_index, iteration)]
+        return user_context.decide(flag_keys[iteration % len(flag_keys)])
+
+    return operation
+
+
+def _decide(context: BenchmarkContext, shared: dict[str, Any], thread_index: int) -> Operation:
+    return _decide_operation(context, context.client, thread_index)
+
+
+def _decide_with_listeners(context: BenchmarkContext, shared: dict[str, Any], thread_index: int) -> Operation:
+    # a listener makes decide() build the notification payload and resolve all variables
+    return _decide_operation(context, context.get_listener_client(), thread_index)
+
+
+def _decide_all(context: BenchmarkContext, shared: dict[str, Any], thread_index: int) -> Operation:
+    def operation(iteration: int) -> Any:
+        user_id, attributes = context.get_user(thread_index, iteration)
+        return context.create_user_context(user_id, attributes).decide_all()
+
+    return operation
+
+
+def _track(context: BenchmarkContext, shared: dict[str, Any], thread_index: int) -> Operation:
+    event_keys = context.event_keys
+
+    def operation(iteration: int) -> Any:
+        user_id, attributes = context.get_user(thread_index, iteration)
+        return context.client.track(event_keys[iteration % len(event_keys)], user_id, attributes)
+
+    return operation
+
+
+def _bucket(context: BenchmarkContext, shared: dict[str, Any], thread_index: int) -> Operation:
+    bucketer = Bucketer()
+    experiments = context.experiments
+
+    def operation(iteration: int) -> Any:
+        user_id, _ = context.get_user(thread_index, iteration)
+        return bucketer.bucket(context.config, experiments[iteration % len(experiments)], user_id, user_id)
+
+    return operation
+
+
+def _audience_evaluation(context: BenchmarkContext, shared: dict[str, Any], thread_index: int) -> Operation:
+    user_contexts = [context.create_user_context(user_id, attributes) for user_id, attributes in context.users]
+    experiments = [experiment for experiment in context.experiments if experiment.audienceIds]
+
+    def operation(iteration: int) -> Any:
+        experiment = experiments[iteration % len(experiments)]
+        return does_user_meet_audience_conditions(
+            context.config,
+            experiment.get_audience_conditions_or_ids(),
+            enums.ExperimentAudienceEvaluationLogs,
+            experiment.key,
+            user_contexts[context.get_user_index(thread_index, iteration)],
+            context.logger
+        )
+
+    return operation
+
+
+def _event_payload(context: BenchmarkContext, shared: dict[str, Any], thread_index: int) -> Operation:
+    experiments = context.experiments
+
+    def operation(iteration: int) -> Any:
+        user_id, attributes = context.get_user(thread_index, iteration)
+        experiment = experiments[iteration % len(experiments)]
+        user_event = UserEventFactory.create_impression_event(
+            context.config, experiment, experiment.variations[0]['id'], experiment.key, experiment.key,
+            enums.DecisionSources.FEATURE_TEST, True, user_id, attributes, None
+        )
+        return EventFactory.create_log_event(user_event, context.logger)
+
+    return operation
+
+
+def _lru_cache(context: BenchmarkContext, shared: dict[str, Any], thread_index: int) -> Operation:
+    if 'cache' not in shared:
+        shared['cache'] = create_lru_cache(LRU_CACHE_CAPACITY, 0)
+    cache = shared['cache']
+    # twice as many keys as the cache holds, so that about half of the lookups are hits
+    keys = [f'key_{index}' for index in range(LRU_CACHE_CAPACITY * 2)]
+    rng = random.Random(thread_index)
+    rng.shuffle(keys)
+
+    def operation(iteration: int) -> Any:
+        key = keys[iteration % len(keys)]
+        value = cache.lookup(key)
+        if value is None:
+            cache.save(key, iteration)
+        return value
+
+    return operation
+
+
+BENCHMARKS: dict[str, OperationFactory] = {
+    'config_build': _config_build,
+    'decide': _decide,
+    # decide_without_listeners is the same as decide, named for comparison with decide_with_listeners
+    'decide_without_listeners': _decide,
+    'decide_with_listeners': _decide_with_listeners,
+    'decide_all': _decide_all,
+    'track': _track,
+    'bucket': _bucket,
+    'audience_evaluation': _audience_evaluation,
+    'event_payload': _event_payload,
+    'lru_cache': _lru_cache,
+}
+
+
+def _percentile(sorted_latencies: list[float], percentile: float) -> float:
+    index = min(len(sorted_latencies) - 1, int(len(sorted_latencies) * percentile))
+    return sorted_latencies[index]
+
+
+def run_benchmark(
+    name: str,
+    scale_name: str,
+    context: BenchmarkContext,
+    threads: int,
+    duration: float = 1.0,
+    iterations: Optional[int] = None
+) -> BenchmarkResult:
+    """Run a benchmark in a number of threads.
+
+    Args:
+        name: Key of the benchmark in BENCHMARKS.
+        scale_name: Name of the scale of the context, for the result.
+        context: Datafile and SDK objects of the scale.
+        threads: Number of threads running the benchmark concurrently.
+        duration: Time in seconds each thread runs the operation for. Ignored if iterations is set.
+        iterations: Number of operations run by each thread.
+
+    Returns:
+        The result of the run.
+    """
+    shared: dict[str, Any] = {}
+    operations = [BENCHMARKS[name](context, shared, thread_index) for thread_index in range(threads)]
+    latencies: list[list[float]] = [[] for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def work(thread_index: int) -> None:
+        operation = operations[thread_index]
+        thread_latencies = latencies[thread_index]
+        barrier.wait()
+        deadline = time.perf_counter() + duration
+        iteration = 0
+        while (iteration < iterations) if iterations is not None else (time.perf_counter() < deadline):
+            start = time.perf_counter()
+            operation(iteration)
+            thread_latencies.append(time.perf_counter() - start)
+            iteration += 1
+
+    workers = [threading.Thread(target=work, args=(thread_index,)) for thread_index in range(threads)]
+    for worker in workers:
+        worker.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    seconds = time.perf_counter() - start
+
+    all_latencies = sorted(latency * 1e6 for thread_latencies in latencies for latency in thread_latencies)
+    count = len(all_latencies)
+    return BenchmarkResult(
+        benchmark=name,
+        scale=scale_name,
+        threads=threads,
+        operations=count,
+        seconds=round(seconds, 6),
+        ops_per_sec=round(count / seconds, 2) if seconds > 0 else 0.0,
+        mean_us=round(sum(all_latencies) / count, 3) if count else 0.0,
+        p50_us=round(_percentile(all_latencies, 0.5), 3) if count else 0.0,
+        p95_us=round(_percentile(all_latencies, 0.95), 3) if count else 0.0,
+        p99_us=round(_percentile(all_latencies, 0.99), 3) if count else 0.0,
+    )
+
+
+def run(
+    scales: list[str],
+    benchmarks: list[str],
+    thread_counts: list[int],
+    duration: float = 1.0,
+    iterations: Optional[int] = None,
+    seed: int = 0,
+    output: Optional[Callable[[BenchmarkResult], None]] = None
+) -> dict[str, Any]:
+    """Run the benchmarks for every scale and thread count.
+
+    Returns:
+        The report with the environment and the results, as written by main.
+    """
+    results = []
+    for scale_name in scales:
+        context = BenchmarkContext(SCALES[scale_name], seed)
+        try:
+            for name in benchmarks:
+                for threads in thread_counts:
+                    result = run_benchmark(name, scale_name, context, threads, duration, iterations)
+                    if output:
+                        output(result)
+                    results.append(result)
+        finally:
+            context.close()
+
+    return {
+        'sdk_version': __version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'seed': seed,
+        'scales': {scale_name: asdict(SCALES[scale_name]) for scale_name in scales},
+        'results': [asdict(result) for result in results],
+    }
+
+
+def find_regressions(
+    report: dict[str, Any], baseline: dict[str, Any], max_regression: float
+) -> list[tuple[dict[str, Any], dict[str, Any]]]:
+    """Returns the results whose throughput dropped by more than max_regression (a fraction) from the
+    baseline result of the same benchmark, scale and thread count, with that baseline result.
+    """
+    def key(result: dict[str, Any]) -> tuple[str, str, int]:
+        return result['benchmark'], result['scale'], result['threads']
+
+    baseline_results = {key(result): result for result in baseline.get('results', [])}
+    regressions = []
+    for result in report['results']:
+        baseline_result = baseline_results.get(key(result))
+        if baseline_result and result['ops_per_sec'] < baseline_result['ops_per_sec'] * (1 - max_regression):
+            regressions.append((result, baseline_result))
+    return regressions
+
+
+def _print_result(result: BenchmarkResult) -> None:
+    print(
+        f'{result.benchmark:<20} {result.scale:<8} {result.threads:>3} threads '
+        f'{result.ops_per_sec:>14,.1f} ops/s  p50 {result.p50_us:>10,.1f}us  p99 {result.p99_us:>10,.1f}us',
+        file=sys.stderr
+    )
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__.splitlines()[0] if __doc__ else None
+    )
+    parser.add_argument('--scales', nargs='+', choices=sorted(SCALES), default=['small', 'medium'])
+    parser.add_argument('--benchmarks', nargs='+', choices=list(BENCHMARKS), default=list(BENCHMARKS))
+    parser.add_argument('--threads', nargs='+', type=int, default=[1, 4])
+    parser.add_argument('--duration', type=float, default=1.0, help='seconds each benchmark runs for')
+    parser.add_argument('--iterations', type=int, help='operations per thread, instead of a duration')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='file to write the JSON report to, stdout by default')
+    parser.add_argument('--baseline', help='JSON report of an earlier run to compare against')
+    parser.add_argument('--max-regression', type=float, default=0.1,
+                        help='fraction of throughput a result may lose against the baseline')
+    args = parser.parse_args(argv)
+
+    report = run(args.scales, args.benchmarks, args.threads, args.duration, args.iterations, args.seed, _print_result)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(report, output_file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = find_regressions(report, baseline, args.max_regression)
+        for result, baseline_result in regressions:
+            print(
+                f'Regression: {result["benchmark"]} ({result["scale"]}, {result["threads"]} threads) '
+                f'{result["ops_per_sec"]:,.1f} ops/s, baseline {baseline_result["ops_per_sec"]:,.1f} ops/s',
+                file=sys.stderr
+            )
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
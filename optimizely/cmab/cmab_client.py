@@ -10,14 +10,20 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from __future__ import annotations
 import json
+import threading
 import time
-import requests
 import math
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Optional
 from optimizely import logger as _logging
-from optimizely.helpers.enums import Errors
+from optimizely.helpers.enums import Errors, MetricNames, TracingAttributes, TracingSpanNames
 from optimizely.exceptions import CmabFetchError, CmabInvalidResponseError
+from optimizely.metrics import MetricsRegistry, NoOpMetricsRegistry
+from optimizely.tracing import BaseTracer, NoOpTracer
+
+if TYPE_CHECKING:
+    import requests
 
 # Default constants for CMAB requests
 DEFAULT_MAX_RETRIES = 1
@@ -54,7 +60,9 @@ class DefaultCmabClient:
     def __init__(self, http_client: Optional[requests.Session] = None,
                  retry_config: Optional[CmabRetryConfig] = None,
                  logger: Optional[_logging.Logger] = None,
-                 prediction_endpoint: Optional[str] = None):
+                 prediction_endpoint: Optional[str] = None,
+                 metrics: Optional[MetricsRegistry] = None,
+                 tracer: Optional[BaseTracer] = None):
         """Initialize the CMAB client.
 
         Args:
@@ -63,11 +71,33 @@ class DefaultCmabClient:
             logger (Optional[_logging.Logger]): Logger for logging messages.
             prediction_endpoint (Optional[str]): Custom prediction endpoint URL template.
                                                   Use {} as placeholder for rule_id.
+            metrics (Optional[MetricsRegistry]): Metrics registry recording fetch latencies and failures.
+            tracer (Optional[BaseTracer]): Tracer emitting a span for every fetch.
         """
-        self.http_client = http_client or requests.Session()
+        self._http_client = http_client
+        self._http_client_lock = threading.Lock()
         self.retry_config = retry_config
         self.logger = _logging.adapt_logger(logger or _logging.NoOpLogger())
         self.prediction_endpoint = prediction_endpoint or DEFAULT_PREDICTION_ENDPOINT
+        self.metrics = metrics or NoOpMetricsRegistry()
+        self.tracer = tracer or NoOpTracer()
+
+    @property
+    def http_client(self) -> requests.Session:
+        """The HTTP client, a requests session created on first use so that clients which never
+        fetch CMAB decisions don't import requests.
+        """
+        if self._http_client is None:
+            import requests
+
+            with self._http_client_lock:
+                if self._http_client is None:
+                    self._http_client = requests.Session()
+        return self._http_client
+
+    @http_client.setter
+    def http_client(self, http_client: requests.Session) -> None:
+        self._http_client = http_client
 
     def fetch_decision(
         self,
@@ -103,10 +133,21 @@ class DefaultCmabClient:
                 "cmabUUID": cmab_uuid,
             }]
         }
-        if self.retry_config:
-            variation_id = self._do_fetch_with_retry(url, request_body, self.retry_config, timeout)
-        else:
-            variation_id = self._do_fetch(url, request_body, timeout)
+        start = self.metrics.start_timer()
+        try:
+            with self.tracer.start_span(TracingSpanNames.CMAB_FETCH) as span:
+                if self.tracer.enabled:
+                    span.set_attribute(TracingAttributes.RULE_KEY, rule_id)
+                    span.set_attribute(TracingAttributes.BYTES, len(json.dumps(request_body)))
+                if self.retry_config:
+                    variation_id = self._do_fetch_with_retry(url, request_body, self.retry_config, timeout)
+                else:
+                    variation_id = self._do_fetch(url, request_body, timeout)
+        except (CmabFetchError, CmabInvalidResponseError):
+            self.metrics.increment(MetricNames.CMAB_FETCH_FAILURES)
+            raise
+        finally:
+            self.metrics.observe_latency(MetricNames.CMAB_FETCH_LATENCY, start)
         return variation_id
 
     def _do_fetch(self, url: str, request_body: Dict[str, Any], timeout: float) -> str:
@@ -119,10 +160,12 @@ class DefaultCmabClient:
         Returns:
             str: The variation ID
         """
+        from requests.exceptions import RequestException
+
         headers = {'Content-Type': 'application/json'}
         try:
             response = self.http_client.post(url, data=json.dumps(request_body), headers=headers, timeout=timeout)
-        except requests.exceptions.RequestException as e:
+        except RequestException as e:
             error_message = Errors.CMAB_FETCH_FAILED.format(str(e))
             self.logger.error(error_message)
             raise CmabFetchError(error_message)
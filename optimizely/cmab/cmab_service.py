@@ -21,6 +21,7 @@ from optimizely.odp.lru_cache import LRUCache
 from optimizely.optimizely_user_context import OptimizelyUserContext, UserAttributes
 from optimizely.project_config import ProjectConfig
 from optimizely.decision.optimizely_decide_option import OptimizelyDecideOption
+from optimizely.helpers.single_flight import SingleFlight
 from optimizely import logger as _logging
 from optimizely.lib import pymmh3 as mmh3
 
@@ -52,13 +53,24 @@ class DefaultCmabService:
 
     Methods:
         get_decision: Retrieves a CMAB decision with caching and attribute filtering.
+        get_coalesced_request_count: Number of requests that waited for an identical request in flight.
     """
+    # decide options that change how a decision is made and so separate requests in flight
+    _CACHE_OPTIONS = (
+        OptimizelyDecideOption.IGNORE_CMAB_CACHE,
+        OptimizelyDecideOption.RESET_CMAB_CACHE,
+        OptimizelyDecideOption.INVALIDATE_USER_CMAB_CACHE,
+    )
+
     def __init__(self, cmab_cache: LRUCache[str, CmabCacheValue],
                  cmab_client: DefaultCmabClient, logger: Optional[_logging.Logger] = None):
         self.cmab_cache = cmab_cache
         self.cmab_client = cmab_client
         self.logger = logger
         self.locks = [threading.Lock() for _ in range(NUM_LOCK_STRIPES)]
+        self.in_flight_decisions: SingleFlight[
+            Tuple[str, str, str, Tuple[bool, ...]], Tuple[CmabDecision, List[str]]
+        ] = SingleFlight()
 
     def _get_lock_index(self, user_id: str, rule_id: str) -> int:
         """Calculate the lock index for a given user and rule combination."""
@@ -70,14 +82,28 @@ class DefaultCmabService:
     def get_decision(self, project_config: ProjectConfig, user_context: OptimizelyUserContext,
                      rule_id: str, options: List[str]) -> Tuple[CmabDecision, List[str]]:
 
-        lock_index = self._get_lock_index(user_context.user_id, rule_id)
-        with self.locks[lock_index]:
-            return self._get_decision(project_config, user_context, rule_id, options)
+        filtered_attributes = self._filter_attributes(project_config, user_context, rule_id)
+        attributes_hash = self._hash_attributes(filtered_attributes)
 
-    def _get_decision(self, project_config: ProjectConfig, user_context: OptimizelyUserContext,
-                      rule_id: str, options: List[str]) -> Tuple[CmabDecision, List[str]]:
+        # identical requests in flight at the same time, e.g. after a cache reset, share one decision
+        flight_key = (user_context.user_id, rule_id, attributes_hash,
+                      tuple(option in options for option in self._CACHE_OPTIONS))
+
+        def get_locked_decision() -> Tuple[CmabDecision, List[str]]:
+            lock_index = self._get_lock_index(user_context.user_id, rule_id)
+            with self.locks[lock_index]:
+                return self._get_decision(user_context, rule_id, options, filtered_attributes, attributes_hash)
+
+        cmab_decision, reasons = self.in_flight_decisions.do(flight_key, get_locked_decision)
+        return cmab_decision, list(reasons)
+
+    def get_coalesced_request_count(self) -> int:
+        """Returns the number of decision requests that waited for an identical request in flight."""
+        return self.in_flight_decisions.get_coalesced_count()
+
+    def _get_decision(self, user_context: OptimizelyUserContext, rule_id: str, options: List[str],
+                      filtered_attributes: UserAttributes, attributes_hash: str) -> Tuple[CmabDecision, List[str]]:
 
-        filtered_attributes = self._filter_attributes(project_config, user_context, rule_id)
         reasons = []
 
         if OptimizelyDecideOption.IGNORE_CMAB_CACHE in options:
@@ -106,8 +132,6 @@ class DefaultCmabService:
 
         cached_value = self.cmab_cache.lookup(cache_key)
 
-        attributes_hash = self._hash_attributes(filtered_attributes)
-
         if cached_value:
             if cached_value['attributes_hash'] == attributes_hash:
                 reason = f"CMAB cache hit for user '{user_context.user_id}' and rule '{rule_id}'"
@@ -15,12 +15,7 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 import numbers
 from typing import TYPE_CHECKING, Any, Optional
-import requests
 import threading
-from requests import codes as http_status_codes
-from requests import exceptions as requests_exceptions
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from . import exceptions as optimizely_exceptions
 from . import logger as optimizely_logger
@@ -30,11 +25,13 @@ from .notification_center import NotificationCenter
 from .notification_center_registry import _NotificationCenterRegistry
 from .helpers import enums
 from .helpers import validator
+from .metrics import MetricsRegistry, NoOpMetricsRegistry
 from .optimizely_config import OptimizelyConfig, OptimizelyConfigService
 
 
 if TYPE_CHECKING:
     # prevent circular dependenacy by skipping import at runtime
+    import requests
     from requests.models import CaseInsensitiveDict
 
 
@@ -45,7 +42,8 @@ class BaseConfigManager(ABC):
         self,
         logger: Optional[optimizely_logger.Logger] = None,
         error_handler: Optional[BaseErrorHandler] = None,
-        notification_center: Optional[NotificationCenter] = None
+        notification_center: Optional[NotificationCenter] = None,
+        metrics: Optional[MetricsRegistry] = None
     ):
         """ Initialize config manager.
 
@@ -53,10 +51,12 @@ class BaseConfigManager(ABC):
             logger: Provides a logger instance.
             error_handler: Provides a handle_error method to handle exceptions.
             notification_center: Provides instance of notification_center.NotificationCenter.
+            metrics: Optional metrics registry recording config build and datafile fetch latencies.
         """
         self.logger = optimizely_logger.adapt_logger(logger or optimizely_logger.NoOpLogger())
         self.error_handler = error_handler or NoOpErrorHandler()
         self.notification_center = notification_center or NotificationCenter(self.logger)
+        self.metrics = metrics or NoOpMetricsRegistry()
         self.optimizely_config: Optional[OptimizelyConfig]
         self._validate_instantiation_options()
 
@@ -99,8 +99,10 @@ class StaticConfigManager(BaseConfigManager):
         error_handler: Optional[BaseErrorHandler] = None,
         notification_center: Optional[NotificationCenter] = None,
         skip_json_validation: Optional[bool] = False,
+        snapshot: Optional[bytes] = None,
+        metrics: Optional[MetricsRegistry] = None,
     ):
-        """ Initialize config manager. Datafile has to be provided to use.
+        """ Initialize config manager. Datafile or snapshot has to be provided to use.
 
         Args:
             datafile: JSON string representing the Optimizely project.
@@ -110,15 +112,20 @@ class StaticConfigManager(BaseConfigManager):
             skip_json_validation: Optional boolean param which allows skipping JSON schema
                                   validation upon object invocation. By default
                                   JSON schema validation will be performed.
+            snapshot: Optional bytes returned by ProjectConfig.to_snapshot. When provided the config
+                      is restored from it instead of parsing the datafile. If the snapshot
+                      cannot be loaded the datafile is used instead.
+            metrics: Optional metrics registry recording the latency of building configs.
         """
         super().__init__(
-            logger=logger, error_handler=error_handler, notification_center=notification_center,
+            logger=logger, error_handler=error_handler, notification_center=notification_center, metrics=metrics,
         )
         self._config: project_config.ProjectConfig = None  # type: ignore[assignment]
         self.optimizely_config: Optional[OptimizelyConfig] = None
         self._sdk_key: Optional[str] = None
         self.validate_schema = not skip_json_validation
-        self._set_config(datafile)
+        if snapshot is None or not self._set_config_from_snapshot(snapshot):
+            self._set_config(datafile)
 
     def get_sdk_key(self) -> Optional[str]:
         return self._sdk_key
@@ -139,9 +146,13 @@ class StaticConfigManager(BaseConfigManager):
         error_to_handle: Optional[Exception] = None
         config = None
 
+        start = self.metrics.start_timer()
         try:
             assert datafile is not None
-            config = project_config.ProjectConfig(datafile, self.logger, self.error_handler)
+            config = project_config.ProjectConfig(
+                datafile, self.logger, self.error_handler, previous_config=self._config
+            )
+            self.metrics.observe_latency(enums.MetricNames.CONFIG_BUILD_LATENCY, start)
         except optimizely_exceptions.UnsupportedDatafileVersionException as error:
             error_msg = error.args[0]
             error_to_handle = error
@@ -154,6 +165,37 @@ class StaticConfigManager(BaseConfigManager):
             self.error_handler.handle_error(error_to_handle or Exception('Unknown Error'))
             return
 
+        self._update_config(config)
+
+    def _set_config_from_snapshot(self, snapshot: bytes) -> bool:
+        """ Restores and sets config from a binary snapshot.
+
+        Schema validation is skipped as the snapshot was created from an already loaded config.
+
+        Args:
+            snapshot: Bytes returned by ProjectConfig.to_snapshot.
+
+        Returns:
+            True if the config was restored from the snapshot. False otherwise.
+        """
+
+        try:
+            config = project_config.ProjectConfig.from_snapshot(snapshot, self.logger, self.error_handler)
+        except optimizely_exceptions.InvalidInputException as error:
+            self.logger.error(error.args[0])
+            self.error_handler.handle_error(error)
+            return False
+
+        self._update_config(config)
+        return True
+
+    def _update_config(self, config: project_config.ProjectConfig) -> None:
+        """ Sets the config and sends config update notifications if the revision changed.
+
+        Args:
+            config: ProjectConfig to use.
+        """
+
         previous_revision = self._config.get_revision() if self._config else None
 
         if previous_revision == config.get_revision():
@@ -203,6 +245,7 @@ class PollingConfigManager(StaticConfigManager):
         notification_center: Optional[NotificationCenter] = None,
         skip_json_validation: Optional[bool] = False,
         retries: Optional[int] = 3,
+        metrics: Optional[MetricsRegistry] = None,
     ):
         """ Initialize config manager. One of sdk_key or datafile has to be set to be able to use.
 
@@ -223,6 +266,7 @@ class PollingConfigManager(StaticConfigManager):
             skip_json_validation: Optional boolean param which allows skipping JSON schema
                                   validation upon object invocation. By default
                                   JSON schema validation will be performed.
+            metrics: Optional metrics registry recording datafile fetch latencies and failures.
 
         """
         self.retries = retries
@@ -233,6 +277,7 @@ class PollingConfigManager(StaticConfigManager):
             error_handler=error_handler,
             notification_center=notification_center,
             skip_json_validation=skip_json_validation,
+            metrics=metrics,
         )
         self._sdk_key = sdk_key or self._sdk_key
 
@@ -370,10 +415,14 @@ class PollingConfigManager(StaticConfigManager):
         Args:
             response: requests.Response
         """
+        from requests import codes as http_status_codes
+        from requests import exceptions as requests_exceptions
+
         try:
             response.raise_for_status()
         except requests_exceptions.RequestException as err:
             self.logger.error(f'Fetching datafile from {self.datafile_url} failed. Error: {err}')
+            self.metrics.increment(enums.MetricNames.CONFIG_FETCH_FAILURES)
             return
 
         # Leave datafile and config unchanged if it has not been modified.
@@ -384,6 +433,25 @@ class PollingConfigManager(StaticConfigManager):
         self.set_last_modified(response.headers)
         self._set_config(response.content)
 
+    def _create_session(self) -> requests.Session:
+        """ Create a session retrying failed datafile requests.
+
+        requests is imported on first fetch, so that clients with a static datafile never import it.
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        retries = Retry(total=self.retries,
+                        backoff_factor=0.1,
+                        status_forcelist=[500, 502, 503, 504])
+        adapter = HTTPAdapter(max_retries=retries)
+
+        session.mount('http://', adapter)
+        session.mount("https://", adapter)
+        return session
+
     def fetch_datafile(self) -> None:
         """ Fetch datafile and set ProjectConfig. """
 
@@ -391,21 +459,18 @@ class PollingConfigManager(StaticConfigManager):
         if self.last_modified:
             request_headers[enums.HTTPHeaders.IF_MODIFIED_SINCE] = self.last_modified
 
-        try:
-            session = requests.Session()
-
-            retries = Retry(total=self.retries,
-                            backoff_factor=0.1,
-                            status_forcelist=[500, 502, 503, 504])
-            adapter = HTTPAdapter(max_retries=retries)
+        from requests import exceptions as requests_exceptions
 
-            session.mount('http://', adapter)
-            session.mount("https://", adapter)
+        try:
+            session = self._create_session()
+            start = self.metrics.start_timer()
             response = session.get(self.datafile_url,
                                    headers=request_headers,
                                    timeout=enums.ConfigManager.REQUEST_TIMEOUT)
+            self.metrics.observe_latency(enums.MetricNames.CONFIG_FETCH_LATENCY, start)
         except requests_exceptions.RequestException as err:
             self.logger.error(f'Fetching datafile from {self.datafile_url} failed. Error: {err}')
+            self.metrics.increment(enums.MetricNames.CONFIG_FETCH_FAILURES)
             return
 
         self._handle_response(response)
@@ -484,21 +549,18 @@ class AuthDatafilePollingConfigManager(PollingConfigManager):
         if self.last_modified:
             request_headers[enums.HTTPHeaders.IF_MODIFIED_SINCE] = self.last_modified
 
-        try:
-            session = requests.Session()
-
-            retries = Retry(total=self.retries,
-                            backoff_factor=0.1,
-                            status_forcelist=[500, 502, 503, 504])
-            adapter = HTTPAdapter(max_retries=retries)
+        from requests import exceptions as requests_exceptions
 
-            session.mount('http://', adapter)
-            session.mount("https://", adapter)
+        try:
+            session = self._create_session()
+            start = self.metrics.start_timer()
             response = session.get(self.datafile_url,
                                    headers=request_headers,
                                    timeout=enums.ConfigManager.REQUEST_TIMEOUT)
+            self.metrics.observe_latency(enums.MetricNames.CONFIG_FETCH_LATENCY, start)
         except requests_exceptions.RequestException as err:
             self.logger.error(f'Fetching datafile from {self.datafile_url} failed. Error: {err}')
+            self.metrics.increment(enums.MetricNames.CONFIG_FETCH_FAILURES)
             return
 
         self._handle_response(response)
@@ -12,12 +12,16 @@
 # limitations under the License.
 
 from __future__ import annotations
-from typing import Optional, Any, TYPE_CHECKING
+from threading import Lock
+from typing import Callable, Optional, Any, TYPE_CHECKING
 
 if TYPE_CHECKING:
     # prevent circular dependenacy by skipping import at runtime
     from optimizely.optimizely_user_context import OptimizelyUserContext
 
+# guards the first resolution of the variables of a decision
+_resolve_variables_lock = Lock()
+
 
 class OptimizelyDecision:
     def __init__(
@@ -28,16 +32,42 @@ class OptimizelyDecision:
         rule_key: Optional[str] = None,
         flag_key: Optional[str] = None,
         user_context: Optional[OptimizelyUserContext] = None,
-        reasons: Optional[list[str]] = None
+        reasons: Optional[list[str]] = None,
+        resolve_variables: Optional[Callable[[], dict[str, Any]]] = None
     ):
+        """
+        Args:
+            resolve_variables: Optional function returning the variables, called on first access of variables
+                instead of passing them, so that decisions whose variables are never read don't resolve them.
+        """
         self.variation_key = variation_key
         self.enabled = enabled
-        self.variables = variables or {}
+        self._variables = variables
+        self._resolve_variables = resolve_variables
+        if resolve_variables is None:
+            self._variables = variables or {}
         self.rule_key = rule_key
         self.flag_key = flag_key
         self.user_context = user_context
         self.reasons = reasons or []
 
+    @property
+    def variables(self) -> dict[str, Any]:
+        """Values of the flag variables, resolved on first access."""
+        if self._variables is None:
+            resolve_variables = self._resolve_variables
+            variables = resolve_variables() if resolve_variables else {}
+            with _resolve_variables_lock:
+                if self._variables is None:
+                    self._variables = variables
+                    self._resolve_variables = None
+        return self._variables
+
+    @variables.setter
+    def variables(self, variables: dict[str, Any]) -> None:
+        self._variables = variables
+        self._resolve_variables = None
+
     def as_json(self) -> dict[str, Any]:
         return {
             'variation_key': self.variation_key,
@@ -0,0 +1,203 @@
+# Copyright 2026, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import contextvars
+import threading
+import time
+from types import TracebackType
+from typing import Any, Optional, Type
+
+from .helpers.enums import DecisionProfilePhases
+
+# key of the flag being decided by the current thread or task
+_current_flag_key: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    'optimizely_profiled_flag_key', default=None
+)
+
+
+class PhaseTiming:
+    """Number of times a phase ran and the time spent in it."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        if elapsed > self.max:
+            self.max = elapsed
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'count': self.count,
+            'total_secs': self.total,
+            'mean_secs': self.total / self.count if self.count else 0.0,
+            'max_secs': self.max,
+        }
+
+
+class _FlagProfile:
+    """Context manager timing the decision of a flag and attributing the phases recorded inside it to the flag."""
+
+    def __init__(self, profiler: DecisionProfiler, flag_key: str):
+        self.profiler = profiler
+        self.flag_key = flag_key
+        self.start = 0.0
+        self.token: Optional[contextvars.Token[Optional[str]]] = None
+
+    def __enter__(self) -> _FlagProfile:
+        self.token = _current_flag_key.set(self.flag_key)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        self.profiler.record(DecisionProfilePhases.TOTAL, self.start)
+        if self.token is not None:
+            _current_flag_key.reset(self.token)
+
+
+class _NoOpFlagProfile(_FlagProfile):
+    def __init__(self) -> None:
+        pass
+
+    def __enter__(self) -> _FlagProfile:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        pass
+
+
+_NO_OP_FLAG_PROFILE = _NoOpFlagProfile()
+
+
+class DecisionProfiler:
+    """Opt-in profiler of flag decisions, attributing the time spent deciding to flags, phases and audiences.
+
+    For every flag it records the time spent in global and local holdouts, experiment and rollout rules,
+    audience evaluation, bucketing, user profile lookups and CMAB decisions, see DecisionProfilePhases.
+    Phases are measured inclusively: audience evaluation, bucketing, user profile lookups, CMAB decisions
+    and local holdouts of a rule also count towards its experiment or rollout rules phase. The evaluation
+    time of every audience is recorded by audience ID. Loading and saving user profiles covers all
+    flags of a decision, so it only counts towards the totals of the user profile phase.
+
+    Profiling adds a lock and a few clock reads per phase to every decision, so it is meant to be enabled
+    for a while to find costly flags and audiences, then reset or disabled.
+    """
+
+    enabled = True
+
+    def __init__(self, top_n: int = 10):
+        self.top_n = top_n
+        self.lock = threading.Lock()
+        self._flags: dict[str, dict[str, PhaseTiming]] = {}
+        self._phases: dict[str, PhaseTiming] = {}
+        self._audiences: dict[str, PhaseTiming] = {}
+
+    def profile_flag(self, flag_key: str) -> _FlagProfile:
+        """Returns a context manager timing the decision of a flag, to which the phases recorded inside it
+        are attributed.
+        """
+        return _FlagProfile(self, flag_key)
+
+    def start_timer(self) -> float:
+        """Returns the start time to pass to record."""
+        return time.perf_counter()
+
+    def record(self, phase: str, start: float) -> None:
+        """Add the time elapsed since start to a phase of the flag being decided."""
+        elapsed = time.perf_counter() - start
+        flag_key = _current_flag_key.get()
+        with self.lock:
+            self._phases.setdefault(phase, PhaseTiming()).add(elapsed)
+            if flag_key is not None:
+                self._flags.setdefault(flag_key, {}).setdefault(phase, PhaseTiming()).add(elapsed)
+
+    def record_audience(self, audience_id: str, start: float) -> None:
+        """Add the time elapsed since start to the evaluations of an audience."""
+        elapsed = time.perf_counter() - start
+        with self.lock:
+            self._audiences.setdefault(audience_id, PhaseTiming()).add(elapsed)
+
+    def get_report(self, top_n: Optional[int] = None) -> dict[str, Any]:
+        """Returns the profile of the decisions made since the profiler was created or reset.
+
+        Args:
+            top_n: Number of flags and audiences to report, by default the top_n of the profiler.
+
+        Returns:
+            A dict with the timing of every phase over all flags under 'phases', and the flags and audiences
+            which took the most time in total under 'flags' and 'audiences', most costly first.
+            Timings have a count and total, mean and max time in seconds.
+        """
+        top_n = self.top_n if top_n is None else top_n
+        with self.lock:
+            phases = {phase: timing.to_dict() for phase, timing in self._phases.items()}
+            flags = sorted(
+                self._flags.items(),
+                key=lambda item: item[1][DecisionProfilePhases.TOTAL].total
+                if DecisionProfilePhases.TOTAL in item[1] else 0.0,
+                reverse=True
+            )[:top_n]
+            flag_reports = [
+                {'flag_key': flag_key, 'phases': {phase: timing.to_dict() for phase, timing in timings.items()}}
+                for flag_key, timings in flags
+            ]
+            audiences = sorted(self._audiences.items(), key=lambda item: item[1].total, reverse=True)[:top_n]
+            audience_reports = [{'audience_id': audience_id, **timing.to_dict()} for audience_id, timing in audiences]
+
+        return {
+            'phases': phases,
+            'flags': flag_reports,
+            'audiences': audience_reports,
+        }
+
+    def reset(self) -> None:
+        """Forget all recorded timings."""
+        with self.lock:
+            self._flags.clear()
+            self._phases.clear()
+            self._audiences.clear()
+
+
+class NoOpDecisionProfiler(DecisionProfiler):
+    """Profiler used when profiling is disabled, which records nothing."""
+
+    enabled = False
+
+    def __init__(self) -> None:
+        super().__init__(0)
+
+    def profile_flag(self, flag_key: str) -> _FlagProfile:
+        return _NO_OP_FLAG_PROFILE
+
+    def start_timer(self) -> float:
+        return 0.0
+
+    def record(self, phase: str, start: float) -> None:
+        pass
+
+    def record_audience(self, audience_id: str, start: float) -> None:
+        pass
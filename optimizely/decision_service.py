@@ -12,7 +12,9 @@
 # limitations under the License.
 
 from __future__ import annotations
-from typing import TYPE_CHECKING, NamedTuple, Optional, Sequence, List, TypedDict, Union
+from typing import (
+    TYPE_CHECKING, Any, Callable, Hashable, NamedTuple, Optional, Sequence, List, TypedDict, TypeVar, Union
+)
 
 from optimizely.helpers.types import VariationDict
 
@@ -25,13 +27,19 @@ from .helpers import experiment as experiment_helper
 from .helpers import validator
 from .optimizely_user_context import OptimizelyUserContext, UserAttributes
 from .user_profile import UserProfile, UserProfileService, UserProfileTracker
-from .cmab.cmab_service import DefaultCmabService, CmabDecision
+from .decision_profiler import DecisionProfiler, NoOpDecisionProfiler
+from .metrics import MetricsRegistry, NoOpMetricsRegistry
+from .tracing import BaseSpan, BaseTracer, NoOpTracer
 from optimizely.helpers.enums import Errors
 
 if TYPE_CHECKING:
     # prevent circular dependenacy by skipping import at runtime
     from .project_config import ProjectConfig
     from .logger import Logger
+    from .cmab.cmab_service import DefaultCmabService, CmabDecision
+    from .odp.lru_cache import LRUCache
+
+T = TypeVar('T')
 
 
 class CmabDecisionResult(TypedDict):
@@ -93,13 +101,26 @@ class DecisionService:
     def __init__(self,
                  logger: Logger,
                  user_profile_service: Optional[UserProfileService],
-                 cmab_service: DefaultCmabService):
+                 cmab_service: DefaultCmabService,
+                 decision_cache: Optional[LRUCache[Hashable, tuple[Decision, tuple[str, ...]]]] = None,
+                 metrics: Optional[MetricsRegistry] = None,
+                 tracer: Optional[BaseTracer] = None,
+                 profiler: Optional[DecisionProfiler] = None):
         self.bucketer = bucketer.Bucketer()
         self.logger = logger
+        self.metrics = metrics or NoOpMetricsRegistry()
+        self.tracer = tracer or NoOpTracer()
+        self.profiler = profiler or NoOpDecisionProfiler()
+        # Disabled metrics, tracing and profiling use no-op implementations. Decisions check this flag once
+        # and skip timing, spans and profiling altogether unless one of them is enabled.
+        self.instrumented = self.metrics.enabled or self.tracer.enabled or self.profiler.enabled
         self.user_profile_service = user_profile_service
         self.cmab_service = cmab_service
         self.cmab_uuid = None
 
+        # Optional cache of flag decisions keyed on the revision, flag and the user inputs the flag depends on.
+        self.decision_cache = decision_cache
+
         # Map of user IDs to another map of experiments to variations.
         # This contains all the forced variations set by the user
         # by calling set_forced_variation (it is not the same as the
@@ -130,6 +151,53 @@ class DecisionService:
 
         return user_id, decide_reasons
 
+    def _bucket(
+        self,
+        project_config: ProjectConfig,
+        experiment: Union[entities.Experiment, entities.Holdout],
+        user_id: str,
+        bucketing_id: str
+    ) -> tuple[Optional[entities.Variation], list[str]]:
+        """ Bucket the user into a variation of the experiment. """
+        return self._instrument(
+            enums.DecisionProfilePhases.BUCKETING, self.bucketer.bucket, project_config, experiment, user_id,
+            bucketing_id, latency_metric=enums.MetricNames.BUCKETING_LATENCY
+        )
+
+    def _evaluate_audiences(
+        self,
+        project_config: ProjectConfig,
+        audience_conditions: Optional[Sequence[Union[str, list[str]]]],
+        audience_logs: type[Union[enums.ExperimentAudienceEvaluationLogs, enums.RolloutRuleAudienceEvaluationLogs]],
+        logging_key: str,
+        user_context: OptimizelyUserContext
+    ) -> tuple[bool, list[str]]:
+        """ Evaluate the audience conditions of a rule. """
+        args: tuple[Any, ...] = (project_config, audience_conditions, audience_logs, logging_key, user_context,
+                                 self.logger)
+        if self.profiler.enabled:
+            args += (self.profiler,)
+        return self._instrument(
+            enums.DecisionProfilePhases.AUDIENCE_EVALUATION, audience_helper.does_user_meet_audience_conditions,
+            *args, latency_metric=enums.MetricNames.AUDIENCE_EVALUATION_LATENCY
+        )
+
+    def _instrument(self, phase: str, fn: Callable[..., T], *args: Any, latency_metric: Optional[str] = None) -> T:
+        """ Call fn(*args), adding its duration to a phase of the profiled decision and to the latency_metric.
+        Nothing is measured unless metrics, tracing or profiling are enabled.
+        """
+        if not self.instrumented:
+            return fn(*args)
+
+        start = self.profiler.start_timer()
+        metrics_start = self.metrics.start_timer()
+        try:
+            return fn(*args)
+        finally:
+            if latency_metric is not None:
+                self.metrics.observe_latency(latency_metric, metrics_start)
+            self.profiler.record(phase, start)
+
     def _get_decision_for_cmab_experiment(
         self,
         project_config: ProjectConfig,
@@ -458,7 +526,10 @@ class DecisionService:
 
         # Check to see if user has a decision available for the given experiment
         if user_profile_tracker is not None and not ignore_user_profile:
-            variation = self.get_stored_variation(project_config, experiment, user_profile_tracker.get_user_profile())
+            variation = self._instrument(
+                enums.DecisionProfilePhases.USER_PROFILE,
+                self.get_stored_variation, project_config, experiment, user_profile_tracker.get_user_profile()
+            )
             if variation:
                 message = f'Returning previously activated variation ID "{variation}" of experiment ' \
                           f'"{experiment}" for user "{user_id}" from user profile.'
@@ -475,11 +546,11 @@ class DecisionService:
 
         # Check audience conditions
         audience_conditions = experiment.get_audience_conditions_or_ids()
-        user_meets_audience_conditions, reasons_received = audience_helper.does_user_meet_audience_conditions(
+        user_meets_audience_conditions, reasons_received = self._evaluate_audiences(
             project_config, audience_conditions,
             enums.ExperimentAudienceEvaluationLogs,
             experiment.key,
-            user_context, self.logger)
+            user_context)
         decide_reasons += reasons_received
         if not user_meets_audience_conditions:
             message = f'User "{user_id}" does not meet conditions to be in experiment "{experiment.key}".'
@@ -501,11 +572,13 @@ class DecisionService:
         # If so, handle CMAB-specific traffic allocation and decision logic.
         # Otherwise, proceed with standard bucketing logic for non-CMAB experiments.
         if experiment.cmab:
-            cmab_decision_result = self._get_decision_for_cmab_experiment(project_config,
-                                                                          experiment,
-                                                                          user_context,
-                                                                          bucketing_id,
-                                                                          options)
+            cmab_decision_result = self._instrument(enums.DecisionProfilePhases.CMAB,
+                                                    self._get_decision_for_cmab_experiment,
+                                                    project_config,
+                                                    experiment,
+                                                    user_context,
+                                                    bucketing_id,
+                                                    options)
             decide_reasons += cmab_decision_result.get('reasons', [])
             cmab_decision = cmab_decision_result.get('result')
             if cmab_decision_result['error']:
@@ -526,7 +599,7 @@ class DecisionService:
                                                              variation_id=variation_id) if variation_id else None
         else:
             # Bucket the user
-            variation, bucket_reasons = self.bucketer.bucket(project_config, experiment, user_id, bucketing_id)
+            variation, bucket_reasons = self._bucket(project_config, experiment, user_id, bucketing_id)
             decide_reasons += bucket_reasons
 
         if isinstance(variation, entities.Variation):
@@ -536,7 +609,10 @@ class DecisionService:
             # Store this new decision and return the variation for the user
             if user_profile_tracker is not None and not ignore_user_profile:
                 try:
-                    user_profile_tracker.update_user_profile(experiment, variation)
+                    self._instrument(
+                        enums.DecisionProfilePhases.USER_PROFILE,
+                        user_profile_tracker.update_user_profile, experiment, variation
+                    )
                 except:
                     self.logger.exception(f'Unable to save user profile for user "{user_id}".')
             return {
@@ -595,26 +671,29 @@ class DecisionService:
             decide_reasons.append(message)
             return Decision(None, None, enums.DecisionSources.ROLLOUT, None), decide_reasons
 
+        has_forced_decisions = user_context.has_forced_decisions()
         index = 0
         while index < len(rollout_rules):
             skip_to_everyone_else = False
 
             # check forced decision first
             rule = rollout_rules[index]
-            optimizely_decision_context = OptimizelyUserContext.OptimizelyDecisionContext(feature.key, rule.key)
-            forced_decision_variation, reasons_received = self.validated_forced_decision(
-                project_config, optimizely_decision_context, user_context)
-            decide_reasons += reasons_received
-
-            if forced_decision_variation:
-                return Decision(experiment=rule, variation=forced_decision_variation,
-                                source=enums.DecisionSources.ROLLOUT, cmab_uuid=None), decide_reasons
+            if has_forced_decisions:
+                optimizely_decision_context = OptimizelyUserContext.OptimizelyDecisionContext(feature.key, rule.key)
+                forced_decision_variation, reasons_received = self.validated_forced_decision(
+                    project_config, optimizely_decision_context, user_context)
+                decide_reasons += reasons_received
+
+                if forced_decision_variation:
+                    return Decision(experiment=rule, variation=forced_decision_variation,
+                                    source=enums.DecisionSources.ROLLOUT, cmab_uuid=None), decide_reasons
 
             # Check local holdouts targeting this specific delivery rule (FSSDK-12369)
             local_holdouts = project_config.get_holdouts_for_rule(rule.id)
             for holdout in local_holdouts:
-                local_holdout_decision = self.get_variation_for_holdout(
-                    holdout, user_context, project_config
+                local_holdout_decision = self._instrument(
+                    enums.DecisionProfilePhases.LOCAL_HOLDOUTS,
+                    self.get_variation_for_holdout, holdout, user_context, project_config
                 )
                 decide_reasons.extend(local_holdout_decision['reasons'])
 
@@ -640,9 +719,9 @@ class DecisionService:
                 continue
             audience_conditions = rollout_rule.get_audience_conditions_or_ids()
 
-            audience_decision_response, reasons_received_audience = audience_helper.does_user_meet_audience_conditions(
+            audience_decision_response, reasons_received_audience = self._evaluate_audiences(
                 project_config, audience_conditions, enums.RolloutRuleAudienceEvaluationLogs,
-                logging_key, user_context, self.logger)
+                logging_key, user_context)
 
             decide_reasons += reasons_received_audience
 
@@ -651,8 +730,8 @@ class DecisionService:
                 self.logger.debug(message)
                 decide_reasons.append(message)
 
-                bucketed_variation, bucket_reasons = self.bucketer.bucket(project_config, rollout_rule, user_id,
-                                                                          bucketing_id)
+                bucketed_variation, bucket_reasons = self._bucket(project_config, rollout_rule, user_id,
+                                                                  bucketing_id)
                 decide_reasons.extend(bucket_reasons)
 
                 if bucketed_variation:
@@ -712,18 +791,76 @@ class DecisionService:
         # Create user profile tracker for sticky bucketing
         user_profile_tracker: Optional[UserProfileTracker] = None
         if self.user_profile_service is not None and not ignore_ups:
-            user_profile_tracker = UserProfileTracker(user_context.user_id, self.user_profile_service, self.logger)
+            user_profile_tracker = UserProfileTracker(
+                user_context.user_id, self.user_profile_service, self.logger, self.tracer
+            )
             # Load user profile once before processing
-            user_profile_tracker.load_user_profile([], None)
+            self._instrument(
+                enums.DecisionProfilePhases.USER_PROFILE, user_profile_tracker.load_user_profile, [], None
+            )
 
         result = self.get_decision_for_flag(feature, user_context, project_config, options, user_profile_tracker)
 
         # Save user profile after decision
         if user_profile_tracker is not None and not ignore_ups:
-            user_profile_tracker.save_user_profile()
+            self._instrument(enums.DecisionProfilePhases.USER_PROFILE, user_profile_tracker.save_user_profile)
 
         return result
 
+    def _get_decision_cache_key(
+        self,
+        feature_flag: entities.FeatureFlag,
+        user_context: OptimizelyUserContext,
+        project_config: ProjectConfig,
+        user_profile_tracker: Optional[UserProfileTracker],
+        decide_reasons: Optional[list[str]]
+    ) -> Optional[Hashable]:
+        """ Helper method to build the decision cache key for the given flag and user.
+
+        Args:
+            feature_flag: The feature flag to get a decision for.
+            user_context: The user context.
+            project_config: The project config.
+            user_profile_tracker: The user profile tracker.
+            decide_reasons: List of decision reasons to merge.
+
+        Returns:
+            The cache key or None if the decision for this user cannot be cached.
+        """
+        if (
+            self.decision_cache is None or
+            user_profile_tracker is not None or
+            decide_reasons or
+            user_context.has_forced_decisions() or
+            user_context.user_id in self.forced_variation_map
+        ):
+            return None
+
+        decision_inputs = project_config.get_decision_inputs_for_flag(feature_flag.key)
+        if decision_inputs is None:
+            return None
+
+        attribute_keys, segments = decision_inputs
+        attributes = user_context.get_user_attributes()
+        # Value types are part of the key as audience evaluation tells apart e.g. True, 1 and 1.0.
+        attribute_values = tuple(
+            (key, type(attributes[key]), attributes[key]) for key in attribute_keys if key in attributes
+        )
+        key = (
+            project_config.revision,
+            feature_flag.key,
+            user_context.user_id,
+            attribute_values,
+            tuple(user_context.is_qualified_for(segment) for segment in segments)
+        )
+        try:
+            hash(key)
+        except TypeError:
+            # Attribute values which are not hashable can not be used for audience evaluation anyway.
+            return None
+
+        return key
+
     def get_decision_for_flag(
         self,
         feature_flag: entities.FeatureFlag,
@@ -737,6 +874,13 @@ class DecisionService:
         Get the decision for a single feature flag.
         Processes holdouts, experiments, and rollouts in that order.
 
+        When a decision cache is configured, decisions which only depend on the revision, the flag,
+        the user's bucketing ID, attributes and segments are served from the cache. Users with
+        forced decisions, forced variations or a user profile as well as flags with CMAB rules
+        are always evaluated. With metrics enabled, the latency of the decision is recorded per flag,
+        with tracing enabled the decision is traced in a span carrying the flag, rule and variation,
+        with profiling enabled the time spent in each phase of the decision is added to the flag's profile.
+
         Args:
             feature_flag: The feature flag to get a decision for.
             user_context: The user context.
@@ -748,13 +892,93 @@ class DecisionService:
         Returns:
             A DecisionResult for the feature flag.
         """
+        if not self.instrumented:
+            return self._get_cached_decision_for_flag(
+                feature_flag, user_context, project_config, decide_options, user_profile_tracker, decide_reasons
+            )
+
+        start = self.metrics.start_timer()
+        with self.profiler.profile_flag(feature_flag.key), self.tracer.start_span(
+            enums.TracingSpanNames.FLAG_DECISION, {enums.TracingAttributes.FLAG_KEY: feature_flag.key}
+        ) as span:
+            result = self._get_cached_decision_for_flag(
+                feature_flag, user_context, project_config, decide_options, user_profile_tracker, decide_reasons,
+                span
+            )
+            if self.tracer.enabled:
+                self._set_decision_span_attributes(span, result['decision'])
+        self.metrics.observe_latency(enums.MetricNames.DECISION_LATENCY, start, {'flag_key': feature_flag.key})
+        return result
+
+    @staticmethod
+    def _set_decision_span_attributes(span: BaseSpan, decision: Decision) -> None:
+        """ Add the rule, variation and source of a decision to its span. """
+        if decision.experiment is not None:
+            span.set_attribute(enums.TracingAttributes.RULE_KEY, decision.experiment.key)
+        if decision.variation is not None:
+            variation_key = decision.variation.get('key') if isinstance(decision.variation, dict) \
+                else decision.variation.key
+            if variation_key is not None:
+                span.set_attribute(enums.TracingAttributes.VARIATION_KEY, variation_key)
+        if decision.source is not None:
+            span.set_attribute(enums.TracingAttributes.DECISION_SOURCE, decision.source)
+
+    def _get_cached_decision_for_flag(
+        self,
+        feature_flag: entities.FeatureFlag,
+        user_context: OptimizelyUserContext,
+        project_config: ProjectConfig,
+        decide_options: Optional[Sequence[str]] = None,
+        user_profile_tracker: Optional[UserProfileTracker] = None,
+        decide_reasons: Optional[list[str]] = None,
+        span: Optional[BaseSpan] = None
+    ) -> DecisionResult:
+        """ Get the decision for a single feature flag from the decision cache if possible. """
+        cache_key = self._get_decision_cache_key(
+            feature_flag, user_context, project_config, user_profile_tracker, decide_reasons
+        )
+        if cache_key is None or self.decision_cache is None:
+            return self._get_decision_for_flag(
+                feature_flag, user_context, project_config, decide_options, user_profile_tracker, decide_reasons
+            )
+
+        cached = self.decision_cache.lookup(cache_key)
+        if span is not None:
+            span.set_attribute(enums.TracingAttributes.CACHE_HIT, cached is not None)
+        if cached is not None:
+            decision, reasons = cached
+            return {
+                'decision': decision,
+                'error': False,
+                'reasons': list(reasons)
+            }
+
+        result = self._get_decision_for_flag(feature_flag, user_context, project_config, decide_options)
+        if not result['error'] and isinstance(result['decision'], Decision):
+            self.decision_cache.save(cache_key, (result['decision'], tuple(result['reasons'])))
+
+        return result
+
+    def _get_decision_for_flag(
+        self,
+        feature_flag: entities.FeatureFlag,
+        user_context: OptimizelyUserContext,
+        project_config: ProjectConfig,
+        decide_options: Optional[Sequence[str]] = None,
+        user_profile_tracker: Optional[UserProfileTracker] = None,
+        decide_reasons: Optional[list[str]] = None
+    ) -> DecisionResult:
+        """ Helper method to evaluate the decision for a single feature flag without the decision cache. """
         reasons = decide_reasons.copy() if decide_reasons else []
         user_id = user_context.user_id
 
         # Check global holdouts (flag level — before any rules are evaluated)
         global_holdouts = project_config.get_global_holdouts()
         for holdout in global_holdouts:
-            holdout_decision = self.get_variation_for_holdout(holdout, user_context, project_config)
+            holdout_decision = self._instrument(
+                enums.DecisionProfilePhases.GLOBAL_HOLDOUTS,
+                self.get_variation_for_holdout, holdout, user_context, project_config
+            )
             reasons.extend(holdout_decision['reasons'])
 
             decision = holdout_decision['decision']
@@ -776,31 +1000,34 @@ class DecisionService:
 
         # If no global holdout decision, check experiments then rollouts
         if feature_flag.experimentIds:
+            has_forced_decisions = user_context.has_forced_decisions()
             for experiment_id in feature_flag.experimentIds:
                 experiment = project_config.get_experiment_from_id(experiment_id)
 
                 if experiment:
                     # Check for forced decision
-                    optimizely_decision_context = OptimizelyUserContext.OptimizelyDecisionContext(
-                        feature_flag.key, experiment.key)
-                    forced_decision_variation, forced_reasons = self.validated_forced_decision(
-                        project_config, optimizely_decision_context, user_context)
-                    reasons.extend(forced_reasons)
-
-                    if forced_decision_variation:
-                        decision = Decision(experiment, forced_decision_variation,
-                                            enums.DecisionSources.FEATURE_TEST, None)
-                        return {
-                            'decision': decision,
-                            'error': False,
-                            'reasons': reasons
-                        }
+                    if has_forced_decisions:
+                        optimizely_decision_context = OptimizelyUserContext.OptimizelyDecisionContext(
+                            feature_flag.key, experiment.key)
+                        forced_decision_variation, forced_reasons = self.validated_forced_decision(
+                            project_config, optimizely_decision_context, user_context)
+                        reasons.extend(forced_reasons)
+
+                        if forced_decision_variation:
+                            decision = Decision(experiment, forced_decision_variation,
+                                                enums.DecisionSources.FEATURE_TEST, None)
+                            return {
+                                'decision': decision,
+                                'error': False,
+                                'reasons': reasons
+                            }
 
                     # Check local holdouts targeting this specific experiment rule (FSSDK-12369)
                     local_holdouts = project_config.get_holdouts_for_rule(experiment.id)
                     for holdout in local_holdouts:
-                        local_holdout_decision = self.get_variation_for_holdout(
-                            holdout, user_context, project_config
+                        local_holdout_decision = self._instrument(
+                            enums.DecisionProfilePhases.LOCAL_HOLDOUTS,
+                            self.get_variation_for_holdout, holdout, user_context, project_config
                         )
                         reasons.extend(local_holdout_decision['reasons'])
 
@@ -819,7 +1046,9 @@ class DecisionService:
                             }
 
                     # Get variation for experiment
-                    variation_result = self.get_variation(
+                    variation_result = self._instrument(
+                        enums.DecisionProfilePhases.EXPERIMENT_RULES,
+                        self.get_variation,
                         project_config, experiment, user_context, user_profile_tracker, reasons, decide_options
                     )
                     reasons.extend(variation_result['reasons'])
@@ -844,8 +1073,9 @@ class DecisionService:
                         }
 
         # If no experiment decision, check rollouts
-        rollout_decision, rollout_reasons = self.get_variation_for_rollout(
-            project_config, feature_flag, user_context
+        rollout_decision, rollout_reasons = self._instrument(
+            enums.DecisionProfilePhases.ROLLOUT_RULES,
+            self.get_variation_for_rollout, project_config, feature_flag, user_context
         )
         if rollout_reasons:
             reasons.extend(rollout_reasons)
@@ -908,13 +1138,12 @@ class DecisionService:
 
         # Check audience conditions using the same method as experiments
         audience_conditions = holdout.get_audience_conditions_or_ids()
-        user_meets_audience_conditions, reasons_received = audience_helper.does_user_meet_audience_conditions(
+        user_meets_audience_conditions, reasons_received = self._evaluate_audiences(
             project_config,
             audience_conditions,
             ExperimentAudienceEvaluationLogs,
             holdout.key,
-            user_context,
-            self.logger
+            user_context
         )
         decide_reasons.extend(reasons_received)
 
@@ -932,7 +1161,7 @@ class DecisionService:
             }
 
         # Bucket user into holdout variation
-        variation, bucket_reasons = self.bucketer.bucket(
+        variation, bucket_reasons = self._bucket(
             project_config, holdout, user_id, bucketing_id
         )
         decide_reasons.extend(bucket_reasons)
@@ -1063,9 +1292,11 @@ class DecisionService:
         # Create user profile tracker once for all features
         user_profile_tracker: Optional[UserProfileTracker] = None
         if self.user_profile_service is not None and not ignore_ups:
-            user_profile_tracker = UserProfileTracker(user_id, self.user_profile_service, self.logger)
+            user_profile_tracker = UserProfileTracker(user_id, self.user_profile_service, self.logger, self.tracer)
             # Load user profile once before processing features
-            user_profile_tracker.load_user_profile([], None)
+            self._instrument(
+                enums.DecisionProfilePhases.USER_PROFILE, user_profile_tracker.load_user_profile, [], None
+            )
 
         # Process each feature by delegating to get_decision_for_flag
         decisions: list[DecisionResult] = []
@@ -1083,6 +1314,6 @@ class DecisionService:
 
         # Save user profile once after all features processed
         if self.user_profile_service is not None and user_profile_tracker is not None and not ignore_ups:
-            user_profile_tracker.save_user_profile()
+            self._instrument(enums.DecisionProfilePhases.USER_PROFILE, user_profile_tracker.save_user_profile)
 
         return decisions
@@ -13,6 +13,7 @@
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
+import json
 import numbers
 import threading
 import time
@@ -27,7 +28,10 @@ from optimizely import notification_center as _notification_center
 from optimizely.event_dispatcher import EventDispatcher, CustomEventDispatcher
 from optimizely.helpers import enums
 from optimizely.helpers import validator
+from optimizely.metrics import MetricsRegistry, NoOpMetricsRegistry
+from optimizely.tracing import BaseSpan, BaseTracer, NoOpTracer
 from .event_factory import EventFactory
+from .log_event import LogEvent
 from .user_event import UserEvent
 
 
@@ -80,6 +84,8 @@ class BatchEventProcessor(BaseEventProcessor):
         flush_interval: Optional[float] = None,
         timeout_interval: Optional[float] = None,
         notification_center: Optional[_notification_center.NotificationCenter] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        tracer: Optional[BaseTracer] = None,
     ):
         """ BatchEventProcessor init method to configure event batching.
 
@@ -96,9 +102,13 @@ class BatchEventProcessor(BaseEventProcessor):
       timeout_interval: Optional floating point number representing time interval in seconds before joining the consumer
                         thread.
       notification_center: Optional instance of notification_center.NotificationCenter.
+      metrics: Optional metrics registry recording the queue depth, batch sizes and dispatch latency.
+      tracer: Optional tracer emitting a span for every dispatch.
     """
         self.event_dispatcher = event_dispatcher or EventDispatcher
         self.logger = _logging.adapt_logger(logger or _logging.NoOpLogger())
+        self.metrics = metrics or NoOpMetricsRegistry()
+        self.tracer = tracer or NoOpTracer()
         self.event_queue = event_queue or queue.Queue(maxsize=self._DEFAULT_QUEUE_CAPACITY)
         self.batch_size: int = (
             batch_size  # type: ignore[assignment]
@@ -252,16 +262,26 @@ class BatchEventProcessor(BaseEventProcessor):
 
         log_event = EventFactory.create_log_event(to_process_batch, self.logger)
 
-        self.notification_center.send_notifications(enums.NotificationTypes.LOG_EVENT, log_event)
+        if self.notification_center.has_listeners(enums.NotificationTypes.LOG_EVENT):
+            self.notification_center.send_notifications(enums.NotificationTypes.LOG_EVENT, log_event)
 
         if log_event is None:
             self.logger.exception('Error dispatching event: Cannot dispatch None event.')
             return
 
-        try:
-            self.event_dispatcher.dispatch_event(log_event)
-        except Exception as e:
-            self.logger.error(f'Error dispatching event: {log_event} {e}')
+        if self.metrics.enabled:
+            self.metrics.observe(enums.MetricNames.EVENT_BATCH_SIZE, batch_len)
+        start = self.metrics.start_timer()
+        with self.tracer.start_span(enums.TracingSpanNames.EVENT_DISPATCH) as span:
+            if self.tracer.enabled:
+                _set_dispatch_span_attributes(span, log_event, batch_len)
+            try:
+                self.event_dispatcher.dispatch_event(log_event)
+            except Exception as e:
+                self.logger.error(f'Error dispatching event: {log_event} {e}')
+                self.metrics.increment(enums.MetricNames.EVENT_DISPATCH_FAILURES)
+                span.record_exception(e)
+        self.metrics.observe_latency(enums.MetricNames.EVENT_DISPATCH_LATENCY, start)
 
     def process(self, user_event: UserEvent) -> None:
         """ Method to process the user_event by putting it in event_queue.
@@ -284,6 +304,9 @@ class BatchEventProcessor(BaseEventProcessor):
                 f'Payload not accepted by the queue. Current size: {self.event_queue.qsize()}'
             )
 
+        if self.metrics.enabled:
+            self.metrics.set_gauge(enums.MetricNames.EVENT_QUEUE_DEPTH, self.event_queue.qsize())
+
     def _add_to_batch(self, user_event: UserEvent) -> None:
         """ Method to append received user event to current batch.
 
@@ -352,7 +375,8 @@ class ForwardingEventProcessor(BaseEventProcessor):
         self,
         event_dispatcher: Optional[type[EventDispatcher] | CustomEventDispatcher],
         logger: Optional[_logging.Logger] = None,
-        notification_center: Optional[_notification_center.NotificationCenter] = None
+        notification_center: Optional[_notification_center.NotificationCenter] = None,
+        tracer: Optional[BaseTracer] = None
     ):
         """ ForwardingEventProcessor init method to configure event dispatching.
 
@@ -360,9 +384,11 @@ class ForwardingEventProcessor(BaseEventProcessor):
       event_dispatcher: Provides a dispatch_event method which if given a URL and params sends a request to it.
       logger: Optional component which provides a log method to log messages. By default nothing would be logged.
       notification_center: Optional instance of notification_center.NotificationCenter.
+      tracer: Optional tracer emitting a span for every dispatch.
     """
         self.event_dispatcher = event_dispatcher or EventDispatcher
         self.logger = _logging.adapt_logger(logger or _logging.NoOpLogger())
+        self.tracer = tracer or NoOpTracer()
         self.notification_center = notification_center or _notification_center.NotificationCenter(self.logger)
 
         if not validator.is_notification_center_valid(self.notification_center):
@@ -385,13 +411,27 @@ class ForwardingEventProcessor(BaseEventProcessor):
 
         log_event = EventFactory.create_log_event(user_event, self.logger)
 
-        self.notification_center.send_notifications(enums.NotificationTypes.LOG_EVENT, log_event)
+        if self.notification_center.has_listeners(enums.NotificationTypes.LOG_EVENT):
+            self.notification_center.send_notifications(enums.NotificationTypes.LOG_EVENT, log_event)
 
         if log_event is None:
             self.logger.exception('Error dispatching event: Cannot dispatch None event.')
             return
 
-        try:
-            self.event_dispatcher.dispatch_event(log_event)
-        except Exception as e:
-            self.logger.exception(f'Error dispatching event: {log_event} {e}')
+        with self.tracer.start_span(enums.TracingSpanNames.EVENT_DISPATCH) as span:
+            if self.tracer.enabled:
+                _set_dispatch_span_attributes(span, log_event, 1)
+            try:
+                self.event_dispatcher.dispatch_event(log_event)
+            except Exception as e:
+                self.logger.exception(f'Error dispatching event: {log_event} {e}')
+                span.record_exception(e)
+
+
+def _set_dispatch_span_attributes(span: BaseSpan, log_event: LogEvent, event_count: int) -> None:
+    """ Add the number of events and the size of the request body to the span of a dispatch. """
+    span.set_attribute(enums.TracingAttributes.EVENT_COUNT, event_count)
+    try:
+        span.set_attribute(enums.TracingAttributes.BYTES, len(json.dumps(log_event.params)))
+    except (TypeError, ValueError):
+        pass
@@ -1,4 +1,4 @@
-# Copyright 2016, 2022, Optimizely
+# Copyright 2016, 2022, 2026, Optimizely
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
 # You may obtain a copy of the License at
@@ -15,11 +15,6 @@ import json
 import logging
 from sys import version_info
 
-import requests
-from requests import exceptions as request_exception
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-
 from . import event_builder
 from .helpers.enums import HTTPVerbs, EventDispatchConfig
 
@@ -45,6 +40,12 @@ class EventDispatcher:
     Args:
       event: Object holding information about the request to be dispatched to the Optimizely backend.
     """
+        # imported on first dispatch to keep importing the SDK fast
+        import requests
+        from requests import exceptions as request_exception
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
         try:
             session = requests.Session()
 
@@ -1,4 +1,4 @@
-# Copyright 2016, 2018-2022, Optimizely
+# Copyright 2016, 2018-2022, 2026, Optimizely
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
 # You may obtain a copy of the License at
@@ -21,6 +21,7 @@ from optimizely import optimizely_user_context
 
 if TYPE_CHECKING:
     # prevent circular dependenacy by skipping import at runtime
+    from optimizely.decision_profiler import DecisionProfiler
     from optimizely.project_config import ProjectConfig
     from optimizely.logger import Logger
     from optimizely.helpers.enums import ExperimentAudienceEvaluationLogs, RolloutRuleAudienceEvaluationLogs
@@ -32,7 +33,8 @@ def does_user_meet_audience_conditions(
     audience_logs: Type[ExperimentAudienceEvaluationLogs | RolloutRuleAudienceEvaluationLogs],
     logging_key: str,
     user_context: optimizely_user_context.OptimizelyUserContext,
-    logger: Logger
+    logger: Logger,
+    profiler: Optional[DecisionProfiler] = None
 ) -> tuple[bool, list[str]]:
     """ Determine for given experiment if user satisfies the audiences for the experiment.
 
@@ -44,6 +46,7 @@ def does_user_meet_audience_conditions(
         attributes: Dict representing user attributes which will be used in determining
                     if the audience conditions are met. If not provided, default to an empty dict.
         logger: Provides a logger to send log messages to.
+        profiler: Optional DecisionProfiler recording the evaluation time of every audience.
 
     Returns:
         Boolean representing if user satisfies audience conditions for any of the audiences or not
@@ -90,7 +93,19 @@ def does_user_meet_audience_conditions(
 
         return result
 
-    eval_result = condition_tree_evaluator.evaluate(audience_conditions, evaluate_audience)
+    evaluate = evaluate_audience
+    if profiler is not None:
+        audience_profiler = profiler
+
+        def evaluate_profiled_audience(audience_id: str) -> Optional[bool]:
+            start = audience_profiler.start_timer()
+            result = evaluate_audience(audience_id)
+            audience_profiler.record_audience(audience_id, start)
+            return result
+
+        evaluate = evaluate_profiled_audience
+
+    eval_result = condition_tree_evaluator.evaluate(audience_conditions, evaluate)
     eval_result = eval_result or False
     message = audience_logs.AUDIENCE_EVALUATION_RESULT_COMBINED.format(logging_key, str(eval_result).upper())
     logger.info(message)
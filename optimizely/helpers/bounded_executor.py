@@ -0,0 +1,115 @@
+# Copyright 2026, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Optional, TypeVar
+
+from optimizely.helpers.enums import ExecutorRejectionPolicies
+
+T = TypeVar('T')
+
+
+class BackgroundFuture(Future):  # type: ignore[type-arg]
+    """Future of a task run by a BoundedExecutor.
+
+    join() waits for the task like Thread.join(), so callers of APIs which used to return a thread keep working.
+    """
+
+    def join(self, timeout: Optional[float] = None) -> None:
+        """Wait until the task has finished or was cancelled, without raising its exception."""
+        wait([self], timeout)
+
+
+class BoundedExecutor:
+    """Runs tasks on a shared pool of threads with a limit on the number of waiting tasks.
+
+    Worker threads are started on demand up to max_workers. Once max_workers tasks are running and
+    queue_size more are waiting, new tasks are rejected: with the 'caller_runs' policy they are run
+    by the submitting thread, with the 'reject' policy their future is cancelled without running them.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        queue_size: int,
+        rejection_policy: str = ExecutorRejectionPolicies.CALLER_RUNS,
+        thread_name_prefix: str = ''
+    ):
+        self.max_workers = max(1, max_workers)
+        self.queue_size = max(0, queue_size)
+        self.rejection_policy = rejection_policy
+        self.lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.queue_size)
+        self._executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix=thread_name_prefix)
+        self._rejected_count = 0
+        self._queued_count = 0
+
+    def submit(self, fn: Callable[..., T], *args: Any) -> BackgroundFuture:
+        """Run fn(*args) on the pool, or reject it if too many tasks are running or waiting.
+
+        Returns:
+            A future of the result of fn. It is cancelled if the task was rejected with the 'reject' policy.
+        """
+        future = BackgroundFuture()
+        if self._slots.acquire(blocking=False):
+            with self.lock:
+                self._queued_count += 1
+            try:
+                self._executor.submit(self._run, future, fn, *args)
+                return future
+            except RuntimeError:
+                # the pool was shut down
+                with self.lock:
+                    self._queued_count -= 1
+                self._slots.release()
+
+        with self.lock:
+            self._rejected_count += 1
+
+        if self.rejection_policy == ExecutorRejectionPolicies.REJECT:
+            future.cancel()
+            future.set_running_or_notify_cancel()
+        else:
+            self._run(future, fn, *args, release=False)
+        return future
+
+    def _run(self, future: BackgroundFuture, fn: Callable[..., T], *args: Any, release: bool = True) -> None:
+        """Run a task and settle its future."""
+        if release:
+            with self.lock:
+                self._queued_count -= 1
+        try:
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args))
+                except BaseException as err:
+                    future.set_exception(err)
+        finally:
+            if release:
+                self._slots.release()
+
+    def get_rejected_count(self) -> int:
+        """Returns the number of tasks which did not fit in the pool and its queue."""
+        with self.lock:
+            return self._rejected_count
+
+    def get_queue_depth(self) -> int:
+        """Returns the number of submitted tasks which are waiting for a worker thread."""
+        with self.lock:
+            return self._queued_count
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop accepting tasks. Tasks already submitted still run."""
+        self._executor.shutdown(wait=wait)
@@ -130,6 +130,7 @@ class Errors:
     MISSING_SDK_KEY: Final = 'SDK key not provided/cannot be found in the datafile.'
     CMAB_FETCH_FAILED: Final = 'CMAB decision fetch failed with status: {}.'
     INVALID_CMAB_FETCH_RESPONSE: Final = 'Invalid CMAB fetch response.'
+    INVALID_CONFIG_SNAPSHOT: Final = 'Provided config snapshot cannot be loaded ({}).'
     CMAB_FETCH_FAILED_DETAILED: Final = 'Failed to fetch CMAB data for experiment {}.'
 
 
@@ -205,6 +206,11 @@ class EventDispatchConfig:
     RETRIES: Final = 3
 
 
+class OdpHttpConfig:
+    """Configs of the connection pool shared by the ODP APIs."""
+    DEFAULT_POOL_SIZE: Final = 10
+
+
 class OdpEventApiConfig:
     """ODP Events API configs."""
     REQUEST_TIMEOUT: Final = 10
@@ -213,6 +219,8 @@ class OdpEventApiConfig:
 class OdpSegmentApiConfig:
     """ODP Segments API configs."""
     REQUEST_TIMEOUT: Final = 10
+    # Maximum number of users fetched in one aliased GraphQL request
+    MAX_USERS_PER_REQUEST: Final = 100
 
 
 class OdpEventManagerConfig:
@@ -221,6 +229,8 @@ class OdpEventManagerConfig:
     DEFAULT_BATCH_SIZE: Final = 10
     DEFAULT_FLUSH_INTERVAL: Final = 1
     DEFAULT_RETRY_COUNT: Final = 3
+    # Maximum number of failed batches waiting for their retry
+    DEFAULT_RETRY_BUFFER_CAPACITY: Final = 100
 
 
 class OdpManagerConfig:
@@ -241,3 +251,121 @@ class OdpSegmentsCacheConfig:
     """ODP Segment Cache configs."""
     DEFAULT_CAPACITY: Final = 10_000
     DEFAULT_TIMEOUT_SECS: Final = 600
+    # Maximum number of stale users waiting for a background refresh
+    DEFAULT_REFRESH_QUEUE_SIZE: Final = 1000
+    # Time to wait for a refresh in flight when stopping the segment manager
+    DEFAULT_REFRESH_STOP_TIMEOUT_SECS: Final = 1
+
+
+class OdpSegmentsFetchConfig:
+    """Configs of the thread pool running non-blocking segment fetches."""
+    DEFAULT_MAX_WORKERS: Final = 8
+    DEFAULT_QUEUE_SIZE: Final = 1000
+
+
+class NotificationDeliveryConfig:
+    """Configs of the thread pool delivering notifications to asynchronous listeners."""
+    DEFAULT_MAX_WORKERS: Final = 1
+    DEFAULT_QUEUE_SIZE: Final = 1000
+
+
+class MetricNames:
+    """Names of the metrics recorded by the SDK. Latencies are in seconds."""
+    DECISION_LATENCY: Final = 'decision.latency'
+    BUCKETING_LATENCY: Final = 'decision.bucketing_latency'
+    AUDIENCE_EVALUATION_LATENCY: Final = 'decision.audience_evaluation_latency'
+    CACHE_HITS: Final = 'cache.hits'
+    CACHE_MISSES: Final = 'cache.misses'
+    EVENT_QUEUE_DEPTH: Final = 'event.queue_depth'
+    EVENT_BATCH_SIZE: Final = 'event.batch_size'
+    EVENT_DISPATCH_LATENCY: Final = 'event.dispatch_latency'
+    EVENT_DISPATCH_FAILURES: Final = 'event.dispatch_failures'
+    ODP_EVENT_QUEUE_DEPTH: Final = 'odp_event.queue_depth'
+    ODP_EVENT_BATCH_SIZE: Final = 'odp_event.batch_size'
+    ODP_EVENT_DISPATCH_LATENCY: Final = 'odp_event.dispatch_latency'
+    ODP_EVENT_DISPATCH_FAILURES: Final = 'odp_event.dispatch_failures'
+    CONFIG_BUILD_LATENCY: Final = 'config.build_latency'
+    CONFIG_FETCH_LATENCY: Final = 'config.fetch_latency'
+    CONFIG_FETCH_FAILURES: Final = 'config.fetch_failures'
+    CMAB_FETCH_LATENCY: Final = 'cmab.fetch_latency'
+    CMAB_FETCH_FAILURES: Final = 'cmab.fetch_failures'
+
+
+class TracingSpanNames:
+    """Names of the spans emitted by the SDK."""
+    DECIDE: Final = 'optimizely.decide'
+    FLAG_DECISION: Final = 'optimizely.flag_decision'
+    USER_PROFILE_LOAD: Final = 'optimizely.user_profile.load'
+    USER_PROFILE_SAVE: Final = 'optimizely.user_profile.save'
+    CMAB_FETCH: Final = 'optimizely.cmab.fetch'
+    ODP_SEGMENTS_FETCH: Final = 'optimizely.odp.fetch_segments'
+    EVENT_DISPATCH: Final = 'optimizely.event.dispatch'
+
+
+class TracingAttributes:
+    """Attributes of the spans emitted by the SDK."""
+    FLAG_KEY: Final = 'optimizely.flag_key'
+    FLAG_COUNT: Final = 'optimizely.flag_count'
+    RULE_KEY: Final = 'optimizely.rule_key'
+    VARIATION_KEY: Final = 'optimizely.variation_key'
+    DECISION_SOURCE: Final = 'optimizely.decision_source'
+    CACHE_HIT: Final = 'optimizely.cache_hit'
+    EXPERIMENT_COUNT: Final = 'optimizely.experiment_count'
+    EVENT_COUNT: Final = 'optimizely.event_count'
+    SEGMENT_COUNT: Final = 'optimizely.segment_count'
+    BYTES: Final = 'optimizely.bytes'
+
+
+class DecisionProfilePhases:
+    """Phases of flag decisions timed by the DecisionProfiler."""
+    TOTAL: Final = 'total'
+    GLOBAL_HOLDOUTS: Final = 'global_holdouts'
+    LOCAL_HOLDOUTS: Final = 'local_holdouts'
+    EXPERIMENT_RULES: Final = 'experiment_rules'
+    ROLLOUT_RULES: Final = 'rollout_rules'
+    AUDIENCE_EVALUATION: Final = 'audience_evaluation'
+    BUCKETING: Final = 'bucketing'
+    USER_PROFILE: Final = 'user_profile'
+    CMAB: Final = 'cmab'
+
+
+class MetricsConfig:
+    """Configs of the in-memory metrics exporter."""
+    # upper bounds of histogram buckets, covering latencies in seconds as well as batch sizes
+    DEFAULT_HISTOGRAM_BOUNDS: Final = (
+        0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+        1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000
+    )
+
+
+class ExecutorRejectionPolicies:
+    """What to do with background tasks which do not fit in a full thread pool."""
+    CALLER_RUNS: Final = 'caller_runs'
+    REJECT: Final = 'reject'
+
+
+class CacheEvictionPolicies:
+    """Eviction policies of the SDK's in-memory caches."""
+    LRU: Final = 'lru'
+    CLOCK: Final = 'clock'
+    TINY_LFU: Final = 'tinylfu'
+
+
+class CacheEvictionCauses:
+    """Reasons for removing elements from the SDK's in-memory caches."""
+    CAPACITY: Final = 'capacity'
+    MEMORY: Final = 'memory'
+    EXPIRED: Final = 'expired'
+
+
+class UserProfileWriteBehindConfig:
+    """Configs of the write-behind user profile service."""
+    DEFAULT_BATCH_SIZE: Final = 100
+    DEFAULT_FLUSH_INTERVAL: Final = 1
+    DEFAULT_MAX_PENDING: Final = 10_000
+
+
+class DecisionCacheConfig:
+    """Decision Cache configs."""
+    DEFAULT_CAPACITY: Final = 0
+    DEFAULT_TIMEOUT_SECS: Final = 0
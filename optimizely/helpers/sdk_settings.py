@@ -12,12 +12,20 @@
 # limitations under the License.
 
 
-from typing import Optional
+from __future__ import annotations
+from typing import TYPE_CHECKING, Optional
 
 from optimizely.helpers import enums
-from optimizely.odp.lru_cache import OptimizelySegmentsCache
-from optimizely.odp.odp_event_manager import OdpEventManager
-from optimizely.odp.odp_segment_manager import OdpSegmentManager
+from optimizely.decision_profiler import DecisionProfiler
+from optimizely.metrics import MetricsRegistry
+from optimizely.tracing import BaseTracer
+
+if TYPE_CHECKING:
+    # the ODP and CMAB components are only imported by the client once it sets them up
+    from optimizely.cmab.cmab_service import CmabCacheValue
+    from optimizely.odp.lru_cache import LRUCache, OptimizelySegmentsCache
+    from optimizely.odp.odp_event_manager import OdpEventManager
+    from optimizely.odp.odp_segment_manager import OdpSegmentManager
 
 
 class OptimizelySdkSettings:
@@ -34,7 +42,28 @@ class OptimizelySdkSettings:
             odp_segment_request_timeout: Optional[int] = None,
             odp_event_request_timeout: Optional[int] = None,
             odp_event_flush_interval: Optional[int] = None,
-            cmab_prediction_endpoint: Optional[str] = None
+            cmab_prediction_endpoint: Optional[str] = None,
+            decision_cache_size: int = enums.DecisionCacheConfig.DEFAULT_CAPACITY,
+            decision_cache_timeout_in_secs: int = enums.DecisionCacheConfig.DEFAULT_TIMEOUT_SECS,
+            segments_cache_shards: int = 1,
+            cmab_cache_shards: int = 1,
+            segments_cache_eviction_policy: str = enums.CacheEvictionPolicies.LRU,
+            cmab_cache_eviction_policy: str = enums.CacheEvictionPolicies.LRU,
+            segments_cache_max_size_in_bytes: int = 0,
+            cmab_cache_max_size_in_bytes: int = 0,
+            cmab_cache: Optional[LRUCache[str, CmabCacheValue]] = None,
+            segments_cache_max_staleness_in_secs: float = 0,
+            segments_refresh_queue_size: int = enums.OdpSegmentsCacheConfig.DEFAULT_REFRESH_QUEUE_SIZE,
+            fetch_segments_max_workers: int = enums.OdpSegmentsFetchConfig.DEFAULT_MAX_WORKERS,
+            fetch_segments_queue_size: int = enums.OdpSegmentsFetchConfig.DEFAULT_QUEUE_SIZE,
+            fetch_segments_rejection_policy: str = enums.ExecutorRejectionPolicies.CALLER_RUNS,
+            odp_http_pool_size: int = enums.OdpHttpConfig.DEFAULT_POOL_SIZE,
+            odp_http_keep_alive: bool = True,
+            odp_http_connect_timeout: Optional[float] = None,
+            metrics: Optional[MetricsRegistry] = None,
+            tracer: Optional[BaseTracer] = None,
+            decision_profiler: Optional[DecisionProfiler] = None,
+            user_profile_write_behind: bool = False
     ) -> None:
         """
         Args:
@@ -55,6 +84,51 @@ class OptimizelySdkSettings:
           odp_event_flush_interval: Time to wait for events to accumulate before sending a batch in seconds (optional).
           cmab_prediction_endpoint: Custom CMAB prediction endpoint URL template (optional).
             Use {} as placeholder for rule_id. Defaults to production endpoint if not provided.
+          decision_cache_size: The maximum size of the flag decision cache (optional. default = 0).
+            Set to zero to disable caching.
+          decision_cache_timeout_in_secs: The timeout in seconds of the flag decision cache (optional. default = 0).
+            Set to zero to disable timeout.
+          segments_cache_shards: The number of independently locked shards of the default audience segments cache
+            (optional. default = 1). Use more than one shard to reduce lock contention between threads.
+          cmab_cache_shards: The number of independently locked shards of the default CMAB decision cache
+            (optional. default = 1).
+          segments_cache_eviction_policy: The eviction policy of the default audience segments cache, one of
+            CacheEvictionPolicies (optional. default = 'lru'). 'clock' avoids reordering entries on every hit and
+            'tinylfu' additionally only admits keys which are accessed more often than the evicted ones.
+          cmab_cache_eviction_policy: The eviction policy of the default CMAB decision cache
+            (optional. default = 'lru').
+          segments_cache_max_size_in_bytes: Bound of the estimated memory used by the default audience segments
+            cache with the 'lru' eviction policy (optional. default = 0). Set to zero to only bound the entry count.
+          cmab_cache_max_size_in_bytes: Bound of the estimated memory used by the default CMAB decision cache
+            with the 'lru' eviction policy (optional. default = 0).
+          cmab_cache: A custom CMAB decision cache, e.g. a SqliteCache shared by the processes of a host (optional).
+            The cmab cache settings above only apply to the default cache.
+          segments_cache_max_staleness_in_secs: How long past their timeout audience segments may still be
+            returned from the cache while they are refreshed in the background (optional. default = 0).
+            Set to zero to always fetch expired segments before returning.
+          segments_refresh_queue_size: The maximum number of users waiting for a background refresh of their
+            audience segments (optional. default = 1,000).
+          fetch_segments_max_workers: The number of threads shared by non-blocking fetch_qualified_segments calls
+            (optional. default = 8).
+          fetch_segments_queue_size: The maximum number of non-blocking segment fetches waiting for a thread
+            (optional. default = 1,000).
+          fetch_segments_rejection_policy: What to do with non-blocking segment fetches when the threads and the
+            queue are full, one of ExecutorRejectionPolicies (optional. default = 'caller_runs').
+            'caller_runs' runs the fetch in the calling thread, 'reject' fails it without fetching.
+          odp_http_pool_size: The maximum number of pooled connections to ODP kept for reuse by segment fetches and
+            event dispatches (optional. default = 10).
+          odp_http_keep_alive: Set this flag to false (default = True) to close connections to ODP after each request.
+          odp_http_connect_timeout: Time to wait in seconds for a connection to ODP to be established (optional).
+            By default the request timeouts also apply to connecting.
+          metrics: Optional MetricsRegistry recording decision, cache, event dispatch, datafile and CMAB metrics.
+            By default no metrics are recorded.
+          tracer: Optional BaseTracer, e.g. an OpenTelemetryTracer, emitting spans of decisions, user profile
+            lookups and saves, CMAB and ODP segment fetches and event dispatches. By default nothing is traced.
+          decision_profiler: Optional DecisionProfiler attributing the time spent in flag decisions to flags, rules,
+            audiences, bucketing, user profile lookups and CMAB. By default decisions are not profiled.
+          user_profile_write_behind: Set this flag to true (default = False) to save user profiles in batches
+            from a background thread instead of during decisions, see WriteBehindUserProfileService.
+            Queued profiles are saved when the client is closed.
         """
 
         self.odp_disabled = odp_disabled
@@ -67,3 +141,24 @@ class OptimizelySdkSettings:
         self.odp_event_timeout = odp_event_request_timeout
         self.odp_flush_interval = odp_event_flush_interval
         self.cmab_prediction_endpoint = cmab_prediction_endpoint
+        self.decision_cache_size = decision_cache_size
+        self.decision_cache_timeout_in_secs = decision_cache_timeout_in_secs
+        self.segments_cache_shards = segments_cache_shards
+        self.cmab_cache_shards = cmab_cache_shards
+        self.segments_cache_eviction_policy = segments_cache_eviction_policy
+        self.cmab_cache_eviction_policy = cmab_cache_eviction_policy
+        self.segments_cache_max_size_in_bytes = segments_cache_max_size_in_bytes
+        self.cmab_cache_max_size_in_bytes = cmab_cache_max_size_in_bytes
+        self.cmab_cache = cmab_cache
+        self.segments_cache_max_staleness_in_secs = segments_cache_max_staleness_in_secs
+        self.segments_refresh_queue_size = segments_refresh_queue_size
+        self.fetch_segments_max_workers = fetch_segments_max_workers
+        self.fetch_segments_queue_size = fetch_segments_queue_size
+        self.fetch_segments_rejection_policy = fetch_segments_rejection_policy
+        self.odp_http_pool_size = odp_http_pool_size
+        self.odp_http_keep_alive = odp_http_keep_alive
+        self.odp_http_connect_timeout = odp_http_connect_timeout
+        self.metrics = metrics
+        self.tracer = tracer
+        self.decision_profiler = decision_profiler
+        self.user_profile_write_behind = user_profile_write_behind
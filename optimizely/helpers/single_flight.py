@@ -0,0 +1,76 @@
+# Copyright 2026, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import threading
+from typing import Callable, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+
+class _Call(Generic[V]):
+    """A call in flight and its outcome."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Optional[V] = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight(Generic[K, V]):
+    """Coalesces concurrent calls for the same key into one call.
+
+    The first caller of a key runs the function, callers arriving while it is in flight wait for it
+    and receive its result, or its exception. Once the call finishes the key is forgotten, so later
+    callers run the function again.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self._calls: dict[K, _Call[V]] = {}
+        self._coalesced_count = 0
+
+    def do(self, key: K, fn: Callable[[], V]) -> V:
+        """Run fn unless a call for key is already in flight, in which case wait for its result."""
+        with self.lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                self._coalesced_count += 1
+                leader = False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[return-value]
+
+        try:
+            call.result = fn()
+        except BaseException as err:
+            call.error = err
+            raise
+        finally:
+            with self.lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result
+
+    def get_coalesced_count(self) -> int:
+        """Returns the number of calls that waited for a call in flight instead of running fn."""
+        with self.lock:
+            return self._coalesced_count
@@ -13,20 +13,20 @@
 
 from __future__ import annotations
 import json
+from functools import lru_cache
 from typing import TYPE_CHECKING, Any, Optional, Type
-import jsonschema
 import math
 import numbers
 
 from optimizely.notification_center import NotificationCenter
 from optimizely.user_profile import UserProfile
-from . import constants
-from ..odp.lru_cache import OptimizelySegmentsCache
-from ..odp.odp_event_manager import OdpEventManager
-from ..odp.odp_segment_manager import OdpSegmentManager
 
 if TYPE_CHECKING:
     # prevent circular dependenacy by skipping import at runtime
+    import jsonschema
+    from ..odp.lru_cache import OptimizelySegmentsCache
+    from ..odp.odp_event_manager import OdpEventManager
+    from ..odp.odp_segment_manager import OdpSegmentManager
     from optimizely.logger import Logger
     from optimizely.event_dispatcher import CustomEventDispatcher
     from optimizely.error_handler import BaseErrorHandler
@@ -37,6 +37,19 @@ if TYPE_CHECKING:
     from optimizely.odp.odp_event import OdpDataDict
 
 
+@lru_cache(maxsize=1)
+def _get_datafile_validator() -> jsonschema.Draft4Validator:
+    """ Returns the validator of the datafile schema.
+
+    jsonschema and the schema are loaded on first validation, since clients which skip JSON validation
+    never need them.
+    """
+    import jsonschema
+    from . import constants
+
+    return jsonschema.Draft4Validator(constants.JSON_SCHEMA)
+
+
 def is_datafile_valid(datafile: Optional[str | bytes]) -> bool:
     """ Given a datafile determine if it is valid or not.
 
@@ -55,7 +68,7 @@ def is_datafile_valid(datafile: Optional[str | bytes]) -> bool:
         return False
 
     try:
-        jsonschema.Draft4Validator(constants.JSON_SCHEMA).validate(datafile_json)
+        _get_datafile_validator().validate(datafile_json)
     except:
         return False
 
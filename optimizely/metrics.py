@@ -0,0 +1,224 @@
+# Copyright 2026, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import bisect
+import threading
+import time
+from typing import Dict, Optional, Sequence, Tuple
+
+from . import logger as _logging
+from .helpers.enums import MetricsConfig
+
+MetricTags = Optional[Dict[str, str]]
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class BaseMetricsExporter:
+    """Receives the measurements recorded by the SDK. Override the methods to forward them to a metrics backend.
+
+    Methods are called on the threads doing the measured work, so they have to be fast and thread safe.
+    """
+
+    def increment(self, name: str, value: int, tags: MetricTags) -> None:
+        """Add value to a counter."""
+        pass
+
+    def set_gauge(self, name: str, value: float, tags: MetricTags) -> None:
+        """Set the current value of a gauge."""
+        pass
+
+    def observe(self, name: str, value: float, tags: MetricTags) -> None:
+        """Add a value, e.g. a latency in seconds, to a histogram."""
+        pass
+
+
+class Histogram:
+    """Distribution of observed values, counted in buckets with the given upper bounds."""
+
+    def __init__(self, bounds: Sequence[float] = MetricsConfig.DEFAULT_HISTOGRAM_BOUNDS):
+        self.bounds = tuple(bounds)
+        self.bucket_counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def get_percentile(self, percentile: float) -> float:
+        """Estimate a percentile between 0 and 100 as the upper bound of the bucket containing it.
+
+        Returns:
+            The estimate, capped at the largest observed value. 0.0 if nothing was observed.
+        """
+        if not self.count or self.max is None:
+            return 0.0
+
+        rank = percentile / 100 * self.count
+        seen = 0
+        for index, bucket_count in enumerate(self.bucket_counts):
+            seen += bucket_count
+            if seen >= rank and bucket_count:
+                return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+        return self.max
+
+    def copy(self) -> Histogram:
+        histogram = Histogram(self.bounds)
+        histogram.__dict__.update(self.__dict__)
+        histogram.bucket_counts = list(self.bucket_counts)
+        return histogram
+
+
+class InMemoryMetricsExporter(BaseMetricsExporter):
+    """Keeps counters, gauges and histograms in memory, so that the application can read or report them."""
+
+    def __init__(self, histogram_bounds: Sequence[float] = MetricsConfig.DEFAULT_HISTOGRAM_BOUNDS):
+        self.histogram_bounds = tuple(histogram_bounds)
+        self.lock = threading.Lock()
+        self._counters: dict[MetricKey, int] = {}
+        self._gauges: dict[MetricKey, float] = {}
+        self._histograms: dict[MetricKey, Histogram] = {}
+
+    @staticmethod
+    def _get_key(name: str, tags: MetricTags) -> MetricKey:
+        return name, tuple(sorted(tags.items())) if tags else ()
+
+    def increment(self, name: str, value: int, tags: MetricTags) -> None:
+        key = self._get_key(name, tags)
+        with self.lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, tags: MetricTags) -> None:
+        key = self._get_key(name, tags)
+        with self.lock:
+            self._gauges[key] = value
+
+    def observe(self, name: str, value: float, tags: MetricTags) -> None:
+        key = self._get_key(name, tags)
+        with self.lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.histogram_bounds)
+            histogram.observe(value)
+
+    def get_counter(self, name: str, tags: MetricTags = None) -> int:
+        """Returns the value of a counter, 0 if it was never incremented."""
+        with self.lock:
+            return self._counters.get(self._get_key(name, tags), 0)
+
+    def get_gauge(self, name: str, tags: MetricTags = None) -> Optional[float]:
+        """Returns the last value of a gauge, or None if it was never set."""
+        with self.lock:
+            return self._gauges.get(self._get_key(name, tags))
+
+    def get_histogram(self, name: str, tags: MetricTags = None) -> Optional[Histogram]:
+        """Returns a copy of a histogram, or None if nothing was observed."""
+        with self.lock:
+            histogram = self._histograms.get(self._get_key(name, tags))
+            return histogram.copy() if histogram else None
+
+    def get_counters(self) -> dict[MetricKey, int]:
+        """Returns all counters keyed by name and sorted tag items."""
+        with self.lock:
+            return dict(self._counters)
+
+    def get_gauges(self) -> dict[MetricKey, float]:
+        """Returns all gauges keyed by name and sorted tag items."""
+        with self.lock:
+            return dict(self._gauges)
+
+    def get_histograms(self) -> dict[MetricKey, Histogram]:
+        """Returns copies of all histograms keyed by name and sorted tag items."""
+        with self.lock:
+            return {key: histogram.copy() for key, histogram in self._histograms.items()}
+
+    def reset(self) -> None:
+        """Remove all metrics."""
+        with self.lock:
+            self._counters.clear()
+            self._gauges.clear()
+            self._histograms.clear()
+
+
+class MetricsRegistry:
+    """Records the metrics of the SDK components it is passed to and forwards them to an exporter.
+
+    Exceptions raised by the exporter are logged, so that they never fail a decision or a dispatch.
+    """
+
+    enabled = True
+
+    def __init__(self, exporter: Optional[BaseMetricsExporter] = None, logger: Optional[_logging.Logger] = None):
+        self.exporter = exporter or InMemoryMetricsExporter()
+        self.logger = _logging.adapt_logger(logger or _logging.NoOpLogger())
+
+    def increment(self, name: str, value: int = 1, tags: MetricTags = None) -> None:
+        try:
+            self.exporter.increment(name, value, tags)
+        except Exception as error:
+            self.logger.warning(f'Failed to export metric "{name}": {error}')
+
+    def set_gauge(self, name: str, value: float, tags: MetricTags = None) -> None:
+        try:
+            self.exporter.set_gauge(name, value, tags)
+        except Exception as error:
+            self.logger.warning(f'Failed to export metric "{name}": {error}')
+
+    def observe(self, name: str, value: float, tags: MetricTags = None) -> None:
+        try:
+            self.exporter.observe(name, value, tags)
+        except Exception as error:
+            self.logger.warning(f'Failed to export metric "{name}": {error}')
+
+    def start_timer(self) -> float:
+        """Returns the start time to pass to observe_latency."""
+        return time.perf_counter()
+
+    def observe_latency(self, name: str, start: float, tags: MetricTags = None) -> None:
+        """Add the time elapsed since start to a histogram."""
+        self.observe(name, time.perf_counter() - start, tags)
+
+
+class NoOpMetricsRegistry(MetricsRegistry):
+    """Registry used when metrics are disabled, which records nothing."""
+
+    enabled = False
+
+    def __init__(self) -> None:
+        self.exporter = BaseMetricsExporter()
+        self.logger = _logging.NoOpLogger()
+
+    def increment(self, name: str, value: int = 1, tags: MetricTags = None) -> None:
+        pass
+
+    def set_gauge(self, name: str, value: float, tags: MetricTags = None) -> None:
+        pass
+
+    def observe(self, name: str, value: float, tags: MetricTags = None) -> None:
+        pass
+
+    def start_timer(self) -> float:
+        return 0.0
+
+    def observe_latency(self, name: str, start: float, tags: MetricTags = None) -> None:
+        pass
@@ -12,8 +12,10 @@
 # limitations under the License.
 
 from __future__ import annotations
+import threading
 from typing import Any, Callable, Optional
 from .helpers import enums
+from .helpers.bounded_executor import BoundedExecutor
 from . import logger as optimizely_logger
 from sys import version_info
 
@@ -30,21 +32,43 @@ NOTIFICATION_TYPES: Final = tuple(
 
 class NotificationCenter:
     """ Class encapsulating methods to manage notifications and their listeners.
-  The enums.NotificationTypes includes predefined notifications."""
-
-    def __init__(self, logger: Optional[optimizely_logger.Logger] = None):
+  The enums.NotificationTypes includes predefined notifications.
+
+  Listeners are called synchronously by default. Listeners added with async_delivery are called
+  on a pool of async_max_workers threads which is started on first use. At most async_queue_size
+  notifications wait for the pool, further notifications are dropped with the 'reject' overflow
+  policy or delivered synchronously with the 'caller_runs' policy."""
+
+    def __init__(
+        self,
+        logger: Optional[optimizely_logger.Logger] = None,
+        async_max_workers: int = enums.NotificationDeliveryConfig.DEFAULT_MAX_WORKERS,
+        async_queue_size: int = enums.NotificationDeliveryConfig.DEFAULT_QUEUE_SIZE,
+        async_overflow_policy: str = enums.ExecutorRejectionPolicies.REJECT
+    ):
         self.listener_id = 1
         self.notification_listeners: dict[str, list[tuple[int, Callable[..., None]]]] = {}
         for notification_type in NOTIFICATION_TYPES:
             self.notification_listeners[notification_type] = []
         self.logger = optimizely_logger.adapt_logger(logger or optimizely_logger.NoOpLogger())
-
-    def add_notification_listener(self, notification_type: str, notification_callback: Callable[..., None]) -> int:
+        self.async_max_workers = async_max_workers
+        self.async_queue_size = async_queue_size
+        self.async_overflow_policy = async_overflow_policy
+        self.async_listener_ids: set[int] = set()
+        self.executor: Optional[BoundedExecutor] = None
+        self._executor_lock = threading.Lock()
+
+    def add_notification_listener(
+        self, notification_type: str, notification_callback: Callable[..., None], async_delivery: bool = False
+    ) -> int:
         """ Add a notification callback to the notification center for a given notification type.
 
     Args:
       notification_type: A string representing the notification type from helpers.enums.NotificationTypes
       notification_callback: Closure of function to call when event is triggered.
+      async_delivery: Whether to call the listener on a background thread rather than the thread
+                      sending the notification. The listener then receives copies of the dicts and lists
+                      of the notification, so that the sender can modify them while it is delivered.
 
     Returns:
       Integer notification ID used to remove the notification or
@@ -62,6 +86,8 @@ class NotificationCenter:
                 return -1
 
         self.notification_listeners[notification_type].append((self.listener_id, notification_callback))
+        if async_delivery:
+            self.async_listener_ids.add(self.listener_id)
         current_listener_id = self.listener_id
         self.listener_id += 1
 
@@ -81,6 +107,7 @@ class NotificationCenter:
             listener_to_remove = list(filter(lambda tup: tup[0] == notification_id, listener))
             if len(listener_to_remove) > 0:
                 listener.remove(listener_to_remove[0])
+                self.async_listener_ids.discard(notification_id)
                 return True
 
         return False
@@ -96,6 +123,8 @@ class NotificationCenter:
             self.logger.error(
                 f'Invalid notification_type: {notification_type} provided. Not removing any listener.'
             )
+        for notification_id, _ in self.notification_listeners.get(notification_type, []):
+            self.async_listener_ids.discard(notification_id)
         self.notification_listeners[notification_type] = []
 
     def clear_notifications(self, notification_type: str) -> None:
@@ -117,6 +146,17 @@ class NotificationCenter:
     Remove all notification listeners. """
         self.clear_all_notification_listeners()
 
+    def has_listeners(self, notification_type: str) -> bool:
+        """ Check whether any listener is added for a certain notification type.
+
+    Args:
+      notification_type: String denoting notification type.
+
+    Returns:
+      True if a notification of this type would be received by a listener.
+    """
+        return bool(self.notification_listeners.get(notification_type))
+
     def send_notifications(self, notification_type: str, *args: Any) -> None:
         """ Fires off the notification for the specific event.  Uses var args to pass in a
         arbitrary list of parameter according to which notification type was fired.
@@ -133,10 +173,60 @@ class NotificationCenter:
             return
 
         if notification_type in self.notification_listeners:
+            async_args: Optional[tuple[Any, ...]] = None
             for notification_id, callback in self.notification_listeners[notification_type]:
-                try:
-                    callback(*args)
-                except:
-                    self.logger.exception(
-                        f'Unknown problem when sending "{notification_type}" type notification.'
-                    )
+                if notification_id in self.async_listener_ids:
+                    if async_args is None:
+                        async_args = tuple(_copy_payload(arg) for arg in args)
+                    self._get_executor().submit(self._call_listener, notification_type, callback, *async_args)
+                else:
+                    self._call_listener(notification_type, callback, *args)
+
+    def _call_listener(self, notification_type: str, callback: Callable[..., None], *args: Any) -> None:
+        """ Call a listener, logging instead of raising its exceptions. """
+        try:
+            callback(*args)
+        except:
+            self.logger.exception(
+                f'Unknown problem when sending "{notification_type}" type notification.'
+            )
+
+    def _get_executor(self) -> BoundedExecutor:
+        """ Returns the pool calling asynchronous listeners, starting it on first use. """
+        with self._executor_lock:
+            if self.executor is None:
+                self.executor = BoundedExecutor(
+                    self.async_max_workers,
+                    self.async_queue_size,
+                    self.async_overflow_policy,
+                    thread_name_prefix='OptimizelyNotificationThread'
+                )
+            return self.executor
+
+    def get_async_queue_depth(self) -> int:
+        """ Returns the number of notifications waiting to be delivered to asynchronous listeners. """
+        executor = self.executor
+        return executor.get_queue_depth() if executor else 0
+
+    def get_dropped_notification_count(self) -> int:
+        """ Returns the number of notifications for asynchronous listeners which did not fit in the queue.
+    They were dropped, or delivered synchronously with the 'caller_runs' overflow policy. """
+        executor = self.executor
+        return executor.get_rejected_count() if executor else 0
+
+    def close(self) -> None:
+        """ Stop the pool of asynchronous listeners once queued notifications are delivered.
+    A new pool is started if further notifications are sent to asynchronous listeners. """
+        with self._executor_lock:
+            executor, self.executor = self.executor, None
+        if executor:
+            executor.shutdown(wait=False)
+
+
+def _copy_payload(value: Any) -> Any:
+    """ Copy the dicts and lists of a notification argument, sharing any other values. """
+    if isinstance(value, dict):
+        return {key: _copy_payload(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_payload(item) for item in value]
+    return value
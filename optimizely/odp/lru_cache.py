@@ -16,9 +16,13 @@ from dataclasses import dataclass, field
 import threading
 from time import time
 from collections import OrderedDict
-from typing import Optional, Generic, TypeVar, Hashable
+from typing import Any, Callable, Optional, Generic, TypeVar, Hashable
+import sys
 from sys import version_info
 
+from optimizely.helpers.enums import CacheEvictionCauses, CacheEvictionPolicies, MetricNames
+from optimizely.metrics import MetricsRegistry, NoOpMetricsRegistry
+
 if version_info < (3, 8):
     from typing_extensions import Protocol
 else:
@@ -30,13 +34,42 @@ V = TypeVar('V')
 
 
 class LRUCache(Generic[K, V]):
-    """Least Recently Used cache that invalidates entries older than the timeout."""
+    """Least Recently Used cache that invalidates entries older than the timeout.
+
+    Stale entries are dropped when looked up, and every save also drops a few stale entries from the
+    least recently used end, so entries of users who never return do not linger until capacity pressure
+    evicts them. remove_expired() drops all stale entries at once.
+
+    When max_size_in_bytes is set, the estimated size of cached keys and values is bounded as well.
+    get_eviction_counts() reports how many entries were dropped because of capacity, memory or expiry.
+    After set_metrics(), hits and misses of lookups are counted by the metrics registry.
+    """
+
+    # number of least recently used entries checked for expiry on every save
+    EXPIRY_SWEEP_SIZE = 4
+
+    metrics: MetricsRegistry = NoOpMetricsRegistry()
+    metrics_tags: Optional[dict[str, str]] = None
 
-    def __init__(self, capacity: int, timeout_in_secs: int):
+    def __init__(
+        self,
+        capacity: int,
+        timeout_in_secs: int,
+        max_size_in_bytes: int = 0,
+        size_of: Optional[Callable[[Any], int]] = None
+    ):
         self.lock = threading.Lock()
         self.map: OrderedDict[K, CacheElement[V]] = OrderedDict()
         self.capacity = capacity
         self.timeout = timeout_in_secs
+        self.max_size_in_bytes = max_size_in_bytes
+        self.size_of = size_of or estimate_size_in_bytes
+        self._size_in_bytes = 0
+        self._eviction_counts = {
+            CacheEvictionCauses.CAPACITY: 0,
+            CacheEvictionCauses.MEMORY: 0,
+            CacheEvictionCauses.EXPIRED: 0
+        }
 
     def lookup(self, key: K) -> Optional[V]:
         """Return the non-stale value associated with the provided key and move the
@@ -47,34 +80,74 @@ class LRUCache(Generic[K, V]):
             return None
 
         with self.lock:
-            if key not in self.map:
-                return None
+            element = self.map.get(key)
+            if element is not None:
+                self.map.move_to_end(key)
+                if element._is_stale(self.timeout):
+                    self._pop(key, CacheEvictionCauses.EXPIRED)
+                    element = None
+
+        if self.metrics.enabled:
+            self._record_lookup(element is not None)
+        return element.value if element is not None else None
+
+    def lookup_allow_stale(self, key: K, max_staleness_in_secs: float) -> Optional[tuple[V, bool]]:
+        """Like lookup, but also return values up to max_staleness_in_secs past their timeout, so that
+        they can be served while being refreshed.
+
+        Returns:
+            The value and whether it is stale, or None if there is no value or it is too stale.
+        """
+        if self.capacity <= 0:
+            return None
+
+        with self.lock:
+            element = self.map.get(key)
+            if element is not None:
+                self.map.move_to_end(key)
+                is_stale = element._is_stale(self.timeout)
+                if is_stale and element._is_stale(self.timeout + max_staleness_in_secs):
+                    self._pop(key, CacheEvictionCauses.EXPIRED)
+                    element = None
 
-            self.map.move_to_end(key)
-            element = self.map[key]
+        if self.metrics.enabled:
+            self._record_lookup(element is not None)
+        return (element.value, is_stale) if element is not None else None
 
-            if element._is_stale(self.timeout):
-                del self.map[key]
-                return None
+    def set_metrics(self, metrics: MetricsRegistry, name: str) -> None:
+        """Count hits and misses of lookups in metrics, tagged with the given cache name."""
+        self.metrics = metrics
+        self.metrics_tags = {'cache': name}
 
-        return element.value
+    def _record_lookup(self, hit: bool) -> None:
+        self.metrics.increment(MetricNames.CACHE_HITS if hit else MetricNames.CACHE_MISSES, 1, self.metrics_tags)
 
     def save(self, key: K, value: V) -> None:
         """Insert and/or move the provided key/value pair to the most recent end of the cache.
-        If the cache grows beyond the cache capacity, the least recently used element will be
-        removed.
+        If the cache grows beyond the cache capacity or memory bound, the least recently used
+        elements will be removed.
         """
         if self.capacity <= 0:
             return
 
+        element = CacheElement(value)
+        if self.max_size_in_bytes > 0:
+            element.size = self.size_of(key) + self.size_of(value)
+
         with self.lock:
             if key in self.map:
-                self.map.move_to_end(key)
+                self._pop(key)
+
+            self.map[key] = element
+            self._size_in_bytes += element.size
+
+            self._sweep_expired()
 
-            self.map[key] = CacheElement(value)
+            while len(self.map) > self.capacity:
+                self._pop(next(iter(self.map)), CacheEvictionCauses.CAPACITY)
 
-            if len(self.map) > self.capacity:
-                self.map.popitem(last=False)
+            while self.max_size_in_bytes > 0 and self._size_in_bytes > self.max_size_in_bytes and len(self.map) > 1:
+                self._pop(next(iter(self.map)), CacheEvictionCauses.MEMORY)
 
     def reset(self) -> None:
         """ Clear the cache."""
@@ -82,6 +155,7 @@ class LRUCache(Generic[K, V]):
             return
         with self.lock:
             self.map.clear()
+            self._size_in_bytes = 0
 
     def peek(self, key: K) -> Optional[V]:
         """Returns the value associated with the provided key without updating the cache."""
@@ -94,7 +168,402 @@ class LRUCache(Generic[K, V]):
     def remove(self, key: K) -> None:
         """Remove the element associated with the provided key from the cache."""
         with self.lock:
-            self.map.pop(key, None)
+            if key in self.map:
+                self._pop(key)
+
+    def get_size_in_bytes(self) -> int:
+        """Returns the estimated size of cached keys and values. Only tracked when max_size_in_bytes is set."""
+        return self._size_in_bytes
+
+    def get_eviction_counts(self) -> dict[str, int]:
+        """Returns the number of elements removed by the cache, keyed by CacheEvictionCauses."""
+        with self.lock:
+            return self._eviction_counts.copy()
+
+    def remove_expired(self) -> int:
+        """Remove all stale elements from the cache.
+
+        Returns:
+            The number of removed elements.
+        """
+        if self.timeout <= 0:
+            return 0
+        with self.lock:
+            stale_keys = [key for key, element in self.map.items() if element._is_stale(self.timeout)]
+            for key in stale_keys:
+                self._pop(key, CacheEvictionCauses.EXPIRED)
+        return len(stale_keys)
+
+    def close(self) -> None:
+        """Release resources held by the cache. Nothing to release for an in-memory cache."""
+        pass
+
+    def _sweep_expired(self) -> None:
+        """Remove stale elements from the least recently used end, stopping at the first fresh one.
+        Must be called while holding the lock.
+        """
+        if self.timeout <= 0:
+            return
+        for _ in range(self.EXPIRY_SWEEP_SIZE):
+            if len(self.map) <= 1:
+                return
+            key, element = next(iter(self.map.items()))
+            if not element._is_stale(self.timeout):
+                return
+            self._pop(key, CacheEvictionCauses.EXPIRED)
+
+    def _pop(self, key: K, cause: Optional[str] = None) -> None:
+        """Remove an element, updating the size and eviction counts. Must be called while holding the lock."""
+        element = self.map.pop(key)
+        self._size_in_bytes -= element.size
+        if cause:
+            self._eviction_counts[cause] += 1
+
+
+class ShardedLRUCache(LRUCache[K, V]):
+    """LRUCache split into independent shards selected by key hash.
+
+    Each shard has its own lock, so threads working on keys in different shards do not
+    wait on each other. Recency and capacity are tracked per shard, which makes eviction
+    approximate across the whole cache.
+    """
+
+    def __init__(
+        self,
+        capacity: int,
+        timeout_in_secs: int,
+        shard_count: int = 16,
+        eviction_policy: str = CacheEvictionPolicies.LRU,
+        max_size_in_bytes: int = 0
+    ):
+        # the elements are kept by the shards, the map of the sharded cache itself stays empty
+        super().__init__(capacity, timeout_in_secs, max_size_in_bytes)
+        self.shard_count = max(1, shard_count)
+        shard_capacity = -(-capacity // self.shard_count) if capacity > 0 else capacity
+        shard_max_size_in_bytes = -(-max_size_in_bytes // self.shard_count) if max_size_in_bytes > 0 else 0
+        self.shards: list[LRUCache[K, V]] = [
+            create_lru_cache(
+                shard_capacity,
+                timeout_in_secs,
+                eviction_policy=eviction_policy,
+                max_size_in_bytes=shard_max_size_in_bytes
+            )
+            for _ in range(self.shard_count)
+        ]
+
+    def _get_shard(self, key: K) -> LRUCache[K, V]:
+        return self.shards[hash(key) % self.shard_count]
+
+    @property
+    def hits(self) -> int:
+        """Number of lookups which found a value in ClockCache shards."""
+        return sum(getattr(shard, 'hits', 0) for shard in self.shards)
+
+    @property
+    def misses(self) -> int:
+        """Number of lookups which found no value in ClockCache shards."""
+        return sum(getattr(shard, 'misses', 0) for shard in self.shards)
+
+    @property
+    def hit_ratio(self) -> float:
+        """Ratio of lookups which found a value over all ClockCache shards, or 0.0 before the first lookup."""
+        hits = self.hits
+        lookups = hits + self.misses
+        return hits / lookups if lookups else 0.0
+
+    def set_metrics(self, metrics: MetricsRegistry, name: str) -> None:
+        """Count hits and misses of lookups in all shards, tagged with the given cache name."""
+        super().set_metrics(metrics, name)
+        for shard in self.shards:
+            shard.set_metrics(metrics, name)
+
+    def lookup(self, key: K) -> Optional[V]:
+        """Return the non-stale value associated with the provided key from its shard."""
+        return self._get_shard(key).lookup(key)
+
+    def lookup_allow_stale(self, key: K, max_staleness_in_secs: float) -> Optional[tuple[V, bool]]:
+        """Return the value associated with the provided key from its shard and whether it is stale."""
+        return self._get_shard(key).lookup_allow_stale(key, max_staleness_in_secs)
+
+    def save(self, key: K, value: V) -> None:
+        """Insert and/or move the provided key/value pair to the most recent end of its shard."""
+        self._get_shard(key).save(key, value)
+
+    def reset(self) -> None:
+        """ Clear all shards."""
+        for shard in self.shards:
+            shard.reset()
+
+    def peek(self, key: K) -> Optional[V]:
+        """Returns the value associated with the provided key without updating the cache."""
+        return self._get_shard(key).peek(key)
+
+    def remove(self, key: K) -> None:
+        """Remove the element associated with the provided key from the cache."""
+        self._get_shard(key).remove(key)
+
+    def get_size_in_bytes(self) -> int:
+        """Returns the estimated size of cached keys and values across all shards."""
+        return sum(shard.get_size_in_bytes() for shard in self.shards)
+
+    def get_eviction_counts(self) -> dict[str, int]:
+        """Returns the number of elements removed by all shards, keyed by CacheEvictionCauses."""
+        eviction_counts: dict[str, int] = {}
+        for shard in self.shards:
+            for cause, count in shard.get_eviction_counts().items():
+                eviction_counts[cause] = eviction_counts.get(cause, 0) + count
+        return eviction_counts
+
+    def remove_expired(self) -> int:
+        """Remove all stale elements from all shards.
+
+        Returns:
+            The number of removed elements.
+        """
+        return sum(shard.remove_expired() for shard in self.shards)
+
+    def close(self) -> None:
+        """Release resources held by all shards."""
+        for shard in self.shards:
+            shard.close()
+
+
+class ClockCache(LRUCache[K, V]):
+    """Cache approximating LRU with the CLOCK algorithm.
+
+    Hits only set a reference bit instead of reordering entries, so lookups do not take the lock
+    unless they find a stale element. On eviction the clock hand gives referenced entries a second
+    chance. With admission enabled, TinyLFU style access frequencies, which are halved periodically,
+    decide whether a new key is accessed often enough to replace the eviction victim.
+
+    The hits and misses counters are approximate when the cache is used from several threads.
+    Memory bounds are not supported, so max_size_in_bytes is always zero.
+    """
+
+    def __init__(self, capacity: int, timeout_in_secs: int, admission: bool = False):
+        super().__init__(capacity, timeout_in_secs)
+        self.map: dict[K, _ClockEntry[V]] = {}  # type: ignore[assignment]
+        self.admission = admission
+        self.hits = 0
+        self.misses = 0
+
+        self._ring: list[Optional[K]] = []
+        self._free_slots: list[int] = []
+        self._hand = 0
+
+        # access counts of recently looked up keys, aged every sample period to stay bounded
+        self._frequencies: dict[K, int] = {}
+        self._accesses = 0
+        self._sample_size = 10 * max(capacity, 1)
+
+    @property
+    def hit_ratio(self) -> float:
+        """Ratio of lookups which found a value, or 0.0 before the first lookup."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def lookup(self, key: K) -> Optional[V]:
+        """Return the non-stale value associated with the provided key and mark it as referenced."""
+        if self.capacity <= 0:
+            return None
+
+        if self.admission:
+            self._record_access(key)
+
+        entry = self.map.get(key)
+        if entry is None:
+            self.misses += 1
+            if self.metrics.enabled:
+                self._record_lookup(False)
+            return None
+
+        if entry._is_stale(self.timeout):
+            with self.lock:
+                if self.map.get(key) is entry:
+                    self._remove_entry(key, entry)
+                    self._eviction_counts[CacheEvictionCauses.EXPIRED] += 1
+            self.misses += 1
+            if self.metrics.enabled:
+                self._record_lookup(False)
+            return None
+
+        entry.referenced = True
+        self.hits += 1
+        if self.metrics.enabled:
+            self._record_lookup(True)
+        return entry.value
+
+    def lookup_allow_stale(self, key: K, max_staleness_in_secs: float) -> Optional[tuple[V, bool]]:
+        """Return the value associated with the provided key and whether it is stale, unless it is more
+        than max_staleness_in_secs past its timeout.
+        """
+        if self.capacity <= 0:
+            return None
+
+        if self.admission:
+            self._record_access(key)
+
+        entry = self.map.get(key)
+        if entry is None:
+            self.misses += 1
+            if self.metrics.enabled:
+                self._record_lookup(False)
+            return None
+
+        is_stale = entry._is_stale(self.timeout)
+        if is_stale and entry._is_stale(self.timeout + max_staleness_in_secs):
+            with self.lock:
+                if self.map.get(key) is entry:
+                    self._remove_entry(key, entry)
+                    self._eviction_counts[CacheEvictionCauses.EXPIRED] += 1
+            self.misses += 1
+            if self.metrics.enabled:
+                self._record_lookup(False)
+            return None
+
+        entry.referenced = True
+        self.hits += 1
+        if self.metrics.enabled:
+            self._record_lookup(True)
+        return entry.value, is_stale
+
+    def save(self, key: K, value: V) -> None:
+        """Insert or update the provided key/value pair. When the cache is full, the clock hand evicts
+        the first unreferenced entry, unless admission rejects the new key.
+        """
+        if self.capacity <= 0:
+            return
+
+        with self.lock:
+            entry = self.map.get(key)
+            if entry is not None:
+                entry = _ClockEntry(value, entry.slot)
+                entry.referenced = True
+                self.map[key] = entry
+                return
+
+            if self._free_slots:
+                slot = self._free_slots.pop()
+            elif len(self._ring) < self.capacity:
+                slot = len(self._ring)
+                self._ring.append(None)
+            else:
+                slot = self._find_victim_slot()
+                victim_key = self._ring[slot]
+                if self.admission and self._estimate(key) <= self._estimate(victim_key):
+                    return
+                del self.map[victim_key]  # type: ignore[arg-type]
+                self._eviction_counts[CacheEvictionCauses.CAPACITY] += 1
+
+            self._ring[slot] = key
+            self.map[key] = _ClockEntry(value, slot)
+
+    def reset(self) -> None:
+        """ Clear the cache."""
+        if self.capacity <= 0:
+            return
+        with self.lock:
+            self.map.clear()
+            self._ring.clear()
+            self._free_slots.clear()
+            self._hand = 0
+
+    def peek(self, key: K) -> Optional[V]:
+        """Returns the value associated with the provided key without marking it as referenced."""
+        if self.capacity <= 0:
+            return None
+        entry = self.map.get(key)
+        return entry.value if entry is not None else None
+
+    def remove(self, key: K) -> None:
+        """Remove the element associated with the provided key from the cache."""
+        with self.lock:
+            entry = self.map.get(key)
+            if entry is not None:
+                self._remove_entry(key, entry)
+
+    def remove_expired(self) -> int:
+        """Remove all stale elements from the cache.
+
+        Returns:
+            The number of removed elements.
+        """
+        if self.timeout <= 0:
+            return 0
+        with self.lock:
+            stale = [(key, entry) for key, entry in self.map.items() if entry._is_stale(self.timeout)]
+            for key, entry in stale:
+                self._remove_entry(key, entry)
+            self._eviction_counts[CacheEvictionCauses.EXPIRED] += len(stale)
+        return len(stale)
+
+    def _remove_entry(self, key: K, entry: _ClockEntry[V]) -> None:
+        """Remove an entry and free its slot. Must be called while holding the lock."""
+        del self.map[key]
+        self._ring[entry.slot] = None
+        self._free_slots.append(entry.slot)
+
+    def _find_victim_slot(self) -> int:
+        """Advance the clock hand to the first unreferenced entry, clearing reference bits on the way."""
+        while True:
+            slot = self._hand
+            self._hand = (self._hand + 1) % len(self._ring)
+            entry = self.map[self._ring[slot]]  # type: ignore[index]
+            if not entry.referenced:
+                return slot
+            entry.referenced = False
+
+    def _record_access(self, key: K) -> None:
+        """Count an access to a key, halving all counts and dropping rare keys once per sample period."""
+        frequencies = self._frequencies
+        frequencies[key] = frequencies.get(key, 0) + 1
+
+        self._accesses += 1
+        if self._accesses >= self._sample_size:
+            self._accesses = 0
+            # list() copies the items atomically while other threads may keep counting
+            self._frequencies = {k: count >> 1 for k, count in list(frequencies.items()) if count > 1}
+
+    def _estimate(self, key: Optional[K]) -> int:
+        """Recent access frequency of a key."""
+        return self._frequencies.get(key, 0)  # type: ignore[arg-type]
+
+
+def create_lru_cache(
+    capacity: int,
+    timeout_in_secs: int,
+    shard_count: int = 1,
+    eviction_policy: str = CacheEvictionPolicies.LRU,
+    max_size_in_bytes: int = 0
+) -> LRUCache[K, V]:
+    """Create a cache with the given eviction policy, sharded when more than one shard is requested.
+
+    Args:
+        capacity: Maximum number of elements. Set to zero to disable caching.
+        timeout_in_secs: Timeout of elements in seconds. Set to zero to disable timeout.
+        shard_count: Number of independently locked shards.
+        eviction_policy: One of CacheEvictionPolicies. Unknown policies fall back to LRU.
+        max_size_in_bytes: Bound of the estimated size of cached keys and values. Set to zero to disable.
+            Not supported by the CLOCK based policies.
+
+    Returns:
+        An LRUCache, ClockCache or ShardedLRUCache.
+    """
+    if shard_count > 1:
+        return ShardedLRUCache(capacity, timeout_in_secs, shard_count, eviction_policy, max_size_in_bytes)
+    if eviction_policy in (CacheEvictionPolicies.CLOCK, CacheEvictionPolicies.TINY_LFU):
+        return ClockCache(capacity, timeout_in_secs, eviction_policy == CacheEvictionPolicies.TINY_LFU)
+    return LRUCache(capacity, timeout_in_secs, max_size_in_bytes)
+
+
+def estimate_size_in_bytes(value: Any) -> int:
+    """Estimate the memory used by a value, including the items of nested lists, tuples, sets and dicts."""
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(estimate_size_in_bytes(k) + estimate_size_in_bytes(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple, set, frozenset)):
+        size += sum(estimate_size_in_bytes(item) for item in value)
+    return size
 
 
 @dataclass
@@ -102,6 +571,7 @@ class CacheElement(Generic[V]):
     """Individual element for the LRUCache."""
     value: V
     timestamp: float = field(default_factory=time)
+    size: int = 0
 
     def _is_stale(self, timeout: float) -> bool:
         """Returns True if the provided timeout has passed since the element's timestamp."""
@@ -110,6 +580,15 @@ class CacheElement(Generic[V]):
         return time() - self.timestamp >= timeout
 
 
+class _ClockEntry(CacheElement[V]):
+    """Element of the ClockCache with its slot in the clock ring and its reference bit."""
+
+    def __init__(self, value: V, slot: int):
+        super().__init__(value)
+        self.slot = slot
+        self.referenced = False
+
+
 class OptimizelySegmentsCache(Protocol):
     """Protocol for implementing custom cache."""
     def reset(self) -> None:
@@ -16,12 +16,10 @@ from __future__ import annotations
 import json
 from typing import Optional
 
-import requests
-from requests.exceptions import RequestException, ConnectionError, Timeout
-
 from optimizely import logger as optimizely_logger
 from optimizely.helpers.enums import Errors, OdpEventApiConfig
 from optimizely.odp.odp_event import OdpEvent, OdpEventEncoder
+from optimizely.odp.odp_http_transport import OdpHttpTransport
 
 """
  ODP REST Events API
@@ -40,9 +38,11 @@ from optimizely.odp.odp_event import OdpEvent, OdpEventEncoder
 class OdpEventApiManager:
     """Provides an internal service for ODP event REST api access."""
 
-    def __init__(self, logger: Optional[optimizely_logger.Logger] = None, timeout: Optional[int] = None):
+    def __init__(self, logger: Optional[optimizely_logger.Logger] = None, timeout: Optional[int] = None,
+                 transport: Optional[OdpHttpTransport] = None):
         self.logger = logger or optimizely_logger.NoOpLogger()
         self.timeout = timeout or OdpEventApiConfig.REQUEST_TIMEOUT
+        self.transport = transport
 
     def send_odp_events(self,
                         api_key: str,
@@ -69,11 +69,15 @@ class OdpEventApiManager:
             self.logger.error(Errors.ODP_EVENT_FAILED.format(err))
             return should_retry
 
+        import requests
+        from requests.exceptions import RequestException, ConnectionError, Timeout
+
         try:
-            response = requests.post(url=url,
-                                     headers=request_headers,
-                                     data=payload_dict,
-                                     timeout=self.timeout)
+            post = self.transport.post if self.transport else requests.post
+            response = post(url=url,
+                            headers=request_headers,
+                            data=payload_dict,
+                            timeout=self.timeout)
 
             response.raise_for_status()
 
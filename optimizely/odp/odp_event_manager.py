@@ -13,6 +13,8 @@
 
 from __future__ import annotations
 
+import heapq
+import itertools
 import time
 from enum import Enum
 from queue import Empty, Queue, Full
@@ -20,10 +22,12 @@ from threading import Thread
 from typing import Optional
 
 from optimizely import logger as _logging
-from optimizely.helpers.enums import OdpEventManagerConfig, Errors, OdpManagerConfig
+from optimizely.helpers.enums import OdpEventManagerConfig, Errors, OdpManagerConfig, MetricNames
+from optimizely.metrics import MetricsRegistry, NoOpMetricsRegistry
 from .odp_config import OdpConfig, OdpConfigState
 from .odp_event import OdpEvent, OdpDataDict
 from .odp_event_api_manager import OdpEventApiManager
+from .odp_http_transport import OdpHttpTransport
 
 
 class Signal(Enum):
@@ -41,14 +45,23 @@ class OdpEventManager:
     the queue and buffers them before events are sent to ODP.
     Sends events when the batch size is met or when the flush timeout has elapsed.
     Flushes the event queue after specified time (seconds).
+    Batches which failed with a retryable error wait in a retry buffer, bounded separately from the
+    event queue, and are resent by the same thread once their backoff has elapsed.
     """
 
+    # exponential backoff of retries: 200ms, 400ms, 800ms, ... capped at 1s
+    retry_initial_interval = 0.2
+    retry_max_interval = 1.0
+
     def __init__(
         self,
         logger: Optional[_logging.Logger] = None,
         api_manager: Optional[OdpEventApiManager] = None,
         request_timeout: Optional[int] = None,
-        flush_interval: Optional[int] = None
+        flush_interval: Optional[int] = None,
+        transport: Optional[OdpHttpTransport] = None,
+        retry_buffer_capacity: int = OdpEventManagerConfig.DEFAULT_RETRY_BUFFER_CAPACITY,
+        metrics: Optional[MetricsRegistry] = None
     ):
         """OdpEventManager init method to configure event batching.
 
@@ -57,9 +70,13 @@ class OdpEventManager:
             api_manager: Optional component which sends events to ODP.
             request_timeout: Optional event timeout in seconds - wait time for odp platform to respond before failing.
             flush_interval: Optional time to wait for events to accumulate before sending the batch in seconds.
+            transport: Optional connection pool of the default api manager.
+            retry_buffer_capacity: Optional maximum number of failed batches waiting to be retried.
+            metrics: Optional metrics registry recording the queue depth, batch sizes and dispatch latency.
         """
         self.logger = logger or _logging.NoOpLogger()
-        self.api_manager = api_manager or OdpEventApiManager(self.logger, request_timeout)
+        self.metrics = metrics or NoOpMetricsRegistry()
+        self.api_manager = api_manager or OdpEventApiManager(self.logger, request_timeout, transport)
 
         self.odp_config: Optional[OdpConfig] = None
         self.api_key: Optional[str] = None
@@ -75,6 +92,10 @@ class OdpEventManager:
         self.retry_count = OdpEventManagerConfig.DEFAULT_RETRY_COUNT
         self._current_batch: list[OdpEvent] = []
         """_current_batch should only be modified by the processing thread, as it is not thread safe"""
+        self.retry_buffer_capacity = retry_buffer_capacity
+        self._retry_batches: list[tuple[float, int, int, str, str, list[OdpEvent]]] = []
+        """heap of (due time, sequence, attempt, api key, api host, events), only used by the processing thread"""
+        self._retry_sequence = itertools.count()
         self.thread = Thread(target=self._run, name="OdpThread", daemon=True)
         self.thread_exception = False
         """thread_exception will be True if the processing thread did not exit cleanly"""
@@ -127,10 +148,12 @@ class OdpEventManager:
                     self._add_to_batch(item)
                     self.event_queue.task_done()
 
-                elif len(self._current_batch) > 0:
+                elif len(self._current_batch) > 0 and self._get_time_till_flush() == 0:
                     self.logger.debug('ODP event queue: flushing on interval.')
                     self._flush_batch()
 
+                self._send_due_retries()
+
         except Exception as exception:
             self.thread_exception = True
             self.logger.error(f'Uncaught exception processing ODP events. Error: {exception}')
@@ -138,6 +161,7 @@ class OdpEventManager:
         finally:
             self.logger.info('Exiting ODP event processing loop. Attempting to flush pending events.')
             self._flush_batch()
+            self._flush_retries()
             if item == Signal.SHUTDOWN:
                 self.event_queue.task_done()
 
@@ -162,33 +186,56 @@ class OdpEventManager:
             return
 
         self.logger.debug(f'ODP event queue: flushing batch size {batch_len}.')
-        should_retry = False
-        initial_retry_interval = 0.2  # 200ms
-        max_retry_interval = 1.0  # 1 second
-
-        for i in range(1 + self.retry_count):
-            try:
-                should_retry = self.api_manager.send_odp_events(self.api_key,
-                                                                self.api_host,
-                                                                self._current_batch)
-            except Exception as error:
-                should_retry = False
-                self.logger.error(Errors.ODP_EVENT_FAILED.format(f'Error: {error} {self._current_batch}'))
-
-            if not should_retry:
-                break
-            if i < self.retry_count:
-                # Exponential backoff: 200ms, 400ms, 800ms, ... capped at 1s
-                delay = initial_retry_interval * (2 ** i)
-                if delay > max_retry_interval:
-                    delay = max_retry_interval
-                self.logger.debug(f'Error dispatching ODP events, retrying after {delay}s.')
-                time.sleep(delay)
-
-        if should_retry:
-            self.logger.error(Errors.ODP_EVENT_FAILED.format(f'Failed after {i} retries: {self._current_batch}'))
-
-        self._current_batch.clear()
+        batch, self._current_batch = self._current_batch, []
+        if self.metrics.enabled:
+            self.metrics.observe(MetricNames.ODP_EVENT_BATCH_SIZE, batch_len)
+        self._send_batch(self.api_key, self.api_host, batch, 0)
+
+    def _send_batch(self, api_key: str, api_host: str, batch: list[OdpEvent], attempt: int,
+                    final: bool = False) -> None:
+        """Sends a batch, scheduling a retry on retryable errors until the retry count is exhausted.
+        Should only be called by the processing thread."""
+        start = self.metrics.start_timer()
+        try:
+            should_retry = self.api_manager.send_odp_events(api_key, api_host, batch)
+        except Exception as error:
+            should_retry = False
+            self.logger.error(Errors.ODP_EVENT_FAILED.format(f'Error: {error} {batch}'))
+            self.metrics.increment(MetricNames.ODP_EVENT_DISPATCH_FAILURES)
+        self.metrics.observe_latency(MetricNames.ODP_EVENT_DISPATCH_LATENCY, start)
+
+        if not should_retry:
+            return
+
+        if final or attempt >= self.retry_count:
+            self.logger.error(Errors.ODP_EVENT_FAILED.format(f'Failed after {attempt} retries: {batch}'))
+            self.metrics.increment(MetricNames.ODP_EVENT_DISPATCH_FAILURES)
+            return
+
+        if len(self._retry_batches) >= self.retry_buffer_capacity:
+            self.logger.error(Errors.ODP_EVENT_FAILED.format(f'Retry buffer is full: {batch}'))
+            self.metrics.increment(MetricNames.ODP_EVENT_DISPATCH_FAILURES)
+            return
+
+        delay = min(self.retry_initial_interval * (2 ** attempt), self.retry_max_interval)
+        self.logger.debug(f'Error dispatching ODP events, retrying after {delay}s.')
+        due = time.time() + delay
+        heapq.heappush(self._retry_batches, (due, next(self._retry_sequence), attempt + 1, api_key, api_host, batch))
+
+    def _send_due_retries(self) -> None:
+        """Resends the failed batches whose backoff has elapsed.
+        Should only be called by the processing thread."""
+        now = time.time()
+        while self._retry_batches and self._retry_batches[0][0] <= now:
+            _, _, attempt, api_key, api_host, batch = heapq.heappop(self._retry_batches)
+            self._send_batch(api_key, api_host, batch, attempt)
+
+    def _flush_retries(self) -> None:
+        """Resends all failed batches once without waiting for their backoff.
+        Should only be called by the processing thread."""
+        while self._retry_batches:
+            _, _, attempt, api_key, api_host, batch = heapq.heappop(self._retry_batches)
+            self._send_batch(api_key, api_host, batch, attempt, final=True)
 
     def _add_to_batch(self, odp_event: OdpEvent) -> None:
         """Appends received ODP event to current batch, flushing if batch is greater than batch size.
@@ -210,10 +257,13 @@ class OdpEventManager:
         return max(0, self._flush_deadline - time.time())
 
     def _get_queue_timeout(self) -> Optional[float]:
-        """Returns seconds until next flush or None if current batch is empty."""
-        if len(self._current_batch) == 0:
-            return None
-        return self._get_time_till_flush()
+        """Returns seconds until next flush or retry, or None if there is nothing to send."""
+        timeouts = []
+        if len(self._current_batch) > 0:
+            timeouts.append(self._get_time_till_flush())
+        if self._retry_batches:
+            timeouts.append(max(0, self._retry_batches[0][0] - time.time()))
+        return min(timeouts) if timeouts else None
 
     def stop(self) -> None:
         """Flushes and then stops ODP event queue."""
@@ -267,6 +317,9 @@ class OdpEventManager:
         except Full:
             self.logger.warning(Errors.ODP_EVENT_FAILED.format("Queue is full"))
 
+        if self.metrics.enabled:
+            self.metrics.set_gauge(MetricNames.ODP_EVENT_QUEUE_DEPTH, self.event_queue.qsize())
+
     def identify_user(self, identifiers: dict[str, str]) -> None:
         """Send an identify event to ODP if there are multiple valid identifiers.
 
@@ -0,0 +1,87 @@
+# Copyright 2026, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import threading
+from typing import TYPE_CHECKING, Optional, Union
+
+from optimizely.helpers.enums import OdpHttpConfig
+
+if TYPE_CHECKING:
+    import requests
+
+
+class OdpHttpTransport:
+    """Session shared by the ODP API managers, so that requests to ODP reuse pooled connections.
+
+    Connections are kept alive between requests unless keep_alive is False. With a connect_timeout,
+    establishing a connection is limited separately from the read timeout of each request.
+    The session is created on first use, so that clients which never send requests to ODP don't
+    import requests.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = OdpHttpConfig.DEFAULT_POOL_SIZE,
+        keep_alive: bool = True,
+        connect_timeout: Optional[float] = None
+    ):
+        self.pool_size = max(1, pool_size)
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        self.lock = threading.Lock()
+        self._session: Optional[requests.Session] = None
+
+    @property
+    def session(self) -> requests.Session:
+        """The session holding the pooled connections."""
+        if self._session is None:
+            with self.lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> requests.Session:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        if not self.keep_alive:
+            session.headers['Connection'] = 'close'
+        return session
+
+    def post(self, url: str, headers: dict[str, str], data: str, timeout: float) -> requests.Response:
+        """Send a POST request on a pooled connection.
+
+        Args:
+            url: The request url.
+            headers: The request headers.
+            data: The request body.
+            timeout: Time to wait in seconds for the server to respond.
+
+        Returns:
+            The response. Raises requests exceptions like requests.post.
+        """
+        request_timeout: Union[float, tuple[float, float]] = timeout
+        if self.connect_timeout is not None:
+            request_timeout = (self.connect_timeout, timeout)
+        return self.session.post(url=url, headers=headers, data=data, timeout=request_timeout)
+
+    def close(self) -> None:
+        """Close the pooled connections."""
+        with self.lock:
+            if self._session is not None:
+                self._session.close()
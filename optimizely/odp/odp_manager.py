@@ -16,11 +16,23 @@ from __future__ import annotations
 from typing import Optional, Any
 
 from optimizely import logger as optimizely_logger
-from optimizely.helpers.enums import Errors, OdpManagerConfig, OdpSegmentsCacheConfig
+from optimizely.helpers.bounded_executor import BoundedExecutor
+from optimizely.helpers.enums import (
+    CacheEvictionPolicies,
+    Errors,
+    ExecutorRejectionPolicies,
+    OdpHttpConfig,
+    OdpManagerConfig,
+    OdpSegmentsCacheConfig,
+    OdpSegmentsFetchConfig,
+)
 from optimizely.helpers.validator import are_odp_data_types_valid
-from optimizely.odp.lru_cache import OptimizelySegmentsCache, LRUCache
+from optimizely.metrics import MetricsRegistry
+from optimizely.tracing import BaseTracer
+from optimizely.odp.lru_cache import LRUCache, OptimizelySegmentsCache, create_lru_cache
 from optimizely.odp.odp_config import OdpConfig, OdpConfigState
 from optimizely.odp.odp_event_manager import OdpEventManager
+from optimizely.odp.odp_http_transport import OdpHttpTransport
 from optimizely.odp.odp_segment_manager import OdpSegmentManager
 
 
@@ -36,31 +48,72 @@ class OdpManager:
         fetch_segments_timeout: Optional[int] = None,
         odp_event_timeout: Optional[int] = None,
         odp_flush_interval: Optional[int] = None,
-        logger: Optional[optimizely_logger.Logger] = None
+        logger: Optional[optimizely_logger.Logger] = None,
+        segments_cache_shards: int = 1,
+        segments_cache_eviction_policy: str = CacheEvictionPolicies.LRU,
+        segments_cache_max_size_in_bytes: int = 0,
+        segments_cache_max_staleness_in_secs: float = 0,
+        segments_refresh_queue_size: int = OdpSegmentsCacheConfig.DEFAULT_REFRESH_QUEUE_SIZE,
+        fetch_segments_max_workers: int = OdpSegmentsFetchConfig.DEFAULT_MAX_WORKERS,
+        fetch_segments_queue_size: int = OdpSegmentsFetchConfig.DEFAULT_QUEUE_SIZE,
+        fetch_segments_rejection_policy: str = ExecutorRejectionPolicies.CALLER_RUNS,
+        http_pool_size: int = OdpHttpConfig.DEFAULT_POOL_SIZE,
+        http_keep_alive: bool = True,
+        http_connect_timeout: Optional[float] = None,
+        metrics: Optional[MetricsRegistry] = None,
+        tracer: Optional[BaseTracer] = None
     ) -> None:
 
         self.enabled = not disable
         self.odp_config = OdpConfig()
         self.logger = logger or optimizely_logger.NoOpLogger()
 
+        # shared by the non-blocking segment fetches of all user contexts
+        self.fetch_executor = BoundedExecutor(
+            fetch_segments_max_workers,
+            fetch_segments_queue_size,
+            fetch_segments_rejection_policy,
+            thread_name_prefix='FetchQualifiedSegmentsThread'
+        )
+
         self.segment_manager = segment_manager
         self.event_manager = event_manager
         self.fetch_segments_timeout = fetch_segments_timeout
+        self.transport: Optional[OdpHttpTransport] = None
 
         if not self.enabled:
             self.logger.info('ODP is disabled.')
             return
 
+        # pooled connections shared by the default segment and event api managers
+        if not self.segment_manager or not self.event_manager:
+            self.transport = OdpHttpTransport(http_pool_size, http_keep_alive, http_connect_timeout)
+
         if not self.segment_manager:
             if not segments_cache:
-                segments_cache = LRUCache(
+                segments_cache = create_lru_cache(
                     OdpSegmentsCacheConfig.DEFAULT_CAPACITY,
-                    OdpSegmentsCacheConfig.DEFAULT_TIMEOUT_SECS
+                    OdpSegmentsCacheConfig.DEFAULT_TIMEOUT_SECS,
+                    segments_cache_shards,
+                    segments_cache_eviction_policy,
+                    segments_cache_max_size_in_bytes
                 )
-            self.segment_manager = OdpSegmentManager(segments_cache, logger=self.logger, timeout=fetch_segments_timeout)
+            if metrics and isinstance(segments_cache, LRUCache):
+                segments_cache.set_metrics(metrics, 'odp_segments')
+            self.segment_manager = OdpSegmentManager(
+                segments_cache,
+                logger=self.logger,
+                timeout=fetch_segments_timeout,
+                max_staleness_in_secs=segments_cache_max_staleness_in_secs,
+                refresh_queue_size=segments_refresh_queue_size,
+                transport=self.transport,
+                tracer=tracer
+            )
 
         self.event_manager = self.event_manager or OdpEventManager(self.logger, request_timeout=odp_event_timeout,
-                                                                   flush_interval=odp_flush_interval)
+                                                                   flush_interval=odp_flush_interval,
+                                                                   transport=self.transport,
+                                                                   metrics=metrics)
         self.segment_manager.odp_config = self.odp_config
 
     def fetch_qualified_segments(self, user_id: str, options: list[str]) -> Optional[list[str]]:
@@ -131,5 +184,12 @@ class OdpManager:
             self.event_manager.start(self.odp_config)
 
     def close(self) -> None:
+        self.fetch_executor.shutdown(wait=False)
         if self.enabled and self.event_manager:
             self.event_manager.stop()
+        if self.enabled and isinstance(self.segment_manager, OdpSegmentManager):
+            self.segment_manager.stop()
+            if callable(getattr(self.segment_manager.segments_cache, 'close', None)):
+                self.segment_manager.segments_cache.close()  # type: ignore[attr-defined]
+        if self.transport:
+            self.transport.close()
@@ -14,13 +14,11 @@
 from __future__ import annotations
 
 import json
-from typing import Optional
-
-import requests
-from requests.exceptions import RequestException, ConnectionError, Timeout, JSONDecodeError
+from typing import Any, Optional
 
 from optimizely import logger as optimizely_logger
 from optimizely.helpers.enums import Errors, OdpSegmentApiConfig
+from optimizely.odp.odp_http_transport import OdpHttpTransport
 
 """
  ODP GraphQL API
@@ -108,9 +106,11 @@ from optimizely.helpers.enums import Errors, OdpSegmentApiConfig
 class OdpSegmentApiManager:
     """Interface for manging the fetching of audience segments."""
 
-    def __init__(self, logger: Optional[optimizely_logger.Logger] = None, timeout: Optional[int] = None):
+    def __init__(self, logger: Optional[optimizely_logger.Logger] = None, timeout: Optional[int] = None,
+                 transport: Optional[OdpHttpTransport] = None):
         self.logger = logger or optimizely_logger.NoOpLogger()
         self.timeout = timeout or OdpSegmentApiConfig.REQUEST_TIMEOUT
+        self.transport = transport
 
     def fetch_segments(self, api_key: str, api_host: str, user_key: str,
                        user_value: str, segments_to_check: list[str]) -> Optional[list[str]]:
@@ -127,10 +127,6 @@ class OdpSegmentApiManager:
         Returns:
             Audience segments from GraphQL.
         """
-        url = f'{api_host}/v3/graphql'
-        request_headers = {'content-type': 'application/json',
-                           'x-api-key': str(api_key)}
-
         query = {
             'query':
                 'query($userId: String, $audiences: [String]) {'
@@ -141,32 +137,8 @@ class OdpSegmentApiManager:
                 'audiences': segments_to_check}
         }
 
-        try:
-            payload_dict = json.dumps(query)
-        except TypeError as err:
-            self.logger.error(Errors.FETCH_SEGMENTS_FAILED.format(err))
-            return None
-
-        try:
-            response = requests.post(url=url,
-                                     headers=request_headers,
-                                     data=payload_dict,
-                                     timeout=self.timeout)
-
-            response.raise_for_status()
-            response_dict = response.json()
-
-        # There is no status code with network issues such as ConnectionError or Timeouts
-        # (i.e. no internet, server can't be reached).
-        except (ConnectionError, Timeout) as err:
-            self.logger.debug(f'GraphQL download failed: {err}')
-            self.logger.error(Errors.FETCH_SEGMENTS_FAILED.format('network error'))
-            return None
-        except JSONDecodeError:
-            self.logger.error(Errors.FETCH_SEGMENTS_FAILED.format('JSON decode error'))
-            return None
-        except RequestException as err:
-            self.logger.error(Errors.FETCH_SEGMENTS_FAILED.format(err))
+        response_dict = self._send_query(api_key, api_host, query)
+        if response_dict is None:
             return None
 
         if response_dict and 'errors' in response_dict:
@@ -192,3 +164,136 @@ class OdpSegmentApiManager:
             except (KeyError, TypeError):
                 self.logger.error(Errors.FETCH_SEGMENTS_FAILED.format('decode error'))
                 return None
+
+    def fetch_segments_for_users(
+        self, api_key: str, api_host: str, user_key: str, user_values: list[str], segments_to_check: list[str]
+    ) -> dict[str, Optional[list[str]]]:
+        """
+        Fetch segments of many users from ODP GraphQL API.
+
+        Users are queried with aliased customer fields (u0: customer(...), u1: customer(...), ...),
+        so that up to OdpSegmentApiConfig.MAX_USERS_PER_REQUEST users are fetched in one round trip.
+
+        Args:
+            api_key: public api key
+            api_host: domain url of the host
+            user_key: vuid or fs_user_id (client device id or fullstack id)
+            user_values: values of user_key
+            segments_to_check: list of segments to check
+
+        Returns:
+            Audience segments from GraphQL keyed by user value. The value is None for users
+            whose segments could not be fetched.
+        """
+        unique_user_values = list(dict.fromkeys(str(user_value) for user_value in user_values))
+        batch_size = OdpSegmentApiConfig.MAX_USERS_PER_REQUEST
+        results: dict[str, Optional[list[str]]] = {}
+
+        for start in range(0, len(unique_user_values), batch_size):
+            batch = unique_user_values[start:start + batch_size]
+            results.update(self._fetch_segments_batch(api_key, api_host, user_key, batch, segments_to_check))
+
+        return results
+
+    def _fetch_segments_batch(
+        self, api_key: str, api_host: str, user_key: str, user_values: list[str], segments_to_check: list[str]
+    ) -> dict[str, Optional[list[str]]]:
+        """Fetch segments of the given users in a single aliased GraphQL request."""
+        results: dict[str, Optional[list[str]]] = dict.fromkeys(user_values)
+        aliases = {f'u{index}': user_value for index, user_value in enumerate(user_values)}
+
+        variable_definitions = ''.join(f', ${alias}: String' for alias in aliases)
+        fields = ' '.join(
+            f'{alias}: customer({user_key}: ${alias}) '
+            '{audiences(subset: $audiences) {edges {node {name state}}}}'
+            for alias in aliases
+        )
+        variables: dict[str, Any] = {'audiences': segments_to_check}
+        variables.update(aliases)
+        query = {
+            'query': f'query($audiences: [String]{variable_definitions}) {{{fields}}}',
+            'variables': variables
+        }
+
+        response_dict = self._send_query(api_key, api_host, query)
+        if response_dict is None:
+            return results
+
+        errors = (response_dict.get('errors') or []) if isinstance(response_dict, dict) else None
+        if not isinstance(errors, list):
+            self.logger.error(Errors.FETCH_SEGMENTS_FAILED.format('decode error'))
+            return results
+
+        # errors of individual customers carry the alias of the failed field in their path,
+        # any other error fails the whole request.
+        failed_aliases = set()
+        for error in errors:
+            try:
+                alias = error['path'][0]
+                error_class = error['extensions']['classification']
+                error_code = error['extensions'].get('code')
+            except (KeyError, IndexError, TypeError, AttributeError):
+                alias = None
+
+            if not isinstance(alias, str) or alias not in aliases:
+                self.logger.error(Errors.FETCH_SEGMENTS_FAILED.format('decode error'))
+                return results
+
+            failed_aliases.add(alias)
+            if error_code == 'INVALID_IDENTIFIER_EXCEPTION':
+                self.logger.warning(Errors.FETCH_SEGMENTS_FAILED.format(f'invalid identifier {aliases[alias]}'))
+            else:
+                self.logger.error(Errors.FETCH_SEGMENTS_FAILED.format(error_class))
+
+        for alias, user_value in aliases.items():
+            if alias in failed_aliases:
+                continue
+            try:
+                audiences = response_dict['data'][alias]['audiences']['edges']
+                results[user_value] = [
+                    edge['node']['name'] for edge in audiences if edge['node']['state'] == 'qualified'
+                ]
+            except (KeyError, TypeError):
+                self.logger.error(Errors.FETCH_SEGMENTS_FAILED.format('decode error'))
+
+        return results
+
+    def _send_query(self, api_key: str, api_host: str, query: dict[str, Any]) -> Optional[dict[str, Any]]:
+        """Post a GraphQL query and return the decoded response, or None if the request failed."""
+        url = f'{api_host}/v3/graphql'
+        request_headers = {'content-type': 'application/json',
+                           'x-api-key': str(api_key)}
+
+        try:
+            payload_dict = json.dumps(query)
+        except TypeError as err:
+            self.logger.error(Errors.FETCH_SEGMENTS_FAILED.format(err))
+            return None
+
+        import requests
+        from requests.exceptions import RequestException, ConnectionError, Timeout, JSONDecodeError
+
+        try:
+            post = self.transport.post if self.transport else requests.post
+            response = post(url=url,
+                            headers=request_headers,
+                            data=payload_dict,
+                            timeout=self.timeout)
+
+            response.raise_for_status()
+            response_dict: dict[str, Any] = response.json()
+
+        # There is no status code with network issues such as ConnectionError or Timeouts
+        # (i.e. no internet, server can't be reached).
+        except (ConnectionError, Timeout) as err:
+            self.logger.debug(f'GraphQL download failed: {err}')
+            self.logger.error(Errors.FETCH_SEGMENTS_FAILED.format('network error'))
+            return None
+        except JSONDecodeError:
+            self.logger.error(Errors.FETCH_SEGMENTS_FAILED.format('JSON decode error'))
+            return None
+        except RequestException as err:
+            self.logger.error(Errors.FETCH_SEGMENTS_FAILED.format(err))
+            return None
+
+        return response_dict
@@ -13,31 +13,56 @@
 
 from __future__ import annotations
 
+import queue
+from threading import Event, Lock, Thread
 from typing import Optional
 
 from optimizely import logger as optimizely_logger
-from optimizely.helpers.enums import Errors
+from optimizely.helpers.enums import Errors, OdpSegmentsCacheConfig, TracingAttributes, TracingSpanNames
+from optimizely.helpers.single_flight import SingleFlight
 from optimizely.odp.odp_config import OdpConfig
 from optimizely.odp.optimizely_odp_option import OptimizelyOdpOption
 from optimizely.odp.lru_cache import OptimizelySegmentsCache
+from optimizely.odp.odp_http_transport import OdpHttpTransport
 from optimizely.odp.odp_segment_api_manager import OdpSegmentApiManager
+from optimizely.tracing import BaseSpan, BaseTracer, NoOpTracer
 
 
 class OdpSegmentManager:
-    """Schedules connections to ODP for audience segmentation and caches the results."""
+    """Schedules connections to ODP for audience segmentation and caches the results.
+
+    With a max_staleness_in_secs above zero, segments up to that long past their cache timeout are
+    returned immediately and refreshed by a background thread. Users waiting for a refresh are held in
+    a queue of refresh_queue_size, refreshes of users which do not fit are skipped until their next lookup.
+    Stopping the manager drops the queued refreshes instead of waiting for them.
+    This requires a segments cache with lookup_allow_stale(key, max_staleness_in_secs), like the SDK caches.
+    """
 
     def __init__(
         self,
         segments_cache: OptimizelySegmentsCache,
         api_manager: Optional[OdpSegmentApiManager] = None,
         logger: Optional[optimizely_logger.Logger] = None,
-        timeout: Optional[int] = None
+        timeout: Optional[int] = None,
+        max_staleness_in_secs: float = 0,
+        refresh_queue_size: int = OdpSegmentsCacheConfig.DEFAULT_REFRESH_QUEUE_SIZE,
+        transport: Optional[OdpHttpTransport] = None,
+        tracer: Optional[BaseTracer] = None
     ) -> None:
 
         self.odp_config: Optional[OdpConfig] = None
         self.segments_cache = segments_cache
         self.logger = logger or optimizely_logger.NoOpLogger()
-        self.api_manager = api_manager or OdpSegmentApiManager(self.logger, timeout)
+        self.tracer = tracer or NoOpTracer()
+        self.api_manager = api_manager or OdpSegmentApiManager(self.logger, timeout, transport)
+        self.in_flight_fetches: SingleFlight[str, Optional[list[str]]] = SingleFlight()
+
+        self.max_staleness_in_secs = max_staleness_in_secs
+        self.refresh_queue: queue.Queue[Optional[tuple[str, str]]] = queue.Queue(max(1, refresh_queue_size))
+        self.refresh_thread: Optional[Thread] = None
+        self._refresh_lock = Lock()
+        self._pending_refreshes: set[str] = set()
+        self._stopped = Event()
 
     def fetch_qualified_segments(self, user_key: str, user_value: str, options: list[str]) -> Optional[list[str]]:
         """
@@ -49,6 +74,18 @@ class OdpSegmentManager:
         Returns:
             Qualified segments for the user from the cache or the ODP server if not in the cache.
         """
+        if not self.tracer.enabled:
+            return self._fetch_qualified_segments(user_key, user_value, options)
+
+        with self.tracer.start_span(TracingSpanNames.ODP_SEGMENTS_FETCH) as span:
+            segments = self._fetch_qualified_segments(user_key, user_value, options, span)
+            if segments is not None:
+                span.set_attribute(TracingAttributes.SEGMENT_COUNT, len(segments))
+            return segments
+
+    def _fetch_qualified_segments(
+        self, user_key: str, user_value: str, options: list[str], span: Optional[BaseSpan] = None
+    ) -> Optional[list[str]]:
         if self.odp_config:
             odp_api_key = self.odp_config.get_api_key()
             odp_api_host = self.odp_config.get_api_host()
@@ -71,22 +108,186 @@ class OdpSegmentManager:
             self.reset()
 
         if not ignore_cache and not reset_cache:
-            segments = self.segments_cache.lookup(cache_key)
+            segments = self._lookup_segments(user_key, user_value, cache_key)
+            if span is not None:
+                span.set_attribute(TracingAttributes.CACHE_HIT, bool(segments))
             if segments:
                 self.logger.debug('ODP cache hit. Returning segments from cache.')
                 return segments
             self.logger.debug('ODP cache miss.')
 
+        def fetch_segments() -> Optional[list[str]]:
+            return self._fetch_segments(odp_api_key, odp_api_host, odp_segments_to_check,
+                                        user_key, user_value, save=not ignore_cache)
+
+        if ignore_cache:
+            return fetch_segments()
+
+        # concurrent misses for the same user, e.g. after a cache reset, wait for a single fetch
+        return self.in_flight_fetches.do(cache_key, fetch_segments)
+
+    def fetch_qualified_segments_for_users(
+        self, user_key: str, user_values: list[str], options: list[str]
+    ) -> dict[str, Optional[list[str]]]:
+        """
+        Args:
+            user_key: The key for identifying the id type.
+            user_values: The ids of the users.
+            options: An array of OptimizelySegmentOptions used to ignore and/or reset the cache.
+
+        Returns:
+            Qualified segments keyed by user id. Users found in the cache are served from it and
+            all other users are fetched from the ODP server in as few requests as possible.
+            The value is None for users whose segments could not be fetched.
+        """
+        if self.odp_config:
+            odp_api_key = self.odp_config.get_api_key()
+            odp_api_host = self.odp_config.get_api_host()
+            odp_segments_to_check = self.odp_config.get_segments_to_check()
+
+        if not self.odp_config or not (odp_api_key and odp_api_host):
+            self.logger.error(Errors.FETCH_SEGMENTS_FAILED.format('api_key/api_host not defined'))
+            return {str(user_value): None for user_value in user_values}
+
+        if not odp_segments_to_check:
+            self.logger.debug('No segments are used in the project. Returning empty list.')
+            return {str(user_value): [] for user_value in user_values}
+
+        ignore_cache = OptimizelyOdpOption.IGNORE_CACHE in options
+        reset_cache = OptimizelyOdpOption.RESET_CACHE in options
+
+        if reset_cache:
+            self.reset()
+
+        results: dict[str, Optional[list[str]]] = {}
+        missed_user_values = []
+        for user_value in dict.fromkeys(str(user_value) for user_value in user_values):
+            if not ignore_cache and not reset_cache:
+                segments = self.segments_cache.lookup(self.make_cache_key(user_key, user_value))
+                if segments:
+                    results[user_value] = segments
+                    continue
+            missed_user_values.append(user_value)
+
+        self.logger.debug(f'ODP cache hits: {len(results)}, misses: {len(missed_user_values)}.')
+        if not missed_user_values:
+            return results
+
         self.logger.debug('Making a call to ODP server.')
 
-        segments = self.api_manager.fetch_segments(odp_api_key, odp_api_host, user_key, user_value,
-                                                   odp_segments_to_check)
+        fetched = self.api_manager.fetch_segments_for_users(odp_api_key, odp_api_host, user_key,
+                                                            missed_user_values, odp_segments_to_check)
+
+        for user_value in missed_user_values:
+            segments = fetched.get(user_value)
+            if segments and not ignore_cache:
+                self.segments_cache.save(self.make_cache_key(user_key, user_value), segments)
+            results[user_value] = segments
+
+        return results
+
+    def _lookup_segments(self, user_key: str, user_value: str, cache_key: str) -> Optional[list[str]]:
+        """Look up cached segments, scheduling a refresh when stale segments are served."""
+        lookup_allow_stale = getattr(self.segments_cache, 'lookup_allow_stale', None)
+        if self.max_staleness_in_secs <= 0 or lookup_allow_stale is None:
+            return self.segments_cache.lookup(cache_key)
+
+        cached: Optional[tuple[list[str], bool]] = lookup_allow_stale(cache_key, self.max_staleness_in_secs)
+        if not cached:
+            return None
+
+        segments, is_stale = cached
+        if segments and is_stale:
+            self.logger.debug('ODP cache entry is stale. Refreshing segments in the background.')
+            self._schedule_refresh(user_key, user_value, cache_key)
+        return segments
 
-        if segments and not ignore_cache:
-            self.segments_cache.save(cache_key, segments)
+    def _fetch_segments(self, api_key: str, api_host: str, segments_to_check: list[str],
+                        user_key: str, user_value: str, save: bool) -> Optional[list[str]]:
+        """Fetch segments from the ODP server and save them to the cache if requested."""
+        self.logger.debug('Making a call to ODP server.')
+        segments = self.api_manager.fetch_segments(api_key, api_host, user_key, user_value, segments_to_check)
 
+        if segments and save:
+            self.segments_cache.save(self.make_cache_key(user_key, user_value), segments)
         return segments
 
+    def _refresh_segments(self, api_key: str, api_host: str, segments_to_check: list[str],
+                          user_key: str, user_value: str) -> None:
+        """Replace the user's stale segments with freshly fetched ones. Empty segments are not cached,
+        so the stale entry is removed instead of being served until it is too stale.
+        """
+        segments = self._fetch_segments(api_key, api_host, segments_to_check, user_key, user_value, save=True)
+
+        remove = getattr(self.segments_cache, 'remove', None)
+        if segments is not None and not segments and remove is not None:
+            remove(self.make_cache_key(user_key, user_value))
+
+    def _schedule_refresh(self, user_key: str, user_value: str, cache_key: str) -> None:
+        """Queue a background refresh of the user's segments unless one is pending or the queue is full."""
+        with self._refresh_lock:
+            if cache_key in self._pending_refreshes or self._stopped.is_set():
+                return
+            try:
+                self.refresh_queue.put_nowait((user_key, user_value))
+            except queue.Full:
+                self.logger.debug('ODP segments refresh queue is full. Skipping refresh.')
+                return
+            self._pending_refreshes.add(cache_key)
+
+            if self.refresh_thread is None:
+                self.refresh_thread = Thread(target=self._run_refreshes, name='OdpSegmentsRefreshThread', daemon=True)
+                self.refresh_thread.start()
+
+    def _run_refreshes(self) -> None:
+        """Refresh queued users until stop() is called."""
+        while not self._stopped.is_set():
+            item = self.refresh_queue.get()
+            if item is None or self._stopped.is_set():
+                break
+
+            user_key, user_value = item
+            cache_key = self.make_cache_key(user_key, user_value)
+            try:
+                if self.odp_config:
+                    api_key = self.odp_config.get_api_key()
+                    api_host = self.odp_config.get_api_host()
+                    segments_to_check = self.odp_config.get_segments_to_check()
+                    if api_key and api_host and segments_to_check:
+                        self.in_flight_fetches.do(cache_key, lambda: self._refresh_segments(
+                            api_key, api_host, segments_to_check, user_key, user_value
+                        ))
+            except Exception as err:
+                self.logger.error(Errors.FETCH_SEGMENTS_FAILED.format(err))
+            finally:
+                with self._refresh_lock:
+                    self._pending_refreshes.discard(cache_key)
+
+    def stop(self, timeout: Optional[float] = OdpSegmentsCacheConfig.DEFAULT_REFRESH_STOP_TIMEOUT_SECS) -> None:
+        """Stop the background refresh thread, if it was started, dropping the queued refreshes.
+
+        Args:
+            timeout: Time to wait in seconds for a refresh in flight to finish. The thread is a daemon thread,
+                so a refresh which takes longer does not keep the process alive.
+        """
+        with self._refresh_lock:
+            self._stopped.set()
+            refresh_thread, self.refresh_thread = self.refresh_thread, None
+            while True:
+                try:
+                    self.refresh_queue.get_nowait()
+                except queue.Empty:
+                    break
+            self._pending_refreshes.clear()
+        if refresh_thread is not None:
+            # wake up the thread if it waits for a refresh, the queue was just drained so there is room
+            self.refresh_queue.put_nowait(None)
+            refresh_thread.join(timeout)
+
+    def get_coalesced_request_count(self) -> int:
+        """Returns the number of segment fetches that waited for a fetch of the same user in flight."""
+        return self.in_flight_fetches.get_coalesced_count()
+
     def reset(self) -> None:
         self.segments_cache.reset()
 
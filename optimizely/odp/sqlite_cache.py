@@ -0,0 +1,292 @@
+# Copyright 2026, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import marshal
+import os
+import sqlite3
+import threading
+from time import time
+from typing import Any, Optional
+
+from optimizely.helpers.enums import CacheEvictionCauses
+from optimizely.odp.lru_cache import LRUCache, V
+
+# marshal.dumps raises ValueError on unsupported types, marshal.loads raises these on unreadable data
+_SERIALIZATION_ERRORS = (ValueError, EOFError, TypeError)
+
+
+class SqliteCache(LRUCache[str, V]):
+    """Cache stored in a local SQLite file so that it can be shared by all processes on a host.
+
+    Caches of different kinds can share a file by using different namespaces. Values are serialized
+    with marshal, which is faster and more compact than JSON for the segment lists and CMAB decisions
+    stored here, and only supports plain built-in types.
+
+    Lookups refresh the access time of an entry and saves periodically evict the least recently
+    accessed entries above capacity, so eviction is approximately LRU across all processes.
+    Database errors are treated as cache misses so that a broken cache file never fails a decision.
+
+    Every thread uses its own connection. Connections are opened again in a forked child process,
+    since SQLite connections must not be used across fork, so a cache created before workers are
+    forked can be used by all of them. close() closes the connections of all threads of the process.
+    """
+
+    # number of saves by this process between checks of the capacity
+    EVICTION_CHECK_INTERVAL = 64
+
+    def __init__(
+        self,
+        path: str,
+        capacity: int,
+        timeout_in_secs: int,
+        namespace: str = 'default',
+        busy_timeout_in_secs: float = 5.0
+    ):
+        super().__init__(capacity, timeout_in_secs)
+        self.path = path
+        self.namespace = namespace
+        self.busy_timeout = busy_timeout_in_secs
+        self._saves = 0
+        self._local = threading.local()
+        # connections opened by all threads, with the process which opened them
+        self._connections: list[tuple[int, sqlite3.Connection]] = []
+        # incremented by close(), so that threads open a new connection afterwards
+        self._generation = 0
+
+        if self.capacity > 0:
+            self._execute(
+                'CREATE TABLE IF NOT EXISTS optimizely_cache ('
+                'namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, '
+                'saved_at REAL NOT NULL, accessed_at REAL NOT NULL, PRIMARY KEY (namespace, key))'
+            )
+            self._execute(
+                'CREATE INDEX IF NOT EXISTS optimizely_cache_accessed ON optimizely_cache (namespace, accessed_at)'
+            )
+
+    def _get_connection(self) -> sqlite3.Connection:
+        """Returns the connection of the current thread, opening it on first use, after a fork or after close."""
+        pid = os.getpid()
+        connection: Optional[sqlite3.Connection] = getattr(self._local, 'connection', None)
+        if connection is None or self._local.owner != (pid, self._generation):
+            # a connection inherited from the parent process is dropped without closing it,
+            # so that the parent's connection is left untouched
+            connection = sqlite3.connect(
+                self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False
+            )
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            with self.lock:
+                self._connections = [(owner_pid, c) for owner_pid, c in self._connections if owner_pid == pid]
+                self._connections.append((pid, connection))
+                self._local.owner = (pid, self._generation)
+            self._local.connection = connection
+        return connection
+
+    def _execute(self, sql: str, parameters: tuple[Any, ...] = ()) -> Optional[sqlite3.Cursor]:
+        """Execute a statement, returning None on database errors."""
+        try:
+            return self._get_connection().execute(sql, parameters)
+        except sqlite3.Error:
+            return None
+
+    @staticmethod
+    def _serialize(value: Any) -> bytes:
+        return bytes([marshal.version]) + marshal.dumps(value)
+
+    @staticmethod
+    def _deserialize(data: bytes) -> Any:
+        if not data or data[0] != marshal.version:
+            raise ValueError('unsupported marshal version')
+        return marshal.loads(data[1:])
+
+    def _is_stale(self, saved_at: float, now: float) -> bool:
+        return self.timeout > 0 and now - saved_at >= self.timeout
+
+    def lookup(self, key: str) -> Optional[V]:
+        """Return the non-stale value associated with the provided key and refresh its access time."""
+        if self.capacity <= 0:
+            return None
+
+        cursor = self._execute(
+            'SELECT value, saved_at FROM optimizely_cache WHERE namespace = ? AND key = ?', (self.namespace, key)
+        )
+        row = cursor.fetchone() if cursor else None
+        if row is None:
+            return None
+
+        now = time()
+        try:
+            value = self._deserialize(row[0])
+        except _SERIALIZATION_ERRORS:
+            value = None
+
+        if value is None or self._is_stale(row[1], now):
+            self._execute(
+                'DELETE FROM optimizely_cache WHERE namespace = ? AND key = ? AND saved_at = ?',
+                (self.namespace, key, row[1])
+            )
+            if value is not None:
+                with self.lock:
+                    self._eviction_counts[CacheEvictionCauses.EXPIRED] += 1
+            return None
+
+        self._execute(
+            'UPDATE optimizely_cache SET accessed_at = ? WHERE namespace = ? AND key = ?', (now, self.namespace, key)
+        )
+        return value  # type: ignore[no-any-return]
+
+    def lookup_allow_stale(self, key: str, max_staleness_in_secs: float) -> Optional[tuple[V, bool]]:
+        """Like lookup, but also return values up to max_staleness_in_secs past their timeout together
+        with whether they are stale.
+        """
+        if self.capacity <= 0:
+            return None
+
+        cursor = self._execute(
+            'SELECT value, saved_at FROM optimizely_cache WHERE namespace = ? AND key = ?', (self.namespace, key)
+        )
+        row = cursor.fetchone() if cursor else None
+        if row is None:
+            return None
+
+        now = time()
+        try:
+            value = self._deserialize(row[0])
+        except _SERIALIZATION_ERRORS:
+            value = None
+
+        is_stale = self._is_stale(row[1], now)
+        if value is None or (is_stale and now - row[1] >= self.timeout + max_staleness_in_secs):
+            self._execute(
+                'DELETE FROM optimizely_cache WHERE namespace = ? AND key = ? AND saved_at = ?',
+                (self.namespace, key, row[1])
+            )
+            if value is not None:
+                with self.lock:
+                    self._eviction_counts[CacheEvictionCauses.EXPIRED] += 1
+            return None
+
+        self._execute(
+            'UPDATE optimizely_cache SET accessed_at = ? WHERE namespace = ? AND key = ?', (now, self.namespace, key)
+        )
+        return value, is_stale
+
+    def save(self, key: str, value: V) -> None:
+        """Insert or replace the provided key/value pair. Every EVICTION_CHECK_INTERVAL saves the least
+        recently accessed entries above capacity are removed.
+        """
+        if self.capacity <= 0:
+            return
+
+        try:
+            data = self._serialize(value)
+        except _SERIALIZATION_ERRORS:
+            return
+
+        now = time()
+        self._execute(
+            'INSERT OR REPLACE INTO optimizely_cache (namespace, key, value, saved_at, accessed_at) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (self.namespace, key, data, now, now)
+        )
+
+        with self.lock:
+            self._saves += 1
+            check_capacity = self._saves % self.EVICTION_CHECK_INTERVAL == 0
+        if check_capacity:
+            self._evict()
+
+    def _evict(self) -> None:
+        """Remove the least recently accessed entries above capacity."""
+        cursor = self._execute(
+            'DELETE FROM optimizely_cache WHERE namespace = ? AND key IN ('
+            'SELECT key FROM optimizely_cache WHERE namespace = ? ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+            (self.namespace, self.namespace, self.capacity)
+        )
+        if cursor and cursor.rowcount > 0:
+            with self.lock:
+                self._eviction_counts[CacheEvictionCauses.CAPACITY] += cursor.rowcount
+
+    def reset(self) -> None:
+        """ Clear all entries of this namespace."""
+        if self.capacity <= 0:
+            return
+        self._execute('DELETE FROM optimizely_cache WHERE namespace = ?', (self.namespace,))
+
+    def peek(self, key: str) -> Optional[V]:
+        """Returns the value associated with the provided key without refreshing its access time."""
+        if self.capacity <= 0:
+            return None
+        cursor = self._execute(
+            'SELECT value FROM optimizely_cache WHERE namespace = ? AND key = ?', (self.namespace, key)
+        )
+        row = cursor.fetchone() if cursor else None
+        if row is None:
+            return None
+        try:
+            return self._deserialize(row[0])  # type: ignore[no-any-return]
+        except _SERIALIZATION_ERRORS:
+            return None
+
+    def remove(self, key: str) -> None:
+        """Remove the element associated with the provided key from the cache."""
+        if self.capacity <= 0:
+            return
+        self._execute('DELETE FROM optimizely_cache WHERE namespace = ? AND key = ?', (self.namespace, key))
+
+    def get_size_in_bytes(self) -> int:
+        """Returns the size of the serialized values of this namespace."""
+        if self.capacity <= 0:
+            return 0
+        cursor = self._execute(
+            'SELECT COALESCE(SUM(LENGTH(key) + LENGTH(value)), 0) FROM optimizely_cache WHERE namespace = ?',
+            (self.namespace,)
+        )
+        row = cursor.fetchone() if cursor else None
+        return row[0] if row else 0
+
+    def get_eviction_counts(self) -> dict[str, int]:
+        """Returns the number of elements removed by this process, keyed by CacheEvictionCauses."""
+        with self.lock:
+            return self._eviction_counts.copy()
+
+    def remove_expired(self) -> int:
+        """Remove all stale elements of this namespace.
+
+        Returns:
+            The number of removed elements.
+        """
+        if self.capacity <= 0 or self.timeout <= 0:
+            return 0
+        cursor = self._execute(
+            'DELETE FROM optimizely_cache WHERE namespace = ? AND saved_at <= ?',
+            (self.namespace, time() - self.timeout)
+        )
+        removed = max(cursor.rowcount, 0) if cursor else 0
+        with self.lock:
+            self._eviction_counts[CacheEvictionCauses.EXPIRED] += removed
+        return removed
+
+    def close(self) -> None:
+        """Close the connections opened by all threads of this process. Later calls open new connections."""
+        pid = os.getpid()
+        with self.lock:
+            connections = [connection for owner_pid, connection in self._connections if owner_pid == pid]
+            self._connections = []
+            self._generation += 1
+        for connection in connections:
+            try:
+                connection.close()
+            except sqlite3.Error:
+                pass
@@ -13,7 +13,8 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Any, Optional, Union
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Hashable, Optional, Sequence, Union
 
 from optimizely.helpers.types import VariationDict
 
@@ -39,19 +40,21 @@ from .event.event_processor import BatchEventProcessor, BaseEventProcessor
 from .event_dispatcher import EventDispatcher, CustomEventDispatcher
 from .helpers import enums, validator
 from .helpers.sdk_settings import OptimizelySdkSettings
+from .decision_profiler import DecisionProfiler, NoOpDecisionProfiler
+from .metrics import MetricsRegistry
+from .tracing import BaseTracer, NoOpTracer
 from .helpers.enums import DecisionSources
 from .notification_center import NotificationCenter
 from .notification_center_registry import _NotificationCenterRegistry
-from .odp.lru_cache import LRUCache
-from .odp.odp_manager import OdpManager
+from .odp.lru_cache import LRUCache, create_lru_cache
 from .optimizely_config import OptimizelyConfig, OptimizelyConfigService
 from .optimizely_user_context import OptimizelyUserContext, UserAttributes
 from .project_config import ProjectConfig
-from .cmab.cmab_client import DefaultCmabClient, CmabRetryConfig
-from .cmab.cmab_service import DefaultCmabService, CmabCacheValue, DEFAULT_CMAB_CACHE_SIZE, DEFAULT_CMAB_CACHE_TIMEOUT
 
 if TYPE_CHECKING:
     # prevent circular dependency by skipping import at runtime
+    from .cmab.cmab_service import DefaultCmabService, CmabCacheValue
+    from .odp.odp_manager import OdpManager
     from .user_profile import UserProfileService
     from .helpers.event_tag_utils import EventTags
 
@@ -112,6 +115,13 @@ class Optimizely:
         self.error_handler = error_handler or NoOpErrorHandler
         self.config_manager: BaseConfigManager = config_manager  # type: ignore[assignment]
         self.notification_center = notification_center or NotificationCenter(self.logger)
+        self.metrics: Optional[MetricsRegistry] = None
+        self.tracer: BaseTracer = NoOpTracer()
+        self.decision_profiler: DecisionProfiler = NoOpDecisionProfiler()
+        if isinstance(settings, OptimizelySdkSettings):
+            self.metrics = settings.metrics
+            self.tracer = settings.tracer or self.tracer
+            self.decision_profiler = settings.decision_profiler or self.decision_profiler
         event_processor_defaults = {
             'batch_size': 1,
             'flush_interval': 30,
@@ -125,6 +135,8 @@ class Optimizely:
             self.event_dispatcher,
             logger=self.logger,
             notification_center=self.notification_center,
+            metrics=self.metrics,
+            tracer=self.tracer,
             **event_processor_defaults  # type: ignore[arg-type]
         )
         self.default_decide_options: list[str]
@@ -158,6 +170,7 @@ class Optimizely:
             'error_handler': self.error_handler,
             'notification_center': self.notification_center,
             'skip_json_validation': skip_json_validation,
+            'metrics': self.metrics,
         }
 
         if not self.config_manager:
@@ -180,6 +193,10 @@ class Optimizely:
         if cmab_service:
             self.cmab_service = cmab_service
         else:
+            # the CMAB stack is imported when it is set up, which keeps importing the SDK fast
+            from .cmab.cmab_client import DefaultCmabClient, CmabRetryConfig
+            from .cmab.cmab_service import DefaultCmabService, DEFAULT_CMAB_CACHE_SIZE, DEFAULT_CMAB_CACHE_TIMEOUT
+
             # Get custom prediction endpoint from settings if provided
             cmab_prediction_endpoint = None
             if self.sdk_settings and self.sdk_settings.cmab_prediction_endpoint:
@@ -188,16 +205,40 @@ class Optimizely:
             self.cmab_client = DefaultCmabClient(
                 retry_config=CmabRetryConfig(),
                 logger=self.logger,
-                prediction_endpoint=cmab_prediction_endpoint
+                prediction_endpoint=cmab_prediction_endpoint,
+                metrics=self.metrics,
+                tracer=self.tracer
+            )
+            self.cmab_cache: LRUCache[str, CmabCacheValue] = self.sdk_settings.cmab_cache or create_lru_cache(
+                DEFAULT_CMAB_CACHE_SIZE,
+                DEFAULT_CMAB_CACHE_TIMEOUT,
+                self.sdk_settings.cmab_cache_shards,
+                self.sdk_settings.cmab_cache_eviction_policy,
+                self.sdk_settings.cmab_cache_max_size_in_bytes
             )
-            self.cmab_cache: LRUCache[str, CmabCacheValue] = LRUCache(DEFAULT_CMAB_CACHE_SIZE,
-                                                                      DEFAULT_CMAB_CACHE_TIMEOUT)
+            if self.metrics:
+                self.cmab_cache.set_metrics(self.metrics, 'cmab')
             self.cmab_service = DefaultCmabService(
                 cmab_cache=self.cmab_cache,
                 cmab_client=self.cmab_client,
                 logger=self.logger
             )
-        self.decision_service = decision_service.DecisionService(self.logger, user_profile_service, self.cmab_service)
+        self.decision_cache: Optional[LRUCache[Hashable, tuple[decision_service.Decision, tuple[str, ...]]]] = None
+        if self.sdk_settings.decision_cache_size > 0:
+            self.decision_cache = LRUCache(
+                self.sdk_settings.decision_cache_size,
+                self.sdk_settings.decision_cache_timeout_in_secs
+            )
+            if self.metrics:
+                self.decision_cache.set_metrics(self.metrics, 'decision')
+        if user_profile_service is not None and self.sdk_settings.user_profile_write_behind:
+            user_profile_service = user_profile.WriteBehindUserProfileService(
+                user_profile_service, logger=self.logger, error_handler=self.error_handler  # type: ignore[arg-type]
+            )
+        self.decision_service = decision_service.DecisionService(
+            self.logger, user_profile_service, self.cmab_service, self.decision_cache, self.metrics, self.tracer,
+            self.decision_profiler
+        )
         self.user_profile_service = user_profile_service
 
     def _get_variation_key(self, variation: Optional[Union[entities.Variation, VariationDict]]) -> Optional[str]:
@@ -366,7 +407,7 @@ class Optimizely:
         # Kept for backward compatibility.
         # This notification is deprecated and new Decision notifications
         # are sent via their respective method calls.
-        if len(self.notification_center.notification_listeners[enums.NotificationTypes.ACTIVATE]) > 0:
+        if self.notification_center.has_listeners(enums.NotificationTypes.ACTIVATE):
             log_event = event_factory.EventFactory.create_log_event(user_event, self.logger)
             self.notification_center.send_notifications(
                 enums.NotificationTypes.ACTIVATE, experiment, user_id, attributes, variation, log_event.__dict__,
@@ -460,11 +501,17 @@ class Optimizely:
                 'variation_key': self._get_variation_key(decision.variation),
             }
 
-        try:
-            actual_value = project_config.get_typecast_value(variable_value, variable_type)
-        except:
-            self.logger.error('Unable to cast value. Returning None.')
-            actual_value = None
+        typecast_values = project_config.get_typecast_variable_values(
+            feature_key, decision.variation if feature_enabled else None, variable_key
+        )
+        if typecast_values and variable_key in typecast_values:
+            actual_value = typecast_values[variable_key]
+        else:
+            try:
+                actual_value = project_config.get_typecast_value(variable_value, variable_type)
+            except:
+                self.logger.error('Unable to cast value. Returning None.')
+                actual_value = None
 
         self.notification_center.send_notifications(
             enums.NotificationTypes.DECISION,
@@ -541,6 +588,9 @@ class Optimizely:
             )
 
         all_variables = {}
+        typecast_values = project_config.get_typecast_variable_values(
+            feature_key, decision.variation if feature_enabled else None
+        ) or {}
         for variable_key, variable in feature_flag.variables.items():
             variable_value = variable.defaultValue
             if feature_enabled:
@@ -550,11 +600,14 @@ class Optimizely:
                     f'variable "{variable_key}" of feature flag "{feature_key}".'
                 )
 
-            try:
-                actual_value = project_config.get_typecast_value(variable_value, variable.type)
-            except:
-                self.logger.error('Unable to cast value. Returning None.')
-                actual_value = None
+            if variable_key in typecast_values:
+                actual_value = typecast_values[variable_key]
+            else:
+                try:
+                    actual_value = project_config.get_typecast_value(variable_value, variable.type)
+                except:
+                    self.logger.error('Unable to cast value. Returning None.')
+                    actual_value = None
 
             all_variables[variable_key] = actual_value
 
@@ -679,7 +732,7 @@ class Optimizely:
         self.event_processor.process(user_event)
         self.logger.info(f'Tracking event "{event_key}" for user "{user_id}".')
 
-        if len(self.notification_center.notification_listeners[enums.NotificationTypes.TRACK]) > 0:
+        if self.notification_center.has_listeners(enums.NotificationTypes.TRACK):
             log_event = event_factory.EventFactory.create_log_event(user_event, self.logger)
             self.notification_center.send_notifications(
                 enums.NotificationTypes.TRACK, event_key, user_id, attributes, event_tags, log_event.__dict__,
@@ -728,7 +781,9 @@ class Optimizely:
             return None
 
         user_context = OptimizelyUserContext(self, self.logger, user_id, attributes, False)
-        user_profile_tracker = user_profile.UserProfileTracker(user_id, self.user_profile_service, self.logger)
+        user_profile_tracker = user_profile.UserProfileTracker(
+            user_id, self.user_profile_service, self.logger, self.tracer
+        )
         user_profile_tracker.load_user_profile()
         variation_result = self.decision_service.get_variation(project_config, experiment,
                                                                user_context, user_profile_tracker)
@@ -1258,7 +1313,6 @@ class Optimizely:
         # Create Optimizely Decision Result.
         attributes = user_context.get_user_attributes()
         rule_key = flag_decision.experiment.key if flag_decision.experiment else None
-        all_variables = {}
         decision_source = flag_decision.source
         decision_event_dispatched = False
 
@@ -1280,68 +1334,108 @@ class Optimizely:
 
                 decision_event_dispatched = True
 
-        # Generate all variables map if decide options doesn't include excludeVariables
+        # Variables are resolved on first access unless decide options include excludeVariables
+        all_variables: Optional[dict[str, Any]] = {}
+        resolve_variables: Optional[Callable[[], dict[str, Any]]] = None
         if OptimizelyDecideOption.EXCLUDE_VARIABLES not in decide_options and feature_flag:
-            for variable_key, variable in feature_flag.variables.items():
-                variable_value = variable.defaultValue
-                if feature_enabled:
-                    variable_value = project_config.get_variable_value_for_variation(variable, flag_decision.variation)
-                    self.logger.debug(
-                        f'Got variable value "{variable_value}" for '
-                        f'variable "{variable_key}" of feature flag "{flag_key}".'
-                    )
-
-                try:
-                    actual_value = project_config.get_typecast_value(variable_value, variable.type)
-                except:
-                    self.logger.error('Unable to cast value. Returning None.')
-                    actual_value = None
-
-                all_variables[variable_key] = actual_value
+            all_variables = None
+            resolve_variables = partial(
+                self._get_decision_variables, project_config, flag_key, feature_flag.variables,
+                flag_decision.variation if feature_enabled else None
+            )
+            # Listeners receive the same dict as the decision, so resolve the variables for the notification.
+            if self.notification_center.has_listeners(enums.NotificationTypes.DECISION):
+                all_variables = resolve_variables()
+                resolve_variables = None
 
         should_include_reasons = OptimizelyDecideOption.INCLUDE_REASONS in decide_options
         variation_key = self._get_variation_key(flag_decision.variation)
 
-        experiment_id = None
-        variation_id = None
-
-        try:
-            if flag_decision.experiment is not None:
-                experiment_id = flag_decision.experiment.id
-        except AttributeError:
-            self.logger.warning("flag_decision.experiment has no attribute 'id'")
+        # Send notification
+        if self.notification_center.has_listeners(enums.NotificationTypes.DECISION):
+            experiment_id = None
+            variation_id = None
 
-        try:
-            if flag_decision.variation is not None:
-                variation_id = self._get_variation_id(flag_decision.variation)
-        except AttributeError:
-            self.logger.warning("flag_decision.variation has no attribute 'id'")
+            try:
+                if flag_decision.experiment is not None:
+                    experiment_id = flag_decision.experiment.id
+            except AttributeError:
+                self.logger.warning("flag_decision.experiment has no attribute 'id'")
 
-        # Send notification
-        self.notification_center.send_notifications(
-            enums.NotificationTypes.DECISION,
-            enums.DecisionNotificationTypes.FLAG,
-            user_id,
-            attributes or {},
-            {
-                'flag_key': flag_key,
-                'enabled': feature_enabled,
-                'variables': all_variables,
-                'variation_key': variation_key,
-                'rule_key': rule_key,
-                'reasons': decision_reasons if should_include_reasons else [],
-                'decision_event_dispatched': decision_event_dispatched,
-                'experiment_id': experiment_id,
-                'variation_id': variation_id
+            try:
+                if flag_decision.variation is not None:
+                    variation_id = self._get_variation_id(flag_decision.variation)
+            except AttributeError:
+                self.logger.warning("flag_decision.variation has no attribute 'id'")
 
-            },
-        )
+            self.notification_center.send_notifications(
+                enums.NotificationTypes.DECISION,
+                enums.DecisionNotificationTypes.FLAG,
+                user_id,
+                attributes or {},
+                {
+                    'flag_key': flag_key,
+                    'enabled': feature_enabled,
+                    'variables': all_variables,
+                    'variation_key': variation_key,
+                    'rule_key': rule_key,
+                    'reasons': decision_reasons if should_include_reasons else [],
+                    'decision_event_dispatched': decision_event_dispatched,
+                    'experiment_id': experiment_id,
+                    'variation_id': variation_id
+
+                },
+            )
 
         return OptimizelyDecision(variation_key=variation_key, enabled=feature_enabled, variables=all_variables,
                                   rule_key=rule_key, flag_key=flag_key,
-                                  user_context=user_context, reasons=decision_reasons if should_include_reasons else []
+                                  user_context=user_context, reasons=decision_reasons if should_include_reasons else [],
+                                  resolve_variables=resolve_variables
                                   )
 
+    def _get_decision_variables(
+        self,
+        project_config: ProjectConfig,
+        flag_key: str,
+        variables: dict[str, entities.Variable],
+        variation: Optional[Union[entities.Variation, VariationDict]]
+    ) -> dict[str, Any]:
+        """ Get the type-casted values of all variables of a flag for a decision.
+
+        Args:
+            project_config: The config the decision was made with.
+            flag_key: The key of the decided flag.
+            variables: The variables of the flag by key.
+            variation: The Variation the flag is enabled with, or None to get the default values.
+
+        Returns:
+            Dict of the variable values by key.
+        """
+        typecast_values = project_config.get_typecast_variable_values(flag_key, variation) or {}
+        all_variables = {}
+        for variable_key, variable in variables.items():
+            if variable_key in typecast_values:
+                all_variables[variable_key] = typecast_values[variable_key]
+                continue
+
+            # values missing from the table are looked up and type-casted for this decision
+            variable_value = variable.defaultValue
+            if variation is not None:
+                variable_value = project_config.get_variable_value_for_variation(variable, variation)
+                self.logger.debug(
+                    f'Got variable value "{variable_value}" for '
+                    f'variable "{variable_key}" of feature flag "{flag_key}".'
+                )
+
+            try:
+                actual_value = project_config.get_typecast_value(variable_value, variable.type)
+            except:
+                self.logger.error('Unable to cast value. Returning None.')
+                actual_value = None
+
+            all_variables[variable_key] = actual_value
+        return all_variables
+
     def _decide_all(
         self,
         user_context: Optional[OptimizelyUserContext],
@@ -1410,16 +1504,51 @@ class Optimizely:
             self.logger.debug('Provided decide options is not an array. Using default decide options.')
             merged_decide_options = self.default_decide_options
 
+        project_config = self.config_manager.get_config()
+        if project_config is None:
+            return {}
+
+        return self._decide_for_keys_with_config(user_context, keys, merged_decide_options, project_config)
+
+    def _decide_for_keys_with_config(
+        self,
+        user_context: OptimizelyUserContext,
+        keys: list[str],
+        merged_decide_options: list[str],
+        project_config: ProjectConfig
+    ) -> dict[str, OptimizelyDecision]:
+        """
+        Args:
+            user_context: UserContent
+            keys: list of feature keys to run decide on.
+            merged_decide_options: decide options already merged with the default decide options.
+            project_config: config to use for all decisions.
+
+        Returns:
+            An dictionary of feature key to Decision
+        """
+        if not self.tracer.enabled:
+            return self._get_decisions_for_keys(user_context, keys, merged_decide_options, project_config)
+
+        with self.tracer.start_span(
+            enums.TracingSpanNames.DECIDE, {enums.TracingAttributes.FLAG_COUNT: len(keys)}
+        ):
+            return self._get_decisions_for_keys(user_context, keys, merged_decide_options, project_config)
+
+    def _get_decisions_for_keys(
+        self,
+        user_context: OptimizelyUserContext,
+        keys: list[str],
+        merged_decide_options: list[str],
+        project_config: ProjectConfig
+    ) -> dict[str, OptimizelyDecision]:
+        """ Make the decisions of _decide_for_keys_with_config without tracing them. """
         decisions: dict[str, OptimizelyDecision] = {}
         valid_keys = []
         decision_reasons_dict = {}
-
-        project_config = self.config_manager.get_config()
         flags_without_forced_decision: list[entities.FeatureFlag] = []
         flag_decisions: dict[str, Decision] = {}
 
-        if project_config is None:
-            return decisions
         for key in keys:
             feature_flag = project_config.feature_key_map.get(key)
             if feature_flag is None:
@@ -1429,12 +1558,16 @@ class Optimizely:
             decision_reasons: list[str] = []
             decision_reasons_dict[key] = decision_reasons
 
-            optimizely_decision_context = OptimizelyUserContext.OptimizelyDecisionContext(flag_key=key, rule_key=None)
-            forced_decision_response = self.decision_service.validated_forced_decision(project_config,
-                                                                                       optimizely_decision_context,
-                                                                                       user_context)
-            variation, decision_reasons = forced_decision_response
-            decision_reasons_dict[key] += decision_reasons
+            variation: Optional[entities.Variation] = None
+            if user_context.has_forced_decisions():
+                optimizely_decision_context = OptimizelyUserContext.OptimizelyDecisionContext(
+                    flag_key=key, rule_key=None
+                )
+                forced_decision_response = self.decision_service.validated_forced_decision(
+                    project_config, optimizely_decision_context, user_context
+                )
+                variation, decision_reasons = forced_decision_response
+                decision_reasons_dict[key] += decision_reasons
 
             if variation:
                 decision = Decision(None, variation, enums.DecisionSources.FEATURE_TEST, None)
@@ -1481,12 +1614,87 @@ class Optimizely:
 
         return decisions
 
+    def decide_many(
+        self,
+        users: Sequence[tuple[str, Optional[UserAttributes]]],
+        keys: Optional[list[str]] = None,
+        decide_options: Optional[list[str]] = None,
+        columnar: bool = False
+    ) -> Union[list[dict[str, OptimizelyDecision]], dict[str, list[Any]]]:
+        """
+        Returns decisions for many users against the same set of flags.
+
+        All users are decided against a single config and the decide options are merged once.
+        Unlike user contexts created with create_user_context, users are not identified to ODP.
+
+        Args:
+            users: Sequence of (user ID, attributes) pairs.
+            keys: Optional list of feature keys to decide. Defaults to all flags in the config.
+            decide_options: Optional list of OptimizelyDecideOption.
+            columnar: True to return a dictionary of columns with one row per decision instead of
+                      one dictionary of feature key to decision per user.
+
+        Returns:
+            A list with a dictionary of feature key to decision for each user, in the order of the users.
+            The dictionary is empty for invalid users. When columnar is True, a dictionary of
+            'user_id', 'flag_key', 'enabled', 'variation_key', 'rule_key' and 'variables' columns.
+        """
+        results: list[dict[str, OptimizelyDecision]] = []
+        columns: dict[str, list[Any]] = {
+            'user_id': [], 'flag_key': [], 'enabled': [], 'variation_key': [], 'rule_key': [], 'variables': []
+        }
+
+        if not self.is_valid:
+            self.logger.error(enums.Errors.INVALID_OPTIMIZELY.format('decide_many'))
+            return columns if columnar else results
+
+        project_config = self.config_manager.get_config()
+        if not project_config:
+            self.logger.error(enums.Errors.INVALID_PROJECT_CONFIG.format('decide_many'))
+            return columns if columnar else results
+
+        if keys is None:
+            keys = [flag['key'] for flag in project_config.feature_flags]
+
+        if isinstance(decide_options, list):
+            merged_decide_options = decide_options + self.default_decide_options
+        else:
+            self.logger.debug('Provided decide options is not an array. Using default decide options.')
+            merged_decide_options = self.default_decide_options[:]
+
+        for user_id, attributes in users:
+            decisions: dict[str, OptimizelyDecision] = {}
+            if not isinstance(user_id, str):
+                self.logger.error(enums.Errors.INVALID_INPUT.format('user_id'))
+            elif attributes is not None and type(attributes) is not dict:
+                self.logger.error(enums.Errors.INVALID_INPUT.format('attributes'))
+            else:
+                user_context = OptimizelyUserContext(self, self.logger, user_id, attributes, identify=False)
+                decisions = self._decide_for_keys_with_config(
+                    user_context, keys, merged_decide_options, project_config
+                )
+
+            if not columnar:
+                results.append(decisions)
+                continue
+
+            for flag_key, decision in decisions.items():
+                columns['user_id'].append(user_id)
+                columns['flag_key'].append(flag_key)
+                columns['enabled'].append(decision.enabled)
+                columns['variation_key'].append(decision.variation_key)
+                columns['rule_key'].append(decision.rule_key)
+                columns['variables'].append(decision.variables)
+
+        return columns if columnar else results
+
     def _setup_odp(self, sdk_key: Optional[str]) -> None:
         """
         - Make sure odp manager is instantiated with provided parameters or defaults.
         - Set up listener to update odp_config when datafile is updated.
         - Manually call callback in case datafile was received before the listener was registered.
         """
+        from .odp.odp_manager import OdpManager
 
         # no need to instantiate a cache if a custom cache or segment manager is provided.
         if (
@@ -1494,9 +1702,12 @@ class Optimizely:
             not self.sdk_settings.odp_segment_manager and
             not self.sdk_settings.segments_cache
         ):
-            self.sdk_settings.segments_cache = LRUCache(
+            self.sdk_settings.segments_cache = create_lru_cache(
                 self.sdk_settings.segments_cache_size,
-                self.sdk_settings.segments_cache_timeout_in_secs
+                self.sdk_settings.segments_cache_timeout_in_secs,
+                self.sdk_settings.segments_cache_shards,
+                self.sdk_settings.segments_cache_eviction_policy,
+                self.sdk_settings.segments_cache_max_size_in_bytes
             )
 
         self.odp_manager = OdpManager(
@@ -1508,6 +1719,16 @@ class Optimizely:
             self.sdk_settings.odp_event_timeout,
             self.sdk_settings.odp_flush_interval,
             self.logger,
+            segments_cache_max_staleness_in_secs=self.sdk_settings.segments_cache_max_staleness_in_secs,
+            segments_refresh_queue_size=self.sdk_settings.segments_refresh_queue_size,
+            fetch_segments_max_workers=self.sdk_settings.fetch_segments_max_workers,
+            fetch_segments_queue_size=self.sdk_settings.fetch_segments_queue_size,
+            fetch_segments_rejection_policy=self.sdk_settings.fetch_segments_rejection_policy,
+            http_pool_size=self.sdk_settings.odp_http_pool_size,
+            http_keep_alive=self.sdk_settings.odp_http_keep_alive,
+            http_connect_timeout=self.sdk_settings.odp_http_connect_timeout,
+            metrics=self.sdk_settings.metrics,
+            tracer=self.sdk_settings.tracer
         )
 
         if self.sdk_settings.odp_disabled:
@@ -1609,5 +1830,12 @@ class Optimizely:
             self.event_processor.stop()  # type: ignore[attr-defined]
         if self.is_valid:
             self.odp_manager.close()
+            cmab_cache = getattr(self.cmab_service, 'cmab_cache', None)
+            if callable(getattr(cmab_cache, 'close', None)):
+                cmab_cache.close()  # type: ignore[union-attr]
         if callable(getattr(self.config_manager, 'stop', None)):
             self.config_manager.stop()  # type: ignore[attr-defined]
+        if self.is_valid:
+            self.notification_center.close()
+        if self.is_valid and isinstance(self.user_profile_service, user_profile.WriteBehindUserProfileService):
+            self.user_profile_service.close()
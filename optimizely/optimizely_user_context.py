@@ -14,12 +14,12 @@
 #
 from __future__ import annotations
 
-import copy
 import threading
 from typing import TYPE_CHECKING, Any, Callable, Optional, NewType, Dict
 
 from optimizely.decision import optimizely_decision
-from optimizely.helpers.enums import OdpManagerConfig
+from optimizely.helpers.bounded_executor import BackgroundFuture, BoundedExecutor
+from optimizely.helpers.enums import Errors, OdpManagerConfig
 
 if TYPE_CHECKING:
     # prevent circular dependency by skipping import at runtime
@@ -72,6 +72,9 @@ class OptimizelyUserContext:
             OptimizelyUserContext.OptimizelyDecisionContext,
             OptimizelyUserContext.OptimizelyForcedDecision
         ] = {}
+        # True while the attributes, forced decisions and segments may be referenced by a clone.
+        # They are copied before the next modification.
+        self._shared = False
 
         if self.client and identify:
             identifiers = {OdpManagerConfig.KEY_FOR_USER_ID: user_id}
@@ -101,24 +104,25 @@ class OptimizelyUserContext:
         if not self.client:
             return None
 
-        user_context = OptimizelyUserContext(
-            self.client,
-            self.logger,
-            self.user_id,
-            self.get_user_attributes(),
-            identify=False
-        )
+        user_context = OptimizelyUserContext(self.client, self.logger, self.user_id, identify=False)
 
+        # state is shared with the clone and copied by whichever context is modified first
         with self.lock:
-            if self.forced_decisions_map:
-                # makes sure forced_decisions_map is duplicated without any references
-                user_context.forced_decisions_map = copy.deepcopy(self.forced_decisions_map)
-            if self._qualified_segments:
-                # no need to use deepcopy here as qualified_segments does not contain anything other than strings
-                user_context._qualified_segments = self._qualified_segments.copy()
+            self._shared = True
+            user_context._shared = True
+            user_context._user_attributes = self._user_attributes
+            user_context.forced_decisions_map = self.forced_decisions_map
+            user_context._qualified_segments = self._qualified_segments
 
         return user_context
 
+    def _copy_on_write(self) -> None:
+        """ Copies state shared with a clone before it gets modified. Must be called while holding the lock. """
+        if self._shared:
+            self._user_attributes = UserAttributes(self._user_attributes.copy())
+            self.forced_decisions_map = self.forced_decisions_map.copy()
+            self._shared = False
+
     def get_user_attributes(self) -> UserAttributes:
         with self.lock:
             return UserAttributes(self._user_attributes.copy())
@@ -134,6 +138,7 @@ class OptimizelyUserContext:
         None
         """
         with self.lock:
+            self._copy_on_write()
             self._user_attributes[attribute_key] = attribute_value
 
     def decide(
@@ -207,6 +212,7 @@ class OptimizelyUserContext:
             True if the forced decision has been set successfully.
         """
         with self.lock:
+            self._copy_on_write()
             self.forced_decisions_map[decision_context] = decision
 
         return True
@@ -236,6 +242,7 @@ class OptimizelyUserContext:
         """
         with self.lock:
             if decision_context in self.forced_decisions_map:
+                self._copy_on_write()
                 del self.forced_decisions_map[decision_context]
                 return True
 
@@ -249,10 +256,20 @@ class OptimizelyUserContext:
             True if forced decisions have been removed successfully.
         """
         with self.lock:
+            self._copy_on_write()
             self.forced_decisions_map.clear()
 
         return True
 
+    def has_forced_decisions(self) -> bool:
+        """
+        Checks if any forced decision is bound to this user context.
+
+        Returns:
+            True if at least one forced decision is set.
+        """
+        return bool(self.forced_decisions_map)
+
     def find_forced_decision(self, decision_context: OptimizelyDecisionContext) -> Optional[OptimizelyForcedDecision]:
         """
         Gets forced decision from forced decision map.
@@ -314,7 +331,7 @@ class OptimizelyUserContext:
         self,
         callback: Optional[Callable[[bool], None]] = None,
         options: Optional[list[str]] = None
-    ) -> bool | threading.Thread:
+    ) -> bool | BackgroundFuture:
         """
         Fetch all qualified segments for the user context.
         The fetched segments will be saved and can be accessed using get/set_qualified_segment methods.
@@ -322,24 +339,56 @@ class OptimizelyUserContext:
         Args:
             callback: An optional function to run after the fetch has completed. The function will be provided
                 a boolean value indicating if the fetch was successful. If a callback is provided, the fetch
-                will be run in a seperate thread, otherwise it will be run syncronously.
+                will be run by fetch_qualified_segments_async, otherwise it will be run syncronously.
             options: An array of OptimizelySegmentOptions used to ignore and/or reset the cache (optional).
 
         Returns:
-            A boolean value indicating if the fetch was successful.
+            A boolean value indicating if the fetch was successful, or the future of the fetch if a callback
+            is provided.
         """
-        def _fetch_qualified_segments() -> bool:
-            segments = self.client._fetch_qualified_segments(self.user_id, options or []) if self.client else None
-            self.set_qualified_segments(segments)
-            success = segments is not None
+        if callback:
+            return self.fetch_qualified_segments_async(callback, options)
+        return self._fetch_qualified_segments(callback, options)
 
+    def fetch_qualified_segments_async(
+        self,
+        callback: Optional[Callable[[bool], None]] = None,
+        options: Optional[list[str]] = None
+    ) -> BackgroundFuture:
+        """
+        Fetch all qualified segments for the user context on the thread pool shared by the SDK client.
+
+        Args:
+            callback: An optional function to run after the fetch has completed. The function will be provided
+                a boolean value indicating if the fetch was successful.
+            options: An array of OptimizelySegmentOptions used to ignore and/or reset the cache (optional).
+
+        Returns:
+            A concurrent.futures.Future of a boolean value indicating if the fetch was successful. Like a thread,
+            it can be waited for with join(). If the thread pool is full and rejects the fetch, the future is
+            cancelled and the callback is provided False.
+        """
+        odp_manager = getattr(self.client, 'odp_manager', None)
+        if odp_manager is None:
+            future = BackgroundFuture()
+            future.set_result(self._fetch_qualified_segments(callback, options))
+            return future
+
+        fetch_executor: BoundedExecutor = odp_manager.fetch_executor
+        future = fetch_executor.submit(self._fetch_qualified_segments, callback, options)
+        if future.cancelled():
+            self.logger.warning(Errors.FETCH_SEGMENTS_FAILED.format('thread pool is full'))
             if callable(callback):
-                callback(success)
-            return success
+                callback(False)
+        return future
 
-        if callback:
-            fetch_thread = threading.Thread(target=_fetch_qualified_segments, name="FetchQualifiedSegmentsThread")
-            fetch_thread.start()
-            return fetch_thread
-        else:
-            return _fetch_qualified_segments()
+    def _fetch_qualified_segments(
+        self, callback: Optional[Callable[[bool], None]], options: Optional[list[str]]
+    ) -> bool:
+        segments = self.client._fetch_qualified_segments(self.user_id, options or []) if self.client else None
+        self.set_qualified_segments(segments)
+        success = segments is not None
+
+        if callable(callback):
+            callback(success)
+        return success
@@ -11,8 +11,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 from __future__ import annotations
+import gc
 import json
-from typing import TYPE_CHECKING, Optional, Type, TypeVar, Union, cast, Any, Iterable, List
+import marshal
+import struct
+from typing import TYPE_CHECKING, Optional, Type, TypeVar, Union, cast, Any, Iterable, List, Sequence
 from sys import version_info
 
 from . import entities
@@ -42,17 +45,61 @@ RESERVED_ATTRIBUTE_PREFIX: Final = '$opt_'
 
 EntityClass = TypeVar('EntityClass')
 
+# Binary snapshot layout: magic, snapshot format version, marshal version, python major/minor,
+# length of the UTF-8 encoded revision, followed by the revision and the marshalled payload.
+SNAPSHOT_MAGIC: Final = b'OPTC'
+SNAPSHOT_FORMAT_VERSION: Final = 2
+_SNAPSHOT_HEADER = struct.Struct('>4sHBBBI')
+
+# Attributes which are bound to the running SDK instance or lazily computed rather than read from the datafile.
+_SNAPSHOT_EXCLUDED_ATTRIBUTES: Final = ('logger', 'error_handler', '_flag_decision_inputs')
+
+# Entity classes which may be restored from a snapshot. Nothing outside this table is ever instantiated.
+_SNAPSHOT_ENTITY_CLASSES: dict[str, type] = {
+    cls.__qualname__: cls for cls in (
+        entities.Attribute,
+        entities.Audience,
+        entities.Event,
+        entities.Experiment,
+        entities.FeatureFlag,
+        entities.Group,
+        entities.Layer,
+        entities.Variable,
+        entities.Variation,
+        entities.Variation.VariableUsage,
+        entities.Integration,
+        entities.Holdout,
+    )
+}
+
+# Tags marking encoded values which have to be resolved while loading a snapshot.
+_SNAPSHOT_ENTITY_REF: Final = 0
+_SNAPSHOT_LIST: Final = 1
+_SNAPSHOT_DICT: Final = 2
+_SNAPSHOT_TUPLE: Final = 3
+_SNAPSHOT_ENTITY_LIST: Final = 4
+_SNAPSHOT_ENTITY_DICT: Final = 5
+
 
 class ProjectConfig:
     """ Representation of the Optimizely project config. """
 
-    def __init__(self, datafile: str | bytes, logger: Logger, error_handler: Any):
+    def __init__(
+        self,
+        datafile: str | bytes,
+        logger: Logger,
+        error_handler: Any,
+        previous_config: Optional[ProjectConfig] = None
+    ):
         """ ProjectConfig init method to load and set project config data.
 
         Args:
             datafile: JSON string representing the project.
             logger: Provides a logger instance.
             error_handler: Provides a handle_error method to handle exceptions.
+            previous_config: Optional config built from an earlier revision of the datafile.
+                             Entities which did not change are reused from it along with
+                             their compiled audiences and variation maps.
         """
 
         config = json.loads(datafile)
@@ -189,7 +236,21 @@ class ProjectConfig:
                 self.public_key_for_odp = odp_integration.publicKey
                 self.host_for_odp = odp_integration.host
 
-        self.audience_id_map = self._deserialize_audience(self.audience_id_map)
+        # Compiled conditions of unchanged audiences are reused from the previous config.
+        reused_audience_id_map: dict[str, entities.Audience] = {}
+        if previous_config:
+            for audience_id, audience in self.audience_id_map.items():
+                previous_audience = previous_config.audience_id_map.get(audience_id)
+                if (
+                    previous_audience and previous_audience.name == audience.name and
+                    previous_audience.conditions == audience.conditions
+                ):
+                    reused_audience_id_map[audience_id] = previous_audience
+
+        self._deserialize_audience(
+            {key: audience for key, audience in self.audience_id_map.items() if key not in reused_audience_id_map}
+        )
+        self.audience_id_map.update(reused_audience_id_map)
         for group in self.group_id_map.values():
             experiments_in_group_id_map = self._generate_key_map(group.experiments, 'id', entities.Experiment)
             for experiment in experiments_in_group_id_map.values():
@@ -207,7 +268,12 @@ class ProjectConfig:
         self.variation_key_map_by_experiment_id: dict[str, dict[str, Union[entities.Variation, VariationDict]]] = {}
         self.flag_variations_map: dict[str, list[entities.Variation]] = {}
 
-        for experiment in self.experiment_id_map.values():
+        for experiment in list(self.experiment_id_map.values()):
+            previous_experiment = self._get_reusable_experiment(experiment, previous_config)
+            if previous_config and previous_experiment:
+                self._reuse_experiment(previous_experiment, previous_config)
+                continue
+
             self.experiment_key_map[experiment.key] = experiment
             self.variation_key_map[experiment.key] = self._generate_key_map(
                 experiment.variations, 'key', entities.Variation
@@ -228,11 +294,15 @@ class ProjectConfig:
                 )
 
         self.feature_key_map = self._generate_key_map(self.feature_flags, 'key', entities.FeatureFlag)
+        feature_flag_dicts = {flag['key']: flag for flag in self.feature_flags}
+        previous_feature_flag_dicts: dict[str, types.FeatureFlagDict] = {}
+        if previous_config:
+            previous_feature_flag_dicts = {flag['key']: flag for flag in previous_config.feature_flags}
 
         # Dictionary containing dictionary of experiment ID to feature ID.
         # for checking that experiment is a feature experiment or not.
         self.experiment_feature_map: dict[str, list[str]] = {}
-        for feature in self.feature_key_map.values():
+        for feature in list(self.feature_key_map.values()):
             # As we cannot create json variables in datafile directly, here we convert
             # the variables of string type and json subType to json type
             # This is needed to fully support json variables
@@ -241,7 +311,12 @@ class ProjectConfig:
                 if variable['type'] == entities.Variable.Type.STRING and sub_type == entities.Variable.Type.JSON:
                     variable['type'] = entities.Variable.Type.JSON
 
-            feature.variables = self._generate_key_map(feature.variables, 'key', entities.Variable)
+            previous_feature = previous_config.feature_key_map.get(feature.key) if previous_config else None
+            if previous_feature and previous_feature_flag_dicts.get(feature.key) == feature_flag_dicts[feature.key]:
+                feature = previous_feature
+                self.feature_key_map[feature.key] = feature
+            else:
+                feature.variables = self._generate_key_map(feature.variables, 'key', entities.Variable)
 
             rules: list[entities.Experiment] = []
             variations: list[entities.Variation] = []
@@ -286,6 +361,13 @@ class ProjectConfig:
                 for exp in rollout.experiments:
                     rules.append(self.experiment_id_map[exp['id']])
 
+            if (
+                previous_config and feature is previous_feature and
+                all(rule is previous_config.experiment_id_map.get(rule.id) for rule in rules)
+            ):
+                self.flag_variations_map[feature.key] = previous_config.flag_variations_map[feature.key]
+                continue
+
             for rule in rules:
                 # variation_id_map_by_experiment_id gives variation entity object while
                 # experiment_id_map will give us dictionary
@@ -313,6 +395,344 @@ class ProjectConfig:
                         self.variation_key_map_by_experiment_id[holdout.id][variation_dict['key']] = variation_dict
                         self.variation_id_map_by_experiment_id[holdout.id][variation_dict['id']] = variation_dict
 
+        # Type-casted variable values of each flag, so that decisions do not parse variable values again.
+        self.flag_variable_defaults_map: dict[str, dict[str, Any]] = {}
+        self.flag_variation_variables_map: dict[str, dict[str, dict[str, Any]]] = {}
+        for feature in self.feature_key_map.values():
+            if (
+                previous_config and feature is previous_config.feature_key_map.get(feature.key) and
+                self.flag_variations_map[feature.key] is previous_config.flag_variations_map.get(feature.key)
+            ):
+                self.flag_variable_defaults_map[feature.key] = previous_config.flag_variable_defaults_map[feature.key]
+                self.flag_variation_variables_map[feature.key] = (
+                    previous_config.flag_variation_variables_map[feature.key]
+                )
+                continue
+
+            self._index_typecast_variable_values(feature)
+
+        # Keys of flags whose decisions may differ from the previous config. None without a previous config.
+        self.changed_flag_keys: Optional[set[str]] = None
+        if previous_config:
+            self.changed_flag_keys = self._get_changed_flag_keys(previous_config)
+
+        # Lazily populated map of flag key to the user inputs its decision depends on.
+        self._flag_decision_inputs: dict[str, Optional[tuple[tuple[str, ...], tuple[str, ...]]]] = {}
+
+    @classmethod
+    def from_snapshot(cls, snapshot: bytes, logger: Logger, error_handler: Any) -> ProjectConfig:
+        """ Load a ProjectConfig from a binary snapshot created by ProjectConfig.to_snapshot.
+
+        The datafile is neither re-parsed nor re-indexed, entities, compiled audiences and
+        all lookup maps are restored as they were when the snapshot was taken.
+
+        Args:
+            snapshot: Bytes returned by ProjectConfig.to_snapshot.
+            logger: Provides a logger instance.
+            error_handler: Provides a handle_error method to handle exceptions.
+
+        Returns:
+            ProjectConfig restored from the snapshot.
+
+        Raises:
+            InvalidInputException if the snapshot is malformed or was created by an incompatible runtime.
+        """
+
+        _, offset = _read_snapshot_header(snapshot)
+
+        # Restoring allocates many containers at once which makes the cyclic garbage collector
+        # run repeatedly over objects that are all going to stay alive, so pause it meanwhile.
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            payload = marshal.loads(memoryview(snapshot)[offset:])
+            decoder = _SnapshotDecoder(payload['entities'])
+            state = decoder.decode(payload['state'])
+        except (EOFError, ValueError, TypeError, KeyError, IndexError) as err:
+            raise exceptions.InvalidInputException(enums.Errors.INVALID_CONFIG_SNAPSHOT.format(err))
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        config = cls.__new__(cls)
+        config.__dict__.update(state)
+        config.logger = logger
+        config.error_handler = error_handler
+        config._flag_decision_inputs = {}
+        return config
+
+    def to_snapshot(self) -> bytes:
+        """ Serialize the fully indexed config into a versioned binary snapshot.
+
+        The snapshot is tied to the Python runtime that created it and is keyed by the
+        datafile revision, which can be read back with get_snapshot_revision.
+
+        Returns:
+            Bytes which can be passed to ProjectConfig.from_snapshot.
+        """
+
+        encoder = _SnapshotEncoder()
+        state = {
+            name: value for name, value in self.__dict__.items() if name not in _SNAPSHOT_EXCLUDED_ATTRIBUTES
+        }
+        encoded_state, _ = encoder.encode(state)
+        payload = marshal.dumps({'entities': encoder.entities, 'state': encoded_state})
+
+        revision = (self.revision or '').encode('utf-8')
+        header = _SNAPSHOT_HEADER.pack(
+            SNAPSHOT_MAGIC,
+            SNAPSHOT_FORMAT_VERSION,
+            marshal.version,
+            version_info[0],
+            version_info[1],
+            len(revision),
+        )
+        return header + revision + payload
+
+    def _get_reusable_experiment(
+        self, experiment: entities.Experiment, previous_config: Optional[ProjectConfig]
+    ) -> Optional[entities.Experiment]:
+        """ Helper method to find an unchanged experiment in the previous config.
+
+        Feature rollout experiments are never reused as they are modified during config parsing.
+
+        Args:
+            experiment: Experiment parsed from the current datafile.
+            previous_config: Config built from an earlier revision of the datafile.
+
+        Returns:
+            Experiment from the previous config if it is equal to the given one. None otherwise.
+        """
+
+        if not previous_config or experiment.type == enums.ExperimentTypes.fr:
+            return None
+
+        previous_experiment = previous_config.experiment_id_map.get(experiment.id)
+        if (
+            previous_experiment is None or
+            previous_config.experiment_key_map.get(previous_experiment.key) is not previous_experiment or
+            previous_experiment != experiment
+        ):
+            return None
+
+        return previous_experiment
+
+    def _reuse_experiment(self, experiment: entities.Experiment, previous_config: ProjectConfig) -> None:
+        """ Helper method to index an unchanged experiment using the maps of the previous config.
+
+        Args:
+            experiment: Experiment from the previous config.
+            previous_config: Config built from an earlier revision of the datafile.
+        """
+
+        self.experiment_id_map[experiment.id] = experiment
+        self.experiment_key_map[experiment.key] = experiment
+        self.variation_key_map[experiment.key] = previous_config.variation_key_map[experiment.key]
+        self.variation_id_map[experiment.key] = previous_config.variation_id_map[experiment.key]
+        self.variation_id_map_by_experiment_id[experiment.id] = (
+            previous_config.variation_id_map_by_experiment_id[experiment.id]
+        )
+        self.variation_key_map_by_experiment_id[experiment.id] = (
+            previous_config.variation_key_map_by_experiment_id[experiment.id]
+        )
+        for variation_id in self.variation_id_map_by_experiment_id[experiment.id]:
+            self.variation_variable_usage_map[variation_id] = previous_config.variation_variable_usage_map[variation_id]
+
+    def _index_typecast_variable_values(self, feature: entities.FeatureFlag) -> None:
+        """ Helper method to type-cast the default values of the variables of a flag and their values in
+        each variation of the flag.
+
+        Values which can not be type-casted are left out, so that they are reported when they are used.
+
+        Args:
+            feature: The feature flag.
+        """
+
+        variables = feature.variables
+        defaults: dict[str, Any] = {}
+        for variable_key, variable in variables.items():
+            try:
+                defaults[variable_key] = self.get_typecast_value(variable.defaultValue, variable.type)
+            except (ValueError, TypeError):
+                pass
+
+        variation_values: dict[str, dict[str, Any]] = {}
+        for variation in self.flag_variations_map.get(feature.key, []):
+            variable_usages = self.variation_variable_usage_map.get(variation.id)
+            if variable_usages is None:
+                continue
+
+            values = dict(defaults)
+            for variable_key, variable in variables.items():
+                variable_usage = variable_usages.get(variable.id)
+                if variable_usage:
+                    values.pop(variable_key, None)
+                    try:
+                        values[variable_key] = self.get_typecast_value(variable_usage.value, variable.type)
+                    except (ValueError, TypeError):
+                        pass
+            variation_values[variation.id] = values
+
+        self.flag_variable_defaults_map[feature.key] = defaults
+        self.flag_variation_variables_map[feature.key] = variation_values
+
+    def _get_flag_rules(self, feature: entities.FeatureFlag) -> list[entities.Experiment]:
+        """ Helper method to get experiment and rollout rules of a flag.
+
+        Args:
+            feature: The feature flag.
+
+        Returns:
+            List of rules in evaluation order.
+        """
+
+        rules = [self.experiment_id_map[experiment_id] for experiment_id in feature.experimentIds]
+        rollout = self.rollout_id_map.get(feature.rolloutId) if feature.rolloutId else None
+        if rollout:
+            rules.extend(self.experiment_id_map[experiment['id']] for experiment in rollout.experiments)
+
+        return rules
+
+    def _get_changed_flag_keys(self, previous_config: ProjectConfig) -> set[str]:
+        """ Helper method to determine which flags may be decided differently than with the previous config.
+
+        A flag is considered changed if the flag itself, any of its rules, the audiences, groups
+        or local holdouts referenced by its rules changed, or if global holdouts changed.
+
+        Args:
+            previous_config: Config built from an earlier revision of the datafile.
+
+        Returns:
+            Set of keys of added, removed and changed flags.
+        """
+
+        def is_same(current: Any, previous: Any) -> bool:
+            return current is previous or current == previous
+
+        def get_changed_ids(current_map: dict[str, Any], previous_map: dict[str, Any]) -> set[str]:
+            return {
+                entity_id for entity_id in set(current_map) | set(previous_map)
+                if not is_same(current_map.get(entity_id), previous_map.get(entity_id))
+            }
+
+        changed_audience_ids = get_changed_ids(self.audience_id_map, previous_config.audience_id_map)
+        changed_group_ids = get_changed_ids(self.group_id_map, previous_config.group_id_map)
+
+        def audiences_changed(audience_conditions: Sequence[str | list[str]]) -> bool:
+            return bool(changed_audience_ids) and not changed_audience_ids.isdisjoint(
+                self._get_audience_ids(audience_conditions)
+            )
+
+        def holdouts_changed(holdouts: list[entities.Holdout], previous_holdouts: list[entities.Holdout]) -> bool:
+            return holdouts != previous_holdouts or any(
+                audiences_changed(holdout.get_audience_conditions_or_ids()) for holdout in holdouts
+            )
+
+        all_flag_keys = set(self.feature_key_map) | set(previous_config.feature_key_map)
+        if holdouts_changed(self.global_holdouts, previous_config.global_holdouts):
+            return all_flag_keys
+
+        changed_holdout_rule_ids = {
+            rule_id for rule_id in set(self.rule_holdouts_map) | set(previous_config.rule_holdouts_map)
+            if holdouts_changed(self.get_holdouts_for_rule(rule_id), previous_config.get_holdouts_for_rule(rule_id))
+        }
+
+        changed_flag_keys = set()
+        for flag_key in all_flag_keys:
+            feature = self.feature_key_map.get(flag_key)
+            previous_feature = previous_config.feature_key_map.get(flag_key)
+            if feature is None or previous_feature is None or not is_same(feature, previous_feature):
+                changed_flag_keys.add(flag_key)
+                continue
+
+            rules = self._get_flag_rules(feature)
+            previous_rules = previous_config._get_flag_rules(previous_feature)
+            if len(rules) != len(previous_rules):
+                changed_flag_keys.add(flag_key)
+                continue
+
+            for rule, previous_rule in zip(rules, previous_rules):
+                if (
+                    not is_same(rule, previous_rule) or
+                    rule.id in changed_holdout_rule_ids or
+                    rule.groupId in changed_group_ids or
+                    audiences_changed(rule.get_audience_conditions_or_ids())
+                ):
+                    changed_flag_keys.add(flag_key)
+                    break
+
+        return changed_flag_keys
+
+    @staticmethod
+    def _get_audience_ids(audience_conditions: Sequence[str | list[str]]) -> list[str]:
+        """ Helper method to collect audience IDs from (possibly nested) audience conditions.
+
+        Args:
+            audience_conditions: Audience conditions or audience IDs of a rule.
+
+        Returns:
+            List of referenced audience IDs.
+        """
+
+        audience_ids: list[str] = []
+        for condition in audience_conditions:
+            if isinstance(condition, list):
+                audience_ids.extend(ProjectConfig._get_audience_ids(condition))
+            elif condition not in condition_helper.ConditionOperatorTypes.operators:
+                audience_ids.append(condition)
+
+        return audience_ids
+
+    def get_decision_inputs_for_flag(self, flag_key: str) -> Optional[tuple[tuple[str, ...], tuple[str, ...]]]:
+        """ Get the user attributes and segments a decision for the given flag depends on.
+
+        Inputs are collected from the audiences of the flag's rules and of the holdouts applying to them.
+        The bucketing ID attribute is always included.
+
+        Args:
+            flag_key: Key of the flag.
+
+        Returns:
+            A tuple of (attribute keys, segment names). None if the flag does not exist or if its
+            decisions cannot be derived from these inputs alone, e.g. when it has CMAB rules.
+        """
+
+        if flag_key in self._flag_decision_inputs:
+            return self._flag_decision_inputs[flag_key]
+
+        inputs: Optional[tuple[tuple[str, ...], tuple[str, ...]]] = None
+        feature = self.feature_key_map.get(flag_key)
+        rules = self._get_flag_rules(feature) if feature else []
+        if feature and not any(rule.cmab for rule in rules):
+            targeted: list[entities.Experiment | entities.Holdout] = [*rules, *self.global_holdouts]
+            for rule in rules:
+                targeted.extend(self.get_holdouts_for_rule(rule.id))
+
+            attribute_keys = {enums.ControlAttributes.BUCKETING_ID}
+            segments = set()
+            for entity in targeted:
+                for audience_id in self._get_audience_ids(entity.get_audience_conditions_or_ids()):
+                    audience = self.audience_id_map.get(audience_id)
+                    for condition in (audience.conditionList or []) if audience else []:
+                        if condition[3] == condition_helper.ConditionMatchTypes.QUALIFIED:
+                            segments.add(condition[1])
+                        else:
+                            attribute_keys.add(condition[0])
+
+            inputs = tuple(sorted(attribute_keys, key=str)), tuple(sorted(segments, key=str))
+
+        self._flag_decision_inputs[flag_key] = inputs
+        return inputs
+
+    def get_changed_flag_keys(self) -> Optional[set[str]]:
+        """ Get keys of flags which changed compared to the config this config was built from.
+
+        Returns:
+            Set of added, removed and changed flag keys. None if the config was built without a previous config.
+        """
+
+        return self.changed_flag_keys
+
     @staticmethod
     def _generate_key_map(
         entity_list: Iterable[Any], key: str, entity_class: Type[EntityClass], first_value: bool = False
@@ -778,6 +1198,43 @@ class ProjectConfig:
 
         return variable_value
 
+    def get_typecast_variable_values(
+        self,
+        feature_key: str,
+        variation: Optional[Union[entities.Variation, VariationDict]] = None,
+        variable_key: Optional[str] = None
+    ) -> Optional[dict[str, Any]]:
+        """ Get the type-casted values of the variables of a flag for the given variation.
+
+        Values are type-casted when the config is loaded. JSON values are copied, so that
+        callers can modify them without affecting later decisions.
+
+        Args:
+            feature_key: The key of the feature flag.
+            variation: The Variation the flag is enabled with, or None to get the default values.
+            variable_key: Optional key of the only variable to get.
+
+        Returns:
+            Dict of variable key to value, without variables whose value can not be type-casted.
+            None if the values were not computed for the given variation.
+        """
+
+        if variation is None:
+            values = self.flag_variable_defaults_map.get(feature_key)
+        else:
+            variation_id = variation.get('id') if isinstance(variation, dict) else variation.id
+            values = self.flag_variation_variables_map.get(feature_key, {}).get(variation_id or '')
+
+        if values is None:
+            return None
+
+        if variable_key is not None:
+            if variable_key not in values:
+                return {}
+            return {variable_key: _copy_json_value(values[variable_key])}
+
+        return {key: _copy_json_value(value) for key, value in values.items()}
+
     def get_variable_for_feature(self, feature_key: str, variable_key: str) -> Optional[entities.Variable]:
         """ Get the variable with the given variable key for the given feature.
 
@@ -959,3 +1416,177 @@ class ProjectConfig:
 
         self.logger.error(f'Holdout with ID "{holdout_id}" not found.')
         return None
+
+
+def _copy_json_value(value: Any) -> Any:
+    """ Copy the containers of a parsed JSON value. Other values are immutable and returned as they are. """
+
+    if isinstance(value, dict):
+        return {key: _copy_json_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_json_value(item) for item in value]
+    return value
+
+
+def get_snapshot_revision(snapshot: bytes) -> str:
+    """ Get the datafile revision a config snapshot was created from without loading it.
+
+    Args:
+        snapshot: Bytes returned by ProjectConfig.to_snapshot.
+
+    Returns:
+        Revision of the datafile.
+
+    Raises:
+        InvalidInputException if the snapshot is malformed or was created by an incompatible runtime.
+    """
+
+    revision, _ = _read_snapshot_header(snapshot)
+    return revision
+
+
+def _read_snapshot_header(snapshot: bytes) -> tuple[str, int]:
+    """ Validate the snapshot header.
+
+    Returns:
+        A tuple of (revision, offset of the marshalled payload).
+    """
+
+    if not isinstance(snapshot, (bytes, bytearray, memoryview)) or len(snapshot) < _SNAPSHOT_HEADER.size:
+        raise exceptions.InvalidInputException(enums.Errors.INVALID_CONFIG_SNAPSHOT.format('truncated header'))
+
+    magic, format_version, marshal_version, major, minor, revision_length = _SNAPSHOT_HEADER.unpack_from(snapshot)
+    if magic != SNAPSHOT_MAGIC:
+        raise exceptions.InvalidInputException(enums.Errors.INVALID_CONFIG_SNAPSHOT.format('not a config snapshot'))
+    if format_version != SNAPSHOT_FORMAT_VERSION:
+        raise exceptions.InvalidInputException(
+            enums.Errors.INVALID_CONFIG_SNAPSHOT.format(f'unsupported format version {format_version}')
+        )
+    if marshal_version != marshal.version or (major, minor) != version_info[:2]:
+        raise exceptions.InvalidInputException(
+            enums.Errors.INVALID_CONFIG_SNAPSHOT.format(f'created by Python {major}.{minor}')
+        )
+
+    offset = _SNAPSHOT_HEADER.size + revision_length
+    if len(snapshot) < offset:
+        raise exceptions.InvalidInputException(enums.Errors.INVALID_CONFIG_SNAPSHOT.format('truncated header'))
+
+    return bytes(snapshot[_SNAPSHOT_HEADER.size:offset]).decode('utf-8'), offset
+
+
+class _SnapshotEncoder:
+    """ Flattens the ProjectConfig object graph into marshal-compatible values.
+
+    Entities are stored once in an entity table and referenced by index. Containers without
+    entities are emitted untouched so the loader does not need to walk them, and shared
+    containers are memoized so marshal preserves their identity.
+    """
+
+    def __init__(self) -> None:
+        self.entities: list[tuple[str, Any]] = []
+        self._entity_index: dict[int, int] = {}
+        self._memo: dict[int, tuple[Any, bool]] = {}
+
+    def encode(self, value: Any) -> tuple[Any, bool]:
+        """ Encode a value.
+
+        Returns:
+            A tuple of (encoded value, whether the value has to be resolved on load).
+        """
+
+        if isinstance(value, entities.BaseEntity):
+            return (_SNAPSHOT_ENTITY_REF, self._encode_entity(value)), True
+
+        if isinstance(value, (list, dict, tuple)):
+            memo = self._memo.get(id(value))
+            if memo is not None:
+                return memo
+
+            result: tuple[Any, bool]
+            if isinstance(value, dict):
+                if value and all(isinstance(item, entities.BaseEntity) for item in value.values()):
+                    # Lookup maps of entities are the bulk of the config, they are restored without a walk.
+                    result = (
+                        _SNAPSHOT_ENTITY_DICT,
+                        (list(value.keys()), [self._encode_entity(item) for item in value.values()]),
+                    ), True
+                else:
+                    items = {key: self.encode(item) for key, item in value.items()}
+                    if any(resolve for _, resolve in items.values()):
+                        result = (_SNAPSHOT_DICT, {key: item for key, (item, _) in items.items()}), True
+                    else:
+                        result = value, False
+            elif isinstance(value, list) and value and all(isinstance(item, entities.BaseEntity) for item in value):
+                result = (_SNAPSHOT_ENTITY_LIST, [self._encode_entity(item) for item in value]), True
+            else:
+                encoded = [self.encode(item) for item in value]
+                if isinstance(value, tuple):
+                    result = (_SNAPSHOT_TUPLE, [item for item, _ in encoded]), True
+                elif any(resolve for _, resolve in encoded):
+                    result = (_SNAPSHOT_LIST, [item for item, _ in encoded]), True
+                else:
+                    result = value, False
+
+            self._memo[id(value)] = result
+            return result
+
+        if value is None or isinstance(value, (str, int, float, bytes, set, frozenset)):
+            return value, False
+
+        raise ValueError(f'Cannot snapshot value of type "{type(value).__name__}".')
+
+    def _encode_entity(self, entity: entities.BaseEntity) -> int:
+        index = self._entity_index.get(id(entity))
+        if index is not None:
+            return index
+
+        name = type(entity).__qualname__
+        if _SNAPSHOT_ENTITY_CLASSES.get(name) is not type(entity):
+            raise ValueError(f'Cannot snapshot entity of type "{name}".')
+
+        index = len(self.entities)
+        self._entity_index[id(entity)] = index
+        self.entities.append((name, None))
+        state, _ = self.encode(entity.__dict__)
+        self.entities[index] = (name, state)
+        return index
+
+
+class _SnapshotDecoder:
+    """ Restores values produced by _SnapshotEncoder. """
+
+    def __init__(self, entity_table: list[tuple[str, Any]]):
+        self._memo: dict[int, Any] = {}
+        self._entities: list[Any] = [object.__new__(_SNAPSHOT_ENTITY_CLASSES[name]) for name, _ in entity_table]
+        for entity, (_, state) in zip(self._entities, entity_table):
+            # Entity state is a fresh dict owned by the entity unless it references other entities.
+            entity.__dict__ = state if type(state) is dict else self.decode(state)
+
+    def decode(self, value: Any) -> Any:
+        if type(value) is not tuple:
+            return value
+
+        tag, payload = value
+        if tag == _SNAPSHOT_ENTITY_REF:
+            return self._entities[payload]
+
+        result = self._memo.get(id(payload))
+        if result is not None:
+            return result
+
+        if tag == _SNAPSHOT_ENTITY_DICT:
+            keys, indexes = payload
+            result = dict(zip(keys, map(self._entities.__getitem__, indexes)))
+        elif tag == _SNAPSHOT_ENTITY_LIST:
+            result = list(map(self._entities.__getitem__, payload))
+        elif tag == _SNAPSHOT_LIST:
+            result = [self.decode(item) for item in payload]
+        elif tag == _SNAPSHOT_DICT:
+            result = {key: self.decode(item) for key, item in payload.items()}
+        elif tag == _SNAPSHOT_TUPLE:
+            result = tuple(self.decode(item) for item in payload)
+        else:
+            raise ValueError(f'unknown tag {tag}')
+
+        self._memo[id(payload)] = result
+        return result
@@ -0,0 +1,190 @@
+# Copyright 2026, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import contextvars
+import threading
+import time
+from types import TracebackType
+from typing import Any, Dict, Optional, Type
+
+from .version import __version__
+
+SpanAttributes = Optional[Dict[str, Any]]
+
+
+class BaseSpan:
+    """Span of an operation traced by the SDK, which does nothing.
+
+    Spans are context managers: exceptions raised inside the block are recorded and the span ends on exit.
+    """
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute, a string, bool, int or float, of the span."""
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        """Record that the operation failed with exception."""
+        pass
+
+    def end(self) -> None:
+        """End the span."""
+        pass
+
+    def __enter__(self) -> BaseSpan:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType]
+    ) -> None:
+        if exc_value is not None:
+            self.record_exception(exc_value)
+        self.end()
+
+
+class BaseTracer:
+    """Creates the spans of the operations traced by the SDK. Override start_span to forward them to a
+    tracing backend.
+
+    A span started while another span is active on the same thread is expected to become its child.
+    """
+
+    enabled = True
+
+    def start_span(self, name: str, attributes: SpanAttributes = None) -> BaseSpan:
+        """Start a span, which is the active span until it ends."""
+        return BaseSpan()
+
+
+_NO_OP_SPAN = BaseSpan()
+
+
+class NoOpTracer(BaseTracer):
+    """Tracer used when tracing is disabled, which creates no spans."""
+
+    enabled = False
+
+    def start_span(self, name: str, attributes: SpanAttributes = None) -> BaseSpan:
+        return _NO_OP_SPAN
+
+
+class RecordedSpan(BaseSpan):
+    """Span kept by InMemoryTracer, with its parent, attributes, duration in seconds and exception."""
+
+    def __init__(self, tracer: InMemoryTracer, name: str, attributes: SpanAttributes, parent: Optional[RecordedSpan]):
+        self.tracer = tracer
+        self.name = name
+        self.attributes: dict[str, Any] = dict(attributes) if attributes else {}
+        self.parent = parent
+        self.exception: Optional[BaseException] = None
+        self.start_time = time.perf_counter()
+        self.end_time: Optional[float] = None
+        self._token = tracer._current_span.set(self)
+
+    @property
+    def duration(self) -> Optional[float]:
+        return self.end_time - self.start_time if self.end_time is not None else None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.exception = exception
+
+    def end(self) -> None:
+        if self.end_time is not None:
+            return
+        self.end_time = time.perf_counter()
+        try:
+            self.tracer._current_span.reset(self._token)
+        except ValueError:
+            # ended in another context than it was started in
+            pass
+        self.tracer._finish(self)
+
+
+class InMemoryTracer(BaseTracer):
+    """Keeps finished spans in memory, e.g. to inspect the latency of decisions in tests or while debugging."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self._current_span: contextvars.ContextVar[Optional[RecordedSpan]] = contextvars.ContextVar(
+            'optimizely_current_span', default=None
+        )
+        self._finished_spans: list[RecordedSpan] = []
+
+    def start_span(self, name: str, attributes: SpanAttributes = None) -> RecordedSpan:
+        return RecordedSpan(self, name, attributes, self._current_span.get())
+
+    def _finish(self, span: RecordedSpan) -> None:
+        with self.lock:
+            self._finished_spans.append(span)
+
+    def get_finished_spans(self) -> list[RecordedSpan]:
+        """Returns the finished spans in the order they ended."""
+        with self.lock:
+            return list(self._finished_spans)
+
+    def reset(self) -> None:
+        """Remove all finished spans."""
+        with self.lock:
+            self._finished_spans.clear()
+
+
+class _OpenTelemetrySpan(BaseSpan):
+    """Span wrapping the context manager of an OpenTelemetry span started as the current span."""
+
+    def __init__(self, context_manager: Any):
+        self._context_manager = context_manager
+        self._span = context_manager.__enter__()
+        self._exception: Optional[BaseException] = None
+        self._ended = False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self._span.set_attribute(key, value)
+
+    def record_exception(self, exception: BaseException) -> None:
+        self._exception = exception
+
+    def end(self) -> None:
+        if self._ended:
+            return
+        self._ended = True
+        if self._exception is None:
+            self._context_manager.__exit__(None, None, None)
+        else:
+            # OpenTelemetry records the exception, sets the error status of the span and raises it again
+            try:
+                self._context_manager.__exit__(type(self._exception), self._exception, self._exception.__traceback__)
+            except BaseException as error:
+                if error is not self._exception:
+                    raise
+
+
+class OpenTelemetryTracer(BaseTracer):
+    """Emits the spans of the SDK as OpenTelemetry spans, nested in the spans of the application.
+
+    Requires the opentelemetry-api package unless an OpenTelemetry tracer is provided.
+    """
+
+    def __init__(self, tracer: Optional[Any] = None):
+        if tracer is None:
+            from opentelemetry import trace  # type: ignore[import-not-found]
+            tracer = trace.get_tracer('optimizely', __version__)
+        self.tracer = tracer
+
+    def start_span(self, name: str, attributes: SpanAttributes = None) -> BaseSpan:
+        return _OpenTelemetrySpan(self.tracer.start_as_current_span(name, attributes=attributes))
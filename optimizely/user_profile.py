@@ -1,4 +1,4 @@
-# Copyright 2017, 2022, Optimizely
+# Copyright 2017, 2022, 2026, Optimizely
 # Licensed under the Apache License, Version 2.0 (the "License");
 # you may not use this file except in compliance with the License.
 # You may obtain a copy of the License at
@@ -12,9 +12,12 @@
 # limitations under the License.
 
 from __future__ import annotations
-from typing import Any, Optional
+import threading
+from typing import Any, Iterable, Optional
 from sys import version_info
 from . import logger as _logging
+from .helpers.enums import TracingAttributes, TracingSpanNames, UserProfileWriteBehindConfig
+from .tracing import BaseTracer, NoOpTracer
 
 if version_info < (3, 8):
     from typing_extensions import Final
@@ -96,14 +99,209 @@ class UserProfileService:
         pass
 
 
+class BatchUserProfileService(UserProfileService):
+    """ User profile service which can also look up and save the profiles of many users at once,
+  and be used from asyncio code.
+
+  Override lookup_many and save_many to fetch or store profiles in a single round trip to a remote
+  store. By default they call lookup and save for every user. The async variants run the blocking
+  methods in the default executor of the running event loop, override them with native async clients. """
+
+    def lookup_many(self, user_ids: Iterable[str]) -> dict[str, Optional[dict[str, Any]]]:
+        """ Fetch the user profile dicts of several users.
+
+    Args:
+      user_ids: IDs of the users whose profiles need to be retrieved.
+
+    Returns:
+      Dict mapping every user ID to the user's profile dict, or None if no profile is available.
+    """
+        return {user_id: self.lookup(user_id) for user_id in user_ids}
+
+    def save_many(self, user_profiles: list[dict[str, Any]]) -> None:
+        """ Save several user profile dicts.
+
+    Args:
+      user_profiles: Dicts representing the users' profiles.
+    """
+        for user_profile in user_profiles:
+            self.save(user_profile)
+
+    async def lookup_async(self, user_id: str) -> Optional[dict[str, Any]]:
+        """ Async variant of lookup. """
+        import asyncio
+        return await asyncio.get_running_loop().run_in_executor(None, self.lookup, user_id)
+
+    async def save_async(self, user_profile: dict[str, Any]) -> None:
+        """ Async variant of save. """
+        import asyncio
+        await asyncio.get_running_loop().run_in_executor(None, self.save, user_profile)
+
+    async def lookup_many_async(self, user_ids: Iterable[str]) -> dict[str, Optional[dict[str, Any]]]:
+        """ Async variant of lookup_many. """
+        import asyncio
+        return await asyncio.get_running_loop().run_in_executor(None, self.lookup_many, list(user_ids))
+
+    async def save_many_async(self, user_profiles: list[dict[str, Any]]) -> None:
+        """ Async variant of save_many. """
+        import asyncio
+        await asyncio.get_running_loop().run_in_executor(None, self.save_many, user_profiles)
+
+
+class WriteBehindUserProfileService(BatchUserProfileService):
+    """ User profile service which saves profiles to another user profile service in the background.
+
+  Saved profiles are queued and coalesced per user, so that only the latest profile of a user is written,
+  and a worker thread writes them in batches of batch_size, with save_many if the wrapped service
+  is a BatchUserProfileService, at least every flush_interval seconds. Lookups return profiles which
+  are not written yet, so that decisions stay sticky. When max_pending users are waiting, profiles of
+  other users are saved by the calling thread. Call close() to write the remaining profiles and stop
+  the worker. Profiles which fail to save are logged and dropped.
+  """
+
+    def __init__(
+        self,
+        user_profile_service: UserProfileService,
+        batch_size: int = UserProfileWriteBehindConfig.DEFAULT_BATCH_SIZE,
+        flush_interval: float = UserProfileWriteBehindConfig.DEFAULT_FLUSH_INTERVAL,
+        max_pending: int = UserProfileWriteBehindConfig.DEFAULT_MAX_PENDING,
+        logger: Optional[_logging.Logger] = None,
+        error_handler: Optional[BaseErrorHandler] = None
+    ):
+        self.user_profile_service = user_profile_service
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        if flush_interval <= 0:
+            self.flush_interval = UserProfileWriteBehindConfig.DEFAULT_FLUSH_INTERVAL
+        self.max_pending = max(1, max_pending)
+        self.logger = _logging.adapt_logger(logger or _logging.NoOpLogger())
+        self.error_handler = error_handler
+        self.lock = threading.Condition()
+        # serializes writes, so that an older profile of a user is never written after a newer one
+        self._flush_lock = threading.Lock()
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._in_flight: dict[str, dict[str, Any]] = {}
+        self._stopped = False
+        self.thread = threading.Thread(target=self._run, name='UserProfileWriteBehindThread', daemon=True)
+        self.thread.start()
+
+    def lookup(self, user_id: str) -> dict[str, Any]:
+        with self.lock:
+            user_profile = self._pending.get(user_id) or self._in_flight.get(user_id)
+        if user_profile is not None:
+            return _copy_user_profile(user_profile)
+        return self.user_profile_service.lookup(user_id)
+
+    def lookup_many(self, user_ids: Iterable[str]) -> dict[str, Optional[dict[str, Any]]]:
+        user_profiles: dict[str, Optional[dict[str, Any]]] = {}
+        missing: list[str] = []
+        with self.lock:
+            for user_id in user_ids:
+                user_profile = self._pending.get(user_id) or self._in_flight.get(user_id)
+                if user_profile is not None:
+                    user_profiles[user_id] = _copy_user_profile(user_profile)
+                else:
+                    missing.append(user_id)
+        if missing:
+            if isinstance(self.user_profile_service, BatchUserProfileService):
+                user_profiles.update(self.user_profile_service.lookup_many(missing))
+            else:
+                user_profiles.update({user_id: self.user_profile_service.lookup(user_id) for user_id in missing})
+        return user_profiles
+
+    def save(self, user_profile: dict[str, Any]) -> None:
+        user_id = user_profile[UserProfile.USER_ID_KEY]
+        with self.lock:
+            if not self._stopped and (user_id in self._pending or len(self._pending) < self.max_pending):
+                self._pending[user_id] = _copy_user_profile(user_profile)
+                if len(self._pending) >= self.batch_size:
+                    self.lock.notify()
+                return
+
+        # the queue is full or the service was closed
+        with self._flush_lock:
+            self.user_profile_service.save(user_profile)
+
+    def save_many(self, user_profiles: list[dict[str, Any]]) -> None:
+        for user_profile in user_profiles:
+            self.save(user_profile)
+
+    def get_pending_count(self) -> int:
+        """ Returns the number of users whose profiles are waiting to be written. """
+        with self.lock:
+            return len(self._pending)
+
+    def flush(self) -> None:
+        """ Write all queued profiles to the wrapped user profile service. """
+        with self._flush_lock:
+            with self.lock:
+                self._in_flight = self._pending
+                self._pending = {}
+            user_profiles = list(self._in_flight.values())
+            try:
+                for index in range(0, len(user_profiles), self.batch_size):
+                    self._save_batch(user_profiles[index:index + self.batch_size])
+            finally:
+                with self.lock:
+                    self._in_flight = {}
+
+    def _save_batch(self, user_profiles: list[dict[str, Any]]) -> None:
+        try:
+            if isinstance(self.user_profile_service, BatchUserProfileService):
+                self.user_profile_service.save_many(user_profiles)
+            else:
+                for user_profile in user_profiles:
+                    self.user_profile_service.save(user_profile)
+            self.logger.debug(f'Saved {len(user_profiles)} user profiles.')
+        except Exception as exception:
+            self.logger.warning(f'Failed to save {len(user_profiles)} user profiles for exception: {exception}')
+            if self.error_handler:
+                self.error_handler.handle_error(exception)
+
+    def _run(self) -> None:
+        while True:
+            with self.lock:
+                if not self._stopped and len(self._pending) < self.batch_size:
+                    self.lock.wait(self.flush_interval)
+                stopped = self._stopped
+            self.flush()
+            if stopped:
+                return
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        """ Write the queued profiles and stop the worker thread. Later saves are written by the calling thread.
+
+    Args:
+      timeout: Optional time to wait in seconds for the queued profiles to be written.
+    """
+        with self.lock:
+            self._stopped = True
+            self.lock.notify()
+        self.thread.join(timeout)
+
+
+def _copy_user_profile(user_profile: dict[str, Any]) -> dict[str, Any]:
+    """ Copy a user profile dict and its experiment bucket map, which callers may modify after saving it. """
+    user_profile = dict(user_profile)
+    experiment_bucket_map = user_profile.get(UserProfile.EXPERIMENT_BUCKET_MAP_KEY)
+    if isinstance(experiment_bucket_map, dict):
+        user_profile[UserProfile.EXPERIMENT_BUCKET_MAP_KEY] = {
+            experiment_id: dict(decision) if isinstance(decision, dict) else decision
+            for experiment_id, decision in experiment_bucket_map.items()
+        }
+    return user_profile
+
+
 class UserProfileTracker:
     def __init__(self,
                  user_id: str,
                  user_profile_service: Optional[UserProfileService],
-                 logger: Optional[_logging.Logger] = None):
+                 logger: Optional[_logging.Logger] = None,
+                 tracer: Optional[BaseTracer] = None):
         self.user_id = user_id
         self.user_profile_service = user_profile_service
         self.logger = _logging.adapt_logger(logger or _logging.NoOpLogger())
+        self.tracer = tracer or NoOpTracer()
         self.profile_updated = False
         self.user_profile = UserProfile(user_id, {})
 
@@ -112,6 +310,15 @@ class UserProfileTracker:
 
     def load_user_profile(self, reasons: Optional[list[str]] = [],
                           error_handler: Optional[BaseErrorHandler] = None) -> None:
+        if not self.tracer.enabled:
+            self._load_user_profile(reasons, error_handler)
+            return
+
+        with self.tracer.start_span(TracingSpanNames.USER_PROFILE_LOAD) as span:
+            self._load_user_profile(reasons, error_handler)
+            span.set_attribute(TracingAttributes.EXPERIMENT_COUNT, len(self.user_profile.experiment_bucket_map))
+
+    def _load_user_profile(self, reasons: Optional[list[str]], error_handler: Optional[BaseErrorHandler]) -> None:
         if reasons is None:
             reasons = []
         try:
@@ -146,6 +353,15 @@ class UserProfileTracker:
     def save_user_profile(self, error_handler: Optional[BaseErrorHandler] = None) -> None:
         if not self.profile_updated:
             return
+        if not self.tracer.enabled:
+            self._save_user_profile(error_handler)
+            return
+
+        with self.tracer.start_span(TracingSpanNames.USER_PROFILE_SAVE) as span:
+            span.set_attribute(TracingAttributes.EXPERIMENT_COUNT, len(self.user_profile.experiment_bucket_map))
+            self._save_user_profile(error_handler)
+
+    def _save_user_profile(self, error_handler: Optional[BaseErrorHandler]) -> None:
         try:
             if self.user_profile_service:
                 self.user_profile_service.save(self.user_profile.__dict__)
@@ -53,7 +53,7 @@ setup(
         'Programming Language :: Python :: 3.11',
         'Programming Language :: Python :: 3.12',
     ],
-    packages=find_packages(exclude=['docs', 'tests']),
+    packages=find_packages(exclude=['benchmarks', 'docs', 'tests']),
     extras_require={'test': TEST_REQUIREMENTS},
     install_requires=REQUIREMENTS,
     tests_require=TEST_REQUIREMENTS,
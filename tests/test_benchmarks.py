@@ -0,0 +1,95 @@
+# Copyright 2026, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from benchmarks import run
+from benchmarks.datafile_generator import DatafileScale, generate_datafile
+from optimizely import logger
+from optimizely.helpers import enums
+from optimizely.helpers import validator
+from optimizely.project_config import ProjectConfig
+from . import base
+
+
+class DatafileGeneratorTest(base.BaseTest):
+    def setUp(self):
+        base.BaseTest.setUp(self)
+        self.scale = DatafileScale(
+            flags=4, rules_per_flag=3, audiences=6, condition_depth=2, holdouts=2, variables=5, groups=2
+        )
+
+    def test_generate_datafile(self):
+        datafile = json.dumps(generate_datafile(self.scale))
+        self.assertTrue(validator.is_datafile_valid(datafile))
+
+        config = ProjectConfig(datafile, logger.NoOpLogger(), None)
+
+        self.assertEqual(4, len(config.feature_key_map))
+        self.assertEqual(6, len(config.audience_id_map))
+        # two A/B tests and two rollout rules per flag, and two experiments per group
+        self.assertEqual(4 * 4 + 2 * 2, len(config.experiment_id_map))
+        self.assertEqual(2, len(config.group_id_map))
+        self.assertEqual(4, len(config.rollout_id_map))
+        self.assertEqual(2, len(config.get_global_holdouts()))
+        self.assertEqual(5, len(config.get_feature_from_key('flag_0').variables))
+
+    def test_generate_datafile__deterministic(self):
+        self.assertEqual(generate_datafile(self.scale, seed=1), generate_datafile(self.scale, seed=1))
+        self.assertNotEqual(generate_datafile(self.scale, seed=1), generate_datafile(self.scale, seed=2))
+
+
+class RunTest(base.BaseTest):
+    def test_run(self):
+        report = run.run(['small'], ['decide', 'lru_cache'], [1, 2], iterations=5)
+
+        self.assertEqual('small', list(report['scales'])[0])
+        self.assertEqual(
+            [('decide', 1), ('decide', 2), ('lru_cache', 1), ('lru_cache', 2)],
+            [(result['benchmark'], result['threads']) for result in report['results']]
+        )
+        for result in report['results']:
+            self.assertEqual(5 * result['threads'], result['operations'])
+            self.assertGreater(result['ops_per_sec'], 0)
+            self.assertLessEqual(result['p50_us'], result['p99_us'])
+        json.dumps(report)
+
+    def test_decide_with_and_without_listeners(self):
+        report = run.run(['small'], ['decide_without_listeners', 'decide_with_listeners'], [1], iterations=3)
+
+        self.assertEqual(
+            ['decide_without_listeners', 'decide_with_listeners'],
+            [result['benchmark'] for result in report['results']]
+        )
+        self.assertTrue(all(result['operations'] == 3 for result in report['results']))
+
+    def test_listener_client(self):
+        context = run.BenchmarkContext(run.SCALES['small'])
+        self.addCleanup(context.close)
+
+        listener_client = context.get_listener_client()
+
+        self.assertIs(listener_client, context.get_listener_client())
+        self.assertIsNot(context.client, listener_client)
+        self.assertTrue(listener_client.notification_center.has_listeners(enums.NotificationTypes.DECISION))
+        self.assertFalse(context.client.notification_center.has_listeners(enums.NotificationTypes.DECISION))
+
+    def test_find_regressions(self):
+        def report(ops_per_sec):
+            return {'results': [{'benchmark': 'decide', 'scale': 'small', 'threads': 1, 'ops_per_sec': ops_per_sec}]}
+
+        self.assertEqual([], run.find_regressions(report(95), report(100), 0.1))
+        self.assertEqual([], run.find_regressions(report(50), {'results': []}, 0.1))
+        regressions = run.find_regressions(report(80), report(100), 0.1)
+        self.assertEqual(1, len(regressions))
+        self.assertEqual(100, regressions[0][1]['ops_per_sec'])
@@ -0,0 +1,90 @@
+# Copyright 2026, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import threading
+
+from optimizely.helpers.bounded_executor import BoundedExecutor
+from optimizely.helpers.enums import ExecutorRejectionPolicies
+from . import base
+
+
+class BoundedExecutorTest(base.BaseTest):
+    def fill(self, executor, count):
+        """Submit count tasks which block until the returned event is set."""
+        release = threading.Event()
+        futures = [executor.submit(release.wait, 5) for _ in range(count)]
+        self.addCleanup(release.set)
+        return release, futures
+
+    def test_submit(self):
+        executor = BoundedExecutor(2, 10)
+        self.addCleanup(executor.shutdown)
+
+        future = executor.submit(lambda a, b: a + b, 1, 2)
+        self.assertEqual(3, future.result(5))
+
+        failed = executor.submit(lambda: 1 / 0)
+        failed.join(5)
+        self.assertIsInstance(failed.exception(), ZeroDivisionError)
+        self.assertEqual(0, executor.get_rejected_count())
+
+    def test_caller_runs_when_full(self):
+        executor = BoundedExecutor(1, 1)
+        self.addCleanup(executor.shutdown)
+        release, futures = self.fill(executor, 2)
+
+        future = executor.submit(threading.current_thread)
+
+        self.assertTrue(future.done())
+        self.assertIs(threading.current_thread(), future.result())
+        self.assertEqual(1, executor.get_rejected_count())
+
+        release.set()
+        for queued in futures:
+            self.assertTrue(queued.result(5))
+        # the pool accepts tasks again once the queue drained
+        self.assertIsNot(threading.current_thread(), executor.submit(threading.current_thread).result(5))
+
+    def test_reject_when_full(self):
+        executor = BoundedExecutor(1, 0, ExecutorRejectionPolicies.REJECT)
+        self.addCleanup(executor.shutdown)
+        release, futures = self.fill(executor, 1)
+        calls = []
+
+        future = executor.submit(calls.append, 1)
+
+        self.assertTrue(future.cancelled())
+        future.join()
+        self.assertEqual([], calls)
+        self.assertEqual(1, executor.get_rejected_count())
+
+    def test_get_queue_depth(self):
+        executor = BoundedExecutor(1, 5)
+        self.addCleanup(executor.shutdown)
+        release, futures = self.fill(executor, 3)
+
+        # one task runs, the others wait for the worker
+        self.assertEqual(2, executor.get_queue_depth())
+
+        release.set()
+        for future in futures:
+            future.result(5)
+        self.assertEqual(0, executor.get_queue_depth())
+
+    def test_submit_after_shutdown(self):
+        executor = BoundedExecutor(1, 1)
+        executor.shutdown()
+
+        self.assertEqual(2, executor.submit(lambda: 2).result(5))
+        self.assertEqual(1, executor.get_rejected_count())
@@ -15,8 +15,9 @@ import json
 from unittest.mock import MagicMock, patch, call
 from optimizely.cmab.cmab_client import DefaultCmabClient, CmabRetryConfig
 from requests.exceptions import RequestException
-from optimizely.helpers.enums import Errors
+from optimizely.helpers.enums import Errors, MetricNames
 from optimizely.exceptions import CmabFetchError, CmabInvalidResponseError
+from optimizely.metrics import InMemoryMetricsExporter, MetricsRegistry
 
 
 class TestDefaultCmabClient(unittest.TestCase):
@@ -73,6 +74,23 @@ class TestDefaultCmabClient(unittest.TestCase):
         self.mock_logger.error.assert_called_with(Errors.CMAB_FETCH_FAILED.format('Connection error'))
         self.assertIn('Connection error', str(context.exception))
 
+    def test_fetch_decision_records_metrics(self):
+        exporter = InMemoryMetricsExporter()
+        self.client.metrics = MetricsRegistry(exporter)
+        mock_response = MagicMock()
+        mock_response.status_code = 200
+        mock_response.json.return_value = {
+            'predictions': [{'variation_id': 'abc123'}]
+        }
+        self.mock_http_client.post.side_effect = [mock_response, RequestException('Connection error')]
+
+        self.client.fetch_decision(self.rule_id, self.user_id, self.attributes, self.cmab_uuid)
+        with self.assertRaises(CmabFetchError):
+            self.client.fetch_decision(self.rule_id, self.user_id, self.attributes, self.cmab_uuid)
+
+        self.assertEqual(2, exporter.get_histogram(MetricNames.CMAB_FETCH_LATENCY).count)
+        self.assertEqual(1, exporter.get_counter(MetricNames.CMAB_FETCH_FAILURES))
+
     def test_fetch_decision_returns_non_2xx_status_no_retry(self):
         mock_response = MagicMock()
         mock_response.status_code = 500
@@ -10,6 +10,8 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import threading
+import time
 import unittest
 from unittest.mock import MagicMock
 from optimizely.cmab.cmab_service import DefaultCmabService, NUM_LOCK_STRIPES
@@ -222,3 +224,50 @@ class TestDefaultCmabService(unittest.TestCase):
         # We should have multiple different lock indices (though not necessarily all unique due to hash collisions)
         self.assertGreater(len(lock_indices), 1,
                            "Different user/rule combinations should generally use different locks")
+
+    def test_concurrent_identical_requests_share_one_fetch(self):
+        """Verifies that requests arriving while an identical request is in flight wait for its decision"""
+        cmab_service = DefaultCmabService(LRUCache(100, 600), self.mock_cmab_client, self.mock_logger)
+        release = threading.Event()
+
+        def fetch_decision(*args):
+            release.wait(5)
+            return 'varA'
+
+        self.mock_cmab_client.fetch_decision.side_effect = fetch_decision
+        options = [OptimizelyDecideOption.RESET_CMAB_CACHE]
+        results = []
+
+        def decide():
+            results.append(cmab_service.get_decision(self.mock_project_config, self.mock_user_context, 'exp1', options))
+
+        threads = [threading.Thread(target=decide) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        deadline = time.time() + 5
+        while cmab_service.get_coalesced_request_count() < 3 and time.time() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(3, cmab_service.get_coalesced_request_count())
+        self.mock_cmab_client.fetch_decision.assert_called_once()
+        self.assertEqual(1, len({decision['cmab_uuid'] for decision, _ in results}))
+        self.assertIsNot(results[0][1], results[1][1])
+
+    def test_requests_with_different_attributes_are_not_shared(self):
+        cmab_service = DefaultCmabService(LRUCache(100, 600), self.mock_cmab_client, self.mock_logger)
+        self.mock_cmab_client.fetch_decision.return_value = 'varA'
+        other_user_context = MagicMock(spec=OptimizelyUserContext)
+        other_user_context.user_id = 'user123'
+        other_user_context.get_user_attributes.return_value = {'age': 30}
+
+        key = cmab_service._get_cache_key('user123', 'exp1')
+        cmab_service.get_decision(self.mock_project_config, self.mock_user_context, 'exp1', [])
+        cmab_service.get_decision(self.mock_project_config, other_user_context, 'exp1', [])
+
+        self.assertEqual(2, self.mock_cmab_client.fetch_decision.call_count)
+        cached_hash = cmab_service.cmab_cache.peek(key)['attributes_hash']
+        self.assertEqual(cmab_service._hash_attributes({'66': 30}), cached_hash)
+        self.assertEqual(0, cmab_service.get_coalesced_request_count())
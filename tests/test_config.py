@@ -20,6 +20,7 @@ from optimizely import error_handler
 from optimizely import exceptions
 from optimizely import logger
 from optimizely import optimizely
+from optimizely import project_config
 from optimizely.helpers import enums
 from optimizely.project_config import ProjectConfig
 from . import base
@@ -193,6 +194,34 @@ class ConfigTest(base.BaseTest):
         experiment_2 = project_config.get_experiment_from_key('test_experiment_2')
         self.assertIsNone(experiment_2.cmab)
 
+    def test_get_decision_inputs_for_flag(self):
+        """ Test that attributes and segments referenced by a flag's rules are collected. """
+
+        opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_audience_segments))
+        project_config = opt_obj.config_manager.get_config()
+
+        self.assertEqual(
+            (('$opt_bucketing_id', 'age', 'country'), ('odp-segment-1', 'odp-segment-2', 'odp-segment-3')),
+            project_config.get_decision_inputs_for_flag('flag-segment'),
+        )
+        self.assertIsNone(project_config.get_decision_inputs_for_flag('invalid_flag'))
+
+    def test_get_decision_inputs_for_flag__cmab_rule(self):
+        """ Test that no decision inputs are returned for flags with CMAB rules. """
+
+        config_dict = copy.deepcopy(self.config_dict_with_features)
+        experiment = next(e for e in config_dict['experiments'] if e['id'] == '111127')
+        experiment['cmab'] = {'attributeIds': [], 'trafficAllocation': 4000}
+        project_config = ProjectConfig(
+            json.dumps(config_dict), logger.SimpleLogger(), error_handler.NoOpErrorHandler
+        )
+
+        self.assertIsNone(project_config.get_decision_inputs_for_flag('test_feature_in_experiment'))
+        self.assertEqual(
+            (('$opt_bucketing_id', 'test_attribute'), ()),
+            project_config.get_decision_inputs_for_flag('test_feature_in_rollout'),
+        )
+
     def test_init__with_v4_datafile(self):
         """ Test that on creating object, properties are initiated correctly for version 4 datafile. """
 
@@ -1016,6 +1045,57 @@ class ConfigTest(base.BaseTest):
             '45', project_config.get_variable_value_for_variation(variable_without_usage_variable, variation),
         )
 
+    def test_get_typecast_variable_values(self):
+        """ Test that variable values are type-casted at config load and JSON values are copied. """
+
+        opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_features))
+        project_config = opt_obj.config_manager.get_config()
+        variation = project_config.get_variation_from_id('test_experiment', '111128')
+
+        with mock.patch('optimizely.project_config.json.loads') as mock_loads:
+            values = project_config.get_typecast_variable_values('test_feature_in_experiment', variation)
+        mock_loads.assert_not_called()
+        self.assertEqual(
+            {
+                'is_working': False,
+                'environment': 'prod',
+                'cost': 10.01,
+                'count': 4242,
+                'variable_without_usage': 45,
+                'object': {'test': 122},
+                'true_object': {'true_test': 1.3},
+            },
+            values,
+        )
+
+        values['object']['test'] = 0
+        self.assertEqual(
+            {'object': {'test': 122}},
+            project_config.get_typecast_variable_values('test_feature_in_experiment', variation, 'object'),
+        )
+        self.assertEqual(
+            {'test': 12}, project_config.get_typecast_variable_values('test_feature_in_experiment')['object']
+        )
+        self.assertIsNone(
+            project_config.get_typecast_variable_values('test_feature_in_experiment', {'id': 'invalid', 'key': 'x'})
+        )
+        self.assertIsNone(project_config.get_typecast_variable_values('invalid_feature'))
+
+    def test_get_typecast_variable_values__leaves_out_invalid_values(self):
+        """ Test that values which can not be type-casted are not precomputed. """
+
+        config_dict = copy.deepcopy(self.config_dict_with_features)
+        config_dict['featureFlags'][0]['variables'][3]['defaultValue'] = 'invalid'
+        opt_obj = optimizely.Optimizely(json.dumps(config_dict))
+        project_config = opt_obj.config_manager.get_config()
+        variation = project_config.get_variation_from_id('test_experiment', '111128')
+
+        self.assertNotIn('count', project_config.get_typecast_variable_values('test_feature_in_experiment'))
+        self.assertEqual(
+            {'count': 4242},
+            project_config.get_typecast_variable_values('test_feature_in_experiment', variation, 'count'),
+        )
+
     def test_get_variable_for_feature__returns_valid_variable(self):
         """ Test that the feature variable is returned. """
 
@@ -1854,3 +1934,159 @@ class FeatureRolloutConfigTest(base.BaseTest):
 
 
 
+
+
+class ConfigSnapshotTest(base.BaseTest):
+    def setUp(self):
+        base.BaseTest.setUp(self)
+        self.mock_logger = mock.MagicMock()
+        self.config = ProjectConfig(
+            json.dumps(self.config_dict_with_features), self.mock_logger, error_handler.NoOpErrorHandler
+        )
+
+    def test_to_snapshot__round_trip(self):
+        """ Test that a config restored from a snapshot is equal to the original config. """
+
+        snapshot = self.config.to_snapshot()
+        restored = ProjectConfig.from_snapshot(snapshot, self.mock_logger, error_handler.NoOpErrorHandler)
+
+        for name, value in self.config.__dict__.items():
+            self.assertEqual(value, restored.__dict__[name], name)
+
+        self.assertIs(self.mock_logger, restored.logger)
+        self.assertEqual(self.config.to_datafile(), restored.to_datafile())
+        self.assertEqual(
+            self.config.get_audience('11154').conditionStructure,
+            restored.get_audience('11154').conditionStructure,
+        )
+
+    def test_to_snapshot__preserves_shared_entities(self):
+        """ Test that entities referenced from several maps are restored as the same object. """
+
+        restored = ProjectConfig.from_snapshot(
+            self.config.to_snapshot(), self.mock_logger, error_handler.NoOpErrorHandler
+        )
+
+        experiment = restored.experiment_key_map['test_experiment']
+        self.assertIs(experiment, restored.experiment_id_map[experiment.id])
+        self.assertIs(
+            restored.variation_key_map['test_experiment']['control'],
+            restored.variation_id_map_by_experiment_id[experiment.id]['111128'],
+        )
+
+    def test_get_snapshot_revision(self):
+        """ Test that revision can be read from the snapshot header. """
+
+        self.assertEqual('1', project_config.get_snapshot_revision(self.config.to_snapshot()))
+
+    def test_from_snapshot__invalid_snapshot(self):
+        """ Test that malformed or incompatible snapshots are rejected. """
+
+        snapshot = self.config.to_snapshot()
+        invalid_snapshots = [
+            b'',
+            b'not a snapshot at all',
+            project_config.SNAPSHOT_MAGIC + b'\xff' * 20,
+            snapshot[:-10],
+        ]
+        for invalid_snapshot in invalid_snapshots:
+            with self.assertRaisesRegex(exceptions.InvalidInputException, 'Provided config snapshot cannot be loaded'):
+                ProjectConfig.from_snapshot(invalid_snapshot, self.mock_logger, error_handler.NoOpErrorHandler)
+
+    def test_from_snapshot__different_python_version(self):
+        """ Test that snapshots created by another Python version are rejected. """
+
+        snapshot = bytearray(self.config.to_snapshot())
+        # Minor version byte of the header.
+        snapshot[8] = (snapshot[8] + 1) % 256
+
+        with self.assertRaisesRegex(exceptions.InvalidInputException, 'created by Python'):
+            ProjectConfig.from_snapshot(bytes(snapshot), self.mock_logger, error_handler.NoOpErrorHandler)
+
+
+class IncrementalConfigTest(base.BaseTest):
+    def setUp(self):
+        base.BaseTest.setUp(self)
+        self.mock_logger = mock.MagicMock()
+        self.previous_config = ProjectConfig(
+            json.dumps(self.config_dict_with_features), self.mock_logger, error_handler.NoOpErrorHandler
+        )
+
+    def _build(self, config_dict):
+        datafile = json.dumps(config_dict)
+        full_config = ProjectConfig(datafile, self.mock_logger, error_handler.NoOpErrorHandler)
+        incremental_config = ProjectConfig(
+            datafile, self.mock_logger, error_handler.NoOpErrorHandler, previous_config=self.previous_config
+        )
+
+        # Reusing entities must not change the resulting config.
+        for name, value in full_config.__dict__.items():
+            if name != 'changed_flag_keys':
+                self.assertEqual(value, incremental_config.__dict__[name], name)
+
+        return incremental_config
+
+    def test_init__without_previous_config(self):
+        """ Test that changed flags are unknown when config is built without a previous config. """
+
+        self.assertIsNone(self.previous_config.get_changed_flag_keys())
+
+    def test_init__unchanged_datafile(self):
+        """ Test that all entities are reused and no flag is reported when nothing changed. """
+
+        config_dict = copy.deepcopy(self.config_dict_with_features)
+        config_dict['revision'] = '2'
+        config = self._build(config_dict)
+
+        self.assertEqual(set(), config.get_changed_flag_keys())
+        for experiment_id, experiment in config.experiment_id_map.items():
+            self.assertIs(self.previous_config.experiment_id_map[experiment_id], experiment)
+        for feature_key, feature in config.feature_key_map.items():
+            self.assertIs(self.previous_config.feature_key_map[feature_key], feature)
+        for audience_id, audience in config.audience_id_map.items():
+            self.assertIs(self.previous_config.audience_id_map[audience_id], audience)
+        self.assertIs(
+            self.previous_config.variation_key_map['test_experiment'], config.variation_key_map['test_experiment']
+        )
+        self.assertIs(
+            self.previous_config.flag_variation_variables_map['test_feature_in_experiment'],
+            config.flag_variation_variables_map['test_feature_in_experiment'],
+        )
+
+    def test_init__changed_experiment(self):
+        """ Test that only flags using a changed experiment are reported. """
+
+        config_dict = copy.deepcopy(self.config_dict_with_features)
+        config_dict['experiments'][0]['trafficAllocation'][0]['endOfRange'] = 1000
+        config = self._build(config_dict)
+
+        self.assertEqual({'test_feature_in_experiment'}, config.get_changed_flag_keys())
+        self.assertIsNot(self.previous_config.experiment_id_map['111127'], config.experiment_id_map['111127'])
+        self.assertIs(self.previous_config.experiment_id_map['111134'], config.experiment_id_map['111134'])
+
+    def test_init__changed_audience(self):
+        """ Test that flags with rules referencing a changed audience are reported. """
+
+        config_dict = copy.deepcopy(self.config_dict_with_features)
+        audience = next(audience for audience in config_dict['audiences'] if audience['id'] == '11160')
+        audience['conditions'] = '["and", ["or", ["or", {"name": "test_attribute", ' \
+                                 '"type": "custom_attribute", "value": "changed"}]]]'
+        config = self._build(config_dict)
+
+        self.assertEqual(
+            {'test_feature_in_multiple_experiments', 'test_feature_in_exclusion_group'},
+            config.get_changed_flag_keys(),
+        )
+        self.assertIs(self.previous_config.audience_id_map['11154'], config.audience_id_map['11154'])
+
+    def test_init__added_and_removed_flags(self):
+        """ Test that added and removed flags are reported. """
+
+        config_dict = copy.deepcopy(self.config_dict_with_features)
+        removed_flag = config_dict['featureFlags'].pop(0)
+        config_dict['featureFlags'].append(
+            {'id': '99999', 'key': 'new_feature', 'experimentIds': [], 'rolloutId': '', 'variables': []}
+        )
+        config = self._build(config_dict)
+
+        self.assertEqual({removed_flag['key'], 'new_feature'}, config.get_changed_flag_keys())
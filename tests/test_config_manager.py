@@ -21,6 +21,7 @@ from optimizely import exceptions as optimizely_exceptions
 from optimizely import optimizely_config
 from optimizely import project_config
 from optimizely.helpers import enums
+from optimizely.metrics import InMemoryMetricsExporter, MetricsRegistry
 
 from . import base
 
@@ -143,6 +144,12 @@ class StaticConfigManagerTest(base.BaseTest):
         mock_notification_center.send_notifications.assert_called_once_with('OPTIMIZELY_CONFIG_UPDATE')
         self.assertEqual('42', project_config_manager.optimizely_config.revision)
 
+        # Flags of both revisions are reported as changed since the datafiles share no flags.
+        self.assertEqual(
+            {flag['key'] for flag in self.config_dict_with_features['featureFlags']},
+            project_config_manager.get_config().get_changed_flag_keys(),
+        )
+
     def test_set_config__schema_validation(self):
         """ Test set_config calls or does not call schema validation based on skip_json_validation value. """
 
@@ -230,6 +237,41 @@ class StaticConfigManagerTest(base.BaseTest):
             with self.assertRaises(AttributeError):
                 project_config_manager._set_config(test_datafile)
 
+    def test_init__with_snapshot(self):
+        """ Test that config is restored from snapshot without parsing the datafile. """
+        test_datafile = json.dumps(self.config_dict_with_features)
+        snapshot = project_config.ProjectConfig(test_datafile, mock.Mock(), mock.Mock()).to_snapshot()
+        mock_notification_center = mock.Mock()
+
+        with mock.patch('optimizely.config_manager.BaseConfigManager._validate_instantiation_options'), \
+                mock.patch('optimizely.helpers.validator.is_datafile_valid') as mock_validator, \
+                mock.patch('optimizely.project_config.ProjectConfig.__init__') as mock_init:
+            project_config_manager = config_manager.StaticConfigManager(
+                snapshot=snapshot, notification_center=mock_notification_center,
+            )
+
+        mock_validator.assert_not_called()
+        mock_init.assert_not_called()
+        self.assertEqual('1', project_config_manager.get_config().get_revision())
+        self.assertEqual(test_datafile, project_config_manager.get_config().to_datafile())
+        self.assertIsInstance(project_config_manager.optimizely_config, optimizely_config.OptimizelyConfig)
+        mock_notification_center.send_notifications.assert_called_once_with('OPTIMIZELY_CONFIG_UPDATE')
+
+    def test_init__with_invalid_snapshot_falls_back_to_datafile(self):
+        """ Test that datafile is used when snapshot cannot be loaded. """
+        test_datafile = json.dumps(self.config_dict_with_features)
+        mock_logger = mock.Mock()
+
+        with mock.patch('optimizely.config_manager.BaseConfigManager._validate_instantiation_options'):
+            project_config_manager = config_manager.StaticConfigManager(
+                datafile=test_datafile, snapshot=b'invalid_snapshot', logger=mock_logger,
+            )
+
+        mock_logger.error.assert_called_once_with(
+            'Provided config snapshot cannot be loaded (not a config snapshot).'
+        )
+        self.assertEqual('1', project_config_manager.get_config().get_revision())
+
     def test_get_config(self):
         """ Test get_config. """
         test_datafile = json.dumps(self.config_dict_with_features)
@@ -554,6 +596,25 @@ class PollingConfigManagerTest(base.BaseTest):
         self.assertEqual(test_headers['Last-Modified'], project_config_manager.last_modified)
         self.assertIsInstance(project_config_manager.get_config(), project_config.ProjectConfig)
 
+    def test_fetch_datafile__metrics(self, _):
+        """ Test that fetch latencies, failures and config build latencies are recorded. """
+        exporter = InMemoryMetricsExporter()
+        test_response = requests.Response()
+        test_response.status_code = 200
+        test_response._content = json.dumps(self.config_dict_with_features)
+        with mock.patch('requests.Session.get', return_value=test_response):
+            project_config_manager = config_manager.PollingConfigManager(
+                sdk_key='some_key', metrics=MetricsRegistry(exporter)
+            )
+            project_config_manager.stop()
+
+        with mock.patch('requests.Session.get', side_effect=requests.exceptions.RequestException('Error Error !!')):
+            project_config_manager.fetch_datafile()
+
+        self.assertEqual(1, exporter.get_histogram(enums.MetricNames.CONFIG_FETCH_LATENCY).count)
+        self.assertEqual(1, exporter.get_histogram(enums.MetricNames.CONFIG_BUILD_LATENCY).count)
+        self.assertEqual(1, exporter.get_counter(enums.MetricNames.CONFIG_FETCH_FAILURES))
+
     def test_fetch_datafile__exception_polling_thread_failed(self, _):
         """ Test that exception is raised when polling thread stops. """
         sdk_key = 'some_key'
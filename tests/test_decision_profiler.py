@@ -0,0 +1,146 @@
+# Copyright 2026, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import threading
+from unittest import mock
+
+from optimizely import optimizely
+from optimizely import user_profile
+from optimizely.decision_profiler import DecisionProfiler, NoOpDecisionProfiler
+from optimizely.event.event_processor import ForwardingEventProcessor
+from optimizely.helpers.enums import DecisionProfilePhases
+from optimizely.helpers.sdk_settings import OptimizelySdkSettings
+from . import base
+
+
+class DecisionProfilerTest(base.BaseTest):
+    def test_record(self):
+        profiler = DecisionProfiler()
+
+        with profiler.profile_flag('flag_1'):
+            profiler.record(DecisionProfilePhases.BUCKETING, profiler.start_timer())
+            profiler.record(DecisionProfilePhases.BUCKETING, profiler.start_timer())
+        with profiler.profile_flag('flag_2'):
+            profiler.record_audience('audience_1', profiler.start_timer())
+        profiler.record(DecisionProfilePhases.USER_PROFILE, profiler.start_timer())
+
+        report = profiler.get_report()
+        self.assertEqual(2, report['phases'][DecisionProfilePhases.TOTAL]['count'])
+        self.assertEqual(2, report['phases'][DecisionProfilePhases.BUCKETING]['count'])
+        # phases recorded outside of a flag decision only count towards the totals
+        self.assertEqual(1, report['phases'][DecisionProfilePhases.USER_PROFILE]['count'])
+        self.assertEqual({'flag_1', 'flag_2'}, {flag['flag_key'] for flag in report['flags']})
+        flag_1 = next(flag for flag in report['flags'] if flag['flag_key'] == 'flag_1')
+        self.assertEqual({DecisionProfilePhases.TOTAL, DecisionProfilePhases.BUCKETING}, set(flag_1['phases']))
+        self.assertEqual(2, flag_1['phases'][DecisionProfilePhases.BUCKETING]['count'])
+        self.assertEqual('audience_1', report['audiences'][0]['audience_id'])
+        self.assertEqual(1, report['audiences'][0]['count'])
+        json.dumps(report)
+
+        profiler.reset()
+        self.assertEqual({'phases': {}, 'flags': [], 'audiences': []}, profiler.get_report())
+
+    def test_get_report__top_n(self):
+        profiler = DecisionProfiler(top_n=2)
+        for flag_key in ('flag_1', 'flag_2', 'flag_3'):
+            with profiler.profile_flag(flag_key):
+                pass
+        # make flag_3 the most costly flag
+        with profiler.profile_flag('flag_3'):
+            start = profiler.start_timer()
+            while profiler.start_timer() - start < 0.01:
+                pass
+
+        flags = profiler.get_report()['flags']
+        self.assertEqual(2, len(flags))
+        self.assertEqual('flag_3', flags[0]['flag_key'])
+        self.assertEqual(3, len(profiler.get_report(top_n=5)['flags']))
+
+    def test_flags_are_attributed_per_thread(self):
+        profiler = DecisionProfiler()
+        barrier = threading.Barrier(2)
+
+        def decide(flag_key):
+            with profiler.profile_flag(flag_key):
+                barrier.wait()
+                profiler.record(DecisionProfilePhases.BUCKETING, profiler.start_timer())
+
+        threads = [threading.Thread(target=decide, args=(flag_key,)) for flag_key in ('flag_1', 'flag_2')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for flag in profiler.get_report()['flags']:
+            self.assertEqual(1, flag['phases'][DecisionProfilePhases.BUCKETING]['count'])
+
+    def test_no_op_profiler(self):
+        profiler = NoOpDecisionProfiler()
+
+        with profiler.profile_flag('flag_1'):
+            profiler.record(DecisionProfilePhases.BUCKETING, profiler.start_timer())
+            profiler.record_audience('audience_1', profiler.start_timer())
+
+        self.assertFalse(profiler.enabled)
+        self.assertEqual({'phases': {}, 'flags': [], 'audiences': []}, profiler.get_report())
+
+    def test_decide_all(self):
+        profiler = DecisionProfiler()
+        client = optimizely.Optimizely(
+            json.dumps(self.config_dict_with_typed_audiences),
+            event_processor=ForwardingEventProcessor(mock.Mock()),
+            settings=OptimizelySdkSettings(decision_profiler=profiler)
+        )
+        self.assertIs(profiler, client.decision_service.profiler)
+
+        user_context = client.create_user_context('test_user', {'house': 'Gryffindor', 'lasers': 45.5})
+        decisions = user_context.decide_all()
+        client.close()
+
+        report = profiler.get_report()
+        self.assertEqual(len(decisions), report['phases'][DecisionProfilePhases.TOTAL]['count'])
+        for phase in (DecisionProfilePhases.EXPERIMENT_RULES, DecisionProfilePhases.ROLLOUT_RULES,
+                      DecisionProfilePhases.AUDIENCE_EVALUATION, DecisionProfilePhases.BUCKETING):
+            self.assertIn(phase, report['phases'])
+        self.assertEqual(set(decisions), {flag['flag_key'] for flag in report['flags']})
+        self.assertIn(
+            DecisionProfilePhases.EXPERIMENT_RULES,
+            next(flag for flag in report['flags'] if flag['flag_key'] == 'feat_with_var')['phases']
+        )
+        self.assertIn('3468206642', {audience['audience_id'] for audience in report['audiences']})
+        totals = [flag['phases'][DecisionProfilePhases.TOTAL]['total_secs'] for flag in report['flags']]
+        self.assertEqual(sorted(totals, reverse=True), totals)
+
+    def test_decide__user_profile(self):
+        profiler = DecisionProfiler()
+        client = optimizely.Optimizely(
+            json.dumps(self.config_dict_with_features),
+            event_processor=ForwardingEventProcessor(mock.Mock()),
+            user_profile_service=user_profile.UserProfileService(),
+            settings=OptimizelySdkSettings(decision_profiler=profiler)
+        )
+
+        client.create_user_context('test_user').decide('test_feature_in_experiment')
+        client.close()
+
+        report = profiler.get_report()
+        # the profile is loaded and saved once per decide call, looked up and updated for the experiment of the flag
+        self.assertEqual(4, report['phases'][DecisionProfilePhases.USER_PROFILE]['count'])
+        self.assertEqual(2, report['flags'][0]['phases'][DecisionProfilePhases.USER_PROFILE]['count'])
+
+    def test_disabled_by_default(self):
+        client = optimizely.Optimizely(json.dumps(self.config_dict_with_features))
+
+        self.assertIsInstance(client.decision_service.profiler, NoOpDecisionProfiler)
+        client.close()
@@ -21,6 +21,7 @@ from optimizely import optimizely
 from optimizely import optimizely_user_context
 from optimizely import user_profile
 from optimizely.helpers import enums
+from optimizely.helpers.sdk_settings import OptimizelySdkSettings
 from . import base
 
 
@@ -2008,3 +2009,119 @@ class FeatureFlagDecisionTests(base.BaseTest):
         mock_config_logging.debug.assert_called_with(
             'Assigned bucket 4000 to user with bucketing ID "test_user".')
         mock_generate_bucket_value.assert_called_with("test_user211147")
+
+
+class DecisionCacheTests(base.BaseTest):
+    def setUp(self):
+        base.BaseTest.setUp(self)
+        opt_obj = optimizely.Optimizely(
+            json.dumps(self.config_dict_with_features),
+            settings=OptimizelySdkSettings(decision_cache_size=100)
+        )
+        self.project_config = opt_obj.config_manager.get_config()
+        self.decision_service = opt_obj.decision_service
+        self.feature = self.project_config.get_feature_from_key("test_feature_in_experiment_and_rollout")
+
+    def create_user(self, user_id="test_user", attributes=None):
+        return optimizely_user_context.OptimizelyUserContext(optimizely_client=None,
+                                                             logger=None,
+                                                             user_id=user_id,
+                                                             user_attributes=attributes or {})
+
+    def test_init__decision_cache_disabled_by_default(self):
+        """ Test that no decision cache is used unless a size is configured. """
+
+        opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_features))
+
+        self.assertIsNone(opt_obj.decision_service.decision_cache)
+
+    def test_get_decision_for_flag__returns_cached_decision(self):
+        """ Test that repeated decisions for the same user inputs are served from the cache. """
+
+        user = self.create_user(attributes={"test_attribute": "test_value", "unused": 1})
+
+        with mock.patch.object(
+            self.decision_service, "_get_decision_for_flag", wraps=self.decision_service._get_decision_for_flag
+        ) as mock_get_decision:
+            first = self.decision_service.get_decision_for_flag(self.feature, user, self.project_config)
+            user.set_attribute("unused", 2)
+            second = self.decision_service.get_decision_for_flag(self.feature, user, self.project_config)
+
+        self.assertEqual(1, mock_get_decision.call_count)
+        self.assertEqual(first, second)
+        self.assertIsNot(first['reasons'], second['reasons'])
+
+    def test_get_decision_for_flag__evaluates_when_inputs_change(self):
+        """ Test that changing a referenced attribute, the bucketing ID, the user or the revision
+        bypasses cached decisions. """
+
+        with mock.patch.object(
+            self.decision_service, "_get_decision_for_flag", wraps=self.decision_service._get_decision_for_flag
+        ) as mock_get_decision:
+            self.decision_service.get_decision_for_flag(
+                self.feature, self.create_user(attributes={"test_attribute": "test_value"}), self.project_config
+            )
+            self.decision_service.get_decision_for_flag(
+                self.feature, self.create_user(attributes={"test_attribute": "other_value"}), self.project_config
+            )
+            self.decision_service.get_decision_for_flag(
+                self.feature,
+                self.create_user(attributes={"test_attribute": "test_value", "$opt_bucketing_id": "bucket"}),
+                self.project_config
+            )
+            self.decision_service.get_decision_for_flag(
+                self.feature, self.create_user("other_user", {"test_attribute": "test_value"}), self.project_config
+            )
+            with mock.patch.object(self.project_config, "revision", "2"):
+                self.decision_service.get_decision_for_flag(
+                    self.feature, self.create_user(attributes={"test_attribute": "test_value"}), self.project_config
+                )
+
+        self.assertEqual(5, mock_get_decision.call_count)
+
+    def test_get_decision_for_flag__bypasses_cache_for_forced_and_profiled_users(self):
+        """ Test that users with forced decisions, forced variations or a user profile are never served from
+        or stored in the cache. """
+
+        user = self.create_user()
+        tracker = user_profile.UserProfileTracker(user.user_id, user_profile.UserProfileService())
+        tracker.load_user_profile([], None)
+
+        with mock.patch.object(
+            self.decision_service, "_get_decision_for_flag", wraps=self.decision_service._get_decision_for_flag
+        ) as mock_get_decision:
+            self.decision_service.get_decision_for_flag(
+                self.feature, user, self.project_config, user_profile_tracker=tracker
+            )
+            self.assertEqual(0, len(self.decision_service.decision_cache.map))
+
+            self.decision_service.get_decision_for_flag(self.feature, user, self.project_config)
+            self.assertEqual(1, len(self.decision_service.decision_cache.map))
+
+            user.forced_decisions_map[
+                optimizely_user_context.OptimizelyUserContext.OptimizelyDecisionContext(self.feature.key, None)
+            ] = optimizely_user_context.OptimizelyUserContext.OptimizelyForcedDecision("211229")
+            self.decision_service.get_decision_for_flag(self.feature, user, self.project_config)
+            user.forced_decisions_map.clear()
+
+            self.decision_service.forced_variation_map[user.user_id] = {"111127": "111128"}
+            self.decision_service.get_decision_for_flag(self.feature, user, self.project_config)
+
+        self.assertEqual(4, mock_get_decision.call_count)
+
+    def test_decide__cached_decisions_follow_qualified_segments(self):
+        """ Test that cached decisions are keyed on the user's qualification for referenced segments. """
+
+        client = optimizely.Optimizely(
+            json.dumps(self.config_dict_with_audience_segments),
+            settings=OptimizelySdkSettings(decision_cache_size=100)
+        )
+        user = client.create_user_context('user-id')
+
+        user.set_qualified_segments(["odp-segment-1", "odp-segment-none"])
+        self.assertEqual("variation-a", user.decide('flag-segment').variation_key)
+        self.assertEqual("variation-a", user.decide('flag-segment').variation_key)
+
+        user.set_qualified_segments(["odp-segment-2"])
+        self.assertEqual("rollout-variation-on", user.decide('flag-segment').variation_key)
+        self.assertEqual(2, len(client.decision_cache.map))
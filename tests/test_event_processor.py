@@ -27,6 +27,7 @@ from optimizely.event.user_event_factory import UserEventFactory
 from optimizely.event_dispatcher import EventDispatcher as default_event_dispatcher
 from optimizely.helpers import enums
 from optimizely.logger import NoOpLogger
+from optimizely.metrics import InMemoryMetricsExporter, MetricsRegistry
 from . import base
 
 
@@ -526,6 +527,28 @@ class BatchEventProcessorTest(base.BaseTest):
             1, len(self.optimizely.notification_center.notification_listeners[enums.NotificationTypes.LOG_EVENT]),
         )
 
+    def test_metrics(self):
+        exporter = InMemoryMetricsExporter()
+        event_dispatcher = mock.MagicMock()
+        event_dispatcher.dispatch_event.side_effect = [None, Exception('Failed to send.')]
+        self.event_processor = BatchEventProcessor(
+            event_dispatcher, NoOpLogger(), event_queue=self.event_queue, metrics=MetricsRegistry(exporter)
+        )
+
+        user_event = self._build_conversion_event(self.event_name)
+        self.event_processor.process(user_event)
+        self.assertEqual(1, exporter.get_gauge(enums.MetricNames.EVENT_QUEUE_DEPTH))
+
+        self.event_processor._current_batch = [user_event, user_event]
+        self.event_processor._flush_batch()
+        self.event_processor._current_batch = [user_event]
+        self.event_processor._flush_batch()
+
+        batch_sizes = exporter.get_histogram(enums.MetricNames.EVENT_BATCH_SIZE)
+        self.assertEqual((2, 3), (batch_sizes.count, batch_sizes.total))
+        self.assertEqual(2, exporter.get_histogram(enums.MetricNames.EVENT_DISPATCH_LATENCY).count)
+        self.assertEqual(1, exporter.get_counter(enums.MetricNames.EVENT_DISPATCH_FAILURES))
+
     def test_warning_log_level_on_queue_overflow(self):
         """ Test that a warning log is created when events overflow the queue. """
 
@@ -0,0 +1,78 @@
+# Copyright 2026, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+# cumulative time in microseconds `python -X importtime` may report for importing optimizely.optimizely, about twice
+# the import time on a developer machine. Slower machines can raise it with the environment variable.
+IMPORT_TIME_BUDGET_US = int(os.environ.get('OPTIMIZELY_IMPORT_TIME_BUDGET_US') or 200000)
+
+# modules which are only imported on first use of the features needing them
+LAZY_MODULES = [
+    'jsonschema',
+    'requests',
+    'urllib3',
+    'sqlite3',
+    'optimizely.helpers.constants',
+    'optimizely.cmab.cmab_client',
+    'optimizely.cmab.cmab_service',
+    'optimizely.odp.odp_manager',
+    'optimizely.odp.sqlite_cache',
+]
+
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_python(*args):
+    """Run a fresh interpreter, so that modules imported by the tests don't count."""
+    return subprocess.run(
+        [sys.executable, *args], check=True, cwd=REPOSITORY_ROOT, capture_output=True, text=True
+    )
+
+
+class ImportTest(unittest.TestCase):
+    def test_import_does_not_load_lazy_modules(self):
+        script = (
+            'import json, sys; import optimizely.optimizely; '
+            f'print(json.dumps([name for name in {LAZY_MODULES!r} if name in sys.modules]))'
+        )
+
+        self.assertEqual([], json.loads(run_python('-c', script).stdout))
+
+    def test_static_client_does_not_load_http_and_schema_modules(self):
+        datafile = {
+            'version': '4', 'revision': '1', 'projectId': '1', 'accountId': '1', 'attributes': [], 'audiences': [],
+            'experiments': [], 'groups': [], 'rollouts': [], 'featureFlags': [], 'events': [],
+        }
+        script = (
+            'import json, sys; from optimizely import optimizely; '
+            f'client = optimizely.Optimizely({json.dumps(datafile)!r}, skip_json_validation=True); '
+            'client.create_user_context("user").decide_all(); client.close(); '
+            'print(json.dumps([name for name in ("jsonschema", "requests", "urllib3") if name in sys.modules]))'
+        )
+
+        self.assertEqual([], json.loads(run_python('-c', script).stdout))
+
+    def test_import_time(self):
+        stderr = run_python('-X', 'importtime', '-c', 'import optimizely.optimizely').stderr
+
+        # lines are formatted as "import time: self [us] | cumulative | imported package"
+        cumulative = next(
+            int(line.split('|')[1]) for line in stderr.splitlines()
+            if line.startswith('import time:') and line.split('|')[2].strip() == 'optimizely.optimizely'
+        )
+        self.assertLess(cumulative, IMPORT_TIME_BUDGET_US)
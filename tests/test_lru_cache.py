@@ -14,7 +14,11 @@
 from __future__ import annotations
 import time
 from unittest import TestCase
-from optimizely.odp.lru_cache import LRUCache, OptimizelySegmentsCache
+from optimizely.helpers.enums import CacheEvictionCauses, CacheEvictionPolicies, MetricNames
+from optimizely.metrics import InMemoryMetricsExporter, MetricsRegistry
+from optimizely.odp.lru_cache import (
+    ClockCache, LRUCache, OptimizelySegmentsCache, ShardedLRUCache, create_lru_cache, estimate_size_in_bytes
+)
 
 
 class LRUCacheTest(TestCase):
@@ -206,6 +210,442 @@ class LRUCacheTest(TestCase):
 
         self.assertEqual(len(cache.map), max_size // 2)
 
+    def test_save_sweeps_expired_elements(self):
+        cache = LRUCache(1000, 1)
+
+        for i in range(6):
+            cache.save(i, i)
+        for element in cache.map.values():
+            element.timestamp -= 2
+
+        cache.save(6, 6)
+        self.assertEqual([4, 5, 6], list(cache.map))
+
+        cache.map[4].timestamp += 2
+        cache.lookup(4)                          # [5, 6, 4]
+        cache.save(7, 7)
+        self.assertEqual([6, 4, 7], list(cache.map))
+
+        self.assertEqual(
+            {CacheEvictionCauses.CAPACITY: 0, CacheEvictionCauses.MEMORY: 0, CacheEvictionCauses.EXPIRED: 5},
+            cache.get_eviction_counts()
+        )
+
+    def test_remove_expired(self):
+        cache = LRUCache(1000, 1)
+        for i in range(5):
+            cache.save(i, i)
+        cache.map[1].timestamp -= 2
+        cache.map[3].timestamp -= 2
+
+        self.assertEqual(2, cache.remove_expired())
+        self.assertEqual([0, 2, 4], list(cache.map))
+        self.assertEqual(2, cache.get_eviction_counts()[CacheEvictionCauses.EXPIRED])
+
+        self.assertEqual(0, LRUCache(1000, 0).remove_expired())
+
+    def test_lookup_allow_stale(self):
+        cache = LRUCache(1000, 10)
+        cache.save(1, 100)
+        cache.save(2, 200)
+
+        self.assertEqual((100, False), cache.lookup_allow_stale(1, 5))
+
+        cache.map[1].timestamp -= 12
+        cache.map[2].timestamp -= 16
+        self.assertEqual((100, True), cache.lookup_allow_stale(1, 5))
+        self.assertIsNone(cache.lookup_allow_stale(2, 5))
+        self.assertNotIn(2, cache.map)
+        self.assertIsNone(cache.lookup_allow_stale(3, 5))
+        self.assertEqual(1, cache.get_eviction_counts()[CacheEvictionCauses.EXPIRED])
+
+        self.assertIsNone(LRUCache(0, 10).lookup_allow_stale(1, 5))
+
+    def test_max_size_in_bytes(self):
+        segments = ['segment-1', 'segment-2']
+        element_size = estimate_size_in_bytes('user-1') + estimate_size_in_bytes(segments)
+        cache = LRUCache(1000, 0, max_size_in_bytes=2 * element_size)
+
+        cache.save('user-1', segments)
+        cache.save('user-2', segments)
+        self.assertEqual(2 * element_size, cache.get_size_in_bytes())
+
+        cache.save('user-3', segments)
+        self.assertIsNone(cache.peek('user-1'))
+        self.assertEqual(2 * element_size, cache.get_size_in_bytes())
+
+        cache.save('user-3', segments + ['segment-3'])
+        self.assertEqual(['user-3'], list(cache.map))
+
+        cache.remove('user-3')
+        self.assertEqual(0, cache.get_size_in_bytes())
+        self.assertEqual(
+            {CacheEvictionCauses.CAPACITY: 0, CacheEvictionCauses.MEMORY: 2, CacheEvictionCauses.EXPIRED: 0},
+            cache.get_eviction_counts()
+        )
+
+    def test_max_size_in_bytes__custom_size_of(self):
+        cache = LRUCache(1000, 0, max_size_in_bytes=10, size_of=lambda value: len(value))
+
+        cache.save('a', 'xxxx')
+        cache.save('b', 'xxxx')
+        cache.save('c', 'xxxx')
+
+        self.assertEqual(['b', 'c'], list(cache.map))
+        self.assertEqual(10, cache.get_size_in_bytes())
+
+    def test_eviction_counts__capacity(self):
+        cache = LRUCache(2, 0)
+        for i in range(5):
+            cache.save(i, i)
+
+        self.assertEqual(3, cache.get_eviction_counts()[CacheEvictionCauses.CAPACITY])
+        self.assertEqual(0, cache.get_size_in_bytes())
+
+    def test_estimate_size_in_bytes(self):
+        self.assertGreater(estimate_size_in_bytes(['a', 'b']), estimate_size_in_bytes([]))
+        self.assertGreater(
+            estimate_size_in_bytes({'variation_id': '123', 'attributes_hash': 'abc'}),
+            estimate_size_in_bytes({})
+        )
+
+    def test_metrics(self):
+        exporter = InMemoryMetricsExporter()
+        cache = LRUCache(10, 1)
+        cache.set_metrics(MetricsRegistry(exporter), 'segments')
+        cache.save('a', 1)
+
+        cache.lookup('a')
+        cache.lookup('b')
+        cache.lookup_allow_stale('a', 5)
+        cache.map['a'].timestamp -= 2
+        cache.lookup('a')
+
+        self.assertEqual(2, exporter.get_counter(MetricNames.CACHE_HITS, {'cache': 'segments'}))
+        self.assertEqual(2, exporter.get_counter(MetricNames.CACHE_MISSES, {'cache': 'segments'}))
+        self.assertFalse(LRUCache(10, 1).metrics.enabled)
+
     # type checker test
     # confirm that LRUCache matches OptimizelySegmentsCache protocol
     _: OptimizelySegmentsCache = LRUCache(0, 0)
+
+
+class ShardedLRUCacheTest(TestCase):
+    def test_min_config(self):
+        cache = ShardedLRUCache(1000, 2000, 8)
+        self.assertEqual(1000, cache.capacity)
+        self.assertEqual(2000, cache.timeout)
+        self.assertEqual(8, len(cache.shards))
+        self.assertTrue(all(shard.capacity == 125 and shard.timeout == 2000 for shard in cache.shards))
+
+        cache = ShardedLRUCache(0, 0, 0)
+        self.assertEqual(1, len(cache.shards))
+        self.assertEqual(0, cache.shards[0].capacity)
+
+    def test_save_lookup_and_remove(self):
+        cache = ShardedLRUCache(100, 1000, 4)
+
+        for i in range(50):
+            cache.save(f'key-{i}', i)
+
+        self.assertEqual(50, sum(len(shard.map) for shard in cache.shards))
+        self.assertTrue(all(shard.map for shard in cache.shards))
+        for i in range(50):
+            self.assertEqual(i, cache.lookup(f'key-{i}'))
+            self.assertEqual(i, cache.peek(f'key-{i}'))
+
+        cache.remove('key-1')
+        self.assertIsNone(cache.lookup('key-1'))
+        self.assertEqual(2, cache.lookup('key-2'))
+
+        cache.reset()
+        self.assertIsNone(cache.lookup('key-2'))
+        self.assertEqual(0, sum(len(shard.map) for shard in cache.shards))
+
+    def test_size_zero(self):
+        cache = ShardedLRUCache(0, 1000, 4)
+
+        cache.save('1', 100)
+        self.assertIsNone(cache.lookup('1'))
+
+    def test_evicts_least_recently_used_per_shard(self):
+        cache = ShardedLRUCache(2, 1000, 2)
+        shard = cache.shards[0]
+        keys = [key for key in (str(i) for i in range(100)) if cache._get_shard(key) is shard][:2]
+
+        cache.save(keys[0], 0)
+        cache.save(keys[1], 1)
+
+        self.assertIsNone(cache.lookup(keys[0]))
+        self.assertEqual(1, cache.lookup(keys[1]))
+
+    def test_lookup_allow_stale(self):
+        cache = ShardedLRUCache(100, 10, 4)
+        cache.save('1', 100)
+        cache._get_shard('1').map['1'].timestamp -= 12
+
+        self.assertEqual((100, True), cache.lookup_allow_stale('1', 5))
+        self.assertIsNone(cache.lookup_allow_stale('1', 1))
+
+    def test_create_lru_cache(self):
+        self.assertIs(type(create_lru_cache(10, 60)), LRUCache)
+        self.assertIs(type(create_lru_cache(10, 60, 1)), LRUCache)
+
+        cache = create_lru_cache(10, 60, 4)
+        self.assertIsInstance(cache, ShardedLRUCache)
+        self.assertEqual(4, len(cache.shards))
+
+    def test_contention(self):
+        import threading
+
+        cache = ShardedLRUCache(10_000, 600, 16)
+        keys = [f'user-{i}' for i in range(1000)]
+        errors = []
+
+        def work(offset):
+            try:
+                for i in range(5000):
+                    key = keys[(i * 7 + offset) % len(keys)]
+                    if cache.lookup(key) is None:
+                        cache.save(key, [key])
+                    elif i % 100 == 0:
+                        cache.remove(key)
+            except Exception as err:  # pragma: no cover
+                errors.append(err)
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
+        for key in keys:
+            self.assertIn(cache.peek(key), (None, [key]))
+
+    def test_eviction_counts_and_size_in_bytes(self):
+        cache = ShardedLRUCache(4, 1, 2, max_size_in_bytes=10_000)
+        for i in range(20):
+            cache.save(str(i), [str(i)])
+
+        self.assertEqual(4, sum(len(shard.map) for shard in cache.shards))
+        self.assertEqual(16, cache.get_eviction_counts()[CacheEvictionCauses.CAPACITY])
+        self.assertEqual(sum(shard.get_size_in_bytes() for shard in cache.shards), cache.get_size_in_bytes())
+        self.assertTrue(all(shard.max_size_in_bytes == 5000 for shard in cache.shards))
+
+        for shard in cache.shards:
+            for element in shard.map.values():
+                element.timestamp -= 2
+        self.assertEqual(4, cache.remove_expired())
+        self.assertEqual(4, cache.get_eviction_counts()[CacheEvictionCauses.EXPIRED])
+
+    def test_metrics(self):
+        exporter = InMemoryMetricsExporter()
+        cache = ShardedLRUCache(10, 0, 4)
+        cache.set_metrics(MetricsRegistry(exporter), 'cmab')
+        cache.save('a', 1)
+
+        cache.lookup('a')
+        cache.lookup('b')
+
+        self.assertEqual(1, exporter.get_counter(MetricNames.CACHE_HITS, {'cache': 'cmab'}))
+        self.assertEqual(1, exporter.get_counter(MetricNames.CACHE_MISSES, {'cache': 'cmab'}))
+
+    def test_initializes_base_state(self):
+        cache = ShardedLRUCache(10, 1, 2)
+
+        # inherited helpers work on the empty map of the sharded cache itself
+        self.assertEqual(0, len(cache.map))
+        with cache.lock:
+            cache._sweep_expired()
+        self.assertEqual(0, LRUCache.remove_expired(cache))
+        self.assertEqual(0, LRUCache.get_size_in_bytes(cache))
+
+    def test_hit_ratio_of_clock_shards(self):
+        cache = ShardedLRUCache(10, 1000, 2, CacheEvictionPolicies.CLOCK)
+        self.assertEqual(0.0, cache.hit_ratio)
+        cache.save('a', 1)
+        cache.save('b', 2)
+
+        cache.lookup('a')
+        cache.lookup('b')
+        cache.lookup('b')
+        cache.lookup('c')
+
+        self.assertEqual(3, cache.hits)
+        self.assertEqual(1, cache.misses)
+        self.assertEqual(0.75, cache.hit_ratio)
+        self.assertEqual(0.0, ShardedLRUCache(10, 1000, 2).hit_ratio)
+
+    # type checker test
+    # confirm that ShardedLRUCache matches OptimizelySegmentsCache protocol
+    _: OptimizelySegmentsCache = ShardedLRUCache(0, 0)
+
+
+class ClockCacheTest(TestCase):
+    def test_save_and_lookup(self):
+        cache = ClockCache(2, 1000)
+
+        cache.save(1, 100)                       # [1, -]
+        cache.save(2, 200)                       # [1, 2]
+        self.assertEqual(100, cache.lookup(1))   # 1 referenced
+        cache.save(3, 300)                       # 1 gets a second chance, 2 is evicted
+
+        self.assertEqual(100, cache.peek(1))
+        self.assertIsNone(cache.peek(2))
+        self.assertEqual(300, cache.peek(3))
+
+        cache.save(3, 301)
+        self.assertEqual(301, cache.lookup(3))
+        self.assertEqual(2, len(cache.map))
+
+    def test_evicts_unreferenced_in_clock_order(self):
+        cache = ClockCache(3, 1000)
+        for key in (1, 2, 3):
+            cache.save(key, key)
+
+        cache.save(4, 4)                         # replaces 1
+        cache.save(5, 5)                         # replaces 2
+
+        self.assertEqual([None, None, 3, 4, 5], [cache.peek(key) for key in (1, 2, 3, 4, 5)])
+
+    def test_size_zero(self):
+        cache = ClockCache(0, 1000)
+
+        cache.save(1, 100)
+        self.assertIsNone(cache.lookup(1))
+        self.assertEqual(0, cache.hit_ratio)
+
+    def test_timeout(self):
+        cache = ClockCache(10, 1)
+
+        cache.save(1, 100)
+        cache.map[1].timestamp -= 2
+
+        self.assertIsNone(cache.lookup(1))
+        self.assertNotIn(1, cache.map)
+
+    def test_lookup_allow_stale(self):
+        cache = ClockCache(10, 10)
+        cache.save(1, 100)
+        cache.map[1].timestamp -= 12
+
+        self.assertEqual((100, True), cache.lookup_allow_stale(1, 5))
+        self.assertTrue(cache.map[1].referenced)
+        self.assertIsNone(cache.lookup_allow_stale(1, 1))
+        self.assertNotIn(1, cache.map)
+        self.assertIsNone(cache.lookup_allow_stale(1, 5))
+        self.assertEqual((1, 2), (cache.hits, cache.misses))
+
+    def test_remove_reuses_slot(self):
+        cache = ClockCache(2, 1000)
+        cache.save(1, 100)
+        cache.save(2, 200)
+
+        cache.remove(1)
+        cache.remove(3)  # Doesn't exist
+        cache.save(3, 300)
+
+        self.assertEqual(2, len(cache._ring))
+        self.assertIsNone(cache.lookup(1))
+        self.assertEqual(200, cache.lookup(2))
+        self.assertEqual(300, cache.lookup(3))
+
+    def test_reset(self):
+        cache = ClockCache(2, 1000)
+        cache.save(1, 100)
+        cache.save(2, 200)
+
+        cache.reset()
+        self.assertIsNone(cache.lookup(1))
+        self.assertEqual(0, len(cache.map))
+
+        cache.save(3, 300)
+        self.assertEqual(300, cache.lookup(3))
+
+    def test_hit_ratio(self):
+        cache = ClockCache(10, 1000)
+        cache.save(1, 100)
+
+        cache.lookup(1)
+        cache.lookup(1)
+        cache.lookup(1)
+        cache.lookup(2)
+
+        self.assertEqual(3, cache.hits)
+        self.assertEqual(1, cache.misses)
+        self.assertEqual(0.75, cache.hit_ratio)
+
+    def test_metrics(self):
+        exporter = InMemoryMetricsExporter()
+        cache = ClockCache(10, 1000)
+        cache.set_metrics(MetricsRegistry(exporter), 'decision')
+        cache.save(1, 100)
+
+        cache.lookup(1)
+        cache.lookup_allow_stale(1, 5)
+        cache.lookup(2)
+
+        self.assertEqual(2, exporter.get_counter(MetricNames.CACHE_HITS, {'cache': 'decision'}))
+        self.assertEqual(1, exporter.get_counter(MetricNames.CACHE_MISSES, {'cache': 'decision'}))
+
+    def test_admission(self):
+        cache = ClockCache(2, 1000, admission=True)
+        for key in (1, 2):
+            cache.lookup(key)
+            cache.lookup(key)
+            cache.save(key, key)
+
+        cache.lookup(3)
+        cache.save(3, 3)                         # looked up less often than the victim, rejected
+        self.assertIsNone(cache.peek(3))
+
+        for _ in range(3):
+            cache.lookup(3)
+        cache.save(3, 3)                         # now looked up more often, admitted
+        self.assertEqual(3, cache.peek(3))
+        self.assertEqual(2, len(cache.map))
+
+    def test_admission_frequencies_are_aged(self):
+        cache = ClockCache(1, 1000, admission=True)
+
+        for _ in range(9):
+            cache.lookup(1)
+        self.assertEqual(9, cache._estimate(1))
+
+        cache.lookup(2)
+        self.assertEqual(4, cache._estimate(1))
+        self.assertEqual(0, cache._estimate(2))
+
+    def test_create_lru_cache__eviction_policy(self):
+        self.assertIs(type(create_lru_cache(10, 60, eviction_policy=CacheEvictionPolicies.LRU)), LRUCache)
+        self.assertIs(type(create_lru_cache(10, 60, eviction_policy='unknown')), LRUCache)
+
+        cache = create_lru_cache(10, 60, eviction_policy=CacheEvictionPolicies.CLOCK)
+        self.assertIsInstance(cache, ClockCache)
+        self.assertFalse(cache.admission)
+
+        cache = create_lru_cache(10, 60, eviction_policy=CacheEvictionPolicies.TINY_LFU)
+        self.assertIsInstance(cache, ClockCache)
+        self.assertTrue(cache.admission)
+
+        cache = create_lru_cache(10, 60, 2, CacheEvictionPolicies.CLOCK)
+        self.assertIsInstance(cache, ShardedLRUCache)
+        self.assertTrue(all(isinstance(shard, ClockCache) for shard in cache.shards))
+
+    def test_eviction_counts(self):
+        cache = ClockCache(2, 1)
+        for i in range(4):
+            cache.save(i, i)
+        self.assertEqual(2, cache.get_eviction_counts()[CacheEvictionCauses.CAPACITY])
+
+        cache.map[2].timestamp -= 2
+        self.assertIsNone(cache.lookup(2))
+        cache.map[3].timestamp -= 2
+        self.assertEqual(1, cache.remove_expired())
+        self.assertEqual(0, len(cache.map))
+        self.assertEqual(2, cache.get_eviction_counts()[CacheEvictionCauses.EXPIRED])
+
+    # type checker test
+    # confirm that ClockCache matches OptimizelySegmentsCache protocol
+    _: OptimizelySegmentsCache = ClockCache(0, 0)
@@ -0,0 +1,155 @@
+# Copyright 2026, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from unittest import mock
+
+from optimizely import optimizely
+from optimizely.helpers.enums import MetricNames
+from optimizely.helpers.sdk_settings import OptimizelySdkSettings
+from optimizely.metrics import (
+    BaseMetricsExporter, Histogram, InMemoryMetricsExporter, MetricsRegistry, NoOpMetricsRegistry
+)
+from . import base
+
+
+class HistogramTest(base.BaseTest):
+    def test_observe(self):
+        histogram = Histogram((1, 10, 100))
+        for value in (0.5, 2, 3, 50, 500):
+            histogram.observe(value)
+
+        self.assertEqual(5, histogram.count)
+        self.assertEqual([1, 2, 1, 1], histogram.bucket_counts)
+        self.assertEqual(0.5, histogram.min)
+        self.assertEqual(500, histogram.max)
+        self.assertEqual(111.1, histogram.mean)
+
+    def test_get_percentile(self):
+        histogram = Histogram((1, 10, 100))
+        self.assertEqual(0.0, histogram.get_percentile(50))
+
+        for value in (0.5, 2, 3, 50, 500):
+            histogram.observe(value)
+
+        self.assertEqual(1, histogram.get_percentile(20))
+        self.assertEqual(10, histogram.get_percentile(50))
+        self.assertEqual(100, histogram.get_percentile(80))
+        self.assertEqual(500, histogram.get_percentile(99))
+
+        histogram = Histogram((1, 10, 100))
+        histogram.observe(4)
+        self.assertEqual(4, histogram.get_percentile(50))
+
+
+class InMemoryMetricsExporterTest(base.BaseTest):
+    def test_metrics_are_keyed_by_name_and_tags(self):
+        exporter = InMemoryMetricsExporter()
+
+        exporter.increment('hits', 1, {'cache': 'a', 'region': 'eu'})
+        exporter.increment('hits', 2, {'region': 'eu', 'cache': 'a'})
+        exporter.increment('hits', 1, {'cache': 'b'})
+        exporter.set_gauge('depth', 3, None)
+        exporter.set_gauge('depth', 1, None)
+        exporter.observe('latency', 0.002, None)
+
+        self.assertEqual(3, exporter.get_counter('hits', {'cache': 'a', 'region': 'eu'}))
+        self.assertEqual(1, exporter.get_counter('hits', {'cache': 'b'}))
+        self.assertEqual(0, exporter.get_counter('hits'))
+        self.assertEqual(1, exporter.get_gauge('depth'))
+        self.assertIsNone(exporter.get_gauge('missing'))
+        self.assertEqual(1, exporter.get_histogram('latency').count)
+        self.assertIsNone(exporter.get_histogram('latency', {'flag_key': 'x'}))
+        self.assertEqual(
+            {('hits', (('cache', 'a'), ('region', 'eu'))): 3, ('hits', (('cache', 'b'),)): 1},
+            exporter.get_counters()
+        )
+        self.assertEqual({('depth', ()): 1}, exporter.get_gauges())
+        self.assertEqual([('latency', ())], list(exporter.get_histograms()))
+
+        exporter.reset()
+        self.assertEqual({}, exporter.get_counters())
+        self.assertIsNone(exporter.get_histogram('latency'))
+
+    def test_get_histogram_returns_copy(self):
+        exporter = InMemoryMetricsExporter(histogram_bounds=(1, 2))
+        exporter.observe('latency', 1.5, None)
+
+        histogram = exporter.get_histogram('latency')
+        exporter.observe('latency', 1.5, None)
+
+        self.assertEqual(1, histogram.count)
+        self.assertEqual([0, 1, 0], histogram.bucket_counts)
+        self.assertEqual(2, exporter.get_histogram('latency').count)
+
+
+class MetricsRegistryTest(base.BaseTest):
+    def test_forwards_to_exporter(self):
+        exporter = mock.MagicMock(spec=BaseMetricsExporter)
+        metrics = MetricsRegistry(exporter)
+
+        metrics.increment('hits', tags={'cache': 'a'})
+        metrics.set_gauge('depth', 2)
+        metrics.observe('size', 10)
+        metrics.observe_latency('latency', metrics.start_timer())
+
+        exporter.increment.assert_called_once_with('hits', 1, {'cache': 'a'})
+        exporter.set_gauge.assert_called_once_with('depth', 2, None)
+        exporter.observe.assert_any_call('size', 10, None)
+        self.assertEqual('latency', exporter.observe.call_args[0][0])
+        self.assertGreaterEqual(exporter.observe.call_args[0][1], 0)
+
+    def test_exporter_errors_are_logged(self):
+        exporter = mock.MagicMock(spec=BaseMetricsExporter)
+        exporter.increment.side_effect = ValueError('unavailable')
+        mock_logger = mock.MagicMock()
+        metrics = MetricsRegistry(exporter, mock_logger)
+
+        metrics.increment('hits')
+
+        mock_logger.warning.assert_called_once_with('Failed to export metric "hits": unavailable')
+
+    def test_noop_registry(self):
+        metrics = NoOpMetricsRegistry()
+
+        self.assertFalse(metrics.enabled)
+        self.assertTrue(MetricsRegistry().enabled)
+        with mock.patch.object(metrics, 'exporter') as mock_exporter:
+            metrics.increment('hits')
+            metrics.set_gauge('depth', 1)
+            metrics.observe_latency('latency', metrics.start_timer())
+        mock_exporter.increment.assert_not_called()
+        mock_exporter.observe.assert_not_called()
+
+    def test_sdk_records_metrics(self):
+        exporter = InMemoryMetricsExporter()
+        client = optimizely.Optimizely(
+            json.dumps(self.config_dict_with_features),
+            event_dispatcher=mock.MagicMock(),
+            settings=OptimizelySdkSettings(metrics=MetricsRegistry(exporter), decision_cache_size=100)
+        )
+
+        user_context = client.create_user_context('test_user')
+        user_context.decide('test_feature_in_experiment')
+        user_context.decide('test_feature_in_experiment')
+
+        self.assertIsNotNone(exporter.get_histogram(MetricNames.CONFIG_BUILD_LATENCY))
+        self.assertEqual(
+            2, exporter.get_histogram(MetricNames.DECISION_LATENCY, {'flag_key': 'test_feature_in_experiment'}).count
+        )
+        self.assertEqual(1, exporter.get_counter(MetricNames.CACHE_MISSES, {'cache': 'decision'}))
+        self.assertEqual(1, exporter.get_counter(MetricNames.CACHE_HITS, {'cache': 'decision'}))
+        self.assertEqual(1, exporter.get_histogram(MetricNames.BUCKETING_LATENCY).count)
+        self.assertIsNotNone(exporter.get_histogram(MetricNames.AUDIENCE_EVALUATION_LATENCY))
+        self.assertIsNotNone(exporter.get_gauge(MetricNames.EVENT_QUEUE_DEPTH))
+        client.close()
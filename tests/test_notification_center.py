@@ -12,6 +12,7 @@
 # limitations under the License.
 
 from unittest import mock
+import threading
 import unittest
 
 from optimizely import notification_center
@@ -128,6 +129,22 @@ class NotificationCenterTest(unittest.TestCase):
         )
         mock_logger.error.assert_called_once_with('Listener has already been added. Not adding it again.')
 
+    def test_has_listeners(self):
+        """ Test that has_listeners reflects added and removed listeners. """
+
+        test_notification_center = notification_center.NotificationCenter()
+        self.assertFalse(test_notification_center.has_listeners(enums.NotificationTypes.DECISION))
+
+        listener_id = test_notification_center.add_notification_listener(
+            enums.NotificationTypes.DECISION, on_decision_listener
+        )
+        self.assertTrue(test_notification_center.has_listeners(enums.NotificationTypes.DECISION))
+        self.assertFalse(test_notification_center.has_listeners(enums.NotificationTypes.TRACK))
+        self.assertFalse(test_notification_center.has_listeners('invalid_notification_type'))
+
+        test_notification_center.remove_notification_listener(listener_id)
+        self.assertFalse(test_notification_center.has_listeners(enums.NotificationTypes.DECISION))
+
     def test_remove_notification_listener__valid_listener(self):
         """ Test that removing a valid notification listener returns True. """
 
@@ -311,3 +328,146 @@ class NotificationCenterTest(unittest.TestCase):
         mock_logger.exception.assert_called_once_with(
             f'Unknown problem when sending "{enums.NotificationTypes.ACTIVATE}" type notification.'
         )
+
+    def test_send_notifications__async_listener(self):
+        """ Test that asynchronous listeners are called on a background thread and others inline. """
+
+        test_notification_center = notification_center.NotificationCenter()
+        self.addCleanup(test_notification_center.close)
+        delivered = threading.Event()
+        threads = {}
+
+        def async_listener(*args):
+            threads['async'] = (threading.current_thread(), args)
+            delivered.set()
+
+        def sync_listener(*args):
+            threads['sync'] = (threading.current_thread(), args)
+
+        test_notification_center.add_notification_listener(
+            enums.NotificationTypes.DECISION, async_listener, async_delivery=True
+        )
+        test_notification_center.add_notification_listener(enums.NotificationTypes.DECISION, sync_listener)
+        test_notification_center.send_notifications(enums.NotificationTypes.DECISION, 'flag', 'user')
+
+        self.assertEqual((threading.current_thread(), ('flag', 'user')), threads['sync'])
+        self.assertTrue(delivered.wait(5))
+        self.assertIsNot(threading.current_thread(), threads['async'][0])
+        self.assertEqual(('flag', 'user'), threads['async'][1])
+
+    def test_send_notifications__async_listener_receives_copies(self):
+        """ Test that asynchronous listeners receive copies of dicts and lists, which the sender can modify. """
+
+        test_notification_center = notification_center.NotificationCenter()
+        self.addCleanup(test_notification_center.close)
+        release = threading.Event()
+        delivered = threading.Event()
+        received = []
+        shared = object()
+
+        def async_listener(*args):
+            release.wait(5)
+            received.append(args)
+            delivered.set()
+
+        test_notification_center.add_notification_listener(
+            enums.NotificationTypes.DECISION, async_listener, async_delivery=True
+        )
+        decision_info = {'variables': {'a': [1]}, 'reasons': ['reason'], 'object': shared}
+        test_notification_center.send_notifications(enums.NotificationTypes.DECISION, 'flag', decision_info)
+        decision_info['variables']['a'].append(2)
+        decision_info['reasons'].append('other reason')
+        release.set()
+
+        self.assertTrue(delivered.wait(5))
+        self.assertEqual(('flag', {'variables': {'a': [1]}, 'reasons': ['reason'], 'object': shared}), received[0])
+        self.assertIs(shared, received[0][1]['object'])
+
+    def test_send_notifications__async_listener_fails(self):
+        """ Test that exceptions of asynchronous listeners are logged. """
+
+        mock_logger = mock.Mock()
+        test_notification_center = notification_center.NotificationCenter(logger=mock_logger)
+        self.addCleanup(test_notification_center.close)
+
+        def failing_listener(*args):
+            raise ValueError()
+
+        test_notification_center.add_notification_listener(
+            enums.NotificationTypes.TRACK, failing_listener, async_delivery=True
+        )
+        test_notification_center.send_notifications(enums.NotificationTypes.TRACK)
+        test_notification_center.executor.shutdown(wait=True)
+
+        mock_logger.exception.assert_called_once_with(
+            f'Unknown problem when sending "{enums.NotificationTypes.TRACK}" type notification.'
+        )
+
+    def test_send_notifications__async_queue_full(self):
+        """ Test that notifications for asynchronous listeners are dropped once the queue is full. """
+
+        test_notification_center = notification_center.NotificationCenter(async_max_workers=1, async_queue_size=1)
+        self.addCleanup(test_notification_center.close)
+        release = threading.Event()
+        self.addCleanup(release.set)
+        started = threading.Event()
+        calls = []
+
+        def slow_listener(value):
+            started.set()
+            release.wait(5)
+            calls.append(value)
+
+        test_notification_center.add_notification_listener(
+            enums.NotificationTypes.DECISION, slow_listener, async_delivery=True
+        )
+        test_notification_center.send_notifications(enums.NotificationTypes.DECISION, 1)
+        self.assertTrue(started.wait(5))
+        test_notification_center.send_notifications(enums.NotificationTypes.DECISION, 2)
+        test_notification_center.send_notifications(enums.NotificationTypes.DECISION, 3)
+
+        self.assertEqual(1, test_notification_center.get_async_queue_depth())
+        self.assertEqual(1, test_notification_center.get_dropped_notification_count())
+
+        release.set()
+        test_notification_center.executor.shutdown(wait=True)
+        self.assertEqual([1, 2], calls)
+        self.assertEqual(0, test_notification_center.get_async_queue_depth())
+
+    def test_send_notifications__async_queue_full__caller_runs(self):
+        """ Test that notifications are delivered synchronously once the queue is full with the caller_runs policy. """
+
+        test_notification_center = notification_center.NotificationCenter(
+            async_max_workers=1, async_queue_size=0, async_overflow_policy=enums.ExecutorRejectionPolicies.CALLER_RUNS
+        )
+        self.addCleanup(test_notification_center.close)
+        release = threading.Event()
+        self.addCleanup(release.set)
+        threads = []
+
+        def listener(block):
+            threads.append(threading.current_thread())
+            if block:
+                release.wait(5)
+
+        test_notification_center.add_notification_listener(
+            enums.NotificationTypes.DECISION, listener, async_delivery=True
+        )
+        test_notification_center.send_notifications(enums.NotificationTypes.DECISION, True)
+        test_notification_center.send_notifications(enums.NotificationTypes.DECISION, False)
+
+        self.assertIn(threading.current_thread(), threads)
+        self.assertEqual(1, test_notification_center.get_dropped_notification_count())
+
+    def test_remove_notification_listener__async_listener(self):
+        """ Test that removed asynchronous listeners are no longer tracked. """
+
+        test_notification_center = notification_center.NotificationCenter()
+        listener_id = test_notification_center.add_notification_listener(
+            enums.NotificationTypes.DECISION, on_decision_listener, async_delivery=True
+        )
+        self.assertEqual({listener_id}, test_notification_center.async_listener_ids)
+
+        test_notification_center.remove_notification_listener(listener_id)
+        self.assertEqual(set(), test_notification_center.async_listener_ids)
+        self.assertIsNone(test_notification_center.executor)
@@ -22,7 +22,8 @@ from optimizely.odp.odp_config import OdpConfig
 from .base import BaseTest, CopyingMock
 from optimizely.version import __version__
 from optimizely.helpers import validator
-from optimizely.helpers.enums import Errors
+from optimizely.helpers.enums import Errors, MetricNames
+from optimizely.metrics import InMemoryMetricsExporter, MetricsRegistry
 
 
 class MockOdpEventManager(OdpEventManager):
@@ -256,54 +257,143 @@ class OdpEventManagerTest(BaseTest):
         ] * flush_count, any_order=True)
         event_manager.stop()
 
+    def wait_for_calls(self, mock_send, count):
+        """Wait until the processing thread called the mock count times."""
+        deadline = time.time() + 5
+        while mock_send.call_count < count and time.time() < deadline:
+            time.sleep(0.005)
+
     def test_odp_event_manager_retry_failure(self, *args):
         mock_logger = mock.Mock()
         event_manager = OdpEventManager(mock_logger)
+        event_manager.retry_initial_interval = 0.01
         event_manager.start(self.odp_config)
 
         number_of_tries = event_manager.retry_count + 1
 
         with mock.patch.object(
             event_manager.api_manager, 'send_odp_events', new_callable=CopyingMock, return_value=True
-        ) as mock_send, mock.patch('time.sleep') as mock_sleep:
+        ) as mock_send:
             event_manager.send_event(**self.events[0])
             event_manager.send_event(**self.events[1])
             event_manager.flush()
             event_manager.event_queue.join()
+            self.wait_for_calls(mock_send, number_of_tries)
+            event_manager.stop()
 
         mock_send.assert_has_calls(
             [mock.call(self.api_key, self.api_host, self.processed_events)] * number_of_tries
         )
+        self.assertEqual(number_of_tries, mock_send.call_count)
         self.assertEqual(len(event_manager._current_batch), 0)
-        # Verify exponential backoff delays: 0.2s, 0.4s, 0.8s
-        mock_sleep.assert_has_calls([mock.call(0.2), mock.call(0.4), mock.call(0.8)])
-        mock_logger.debug.assert_any_call('Error dispatching ODP events, retrying after 0.2s.')
+        # Verify exponential backoff delays: 0.01s, 0.02s, 0.04s
+        mock_logger.debug.assert_has_calls([
+            mock.call('Error dispatching ODP events, retrying after 0.01s.'),
+            mock.call('Error dispatching ODP events, retrying after 0.02s.'),
+            mock.call('Error dispatching ODP events, retrying after 0.04s.'),
+        ], any_order=True)
         mock_logger.error.assert_called_once_with(
             f'ODP event send failed (Failed after 3 retries: {self.processed_events}).'
         )
-        event_manager.stop()
+
+    def test_odp_event_manager_metrics(self, *args):
+        exporter = InMemoryMetricsExporter()
+        event_manager = OdpEventManager(mock.Mock(), metrics=MetricsRegistry(exporter))
+        event_manager.retry_initial_interval = 0.01
+        event_manager.start(self.odp_config)
+
+        number_of_tries = event_manager.retry_count + 1
+
+        with mock.patch.object(
+            event_manager.api_manager, 'send_odp_events', new_callable=CopyingMock, return_value=True
+        ) as mock_send:
+            event_manager.send_event(**self.events[0])
+            event_manager.send_event(**self.events[1])
+            event_manager.flush()
+            event_manager.event_queue.join()
+            self.wait_for_calls(mock_send, number_of_tries)
+            event_manager.stop()
+
+        batch_sizes = exporter.get_histogram(MetricNames.ODP_EVENT_BATCH_SIZE)
+        self.assertEqual((1, 2), (batch_sizes.count, batch_sizes.total))
+        self.assertEqual(number_of_tries, exporter.get_histogram(MetricNames.ODP_EVENT_DISPATCH_LATENCY).count)
+        self.assertEqual(1, exporter.get_counter(MetricNames.ODP_EVENT_DISPATCH_FAILURES))
+        self.assertIsNotNone(exporter.get_gauge(MetricNames.ODP_EVENT_QUEUE_DEPTH))
 
     def test_odp_event_manager_retry_success(self, *args):
         mock_logger = mock.Mock()
         event_manager = OdpEventManager(mock_logger)
+        event_manager.retry_initial_interval = 0.01
         event_manager.start(self.odp_config)
 
         with mock.patch.object(
             event_manager.api_manager, 'send_odp_events', new_callable=CopyingMock, side_effect=[True, True, False]
-        ) as mock_send, mock.patch('time.sleep') as mock_sleep:
+        ) as mock_send:
             event_manager.send_event(**self.events[0])
             event_manager.send_event(**self.events[1])
             event_manager.flush()
             event_manager.event_queue.join()
+            self.wait_for_calls(mock_send, 3)
+
+            self.assertStrictTrue(event_manager.is_running)
+            event_manager.stop()
 
         mock_send.assert_has_calls([mock.call(self.api_key, self.api_host, self.processed_events)] * 3)
         self.assertEqual(len(event_manager._current_batch), 0)
-        # Verify exponential backoff delays: 0.2s, 0.4s (only 2 delays for 3 attempts)
-        mock_sleep.assert_has_calls([mock.call(0.2), mock.call(0.4)])
-        mock_logger.debug.assert_any_call('Error dispatching ODP events, retrying after 0.2s.')
+        self.assertEqual([], event_manager._retry_batches)
+        mock_logger.debug.assert_any_call('Error dispatching ODP events, retrying after 0.01s.')
+        mock_logger.debug.assert_any_call('Error dispatching ODP events, retrying after 0.02s.')
         mock_logger.error.assert_not_called()
-        self.assertStrictTrue(event_manager.is_running)
-        event_manager.stop()
+
+    def test_odp_event_manager_keeps_sending_while_retry_waits(self, *args):
+        mock_logger = mock.Mock()
+        event_manager = OdpEventManager(mock_logger)
+        event_manager.retry_initial_interval = 60
+        event_manager.start(self.odp_config)
+
+        with mock.patch.object(
+            event_manager.api_manager, 'send_odp_events', new_callable=CopyingMock, side_effect=[True, False, False]
+        ) as mock_send:
+            event_manager.send_event(**self.events[0])
+            event_manager.flush()
+            event_manager.event_queue.join()
+
+            # the failed batch waits for a minute, later batches are sent meanwhile
+            event_manager.send_event(**self.events[1])
+            event_manager.flush()
+            event_manager.event_queue.join()
+            self.assertEqual(2, mock_send.call_count)
+            self.assertEqual(1, len(event_manager._retry_batches))
+
+            # stopping resends the waiting batch without waiting for its backoff
+            event_manager.stop()
+
+        mock_send.assert_has_calls([
+            mock.call(self.api_key, self.api_host, [self.processed_events[0]]),
+            mock.call(self.api_key, self.api_host, [self.processed_events[1]]),
+            mock.call(self.api_key, self.api_host, [self.processed_events[0]]),
+        ])
+        mock_logger.error.assert_not_called()
+
+    def test_odp_event_manager_retry_buffer_capacity(self, *args):
+        mock_logger = mock.Mock()
+        event_manager = OdpEventManager(mock_logger, retry_buffer_capacity=1)
+        event_manager.retry_initial_interval = 60
+        event_manager.start(self.odp_config)
+
+        with mock.patch.object(
+            event_manager.api_manager, 'send_odp_events', new_callable=CopyingMock, return_value=True
+        ):
+            for event in self.events:
+                event_manager.send_event(**event)
+                event_manager.flush()
+                event_manager.event_queue.join()
+
+            self.assertEqual(1, len(event_manager._retry_batches))
+            mock_logger.error.assert_called_once_with(
+                f'ODP event send failed (Retry buffer is full: {[self.processed_events[1]]}).'
+            )
+            event_manager.stop()
 
     def test_odp_event_manager_send_failure(self, *args):
         mock_logger = mock.Mock()
@@ -0,0 +1,105 @@
+# Copyright 2026, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from optimizely.odp.odp_http_transport import OdpHttpTransport
+from optimizely.odp.odp_manager import OdpManager
+from optimizely.odp.odp_segment_api_manager import OdpSegmentApiManager
+from . import base
+
+
+class OdpHttpTransportTest(base.BaseTest):
+    def start_server(self):
+        """Start a local HTTP/1.1 server answering every POST with an empty GraphQL response.
+
+        Returns:
+            The server url and the list of client addresses of the accepted connections.
+        """
+        connections = []
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def setup(self):
+                super().setup()
+                connections.append(self.client_address)
+
+            def do_POST(self):
+                self.rfile.read(int(self.headers['Content-Length']))
+                body = json.dumps({'data': {'customer': {'audiences': {'edges': []}}}}).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f'http://127.0.0.1:{server.server_port}', connections
+
+    def fetch_segments(self, transport, api_host, count):
+        api = OdpSegmentApiManager(transport=transport)
+        return [api.fetch_segments('key', api_host, 'fs_user_id', f'user-{i}', ['a']) for i in range(count)]
+
+    def test_reuses_connections(self):
+        api_host, connections = self.start_server()
+        transport = OdpHttpTransport()
+        self.addCleanup(transport.close)
+
+        self.assertEqual([[]] * 5, self.fetch_segments(transport, api_host, 5))
+        self.assertEqual(1, len(connections))
+
+    def test_without_keep_alive(self):
+        api_host, connections = self.start_server()
+        transport = OdpHttpTransport(keep_alive=False)
+        self.addCleanup(transport.close)
+
+        self.assertEqual([[]] * 3, self.fetch_segments(transport, api_host, 3))
+        self.assertEqual(3, len(connections))
+
+    def test_connect_timeout(self):
+        transport = OdpHttpTransport(pool_size=2, connect_timeout=1.5)
+
+        with mock.patch.object(transport.session, 'post') as mock_post:
+            transport.post('https://host/v3/graphql', {'x-api-key': 'key'}, '{}', 10)
+
+        mock_post.assert_called_once_with(url='https://host/v3/graphql', headers={'x-api-key': 'key'}, data='{}',
+                                          timeout=(1.5, 10))
+        self.assertEqual(2, transport.session.get_adapter('https://host')._pool_maxsize)
+        transport.close()
+
+    def test_shared_by_odp_manager(self):
+        manager = OdpManager(False, http_pool_size=4)
+        transport = manager.transport
+
+        self.assertIsInstance(transport, OdpHttpTransport)
+        self.assertIs(transport, manager.segment_manager.api_manager.transport)
+        self.assertIs(transport, manager.event_manager.api_manager.transport)
+        self.assertEqual(4, transport.pool_size)
+
+        with mock.patch.object(transport, 'close') as mock_close:
+            manager.close()
+        mock_close.assert_called_once()
+
+        self.assertIsNone(OdpManager(True).transport)
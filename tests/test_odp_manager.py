@@ -17,7 +17,7 @@ from unittest import mock
 
 from optimizely import version
 from optimizely.helpers.enums import Errors
-from optimizely.odp.lru_cache import OptimizelySegmentsCache, LRUCache
+from optimizely.odp.lru_cache import OptimizelySegmentsCache, LRUCache, ShardedLRUCache
 from optimizely.odp.odp_config import OdpConfig
 from optimizely.odp.odp_event_manager import OdpEventManager
 from optimizely.odp.odp_manager import OdpManager
@@ -446,3 +446,22 @@ class OdpManagerTest(base.BaseTest):
         segments_cache = manager.segment_manager.segments_cache
         self.assertEqual(segments_cache.capacity, 10_000)
         self.assertEqual(segments_cache.timeout, 600)
+
+    def test_segments_cache_max_staleness(self):
+        manager = OdpManager(False, segments_cache_max_staleness_in_secs=300, segments_refresh_queue_size=10)
+        segment_manager = manager.segment_manager
+        self.assertEqual(300, segment_manager.max_staleness_in_secs)
+        self.assertEqual(10, segment_manager.refresh_queue.maxsize)
+
+        with mock.patch.object(segment_manager, 'stop') as mock_stop:
+            manager.close()
+        mock_stop.assert_called_once()
+
+    def test_segments_cache_shards(self):
+        manager = OdpManager(False, segments_cache_shards=4)
+        segments_cache = manager.segment_manager.segments_cache
+        self.assertIsInstance(segments_cache, ShardedLRUCache)
+        self.assertEqual(4, len(segments_cache.shards))
+        self.assertEqual(segments_cache.capacity, 10_000)
+        self.assertEqual(segments_cache.timeout, 600)
+        manager.close()
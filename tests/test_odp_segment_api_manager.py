@@ -280,8 +280,115 @@ class OdpSegmentApiManagerTest(base.BaseTest):
         mock_logger.error.assert_called_once_with('Audience segments fetch failed '
                                                   f'(500 Server Error: None for url: {self.api_host}).')
 
+    def test_fetch_segments_for_users__valid_request(self):
+        with mock.patch('requests.post') as mock_request_post:
+            api = OdpSegmentApiManager()
+            api.fetch_segments_for_users(api_key=self.api_key,
+                                         api_host=self.api_host,
+                                         user_key=self.user_key,
+                                         user_values=['user-1', 'user-2', 'user-1'],
+                                         segments_to_check=["a", "b"])
+
+        test_payload = {
+            'query': 'query($audiences: [String], $u0: String, $u1: String) {'
+            'u0: customer(vuid: $u0) {audiences(subset: $audiences) {edges {node {name state}}}} '
+            'u1: customer(vuid: $u1) {audiences(subset: $audiences) {edges {node {name state}}}}}',
+            'variables': {'audiences': ["a", "b"], 'u0': 'user-1', 'u1': 'user-2'}
+        }
+        request_headers = {'content-type': 'application/json', 'x-api-key': self.api_key}
+        mock_request_post.assert_called_once_with(url=self.api_host + "/v3/graphql",
+                                                  headers=request_headers,
+                                                  data=json.dumps(test_payload),
+                                                  timeout=OdpSegmentApiConfig.REQUEST_TIMEOUT)
+
+    def test_fetch_segments_for_users__success_with_invalid_identifier(self):
+        with mock.patch('requests.post') as mock_request_post, \
+                mock.patch('optimizely.logger') as mock_logger:
+            mock_request_post.return_value = \
+                self.fake_server_response(status_code=200, content=self.batch_response_data)
+
+            api = OdpSegmentApiManager(logger=mock_logger)
+            response = api.fetch_segments_for_users(api_key=self.api_key,
+                                                    api_host=self.api_host,
+                                                    user_key=self.user_key,
+                                                    user_values=['user-1', 'user-2', 'user-3'],
+                                                    segments_to_check=['a', 'b'])
+
+        self.assertEqual({'user-1': ['a'], 'user-2': None, 'user-3': []}, response)
+        mock_logger.warning.assert_called_once_with('Audience segments fetch failed (invalid identifier user-2).')
+        mock_logger.error.assert_not_called()
+
+    def test_fetch_segments_for_users__request_failure(self):
+        with mock.patch('requests.post') as mock_request_post, \
+                mock.patch('optimizely.logger') as mock_logger:
+            mock_request_post.return_value = self.fake_server_response(status_code=500, url=self.api_host)
+
+            api = OdpSegmentApiManager(logger=mock_logger)
+            response = api.fetch_segments_for_users(api_key=self.api_key,
+                                                    api_host=self.api_host,
+                                                    user_key=self.user_key,
+                                                    user_values=['user-1', 'user-2'],
+                                                    segments_to_check=['a'])
+
+        self.assertEqual({'user-1': None, 'user-2': None}, response)
+        mock_logger.error.assert_called_once_with('Audience segments fetch failed '
+                                                  f'(500 Server Error: None for url: {self.api_host}).')
+
+    def test_fetch_segments_for_users__invalid_response_body(self):
+        for content in ('[1, 2]', '"data"', '{"errors": 1}', '{"errors": [{"path": [["u0"]]}]}'):
+            with self.subTest(content=content), mock.patch('requests.post') as mock_request_post, \
+                    mock.patch('optimizely.logger') as mock_logger:
+                mock_request_post.return_value = self.fake_server_response(status_code=200, content=content)
+
+                api = OdpSegmentApiManager(logger=mock_logger)
+                response = api.fetch_segments_for_users(api_key=self.api_key,
+                                                        api_host=self.api_host,
+                                                        user_key=self.user_key,
+                                                        user_values=['user-1', 'user-2'],
+                                                        segments_to_check=['a'])
+
+            self.assertEqual({'user-1': None, 'user-2': None}, response)
+            mock_logger.error.assert_called_once_with('Audience segments fetch failed (decode error).')
+
+    def test_fetch_segments_for_users__splits_large_requests(self):
+        user_values = [f'user-{i}' for i in range(OdpSegmentApiConfig.MAX_USERS_PER_REQUEST * 2 + 1)]
+
+        with mock.patch('requests.post') as mock_request_post:
+            mock_request_post.return_value = self.fake_server_response(status_code=200, content='{"data": {}}')
+            api = OdpSegmentApiManager()
+            response = api.fetch_segments_for_users(api_key=self.api_key,
+                                                    api_host=self.api_host,
+                                                    user_key=self.user_key,
+                                                    user_values=user_values,
+                                                    segments_to_check=['a'])
+
+        self.assertEqual(3, mock_request_post.call_count)
+        last_variables = json.loads(mock_request_post.call_args[1]['data'])['variables']
+        self.assertEqual({'audiences': ['a'], 'u0': user_values[-1]}, last_variables)
+        self.assertEqual(user_values, list(response))
+
     # test json responses
 
+    batch_response_data = """
+        {
+          "errors": [
+            {
+              "message": "Exception while fetching data (/u1) : java.lang.RuntimeException: could not resolve",
+              "path": ["u1"],
+              "extensions": {"code": "INVALID_IDENTIFIER_EXCEPTION", "classification": "DataFetchingException"}
+            }
+          ],
+          "data": {
+            "u0": {"audiences": {"edges": [
+              {"node": {"name": "a", "state": "qualified"}},
+              {"node": {"name": "b", "state": "not_qualified"}}
+            ]}},
+            "u1": null,
+            "u2": {"audiences": {"edges": []}}
+          }
+        }
+    """
+
     good_response_data = """
         {
             "data": {
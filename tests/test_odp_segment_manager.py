@@ -13,6 +13,10 @@
 
 from __future__ import annotations
 
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
 from unittest import mock
 from unittest.mock import call
 
@@ -172,6 +176,260 @@ class OdpSegmentManagerTest(base.BaseTest):
         mock_logger.debug.assert_called_once_with('Making a call to ODP server.')
         mock_logger.error.assert_not_called()
 
+    def test_fetch_segments_for_users_serves_cache_hits_and_batches_misses(self):
+        odp_config = OdpConfig(self.api_key, self.api_host, ["a", "b", "c"])
+        mock_logger = mock.MagicMock()
+        segments_cache = LRUCache(1000, 1000)
+        api = OdpSegmentApiManager(mock_logger)
+        segment_manager = OdpSegmentManager(segments_cache, api, mock_logger)
+        segment_manager.odp_config = odp_config
+        segments_cache.save(segment_manager.make_cache_key(self.user_key, 'user-1'), ['c'])
+
+        with mock.patch.object(api, 'fetch_segments_for_users') as mock_fetch_segments:
+            mock_fetch_segments.return_value = {'user-2': ['a'], 'user-3': None}
+            segments = segment_manager.fetch_qualified_segments_for_users(
+                self.user_key, ['user-1', 'user-2', 'user-3'], []
+            )
+
+        self.assertEqual({'user-1': ['c'], 'user-2': ['a'], 'user-3': None}, segments)
+        mock_fetch_segments.assert_called_once_with(self.api_key, self.api_host, self.user_key,
+                                                    ['user-2', 'user-3'], ["a", "b", "c"])
+        self.assertEqual(['a'], segments_cache.peek(segment_manager.make_cache_key(self.user_key, 'user-2')))
+        self.assertIsNone(segments_cache.peek(segment_manager.make_cache_key(self.user_key, 'user-3')))
+        mock_logger.debug.assert_any_call('ODP cache hits: 1, misses: 2.')
+
+    def test_fetch_segments_for_users_ignore_cache(self):
+        odp_config = OdpConfig(self.api_key, self.api_host, ["a", "b", "c"])
+        segments_cache = LRUCache(1000, 1000)
+        api = OdpSegmentApiManager()
+        segment_manager = OdpSegmentManager(segments_cache, api)
+        segment_manager.odp_config = odp_config
+        segments_cache.save(segment_manager.make_cache_key(self.user_key, 'user-1'), ['c'])
+
+        with mock.patch.object(api, 'fetch_segments_for_users') as mock_fetch_segments:
+            mock_fetch_segments.return_value = {'user-1': ['a']}
+            segments = segment_manager.fetch_qualified_segments_for_users(
+                self.user_key, ['user-1'], [OptimizelyOdpOption.IGNORE_CACHE]
+            )
+
+        self.assertEqual({'user-1': ['a']}, segments)
+        self.assertEqual(['c'], segments_cache.peek(segment_manager.make_cache_key(self.user_key, 'user-1')))
+
+    def test_fetch_segments_for_users_without_config(self):
+        mock_logger = mock.MagicMock()
+        segment_manager = OdpSegmentManager(LRUCache(1000, 1000), logger=mock_logger)
+
+        segments = segment_manager.fetch_qualified_segments_for_users(self.user_key, ['user-1'], [])
+
+        self.assertEqual({'user-1': None}, segments)
+        mock_logger.error.assert_called_once_with('Audience segments fetch failed (api_key/api_host not defined).')
+
+    def test_fetch_segments_for_users_from_local_server(self):
+        requests_received = []
+
+        class GraphQLHandler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                query = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                requests_received.append(query)
+                data = {
+                    alias: {'audiences': {'edges': [{'node': {'name': f'segment-{user_value}', 'state': 'qualified'}}]}}
+                    for alias, user_value in query['variables'].items() if alias != 'audiences'
+                }
+                body = json.dumps({'data': data}).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = HTTPServer(('127.0.0.1', 0), GraphQLHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        api_host = f'http://127.0.0.1:{server.server_port}'
+        segment_manager = OdpSegmentManager(LRUCache(1000, 1000))
+        segment_manager.odp_config = OdpConfig(self.api_key, api_host, ['segment-user-0'])
+        user_values = [f'user-{i}' for i in range(150)]
+
+        segments = segment_manager.fetch_qualified_segments_for_users(self.user_key, user_values, [])
+        self.assertEqual({user_value: [f'segment-{user_value}'] for user_value in user_values}, segments)
+        self.assertEqual(2, len(requests_received))
+
+        # every user is now served from the cache
+        segments = segment_manager.fetch_qualified_segments_for_users(self.user_key, user_values[:10], [])
+        self.assertEqual(['segment-user-9'], segments['user-9'])
+        self.assertEqual(2, len(requests_received))
+
+    def test_concurrent_cache_misses_share_one_fetch(self):
+        odp_config = OdpConfig(self.api_key, self.api_host, ["a", "b", "c"])
+        segments_cache = LRUCache(1000, 1000)
+        api = OdpSegmentApiManager()
+        segment_manager = OdpSegmentManager(segments_cache, api)
+        segment_manager.odp_config = odp_config
+        release = threading.Event()
+        results = []
+
+        def fetch_segments(*args):
+            release.wait(5)
+            return ['a']
+
+        def fetch_qualified_segments():
+            results.append(segment_manager.fetch_qualified_segments(self.user_key, self.user_value, []))
+
+        with mock.patch.object(api, 'fetch_segments', side_effect=fetch_segments) as mock_fetch_segments:
+            threads = [threading.Thread(target=fetch_qualified_segments) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            deadline = time.time() + 5
+            while segment_manager.get_coalesced_request_count() < 3 and time.time() < deadline:
+                time.sleep(0.001)
+            release.set()
+            for thread in threads:
+                thread.join()
+
+            # ignoring the cache always fetches
+            segment_manager.fetch_qualified_segments(self.user_key, self.user_value, [OptimizelyOdpOption.IGNORE_CACHE])
+
+        self.assertEqual([['a']] * 4, results)
+        self.assertEqual(2, mock_fetch_segments.call_count)
+        self.assertEqual(3, segment_manager.get_coalesced_request_count())
+
+    def make_stale_segment_manager(self, api, max_staleness_in_secs=300, refresh_queue_size=10):
+        segments_cache = LRUCache(1000, 10)
+        segment_manager = OdpSegmentManager(segments_cache, api, max_staleness_in_secs=max_staleness_in_secs,
+                                            refresh_queue_size=refresh_queue_size)
+        segment_manager.odp_config = OdpConfig(self.api_key, self.api_host, ["a", "b", "c"])
+        self.addCleanup(segment_manager.stop)
+        return segment_manager
+
+    def expire(self, segment_manager, user_value, seconds):
+        cache_key = segment_manager.make_cache_key(self.user_key, user_value)
+        segment_manager.segments_cache.map[cache_key].timestamp -= seconds
+
+    def test_stale_segments_are_served_while_refreshed(self):
+        api = OdpSegmentApiManager()
+        segment_manager = self.make_stale_segment_manager(api)
+        segment_manager.segments_cache.save(segment_manager.make_cache_key(self.user_key, self.user_value), ['a'])
+        self.expire(segment_manager, self.user_value, 20)
+        refreshed = threading.Event()
+
+        def fetch_segments(*args):
+            refreshed.set()
+            return ['b']
+
+        with mock.patch.object(api, 'fetch_segments', side_effect=fetch_segments) as mock_fetch_segments:
+            self.assertEqual(['a'], segment_manager.fetch_qualified_segments(self.user_key, self.user_value, []))
+            self.assertTrue(refreshed.wait(5))
+            segment_manager.stop()
+
+        mock_fetch_segments.assert_called_once_with(self.api_key, self.api_host, self.user_key, self.user_value,
+                                                    ["a", "b", "c"])
+        self.assertEqual(['b'], segment_manager.fetch_qualified_segments(self.user_key, self.user_value, []))
+
+    def test_stale_segments_are_removed_when_refreshed_segments_are_empty(self):
+        api = OdpSegmentApiManager()
+        segment_manager = self.make_stale_segment_manager(api)
+        cache_key = segment_manager.make_cache_key(self.user_key, self.user_value)
+        segment_manager.segments_cache.save(cache_key, ['a'])
+        self.expire(segment_manager, self.user_value, 20)
+
+        with mock.patch.object(api, 'fetch_segments', return_value=[]) as mock_fetch_segments:
+            self.assertEqual(['a'], segment_manager.fetch_qualified_segments(self.user_key, self.user_value, []))
+            for _ in range(500):
+                if mock_fetch_segments.called and not segment_manager._pending_refreshes:
+                    break
+                time.sleep(0.01)
+            segment_manager.stop()
+
+            self.assertIsNone(segment_manager.segments_cache.peek(cache_key))
+            # the user lost all segments, which are no longer served from the stale entry
+            self.assertEqual([], segment_manager.fetch_qualified_segments(self.user_key, self.user_value, []))
+
+        self.assertEqual(2, mock_fetch_segments.call_count)
+
+    def test_segments_past_max_staleness_are_fetched(self):
+        api = OdpSegmentApiManager()
+        segment_manager = self.make_stale_segment_manager(api, max_staleness_in_secs=5)
+        segment_manager.segments_cache.save(segment_manager.make_cache_key(self.user_key, self.user_value), ['a'])
+        self.expire(segment_manager, self.user_value, 20)
+
+        with mock.patch.object(api, 'fetch_segments', return_value=['b']) as mock_fetch_segments:
+            segments = segment_manager.fetch_qualified_segments(self.user_key, self.user_value, [])
+
+        self.assertEqual(['b'], segments)
+        mock_fetch_segments.assert_called_once()
+        self.assertIsNone(segment_manager.refresh_thread)
+
+    def test_refreshes_beyond_queue_size_are_skipped(self):
+        api = OdpSegmentApiManager()
+        segment_manager = self.make_stale_segment_manager(api, refresh_queue_size=2)
+        release = threading.Event()
+        user_values = [f'user-{i}' for i in range(5)]
+        for user_value in user_values:
+            segment_manager.segments_cache.save(segment_manager.make_cache_key(self.user_key, user_value), ['a'])
+        for user_value in user_values:
+            self.expire(segment_manager, user_value, 20)
+
+        def fetch_segments(*args):
+            release.wait(5)
+            return ['b']
+
+        with mock.patch.object(api, 'fetch_segments', side_effect=fetch_segments) as mock_fetch_segments:
+            for user_value in user_values + user_values:
+                self.assertEqual(['a'], segment_manager.fetch_qualified_segments(self.user_key, user_value, []))
+            release.set()
+            for _ in range(500):
+                if not segment_manager._pending_refreshes:
+                    break
+                time.sleep(0.01)
+            segment_manager.stop()
+
+        # one refresh in flight and two queued, the others were skipped and repeated lookups were not queued again
+        self.assertLessEqual(mock_fetch_segments.call_count, 3)
+        self.assertGreaterEqual(mock_fetch_segments.call_count, 2)
+
+    def test_stop_drops_queued_refreshes_without_waiting(self):
+        api = OdpSegmentApiManager()
+        segment_manager = self.make_stale_segment_manager(api, refresh_queue_size=3)
+        started = threading.Event()
+        release = threading.Event()
+        self.addCleanup(release.set)
+        user_values = [f'user-{i}' for i in range(4)]
+        for user_value in user_values:
+            segment_manager.segments_cache.save(segment_manager.make_cache_key(self.user_key, user_value), ['a'])
+        for user_value in user_values:
+            self.expire(segment_manager, user_value, 20)
+
+        def fetch_segments(*args):
+            # a fetch hanging during an ODP outage
+            started.set()
+            release.wait(10)
+            return ['b']
+
+        with mock.patch.object(api, 'fetch_segments', side_effect=fetch_segments) as mock_fetch_segments:
+            segment_manager.fetch_qualified_segments(self.user_key, user_values[0], [])
+            self.assertTrue(started.wait(5))
+            for user_value in user_values[1:]:
+                segment_manager.fetch_qualified_segments(self.user_key, user_value, [])
+            self.assertTrue(segment_manager.refresh_queue.full())
+
+            start = time.time()
+            segment_manager.stop(timeout=0.1)
+            self.assertLess(time.time() - start, 2)
+
+            # refreshes are not queued after stopping
+            segment_manager.fetch_qualified_segments(self.user_key, user_values[1], [])
+            release.set()
+
+        self.assertEqual(1, mock_fetch_segments.call_count)
+        self.assertIsNone(segment_manager.refresh_thread)
+        self.assertLessEqual(segment_manager.refresh_queue.qsize(), 1)
+
     def test_make_correct_cache_key(self):
         segment_manager = OdpSegmentManager(None)
         cache_key = segment_manager.make_cache_key(self.user_key, self.user_value)
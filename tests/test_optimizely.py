@@ -26,8 +26,10 @@ from optimizely import exceptions
 from optimizely import logger
 from optimizely import optimizely
 from optimizely import optimizely_config
+from optimizely.odp.lru_cache import ClockCache, ShardedLRUCache
 from optimizely.odp.odp_config import OdpConfigState
 from optimizely import project_config
+from optimizely import user_profile
 from optimizely import version
 from optimizely.event.event_factory import EventFactory
 from optimizely.helpers import enums
@@ -3733,7 +3735,9 @@ class OptimizelyTest(base.BaseTest):
             'error': False
         }
         # Empty variable usage map for the mocked variation
-        opt_obj.config_manager.get_config().variation_variable_usage_map['111129'] = None
+        project_config = opt_obj.config_manager.get_config()
+        project_config.variation_variable_usage_map['111129'] = None
+        project_config._index_typecast_variable_values(project_config.feature_key_map['test_feature_in_experiment'])
 
         # Boolean
         with mock.patch(
@@ -4680,7 +4684,9 @@ class OptimizelyTest(base.BaseTest):
     def test_get_feature_variable__returns_none_if_unable_to_cast(self):
         """ Test that get_feature_variable_* returns None if unable_to_cast_value """
 
-        opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_features))
+        # Values are type-casted when the config is loaded
+        with mock.patch('optimizely.project_config.ProjectConfig.get_typecast_value', side_effect=ValueError()):
+            opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_features))
         mock_experiment = opt_obj.config_manager.get_config().get_experiment_from_key('test_experiment')
         mock_variation = opt_obj.config_manager.get_config().get_variation_from_id('test_experiment', '111129')
         get_variation_for_feature_return_value = {
@@ -4890,6 +4896,60 @@ class OptimizelyTest(base.BaseTest):
 
         client.close()
 
+    def test_decide_many(self):
+        """ Test that decide_many returns the same decisions as decide_for_keys for every valid user. """
+
+        opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_features))
+        keys = ['test_feature_in_experiment', 'test_feature_in_rollout', 'invalid_flag']
+        users = [('user_1', {'test_attribute': 'test_value'}), (123, None), ('user_2', 'invalid'), ('user_3', None)]
+
+        with mock.patch.object(opt_obj, 'config_manager', wraps=opt_obj.config_manager) as mock_config_manager, \
+                mock.patch.object(opt_obj, '_identify_user') as mock_identify:
+            results = opt_obj.decide_many(users, keys, ['DISABLE_DECISION_EVENT'])
+
+        self.assertEqual(1, mock_config_manager.get_config.call_count)
+        mock_identify.assert_not_called()
+        self.assertEqual(4, len(results))
+        self.assertEqual({}, results[1])
+        self.assertEqual({}, results[2])
+        for (user_id, attributes), decisions in zip(users, results):
+            if not decisions:
+                continue
+            user_context = opt_obj.create_user_context(user_id, attributes)
+            expected = user_context.decide_for_keys(keys, ['DISABLE_DECISION_EVENT'])
+            self.assertEqual(set(expected), set(decisions))
+            for key, decision in decisions.items():
+                self.assertEqual(expected[key].variation_key, decision.variation_key)
+                self.assertEqual(expected[key].enabled, decision.enabled)
+                self.assertEqual(expected[key].rule_key, decision.rule_key)
+                self.assertEqual(user_id, decision.user_context.user_id)
+
+    def test_decide_many__columnar(self):
+        """ Test that decide_many returns one row per decision when columnar results are requested. """
+
+        opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_features))
+        users = [('user_1', None), ('user_2', {'test_attribute': 'test_value'})]
+        keys = ['test_feature_in_experiment', 'test_feature_in_rollout']
+
+        with mock.patch.object(opt_obj.event_processor, 'process') as mock_process:
+            columns = opt_obj.decide_many(users, keys, columnar=True)
+
+        self.assertEqual(['user_1', 'user_1', 'user_2', 'user_2'], columns['user_id'])
+        self.assertEqual(keys * 2, columns['flag_key'])
+        self.assertEqual(
+            {'user_id', 'flag_key', 'enabled', 'variation_key', 'rule_key', 'variables'}, set(columns)
+        )
+        self.assertTrue(all(len(column) == 4 for column in columns.values()))
+        self.assertEqual(4, mock_process.call_count)
+
+    def test_decide_many__invalid_config(self):
+        """ Test that decide_many returns empty results when the SDK is not ready. """
+
+        opt_obj = optimizely.Optimizely('invalid_datafile')
+
+        self.assertEqual([], opt_obj.decide_many([('user_1', None)]))
+        self.assertEqual([], opt_obj.decide_many([('user_1', None)], columnar=True)['user_id'])
+
 
 class OptimizelyWithExceptionTest(base.BaseTest):
     def setUp(self):
@@ -5433,6 +5493,99 @@ class OptimizelyWithLoggingTest(base.BaseTest):
         mock_logger.error.assert_not_called()
         client.close()
 
+    def test_sdk_settings__accept_cache_shards(self):
+        mock_logger = mock.Mock()
+        sdk_settings = OptimizelySdkSettings(segments_cache_shards=4, cmab_cache_shards=8)
+        client = optimizely.Optimizely(
+            json.dumps(self.config_dict_with_audience_segments),
+            logger=mock_logger,
+            settings=sdk_settings
+        )
+        segments_cache = client.odp_manager.segment_manager.segments_cache
+        self.assertIsInstance(segments_cache, ShardedLRUCache)
+        self.assertEqual(4, len(segments_cache.shards))
+        self.assertIsInstance(client.cmab_service.cmab_cache, ShardedLRUCache)
+        self.assertEqual(8, len(client.cmab_service.cmab_cache.shards))
+
+        mock_logger.error.assert_not_called()
+        client.close()
+
+    def test_sdk_settings__accept_cache_eviction_policies(self):
+        mock_logger = mock.Mock()
+        sdk_settings = OptimizelySdkSettings(
+            segments_cache_eviction_policy=enums.CacheEvictionPolicies.TINY_LFU,
+            cmab_cache_eviction_policy=enums.CacheEvictionPolicies.CLOCK
+        )
+        client = optimizely.Optimizely(
+            json.dumps(self.config_dict_with_audience_segments),
+            logger=mock_logger,
+            settings=sdk_settings
+        )
+        segments_cache = client.odp_manager.segment_manager.segments_cache
+        self.assertIsInstance(segments_cache, ClockCache)
+        self.assertTrue(segments_cache.admission)
+        self.assertIsInstance(client.cmab_service.cmab_cache, ClockCache)
+        self.assertFalse(client.cmab_service.cmab_cache.admission)
+
+        mock_logger.error.assert_not_called()
+        client.close()
+
+    def test_sdk_settings__accept_cache_max_size_in_bytes(self):
+        mock_logger = mock.Mock()
+        sdk_settings = OptimizelySdkSettings(
+            segments_cache_max_size_in_bytes=1_000_000, cmab_cache_max_size_in_bytes=2_000_000
+        )
+        client = optimizely.Optimizely(
+            json.dumps(self.config_dict_with_audience_segments),
+            logger=mock_logger,
+            settings=sdk_settings
+        )
+        self.assertEqual(1_000_000, client.odp_manager.segment_manager.segments_cache.max_size_in_bytes)
+        self.assertEqual(2_000_000, client.cmab_service.cmab_cache.max_size_in_bytes)
+
+        mock_logger.error.assert_not_called()
+        client.close()
+
+    def test_sdk_settings__accept_segments_cache_max_staleness(self):
+        sdk_settings = OptimizelySdkSettings(segments_cache_max_staleness_in_secs=120, segments_refresh_queue_size=50)
+        client = optimizely.Optimizely(json.dumps(self.config_dict_with_audience_segments), settings=sdk_settings)
+
+        segment_manager = client.odp_manager.segment_manager
+        self.assertEqual(120, segment_manager.max_staleness_in_secs)
+        self.assertEqual(50, segment_manager.refresh_queue.maxsize)
+        client.close()
+
+    def test_sdk_settings__accept_odp_http_settings(self):
+        sdk_settings = OptimizelySdkSettings(
+            odp_http_pool_size=3, odp_http_keep_alive=False, odp_http_connect_timeout=2
+        )
+        client = optimizely.Optimizely(json.dumps(self.config_dict_with_audience_segments), settings=sdk_settings)
+
+        transport = client.odp_manager.transport
+        self.assertEqual((3, False, 2), (transport.pool_size, transport.keep_alive, transport.connect_timeout))
+        with mock.patch.object(transport, 'close') as mock_close:
+            client.close()
+        mock_close.assert_called_once()
+
+    def test_sdk_settings__accept_user_profile_write_behind(self):
+        ups = user_profile.UserProfileService()
+        client = optimizely.Optimizely(
+            json.dumps(self.config_dict), user_profile_service=ups,
+            settings=OptimizelySdkSettings(user_profile_write_behind=True)
+        )
+
+        write_behind = client.decision_service.user_profile_service
+        self.assertIsInstance(write_behind, user_profile.WriteBehindUserProfileService)
+        self.assertIs(ups, write_behind.user_profile_service)
+        self.assertIs(write_behind, client.user_profile_service)
+
+        profile = {'user_id': 'test_user', 'experiment_bucket_map': {'111127': {'variation_id': '111129'}}}
+        with mock.patch.object(ups, 'save') as mock_save:
+            write_behind.save(profile)
+            client.close()
+        mock_save.assert_called_once_with(profile)
+        self.assertFalse(write_behind.thread.is_alive())
+
     def test_sdk_settings__use_default_cache_size_and_timeout_when_odp_flush_interval_none(self):
         mock_logger = mock.Mock()
         sdk_settings = OptimizelySdkSettings()
@@ -5582,7 +5735,7 @@ class OptimizelyWithLoggingTest(base.BaseTest):
             json.dumps(self.config_dict_with_audience_segments),
             logger=mock_logger,
         )
-        with mock.patch('requests.post', return_value=self.fake_server_response(status_code=200)):
+        with mock.patch('requests.Session.post', return_value=self.fake_server_response(status_code=200)):
             client.send_odp_event(type='wow', action='great', identifiers={'amazing': 'fantastic'}, data={})
             client.close()
         mock_logger.error.assert_not_called()
@@ -5596,7 +5749,7 @@ class OptimizelyWithLoggingTest(base.BaseTest):
                 status_code=200,
                 content=json.dumps(self.config_dict_with_audience_segments)
             )
-        ), mock.patch('requests.post', return_value=self.fake_server_response(status_code=200)):
+        ), mock.patch('requests.Session.post', return_value=self.fake_server_response(status_code=200)):
             client = optimizely.Optimizely(sdk_key='test', logger=mock_logger)
             client.send_odp_event(type='wow', action='great', identifiers={'amazing': 'fantastic'}, data={})
             client.close()
@@ -5611,7 +5764,7 @@ class OptimizelyWithLoggingTest(base.BaseTest):
             logger=mock_logger,
             settings=OptimizelySdkSettings(odp_disabled=True)
         )
-        with mock.patch('requests.post', return_value=self.fake_server_response(status_code=200)):
+        with mock.patch('requests.Session.post', return_value=self.fake_server_response(status_code=200)):
             client.send_odp_event(type='wow', action='great', identifiers={'amazing': 'fantastic'}, data={})
             client.close()
         mock_logger.error.assert_called_with('ODP is not enabled.')
@@ -5635,7 +5788,7 @@ class OptimizelyWithLoggingTest(base.BaseTest):
                 status_code=200,
                 content=json.dumps(self.config_dict_with_audience_segments)
             )
-        ), mock.patch('requests.post', return_value=self.fake_server_response(status_code=200)):
+        ), mock.patch('requests.Session.post', return_value=self.fake_server_response(status_code=200)):
             client = optimizely.Optimizely(
                 sdk_key='test',
                 logger=mock_logger,
@@ -0,0 +1,86 @@
+# Copyright 2026, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import threading
+import time
+
+from optimizely.helpers.single_flight import SingleFlight
+from . import base
+
+
+class SingleFlightTest(base.BaseTest):
+    def run_concurrently(self, single_flight, key, fn, count):
+        """Call single_flight.do from count threads while the first call is held in flight."""
+        release = threading.Event()
+        results = []
+        errors = []
+
+        def held():
+            release.wait(5)
+            return fn()
+
+        def call():
+            try:
+                results.append(single_flight.do(key, held))
+            except Exception as err:
+                errors.append(err)
+
+        threads = [threading.Thread(target=call) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        deadline = time.time() + 5
+        while single_flight.get_coalesced_count() < count - 1 and time.time() < deadline:
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        return results, errors
+
+    def test_concurrent_calls_share_result(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        def fn():
+            calls.append(1)
+            return 'value'
+
+        results, errors = self.run_concurrently(single_flight, 'key', fn, 5)
+
+        self.assertEqual(['value'] * 5, results)
+        self.assertEqual([], errors)
+        self.assertEqual(1, len(calls))
+        self.assertEqual(4, single_flight.get_coalesced_count())
+
+        # the key is forgotten once the call finished
+        self.assertEqual('other', single_flight.do('key', lambda: 'other'))
+        self.assertEqual(4, single_flight.get_coalesced_count())
+
+    def test_concurrent_calls_share_exception(self):
+        single_flight = SingleFlight()
+
+        def fn():
+            raise ValueError('failed')
+
+        results, errors = self.run_concurrently(single_flight, 'key', fn, 3)
+
+        self.assertEqual([], results)
+        self.assertEqual(3, len(errors))
+        self.assertTrue(all(isinstance(err, ValueError) for err in errors))
+        self.assertEqual('value', single_flight.do('key', lambda: 'value'))
+
+    def test_different_keys_do_not_wait(self):
+        single_flight = SingleFlight()
+
+        self.assertEqual(1, single_flight.do('key-1', lambda: single_flight.do('key-2', lambda: 1)))
+        self.assertEqual(0, single_flight.get_coalesced_count())
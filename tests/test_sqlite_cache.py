@@ -0,0 +1,236 @@
+# Copyright 2026, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from __future__ import annotations
+import json
+import os
+import shutil
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from optimizely import optimizely
+from optimizely.helpers.enums import CacheEvictionCauses
+from optimizely.helpers.sdk_settings import OptimizelySdkSettings
+from optimizely.odp.lru_cache import OptimizelySegmentsCache
+from optimizely.odp.sqlite_cache import SqliteCache
+from . import base
+
+
+class SqliteCacheTest(base.BaseTest):
+    def setUp(self):
+        base.BaseTest.setUp(self)
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'cache.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_save_and_lookup(self):
+        cache = SqliteCache(self.path, 1000, 600)
+
+        self.assertIsNone(cache.lookup('user-1'))
+        cache.save('user-1', ['segment-1', 'segment-2'])
+        cache.save('user-2', [])
+
+        self.assertEqual(['segment-1', 'segment-2'], cache.lookup('user-1'))
+        self.assertEqual([], cache.lookup('user-2'))
+        self.assertEqual(['segment-1', 'segment-2'], cache.peek('user-1'))
+
+        cache.save('user-1', ['segment-3'])
+        self.assertEqual(['segment-3'], cache.lookup('user-1'))
+
+    def test_shared_between_instances(self):
+        writer = SqliteCache(self.path, 1000, 600, namespace='cmab')
+        reader = SqliteCache(self.path, 1000, 600, namespace='cmab')
+        segments_cache = SqliteCache(self.path, 1000, 600, namespace='segments')
+        value = {'attributes_hash': 'abc', 'variation_id': '123', 'cmab_uuid': 'uuid'}
+
+        writer.save('user-1-rule-1', value)
+
+        self.assertEqual(value, reader.lookup('user-1-rule-1'))
+        self.assertIsNone(segments_cache.lookup('user-1-rule-1'))
+
+        segments_cache.reset()
+        self.assertEqual(value, reader.lookup('user-1-rule-1'))
+        reader.reset()
+        self.assertIsNone(writer.lookup('user-1-rule-1'))
+
+    def test_shared_between_threads(self):
+        cache = SqliteCache(self.path, 1000, 600)
+        errors = []
+
+        def work(thread_index):
+            for i in range(50):
+                cache.save(f'user-{thread_index}-{i}', [str(i)])
+                if cache.lookup(f'user-{thread_index}-{i}') != [str(i)]:
+                    errors.append(f'user-{thread_index}-{i}')
+
+        threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
+        self.assertEqual(['49'], cache.lookup('user-3-49'))
+        self.assertEqual(5, len(cache._connections))
+
+    def test_close_closes_connections_of_all_threads(self):
+        cache = SqliteCache(self.path, 1000, 600)
+        thread = threading.Thread(target=cache.save, args=('user-1', ['segment-1']))
+        thread.start()
+        thread.join()
+        connections = [connection for _, connection in cache._connections]
+        self.assertEqual(2, len(connections))
+
+        cache.close()
+
+        for connection in connections:
+            with self.assertRaises(sqlite3.ProgrammingError):
+                connection.execute('SELECT 1')
+        self.assertEqual([], cache._connections)
+        # the cache opens a new connection when used after close
+        self.assertEqual(['segment-1'], cache.lookup('user-1'))
+
+    @unittest.skipUnless(hasattr(os, 'fork'), 'requires fork')
+    def test_reopens_connection_after_fork(self):
+        cache = SqliteCache(self.path, 1000, 600)
+        cache.save('user-1', ['segment-1'])
+        parent_connection = cache._get_connection()
+
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover
+            # the child must not use the connection opened by its parent
+            ok = cache._get_connection() is not parent_connection and cache.lookup('user-1') == ['segment-1']
+            cache.save('user-2', ['segment-2'])
+            cache.close()
+            os._exit(0 if ok else 1)
+
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(0, status)
+        self.assertIs(parent_connection, cache._get_connection())
+        self.assertEqual(['segment-2'], cache.lookup('user-2'))
+
+    def test_timeout(self):
+        cache = SqliteCache(self.path, 1000, 1)
+        cache.save('user-1', ['segment-1'])
+        cache.save('user-2', ['segment-2'])
+        cache._execute('UPDATE optimizely_cache SET saved_at = saved_at - 2 WHERE key = ?', ('user-1',))
+
+        self.assertIsNone(cache.lookup('user-1'))
+        self.assertIsNone(cache.peek('user-1'))
+        self.assertEqual(['segment-2'], cache.lookup('user-2'))
+
+        cache._execute('UPDATE optimizely_cache SET saved_at = saved_at - 2')
+        self.assertEqual(1, cache.remove_expired())
+        self.assertIsNone(cache.peek('user-2'))
+        self.assertEqual(2, cache.get_eviction_counts()[CacheEvictionCauses.EXPIRED])
+
+    def test_lookup_allow_stale(self):
+        cache = SqliteCache(self.path, 1000, 10)
+        cache.save('user-1', ['segment-1'])
+        self.assertEqual((['segment-1'], False), cache.lookup_allow_stale('user-1', 5))
+
+        cache._execute('UPDATE optimizely_cache SET saved_at = saved_at - 12')
+        self.assertEqual((['segment-1'], True), cache.lookup_allow_stale('user-1', 5))
+        self.assertIsNone(cache.lookup_allow_stale('user-1', 1))
+        self.assertIsNone(cache.peek('user-1'))
+        self.assertIsNone(cache.lookup_allow_stale('user-2', 5))
+
+    def test_capacity(self):
+        cache = SqliteCache(self.path, 2, 600)
+        cache.EVICTION_CHECK_INTERVAL = 1
+
+        cache.save('user-1', ['1'])
+        cache.save('user-2', ['2'])
+        cache._execute('UPDATE optimizely_cache SET accessed_at = accessed_at - 10 WHERE key = ?', ('user-2',))
+        cache.save('user-3', ['3'])
+
+        self.assertEqual(['1'], cache.peek('user-1'))
+        self.assertIsNone(cache.peek('user-2'))
+        self.assertEqual(['3'], cache.peek('user-3'))
+        self.assertEqual(1, cache.get_eviction_counts()[CacheEvictionCauses.CAPACITY])
+        self.assertGreater(cache.get_size_in_bytes(), 0)
+
+    def test_remove(self):
+        cache = SqliteCache(self.path, 1000, 600)
+        cache.save('user-1', ['segment-1'])
+
+        cache.remove('user-1')
+        cache.remove('user-2')  # Doesn't exist
+
+        self.assertIsNone(cache.lookup('user-1'))
+
+    def test_size_zero(self):
+        cache = SqliteCache(self.path, 0, 600)
+
+        cache.save('user-1', ['segment-1'])
+        self.assertIsNone(cache.lookup('user-1'))
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_unserializable_and_corrupt_values_are_misses(self):
+        cache = SqliteCache(self.path, 1000, 600)
+
+        cache.save('user-1', object())
+        self.assertIsNone(cache.lookup('user-1'))
+
+        cache._execute(
+            'INSERT INTO optimizely_cache VALUES (?, ?, ?, 0, 0)', (cache.namespace, 'user-2', b'\x00corrupt')
+        )
+        self.assertIsNone(cache.peek('user-2'))
+        self.assertIsNone(cache.lookup('user-2'))
+
+    def test_database_errors_are_misses(self):
+        cache = SqliteCache(os.path.join(self.directory, 'missing', 'cache.db'), 1000, 600)
+
+        cache.save('user-1', ['segment-1'])
+        self.assertIsNone(cache.lookup('user-1'))
+        self.assertEqual(0, cache.get_size_in_bytes())
+
+    def test_shared_between_processes(self):
+        cache = SqliteCache(self.path, 1000, 600, namespace='segments')
+        script = (
+            'import sys; from optimizely.odp.sqlite_cache import SqliteCache; '
+            'SqliteCache(sys.argv[1], 1000, 600, namespace="segments").save("user-1", ["segment-1"])'
+        )
+
+        repository_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        subprocess.run([sys.executable, '-c', script, self.path], check=True, cwd=repository_root)
+
+        self.assertEqual(['segment-1'], cache.lookup('user-1'))
+
+    def test_used_by_sdk_caches(self):
+        segments_cache = SqliteCache(self.path, 1000, 600, namespace='segments')
+        cmab_cache = SqliteCache(self.path, 1000, 600, namespace='cmab')
+
+        client = optimizely.Optimizely(
+            json.dumps(self.config_dict_with_audience_segments),
+            settings=OptimizelySdkSettings(odp_segments_cache=segments_cache, cmab_cache=cmab_cache)
+        )
+
+        self.assertIs(segments_cache, client.odp_manager.segment_manager.segments_cache)
+        self.assertIs(cmab_cache, client.cmab_service.cmab_cache)
+        with mock.patch.object(segments_cache, 'close') as segments_close, \
+                mock.patch.object(cmab_cache, 'close') as cmab_close:
+            client.close()
+        segments_close.assert_called_once()
+        cmab_close.assert_called_once()
+
+    # type checker test
+    # confirm that SqliteCache matches OptimizelySegmentsCache protocol
+    _: OptimizelySegmentsCache = SqliteCache(':memory:', 0, 0)
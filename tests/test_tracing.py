@@ -0,0 +1,193 @@
+# Copyright 2026, Optimizely
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from unittest import mock
+
+from optimizely import optimizely
+from optimizely.cmab.cmab_client import DefaultCmabClient
+from optimizely.helpers.enums import TracingAttributes, TracingSpanNames
+from optimizely.helpers.sdk_settings import OptimizelySdkSettings
+from optimizely.odp.lru_cache import LRUCache
+from optimizely.odp.odp_config import OdpConfig
+from optimizely.odp.odp_segment_manager import OdpSegmentManager
+from optimizely.tracing import BaseSpan, InMemoryTracer, NoOpTracer, OpenTelemetryTracer
+from optimizely.user_profile import UserProfileService
+from . import base
+
+
+class TracerTest(base.BaseTest):
+    def test_in_memory_tracer__nested_spans(self):
+        tracer = InMemoryTracer()
+
+        with tracer.start_span('parent', {'a': 1}) as parent:
+            with tracer.start_span('child') as child:
+                child.set_attribute('b', True)
+            with self.assertRaises(ValueError):
+                with tracer.start_span('failing'):
+                    raise ValueError('failed')
+        with tracer.start_span('root') as root:
+            pass
+
+        self.assertEqual(['child', 'failing', 'parent', 'root'], [span.name for span in tracer.get_finished_spans()])
+        self.assertIs(parent, child.parent)
+        self.assertIsNone(parent.parent)
+        self.assertIsNone(root.parent)
+        self.assertEqual({'a': 1}, parent.attributes)
+        self.assertEqual({'b': True}, child.attributes)
+        self.assertIsInstance(tracer.get_finished_spans()[1].exception, ValueError)
+        self.assertGreaterEqual(parent.duration, child.duration)
+
+        tracer.reset()
+        self.assertEqual([], tracer.get_finished_spans())
+
+    def test_no_op_tracer(self):
+        tracer = NoOpTracer()
+
+        self.assertFalse(tracer.enabled)
+        self.assertIs(tracer.start_span('a'), tracer.start_span('b'))
+        with self.assertRaises(ValueError):
+            with tracer.start_span('a') as span:
+                span.set_attribute('a', 1)
+                raise ValueError('failed')
+
+    def test_open_telemetry_tracer(self):
+        otel_tracer = mock.MagicMock()
+        context_manager = otel_tracer.start_as_current_span.return_value
+        tracer = OpenTelemetryTracer(otel_tracer)
+
+        with tracer.start_span('span', {'a': 1}) as span:
+            span.set_attribute('b', 2)
+
+        otel_tracer.start_as_current_span.assert_called_once_with('span', attributes={'a': 1})
+        context_manager.__enter__.return_value.set_attribute.assert_called_once_with('b', 2)
+        context_manager.__exit__.assert_called_once_with(None, None, None)
+
+    def test_open_telemetry_tracer__exception(self):
+        otel_tracer = mock.MagicMock()
+        context_manager = otel_tracer.start_as_current_span.return_value
+        error = ValueError('failed')
+
+        def reraise(exc_type, exc_value, traceback):
+            raise exc_value
+
+        context_manager.__exit__.side_effect = reraise
+
+        with self.assertRaises(ValueError):
+            with OpenTelemetryTracer(otel_tracer).start_span('span'):
+                raise error
+
+        self.assertIs(error, context_manager.__exit__.call_args[0][1])
+
+    def test_base_span(self):
+        span = BaseSpan()
+        with mock.patch.object(span, 'end') as mock_end, mock.patch.object(span, 'record_exception') as mock_record:
+            with self.assertRaises(KeyError):
+                with span:
+                    raise KeyError('key')
+
+        mock_end.assert_called_once_with()
+        self.assertIsInstance(mock_record.call_args[0][0], KeyError)
+
+
+class SdkTracingTest(base.BaseTest):
+    def test_decide_spans(self):
+        class Ups(UserProfileService):
+            def lookup(self, user_id):
+                return {'user_id': user_id, 'experiment_bucket_map': {}}
+
+            def save(self, user_profile):
+                pass
+
+        tracer = InMemoryTracer()
+        client = optimizely.Optimizely(
+            json.dumps(self.config_dict_with_features),
+            event_dispatcher=mock.MagicMock(),
+            user_profile_service=Ups(),
+            settings=OptimizelySdkSettings(tracer=tracer)
+        )
+
+        client.create_user_context('test_user').decide_for_keys(['test_feature_in_experiment'])
+        client.close()
+
+        spans = {span.name: span for span in tracer.get_finished_spans()}
+        decide = spans[TracingSpanNames.DECIDE]
+        flag_decision = spans[TracingSpanNames.FLAG_DECISION]
+        self.assertEqual(1, decide.attributes[TracingAttributes.FLAG_COUNT])
+        self.assertIs(decide, flag_decision.parent)
+        self.assertIs(decide, spans[TracingSpanNames.USER_PROFILE_LOAD].parent)
+        self.assertIs(decide, spans[TracingSpanNames.USER_PROFILE_SAVE].parent)
+        self.assertEqual(
+            {
+                TracingAttributes.FLAG_KEY: 'test_feature_in_experiment',
+                TracingAttributes.RULE_KEY: 'test_experiment',
+                TracingAttributes.VARIATION_KEY: 'control',
+                TracingAttributes.DECISION_SOURCE: 'feature-test',
+            },
+            flag_decision.attributes
+        )
+        self.assertEqual(1, spans[TracingSpanNames.USER_PROFILE_SAVE].attributes[TracingAttributes.EXPERIMENT_COUNT])
+        dispatch = spans[TracingSpanNames.EVENT_DISPATCH]
+        self.assertIsNone(dispatch.parent)
+        self.assertEqual(1, dispatch.attributes[TracingAttributes.EVENT_COUNT])
+        self.assertGreater(dispatch.attributes[TracingAttributes.BYTES], 0)
+
+    def test_flag_decision_span__cache_hit(self):
+        tracer = InMemoryTracer()
+        client = optimizely.Optimizely(
+            json.dumps(self.config_dict_with_features),
+            event_dispatcher=mock.MagicMock(),
+            settings=OptimizelySdkSettings(tracer=tracer, decision_cache_size=100)
+        )
+
+        user_context = client.create_user_context('test_user')
+        user_context.decide('test_feature_in_experiment')
+        user_context.decide('test_feature_in_experiment')
+        client.close()
+
+        cache_hits = [
+            span.attributes[TracingAttributes.CACHE_HIT]
+            for span in tracer.get_finished_spans() if span.name == TracingSpanNames.FLAG_DECISION
+        ]
+        self.assertEqual([False, True], cache_hits)
+
+    def test_cmab_fetch_span(self):
+        tracer = InMemoryTracer()
+        mock_http_client = mock.MagicMock()
+        mock_http_client.post.return_value.status_code = 200
+        mock_http_client.post.return_value.json.return_value = {'predictions': [{'variation_id': 'abc123'}]}
+        client = DefaultCmabClient(http_client=mock_http_client, tracer=tracer)
+
+        client.fetch_decision('rule-1', 'user-1', {'age': 20}, 'uuid-1')
+
+        span = tracer.get_finished_spans()[0]
+        self.assertEqual(TracingSpanNames.CMAB_FETCH, span.name)
+        self.assertEqual('rule-1', span.attributes[TracingAttributes.RULE_KEY])
+        self.assertGreater(span.attributes[TracingAttributes.BYTES], 0)
+
+    def test_odp_segments_fetch_span(self):
+        tracer = InMemoryTracer()
+        segment_manager = OdpSegmentManager(LRUCache(1000, 1000), tracer=tracer)
+        segment_manager.odp_config = OdpConfig('valid', 'host', ['a', 'b'])
+
+        with mock.patch.object(segment_manager.api_manager, 'fetch_segments', return_value=['a']):
+            segment_manager.fetch_qualified_segments('fs_user_id', 'user-1', [])
+            segment_manager.fetch_qualified_segments('fs_user_id', 'user-1', [])
+
+        self.assertEqual(
+            [
+                {TracingAttributes.CACHE_HIT: False, TracingAttributes.SEGMENT_COUNT: 1},
+                {TracingAttributes.CACHE_HIT: True, TracingAttributes.SEGMENT_COUNT: 1},
+            ],
+            [span.attributes for span in tracer.get_finished_spans()]
+        )
@@ -10,6 +10,8 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import copy
+from concurrent.futures import Future
 import json
 
 from unittest import mock
@@ -19,6 +21,7 @@ from optimizely import optimizely, decision_service
 from optimizely.decision.optimizely_decide_option import OptimizelyDecideOption as DecideOption
 from optimizely.decision.optimizely_decision import OptimizelyDecision
 from optimizely.helpers import enums
+from optimizely.helpers.sdk_settings import OptimizelySdkSettings
 from optimizely.optimizely_user_context import OptimizelyUserContext
 from optimizely.user_profile import UserProfileService
 from . import base
@@ -238,6 +241,8 @@ class UserContextTest(base.BaseTest):
         ), mock.patch(
             'optimizely.notification_center.NotificationCenter.send_notifications'
         ) as mock_broadcast_decision, mock.patch(
+            'optimizely.notification_center.NotificationCenter.has_listeners', return_value=True
+        ), mock.patch(
             'optimizely.optimizely.Optimizely._send_impression_event'
         ) as mock_send_event:
 
@@ -301,6 +306,124 @@ class UserContextTest(base.BaseTest):
             None
         )
 
+    def test_decide__json_variables_are_not_shared(self):
+        opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_features))
+        user_context = opt_obj.create_user_context('test_user')
+
+        with mock.patch('optimizely.project_config.json.loads') as mock_loads:
+            decision = user_context.decide('test_feature_in_experiment', [DecideOption.DISABLE_DECISION_EVENT])
+        mock_loads.assert_not_called()
+
+        decision.variables['object']['test'] = 0
+        decision = user_context.decide('test_feature_in_experiment', [DecideOption.DISABLE_DECISION_EVENT])
+        self.assertNotEqual(0, decision.variables['object']['test'])
+
+    def test_decide__variables_are_resolved_on_access(self):
+        opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_features))
+        user_context = opt_obj.create_user_context('test_user')
+
+        with mock.patch(
+            'optimizely.project_config.ProjectConfig.get_typecast_variable_values',
+            wraps=opt_obj.config_manager.get_config().get_typecast_variable_values
+        ) as mock_get_values:
+            decisions = user_context.decide_all([DecideOption.DISABLE_DECISION_EVENT])
+            mock_get_values.assert_not_called()
+
+            decision = decisions['test_feature_in_experiment']
+            self.assertEqual(7, len(decision.variables))
+            self.assertEqual(999, decision.variables['count'])
+            self.assertIs(decision.variables, decision.variables)
+            self.assertEqual(1, mock_get_values.call_count)
+
+        self.assertRaises(KeyError, lambda: decision.variables['invalid'])
+        self.assertIs(decision.variables, decision.as_json()['variables'])
+
+    def test_decide__variables_are_looked_up_only_when_missing_from_typecast_values(self):
+        opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_features))
+        project_config = opt_obj.config_manager.get_config()
+        # user1 is bucketed into the variation enabling the flag
+        user_context = opt_obj.create_user_context('user1')
+
+        with mock.patch.object(
+            project_config, 'get_variable_value_for_variation', wraps=project_config.get_variable_value_for_variation
+        ) as mock_get_value, mock.patch.object(opt_obj, 'logger') as mock_logger:
+            decision = user_context.decide('test_feature_in_experiment', [DecideOption.DISABLE_DECISION_EVENT])
+            self.assertEqual(4243, decision.variables['count'])
+            mock_get_value.assert_not_called()
+            mock_logger.debug.assert_not_called()
+
+            with mock.patch.object(project_config, 'get_typecast_variable_values', return_value=None):
+                decision = user_context.decide('test_feature_in_experiment', [DecideOption.DISABLE_DECISION_EVENT])
+                self.assertEqual(4243, decision.variables['count'])
+            self.assertEqual(7, mock_get_value.call_count)
+
+    def test_decide__variables_are_resolved_for_decision_listeners(self):
+        opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_features))
+        notified_variables = []
+        opt_obj.notification_center.add_notification_listener(
+            enums.NotificationTypes.DECISION, lambda *args: notified_variables.append(args[3]['variables'])
+        )
+        user_context = opt_obj.create_user_context('test_user')
+
+        decision = user_context.decide('test_feature_in_experiment', [DecideOption.DISABLE_DECISION_EVENT])
+
+        self.assertIs(decision.variables, notified_variables[0])
+        self.assertEqual(999, notified_variables[0]['count'])
+
+    def test_decide__async_decision_listener_receives_a_copy_of_the_decision(self):
+        opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_features))
+        self.addCleanup(opt_obj.close)
+        release = threading.Event()
+        delivered = threading.Event()
+        notified = []
+
+        def listener(*args):
+            release.wait(5)
+            notified.append(args[3])
+            delivered.set()
+
+        opt_obj.notification_center.add_notification_listener(
+            enums.NotificationTypes.DECISION, listener, async_delivery=True
+        )
+        user_context = opt_obj.create_user_context('test_user')
+
+        decision = user_context.decide(
+            'test_feature_in_experiment', [DecideOption.DISABLE_DECISION_EVENT, DecideOption.INCLUDE_REASONS]
+        )
+        expected_variables = copy.deepcopy(decision.variables)
+        expected_reasons = list(decision.reasons)
+        decision.variables['count'] = 1
+        decision.variables['object']['test'] = 1
+        decision.reasons.append('modified by the caller')
+        release.set()
+
+        self.assertTrue(delivered.wait(5))
+        self.assertEqual(expected_variables, notified[0]['variables'])
+        self.assertEqual(expected_reasons, notified[0]['reasons'])
+
+    def test_decide__variables_are_a_dict_with_and_without_listeners(self):
+        for with_listener in (False, True):
+            with self.subTest(with_listener=with_listener):
+                opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_features))
+                if with_listener:
+                    opt_obj.notification_center.add_notification_listener(
+                        enums.NotificationTypes.DECISION, lambda *args: None
+                    )
+                user_context = opt_obj.create_user_context('test_user')
+
+                decision = user_context.decide('test_feature_in_experiment', [DecideOption.DISABLE_DECISION_EVENT])
+
+                self.assertIsInstance(decision.variables, dict)
+                self.assertEqual(decision.variables, json.loads(json.dumps(decision.variables)))
+                as_json = json.loads(json.dumps(decision.as_json()))
+                self.assertEqual(decision.variables, as_json['variables'])
+                decision.variables['x'] = 1
+                self.assertEqual(1, decision.variables['x'])
+                self.assertEqual(999, decision.variables['count'])
+
+                decision.variables = {'y': 2}
+                self.assertEqual({'y': 2}, decision.as_json()['variables'])
+
     def test_decide__feature_test__send_flag_decision_false(self):
         opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_features))
         project_config = opt_obj.config_manager.get_config()
@@ -320,6 +443,8 @@ class UserContextTest(base.BaseTest):
         ), mock.patch(
             'optimizely.notification_center.NotificationCenter.send_notifications'
         ) as mock_broadcast_decision, mock.patch(
+            'optimizely.notification_center.NotificationCenter.has_listeners', return_value=True
+        ), mock.patch(
             'optimizely.optimizely.Optimizely._send_impression_event'
         ) as mock_send_event:
 
@@ -360,6 +485,8 @@ class UserContextTest(base.BaseTest):
         with mock.patch(
             'optimizely.notification_center.NotificationCenter.send_notifications'
         ) as mock_broadcast_decision, mock.patch(
+            'optimizely.notification_center.NotificationCenter.has_listeners', return_value=True
+        ), mock.patch(
             'optimizely.optimizely.Optimizely._send_impression_event'
         ) as mock_send_event:
 
@@ -435,6 +562,8 @@ class UserContextTest(base.BaseTest):
         with mock.patch(
             'optimizely.notification_center.NotificationCenter.send_notifications'
         ) as mock_broadcast_decision, mock.patch(
+            'optimizely.notification_center.NotificationCenter.has_listeners', return_value=True
+        ), mock.patch(
             'optimizely.optimizely.Optimizely._send_impression_event'
         ) as mock_send_event:
 
@@ -506,6 +635,8 @@ class UserContextTest(base.BaseTest):
         ), mock.patch(
             'optimizely.notification_center.NotificationCenter.send_notifications'
         ) as mock_broadcast_decision, mock.patch(
+            'optimizely.notification_center.NotificationCenter.has_listeners', return_value=True
+        ), mock.patch(
             'optimizely.optimizely.Optimizely._send_impression_event'
         ) as mock_send_event:
 
@@ -588,6 +719,8 @@ class UserContextTest(base.BaseTest):
         ), mock.patch(
             'optimizely.notification_center.NotificationCenter.send_notifications'
         ) as mock_broadcast_decision, mock.patch(
+            'optimizely.notification_center.NotificationCenter.has_listeners', return_value=True
+        ), mock.patch(
             'optimizely.optimizely.Optimizely._send_impression_event'
         ) as mock_send_event:
 
@@ -655,6 +788,8 @@ class UserContextTest(base.BaseTest):
         ), mock.patch(
             'optimizely.notification_center.NotificationCenter.send_notifications'
         ) as mock_broadcast_decision, mock.patch(
+            'optimizely.notification_center.NotificationCenter.has_listeners', return_value=True
+        ), mock.patch(
             'optimizely.optimizely.Optimizely._send_impression_event'
         ) as mock_send_event:
 
@@ -725,6 +860,8 @@ class UserContextTest(base.BaseTest):
         ), mock.patch(
             'optimizely.notification_center.NotificationCenter.send_notifications'
         ) as mock_broadcast_decision, mock.patch(
+            'optimizely.notification_center.NotificationCenter.has_listeners', return_value=True
+        ), mock.patch(
             'optimizely.optimizely.Optimizely._send_impression_event'
         ) as mock_send_event:
 
@@ -792,6 +929,8 @@ class UserContextTest(base.BaseTest):
         ), mock.patch(
             'optimizely.notification_center.NotificationCenter.send_notifications'
         ) as mock_broadcast_decision, mock.patch(
+            'optimizely.notification_center.NotificationCenter.has_listeners', return_value=True
+        ), mock.patch(
             'optimizely.optimizely.Optimizely._send_impression_event'
         ) as mock_send_event:
 
@@ -895,6 +1034,8 @@ class UserContextTest(base.BaseTest):
         ), mock.patch(
             'optimizely.notification_center.NotificationCenter.send_notifications'
         ) as mock_broadcast_decision, mock.patch(
+            'optimizely.notification_center.NotificationCenter.has_listeners', return_value=True
+        ), mock.patch(
             'optimizely.optimizely.Optimizely._send_impression_event'
         ) as mock_send_event:
 
@@ -981,6 +1122,8 @@ class UserContextTest(base.BaseTest):
         ), mock.patch(
             'optimizely.notification_center.NotificationCenter.send_notifications'
         ) as mock_broadcast_decision, mock.patch(
+            'optimizely.notification_center.NotificationCenter.has_listeners', return_value=True
+        ), mock.patch(
             'optimizely.optimizely.Optimizely._send_impression_event'
         ) as mock_send_event:
 
@@ -1441,6 +1584,8 @@ class UserContextTest(base.BaseTest):
         with mock.patch(
             'optimizely.notification_center.NotificationCenter.send_notifications'
         ) as mock_broadcast_decision, mock.patch(
+            'optimizely.notification_center.NotificationCenter.has_listeners', return_value=True
+        ), mock.patch(
             'optimizely.optimizely.Optimizely._send_impression_event'
         ) as mock_send_event:
             decide_decision = user_context.decide('test_feature_in_experiment', ['INCLUDE_REASONS'])
@@ -1916,7 +2061,6 @@ class UserContextTest(base.BaseTest):
         self.assertEqual(user_context_2.user_id, 'test_user')
         self.assertEqual(user_context_2.get_user_attributes(), {})
         self.assertIsNotNone(user_context_2.forced_decisions_map)
-        self.assertIsNot(user_context.forced_decisions_map, user_context_2.forced_decisions_map)
 
         self.assertTrue(user_context_2.get_qualified_segments())
         self.assertEqual(user_context_2.get_qualified_segments(), qualified_segments)
@@ -1929,9 +2073,50 @@ class UserContextTest(base.BaseTest):
         context_with_rule = OptimizelyUserContext.OptimizelyDecisionContext('x', 'y')
         decision_for_rule = OptimizelyUserContext.OptimizelyForcedDecision('z')
         user_context.set_forced_decision(context_with_rule, decision_for_rule)
+        self.assertIsNot(user_context.forced_decisions_map, user_context_2.forced_decisions_map)
         self.assertEqual(user_context.get_forced_decision(context_with_rule).variation_key, 'z')
         self.assertIsNone(user_context_2.get_forced_decision(context_with_rule))
 
+    def test_user_context__clone_copies_state_on_write(self):
+        """
+        Should share state with the clone until either context is modified.
+        """
+        opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_features))
+        user_context = opt_obj.create_user_context("test_user", {"browser": "chrome"})
+        context_with_flag = OptimizelyUserContext.OptimizelyDecisionContext('f1', None)
+        user_context.set_forced_decision(context_with_flag, OptimizelyUserContext.OptimizelyForcedDecision('v1'))
+
+        user_context_2 = user_context._clone()
+        self.assertIs(user_context._user_attributes, user_context_2._user_attributes)
+        self.assertIs(user_context.forced_decisions_map, user_context_2.forced_decisions_map)
+
+        user_context.set_attribute("browser", "firefox")
+        user_context.remove_all_forced_decisions()
+        self.assertEqual({"browser": "chrome"}, user_context_2.get_user_attributes())
+        self.assertEqual(user_context_2.get_forced_decision(context_with_flag).variation_key, 'v1')
+        self.assertTrue(user_context_2.has_forced_decisions())
+        self.assertFalse(user_context.has_forced_decisions())
+
+        user_context_3 = user_context._clone()
+        user_context_3.set_attribute("color", "red")
+        self.assertEqual({"browser": "firefox"}, user_context.get_user_attributes())
+        self.assertEqual({"browser": "firefox", "color": "red"}, user_context_3.get_user_attributes())
+
+    def test_decide__skips_forced_decision_lookup_without_forced_decisions(self):
+        """
+        Should not validate forced decisions per rule when none are set.
+        """
+        opt_obj = optimizely.Optimizely(json.dumps(self.config_dict_with_features))
+        user_context = opt_obj.create_user_context("test_user")
+
+        with mock.patch(
+            'optimizely.decision_service.DecisionService.validated_forced_decision'
+        ) as mock_validated_forced_decision:
+            decision = user_context.decide('test_feature_in_experiment_and_rollout')
+
+        mock_validated_forced_decision.assert_not_called()
+        self.assertEqual('test_feature_in_experiment_and_rollout', decision.flag_key)
+
     def test_forced_decision_sync_return_correct_number_of_calls(self):
         """
         Should return valid number of call on running forced decision calls in thread.
@@ -2122,7 +2307,7 @@ class UserContextTest(base.BaseTest):
         client = optimizely.Optimizely(json.dumps(self.config_dict_with_audience_segments), logger=mock_logger)
         user = OptimizelyUserContext(client, mock_logger, 'user-id')
 
-        with mock.patch('requests.post', return_value=self.fake_server_response(
+        with mock.patch('requests.Session.post', return_value=self.fake_server_response(
             status_code=200, content=json.dumps(self.good_response_data)
         )):
             success = user.fetch_qualified_segments()
@@ -2140,7 +2325,7 @@ class UserContextTest(base.BaseTest):
         client = optimizely.Optimizely(json.dumps(self.config_dict_with_audience_segments), logger=mock_logger)
         user = OptimizelyUserContext(client, mock_logger, 'user-id')
 
-        with mock.patch('requests.post', return_value=self.fake_server_response(
+        with mock.patch('requests.Session.post', return_value=self.fake_server_response(
             status_code=200, content=json.dumps(self.good_response_data)
         )):
             success = user.fetch_qualified_segments()
@@ -2158,7 +2343,7 @@ class UserContextTest(base.BaseTest):
         self.assertEqual(segments_cache.lookup('wow'), 'great')
 
         user = OptimizelyUserContext(client, mock_logger, 'user-id')
-        with mock.patch('requests.post', return_value=self.fake_server_response(
+        with mock.patch('requests.Session.post', return_value=self.fake_server_response(
             status_code=200, content=json.dumps(self.good_response_data)
         )):
             success = user.fetch_qualified_segments(options=['RESET_CACHE'])
@@ -2179,7 +2364,7 @@ class UserContextTest(base.BaseTest):
         self.assertEqual(segments_cache.lookup(cache_key), ['great'])
 
         user = OptimizelyUserContext(client, mock_logger, 'user-id')
-        with mock.patch('requests.post', return_value=self.fake_server_response(
+        with mock.patch('requests.Session.post', return_value=self.fake_server_response(
             status_code=200, content=json.dumps(self.good_response_data)
         )):
             success = user.fetch_qualified_segments()
@@ -2199,7 +2384,7 @@ class UserContextTest(base.BaseTest):
         self.assertEqual(segments_cache.lookup(cache_key), ['great'])
 
         user = OptimizelyUserContext(client, mock_logger, 'user-id')
-        with mock.patch('requests.post', return_value=self.fake_server_response(
+        with mock.patch('requests.Session.post', return_value=self.fake_server_response(
             status_code=200, content=json.dumps(self.good_response_data)
         )):
             success = user.fetch_qualified_segments(options=['IGNORE_CACHE'])
@@ -2215,7 +2400,7 @@ class UserContextTest(base.BaseTest):
         client = optimizely.Optimizely(json.dumps(self.config_dict_with_audience_segments), logger=mock_logger)
         user = OptimizelyUserContext(client, mock_logger, 'user-id')
 
-        with mock.patch('requests.post', return_value=self.fake_server_response(status_code=500)):
+        with mock.patch('requests.Session.post', return_value=self.fake_server_response(status_code=500)):
             success = user.fetch_qualified_segments()
 
         self.assertFalse(success)
@@ -2239,7 +2424,7 @@ class UserContextTest(base.BaseTest):
         client = optimizely.Optimizely(json.dumps(self.config_dict_with_audience_segments), logger=mock_logger)
         user = OptimizelyUserContext(client, mock_logger, 'user-id')
 
-        with mock.patch('requests.post', return_value=self.fake_server_response(
+        with mock.patch('requests.Session.post', return_value=self.fake_server_response(
             status_code=200, content=json.dumps(self.good_response_data)
         )):
             thread = user.fetch_qualified_segments(callback=True)
@@ -2255,7 +2440,7 @@ class UserContextTest(base.BaseTest):
         user = OptimizelyUserContext(client, mock_logger, 'user-id')
         result = []
 
-        with mock.patch('requests.post', return_value=self.fake_server_response(
+        with mock.patch('requests.Session.post', return_value=self.fake_server_response(
             status_code=200, content=json.dumps(self.good_response_data)
         )):
             thread = user.fetch_qualified_segments(callback=lambda x: result.append(x))
@@ -2272,7 +2457,7 @@ class UserContextTest(base.BaseTest):
         user = OptimizelyUserContext(client, mock_logger, 'user-id')
         result = []
 
-        with mock.patch('requests.post', return_value=self.fake_server_response(status_code=500)):
+        with mock.patch('requests.Session.post', return_value=self.fake_server_response(status_code=500)):
             thread = user.fetch_qualified_segments(callback=lambda x: result.append(x))
             thread.join()
 
@@ -2293,7 +2478,7 @@ class UserContextTest(base.BaseTest):
         self.assertEqual(segments_cache.lookup(cache_key), ['great'])
 
         user = OptimizelyUserContext(client, mock_logger, 'user-id')
-        with mock.patch('requests.post', return_value=self.fake_server_response(
+        with mock.patch('requests.Session.post', return_value=self.fake_server_response(
             status_code=200, content=json.dumps(self.good_response_data)
         )):
             thread = user.fetch_qualified_segments(callback=True)
@@ -2303,6 +2488,75 @@ class UserContextTest(base.BaseTest):
         mock_logger.error.assert_not_called()
         client.close()
 
+    def test_fetch_segments_async_returns_future(self):
+        mock_logger = mock.Mock()
+        client = optimizely.Optimizely(json.dumps(self.config_dict_with_audience_segments), logger=mock_logger)
+        user = OptimizelyUserContext(client, mock_logger, 'user-id')
+
+        with mock.patch('requests.Session.post', return_value=self.fake_server_response(
+            status_code=200, content=json.dumps(self.good_response_data)
+        )):
+            future = user.fetch_qualified_segments_async()
+            self.assertIsInstance(future, Future)
+            self.assertStrictTrue(future.result(5))
+
+        self.assertEqual(user.get_qualified_segments(), ['a', 'b'])
+        self.assertTrue(future.done())
+        mock_logger.error.assert_not_called()
+        client.close()
+
+    def test_fetch_segments_async_rejected(self):
+        mock_logger = mock.Mock()
+        client = optimizely.Optimizely(
+            json.dumps(self.config_dict_with_audience_segments),
+            logger=mock_logger,
+            settings=OptimizelySdkSettings(
+                fetch_segments_max_workers=1,
+                fetch_segments_queue_size=0,
+                fetch_segments_rejection_policy=enums.ExecutorRejectionPolicies.REJECT
+            )
+        )
+        release = threading.Event()
+        client.odp_manager.fetch_executor.submit(release.wait, 5)
+        user = OptimizelyUserContext(client, mock_logger, 'user-id')
+        result = []
+
+        with mock.patch('requests.Session.post') as mock_request_post:
+            future = user.fetch_qualified_segments(callback=lambda x: result.append(x))
+        release.set()
+
+        self.assertTrue(future.cancelled())
+        self.assertEqual([False], result)
+        mock_request_post.assert_not_called()
+        mock_logger.warning.assert_called_once_with('Audience segments fetch failed (thread pool is full).')
+        client.close()
+
+    def test_fetch_segments_non_blocking_uses_shared_threads(self):
+        mock_logger = mock.Mock()
+        client = optimizely.Optimizely(
+            json.dumps(self.config_dict_with_audience_segments),
+            logger=mock_logger,
+            settings=OptimizelySdkSettings(fetch_segments_max_workers=2)
+        )
+        thread_names = set()
+
+        def callback(success):
+            thread_names.add(threading.current_thread().name)
+
+        with mock.patch('requests.Session.post', return_value=self.fake_server_response(
+            status_code=200, content=json.dumps(self.good_response_data)
+        )):
+            futures = [
+                OptimizelyUserContext(client, mock_logger, f'user-{i}').fetch_qualified_segments(callback=callback)
+                for i in range(20)
+            ]
+            for future in futures:
+                future.join()
+
+        self.assertLessEqual(len(thread_names), 2)
+        self.assertTrue(all(name.startswith('FetchQualifiedSegmentsThread') for name in thread_names))
+        client.close()
+
     def test_decide_correctly_with_non_blocking(self):
         self.good_response_data['data']['customer']['audiences']['edges'][0]['node']['name'] = 'odp-segment-2'
         mock_logger = mock.Mock()
@@ -2315,7 +2569,7 @@ class UserContextTest(base.BaseTest):
             decision = user.decide('flag-segment')
             results.append(decision.variation_key)
 
-        with mock.patch('requests.post', return_value=self.fake_server_response(
+        with mock.patch('requests.Session.post', return_value=self.fake_server_response(
             status_code=200, content=json.dumps(self.good_response_data)
         )):
             thread = user.fetch_qualified_segments(callback=callback)
@@ -2332,7 +2586,7 @@ class UserContextTest(base.BaseTest):
         client = optimizely.Optimizely(json.dumps(self.config_dict_with_audience_segments), logger=mock_logger)
         user = OptimizelyUserContext(client, mock_logger, 'user"id')
 
-        with mock.patch('requests.post', return_value=self.fake_server_response(
+        with mock.patch('requests.Session.post', return_value=self.fake_server_response(
             status_code=200, content=json.dumps(self.good_response_data)
         )):
             success = user.fetch_qualified_segments()
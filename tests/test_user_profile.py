@@ -11,6 +11,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import time
 import unittest
 
 from optimizely import user_profile
@@ -137,3 +138,117 @@ class UserProfileTrackerTest(unittest.TestCase):
         mock_logger.warning.assert_called_once_with(
             'Failed to save user profile of user "test_user" for exception:Save failure".'
         )
+
+
+class InMemoryUserProfileService(user_profile.BatchUserProfileService):
+    def __init__(self):
+        self.profiles = {}
+        self.save_many_calls = []
+
+    def lookup(self, user_id):
+        return self.profiles.get(user_id)
+
+    def save(self, user_profile):
+        self.profiles[user_profile['user_id']] = user_profile
+
+    def save_many(self, user_profiles):
+        self.save_many_calls.append([profile['user_id'] for profile in user_profiles])
+        super().save_many(user_profiles)
+
+
+def _profile(user_id, variation_id):
+    return {'user_id': user_id, 'experiment_bucket_map': {'111127': {'variation_id': variation_id}}}
+
+
+class BatchUserProfileServiceTest(unittest.TestCase):
+    def test_lookup_many_and_save_many(self):
+        service = InMemoryUserProfileService()
+        service.save_many([_profile('user_1', 'a'), _profile('user_2', 'b')])
+
+        self.assertEqual(
+            {'user_1': _profile('user_1', 'a'), 'user_2': _profile('user_2', 'b'), 'user_3': None},
+            service.lookup_many(['user_1', 'user_2', 'user_3'])
+        )
+
+    def test_async_variants(self):
+        import asyncio
+
+        service = InMemoryUserProfileService()
+
+        async def run():
+            await service.save_async(_profile('user_1', 'a'))
+            await service.save_many_async([_profile('user_2', 'b')])
+            return await service.lookup_async('user_1'), await service.lookup_many_async(['user_2'])
+
+        self.assertEqual((_profile('user_1', 'a'), {'user_2': _profile('user_2', 'b')}), asyncio.run(run()))
+
+
+class WriteBehindUserProfileServiceTest(unittest.TestCase):
+    def test_save__coalesces_per_user_and_flushes_in_batches(self):
+        service = InMemoryUserProfileService()
+        write_behind = user_profile.WriteBehindUserProfileService(service, batch_size=2, flush_interval=60)
+        with mock.patch.object(write_behind.lock, 'notify'):
+            write_behind.save(_profile('user_1', 'a'))
+            write_behind.save(_profile('user_1', 'b'))
+            write_behind.save(_profile('user_2', 'c'))
+            write_behind.save(_profile('user_3', 'd'))
+
+        # queued profiles are returned by lookups before they are written
+        self.assertEqual(3, write_behind.get_pending_count())
+        self.assertEqual({}, service.profiles)
+        self.assertEqual(_profile('user_1', 'b'), write_behind.lookup('user_1'))
+        self.assertEqual(
+            {'user_2': _profile('user_2', 'c'), 'user_4': None}, write_behind.lookup_many(['user_2', 'user_4'])
+        )
+
+        write_behind.close()
+
+        self.assertEqual(['user_1', 'user_2'], service.save_many_calls[0])
+        self.assertEqual(['user_3'], service.save_many_calls[1])
+        self.assertEqual(_profile('user_1', 'b'), service.profiles['user_1'])
+        self.assertEqual(0, write_behind.get_pending_count())
+        self.assertFalse(write_behind.thread.is_alive())
+
+    def test_worker_flushes_full_batches(self):
+        service = InMemoryUserProfileService()
+        write_behind = user_profile.WriteBehindUserProfileService(service, batch_size=1, flush_interval=60)
+
+        write_behind.save(_profile('user_1', 'a'))
+        for _ in range(100):
+            if 'user_1' in service.profiles:
+                break
+            time.sleep(0.01)
+
+        self.assertEqual(_profile('user_1', 'a'), service.profiles['user_1'])
+        write_behind.close()
+
+    def test_save__after_close_or_when_full_saves_synchronously(self):
+        service = InMemoryUserProfileService()
+        write_behind = user_profile.WriteBehindUserProfileService(
+            service, batch_size=10, flush_interval=60, max_pending=1
+        )
+
+        write_behind.save(_profile('user_1', 'a'))
+        write_behind.save(_profile('user_2', 'b'))
+        self.assertEqual({'user_2': _profile('user_2', 'b')}, service.profiles)
+
+        write_behind.close()
+        write_behind.save(_profile('user_3', 'c'))
+        self.assertEqual(['user_1', 'user_2', 'user_3'], sorted(service.profiles))
+
+    def test_flush__logs_failed_saves(self):
+        service = user_profile.UserProfileService()
+        mock_logger = mock.MagicMock()
+        mock_error_handler = mock.MagicMock()
+        write_behind = user_profile.WriteBehindUserProfileService(
+            service, flush_interval=60, logger=mock_logger, error_handler=mock_error_handler
+        )
+        error = Exception('Save failure')
+
+        with mock.patch.object(service, 'save', side_effect=error):
+            write_behind.save(_profile('user_1', 'a'))
+            write_behind.close()
+
+        mock_logger.warning.assert_called_once_with('Failed to save 1 user profiles for exception: Save failure')
+        mock_error_handler.handle_error.assert_called_once_with(error)
+        self.assertEqual(0, write_behind.get_pending_count())